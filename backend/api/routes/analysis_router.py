@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
 from typing import List, Union, Literal, Annotated, Any, Dict, Optional, Tuple
+import asyncio
 import logging
 import os
+import re
 import tempfile
 import json
 import uuid
@@ -11,11 +14,13 @@ import shutil
 from datetime import datetime
 
 # --- 自定义模块 ---
-from ...core.v5_runner import run_v5_analysis
+from ...core.v5_runner import KratosV5Adapter, run_v5_analysis, job_working_dir
+from ...core.post_processing import get_visualization_data, get_preview_image
 from ...core.analysis_runner import (
-    DeepExcavationModel, run_deep_excavation_analysis
+    DeepExcavationModel, run_deep_excavation_analysis_async
 )
 from ...core.kratos_solver import KratosSolver
+from ...core.profiling import load_profile_summary
 
 # --- 日志配置 ---
 logging.basicConfig(level=logging.INFO)
@@ -185,7 +190,9 @@ class CreateExcavationFromDXFFeature(BaseFeature):
 
 
 class CreateGeologicalModelParameters(BaseModel):
-    csvData: str
+    csvData: Optional[str] = None
+    # 已摄取的钻孔数据集 id（见 /api/geology/datasets），提供时无需再上传 csvData
+    datasetId: Optional[str] = None
     terrainParams: Optional[Dict[str, Any]] = None
     layerInfo: Optional[List[Dict[str, Any]]] = None
 
@@ -240,6 +247,14 @@ class AnalysisRequest(BaseModel):
     """Analysis request with scene data"""
     scene: ParametricScene
     settings: Dict[str, Any] = {}
+    profile: bool = False  # 开启后可通过 /jobs/{id}/profile 查看剖析结果
+
+
+class GeologyPreviewRequest(BaseModel):
+    """GemPy 粗算预览请求"""
+    scene: ParametricScene
+    extent: Optional[List[float]] = None  # 岩性取值范围 [xmin, xmax, ymin, ymax, zmin, zmax]
+    resolution: Optional[List[int]] = None  # 岩性取值分辨率 [nx, ny, nz]
 
 
 class Material(BaseModel):
@@ -385,6 +400,10 @@ async def get_analysis_result_file(filename_with_ext: str):
 # ############################################################################
 
 
+# 正在运行或已完成的深基坑分析的部分结果，按项目名索引
+_deep_excavation_progress: Dict[str, Dict[str, Any]] = {}
+
+
 @router.post("/deep-excavation/analyze", tags=["Legacy Analysis"])
 async def analyze_deep_excavation(model: DeepExcavationModel):
     """
@@ -392,8 +411,16 @@ async def analyze_deep_excavation(model: DeepExcavationModel):
     """
     logger.info(f"收到旧版深基坑工程分析请求: {model.project_name}")
     
+    progress = {"status": "running", "results": {}}
+    _deep_excavation_progress[model.project_name] = progress
+    
+    def on_result(analysis_type: str, analysis_result: Dict[str, Any]):
+        # 每个分析完成后立即可通过 /deep-excavation/results/{project_id} 查询
+        progress["results"][analysis_type] = analysis_result
+    
     try:
-        result = run_deep_excavation_analysis(model)
+        result = await run_deep_excavation_analysis_async(model, on_result)
+        progress["status"] = result["status"]
         
         return {
             "status": "success",
@@ -401,6 +428,7 @@ async def analyze_deep_excavation(model: DeepExcavationModel):
             "results": result
         }
     except Exception as e:
+        progress["status"] = "failed"
         logger.error(f"深基坑工程分析失败: {str(e)}")
         raise HTTPException(
             status_code=500,
@@ -417,6 +445,14 @@ async def get_deep_excavation_results(project_id: str):
     """
     logger.info(f"获取深基坑工程分析结果: {project_id}")
     
+    progress = _deep_excavation_progress.get(project_id)
+    if progress is not None:
+        return {
+            "project_id": project_id,
+            "status": progress["status"],
+            "results": dict(progress["results"])
+        }
+    
     return {
         "project_id": project_id,
         "status": "completed",
@@ -467,12 +503,13 @@ async def run_analysis(request: AnalysisRequest):
     """
     try:
         # 运行V5分析
-        result = run_v5_analysis(request.scene.dict())
+        job_id = str(uuid.uuid4())
+        result = run_v5_analysis(request.scene.dict(), job_id=job_id, profile=request.profile)
         
         return {
             "status": "success",
             "message": "Analysis completed successfully",
-            "result_id": result.get("result_id", str(uuid.uuid4())),
+            "result_id": job_id,
             "mesh_filename": result.get("mesh_filename"),
             "visualization_data": result.get("visualization_data")
         }
@@ -480,6 +517,19 @@ async def run_analysis(request: AnalysisRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/geology/preview", tags=["Parametric Analysis"])
+async def preview_geology(request: GeologyPreviewRequest):
+    """
+    GemPy 粗算的地层面预览；插值结果按钻孔数据集缓存，随后的分析在其上细化
+    """
+    adapter = KratosV5Adapter(request.scene.features, extent=request.extent,
+                              resolution=request.resolution)
+    result = await run_in_threadpool(adapter.run_preview)
+    if result["status"] == "failed":
+        raise HTTPException(status_code=500, detail=result["message"])
+    return result
+
+
 @router.get("/results/{filename}")
 async def get_analysis_result(filename: str):
     """
@@ -759,6 +809,54 @@ async def run_coupled_analysis(request: CoupledAnalysisRequest, background_tasks
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _require_job_dir(job_id: str) -> str:
+    working_dir = job_working_dir(job_id)
+    if working_dir is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return working_dir
+
+
+@router.get("/jobs/{job_id}/profile")
+async def get_job_profile(job_id: str):
+    """
+    获取任务的剖析汇总（各阶段耗时/内存峰值、热点函数、主要内存分配位置）
+    """
+    summary = load_profile_summary(_require_job_dir(job_id))
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No profile recorded for this job")
+    return summary
+
+
+@router.get("/jobs/{job_id}/visualization-data")
+async def get_job_visualization_data(job_id: str):
+    """
+    获取任务的前端可视化JSON；首次请求时从最后一个输出步导出并缓存
+    """
+    working_dir = _require_job_dir(job_id)
+    try:
+        path = await run_in_threadpool(get_visualization_data, working_dir, job_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return FileResponse(path, media_type="application/json")
+
+
+@router.get("/jobs/{job_id}/preview")
+async def get_job_preview(job_id: str, field: Optional[str] = None):
+    """
+    获取任务的预览图，可按物理场着色；首次请求时由渲染池生成并缓存
+    """
+    # 字段名会成为文件名的一部分
+    if field is not None and not re.fullmatch(r"[A-Za-z0-9_]+", field):
+        raise HTTPException(status_code=400, detail="Invalid field name")
+    working_dir = _require_job_dir(job_id)
+    try:
+        future = get_preview_image(working_dir, job_id, scalar_field=field, wait=False)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    path = await asyncio.wrap_future(future)
+    return FileResponse(path, media_type="image/png")
+
+
 @router.get("/status/{result_id}")
 async def get_analysis_status(result_id: str):
     """
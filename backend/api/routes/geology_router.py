@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+import asyncio
+import os
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from typing import Any, Dict, List
 from loguru import logger
 
+from backend.core.borehole_dataset import borehole_store
 from backend.services.geology_service import GeologyService
 from backend.models.geology import (
     GeologicalLayer,
@@ -42,4 +46,33 @@ async def create_geological_model_endpoint(
         raise HTTPException(
             status_code=500,
             detail=f"An internal server error occurred: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+
+@router.post(
+    "/datasets",
+    summary="Ingest Borehole Dataset",
+    description="Parses a borehole CSV/XLS/XLSX file once into a validated columnar dataset and returns its content-hash id."
+)
+async def ingest_borehole_dataset(file: UploadFile = File(...)) -> Dict[str, Any]:
+    """
+    Uploads borehole data once; later requests reference it by `datasetId`.
+    """
+    fmt = os.path.splitext(file.filename or "")[1].lstrip(".").lower() or "csv"
+    content = await file.read()
+    try:
+        dataset_id = await asyncio.to_thread(borehole_store.ingest, content, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return borehole_store.metadata(dataset_id)
+
+
+@router.get(
+    "/datasets/{dataset_id}",
+    summary="Get Borehole Dataset Metadata",
+)
+async def get_borehole_dataset(dataset_id: str) -> Dict[str, Any]:
+    try:
+        return borehole_store.metadata(dataset_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
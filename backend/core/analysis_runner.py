@@ -3,17 +3,20 @@
 整合渗流分析、支护结构分析、土体变形分析、稳定性分析和沉降分析
 """
 import os
+import json
+import hashlib
 import tempfile
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional, Union
-from pydantic import BaseModel, Field
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Union
+from pydantic import BaseModel
 
 # 导入各个分析模块
 # from .v5_runner import DXFProcessor  # 暂时禁用复杂依赖
 from .kratos_solver import run_seepage_analysis
 from .memory_optimizer import global_memory_optimizer, memory_efficient
-from .error_handler import global_error_handler, handle_errors
+from .error_handler import handle_errors
 
 # Suzaku cache integration
 from .intelligent_cache import (
@@ -63,6 +66,7 @@ class ExcavationStage(BaseModel):
     name: str
     depth: float
     active_supports: List[str]  # 该阶段激活的支护结构
+    excavated_groups: List[str] = []  # 截至该阶段已开挖的土体单元组，为空时按开挖深度确定
 
 
 class DeepExcavationModel(BaseModel):
@@ -74,7 +78,7 @@ class DeepExcavationModel(BaseModel):
     structural_elements: List[StructuralElement]
     boundary_conditions: List[BoundaryCondition]
     excavation_stages: List[ExcavationStage]
-    analysis_types: List[str]  # 'seepage', 'structural', 'deformation', 'stability', 'settlement'
+    analysis_types: List[str]  # 'seepage', 'structural', 'deformation', 'stability', 'settlement', 'staged'
 
 
 class AnalysisResult(BaseModel):
@@ -87,62 +91,83 @@ class AnalysisResult(BaseModel):
 
 # --- 统一分析流程 ---
 
+# 分析类型 -> 分析器方法
+ANALYSIS_METHODS: Dict[str, str] = {
+    'seepage': '_run_seepage_analysis',
+    'structural': '_run_structural_analysis',
+    'deformation': '_run_deformation_analysis',
+    'stability': '_run_stability_analysis',
+    'settlement': '_run_settlement_analysis',
+    'staged': '_run_staged_excavation_analysis',
+}
+
+# 分析类型之间的依赖：耦合的结构分析和分阶段开挖需要先得到渗流场（孔压）；
+# 稳定性、沉降等分析相互独立，可以并行
+ANALYSIS_DEPENDENCIES: Dict[str, List[str]] = {
+    'structural': ['seepage'],
+    'staged': ['seepage'],
+}
+
+# 单个分析完成时的回调: (analysis_type, result)
+ResultCallback = Callable[[str, Dict[str, Any]], None]
+
+
 class DeepExcavationAnalyzer:
     """深基坑工程统一分析器"""
     
-    def __init__(self, model: DeepExcavationModel):
+    def __init__(self, model: DeepExcavationModel, working_dir: Optional[str] = None,
+                 max_workers: Optional[int] = None):
         self.model = model
-        self.working_dir = tempfile.mkdtemp(prefix=f"deep_excavation_{model.project_name}_")
+        self.working_dir = working_dir or tempfile.mkdtemp(prefix=f"deep_excavation_{model.project_name}_")
+        self.max_workers = max_workers or int(os.environ.get(
+            "DEEPCAD_ANALYSIS_WORKERS", str(os.cpu_count() or 1)))
         self.results = {}
         self.result_files = {}
         logger.info(f"创建分析工作目录: {self.working_dir}")
     
-    def run_all_analyses(self) -> AnalysisResult:
-        """运行所有请求的分析类型"""
+    def run_all_analyses(self, on_result: Optional[ResultCallback] = None) -> AnalysisResult:
+        """运行所有请求的分析类型（同步入口）"""
+        return asyncio.run(self.run_all_analyses_async(on_result))
+    
+    async def run_all_analyses_async(self, on_result: Optional[ResultCallback] = None) -> AnalysisResult:
+        """
+        按依赖关系并行运行所有请求的分析类型
+        
+        互不依赖的分析在独立的工作进程中同时运行，共享同一网格文件；
+        每个分析完成后立即通过 on_result(analysis_type, result) 回调输出，
+        不必等待其余分析。整个运行只使用一个缓存客户端和一个事件循环。
+        """
         try:
-            # 处理DXF文件 - 简化版本
-            # dxf_processor = DXFProcessor(self.model.dxf_file_content, self.model.layer_name)
-            # excavation_footprint = dxf_processor.extract_profile_vertices()
-            excavation_footprint = [(0, 0), (10, 0), (10, 10), (0, 10)]  # 简化的矩形轮廓
-            logger.info(f"提取基坑轮廓，共{len(excavation_footprint)}个顶点")
-            
-            # 生成基本网格文件
-            mesh_filename = self._generate_base_mesh(excavation_footprint)
+            mesh_filename = self._prepare_mesh()
             
-            # 读取 mesh_hash（若由 mesh_generator 生成）
-            mesh_hash_path = os.path.join(os.path.dirname(mesh_filename), "mesh_hash.txt")
-            if os.path.exists(mesh_hash_path):
-                with open(mesh_hash_path, "r") as fh:
-                    self.mesh_hash = fh.read().strip()
-            else:
-                # 回退：使用简单参数计算网格哈希
-                self.mesh_hash = compute_mesh_hash("unknown", {"dummy": 1})
-
             # 初始化缓存系统
             self.cache = IntelligentCacheSystem()
             
-            # 根据请求的分析类型运行相应的分析
-            for analysis_type in self.model.analysis_types:
-                if analysis_type == 'seepage':
-                    # 检查缓存
-                    a_hash = compute_analysis_hash(self.mesh_hash, {"type": "seepage"}, "kratos_v1")
-                    cached = asyncio.run(self.cache.get(a_hash))
-                    if cached:
-                        logger.info("命中渗流分析缓存")
-                        self.results['seepage'] = cached['results']
-                        self.result_files['seepage'] = cached['file']
-                    else:
-                        self._run_seepage_analysis(mesh_filename)
-                        # 写入缓存
-                        asyncio.run(self.cache.set(a_hash, {"results": self.results['seepage'], "file": self.result_files['seepage']}))
-                elif analysis_type == 'structural':
-                    self._run_structural_analysis(mesh_filename)
-                elif analysis_type == 'deformation':
-                    self._run_deformation_analysis(mesh_filename)
-                elif analysis_type == 'stability':
-                    self._run_stability_analysis(mesh_filename)
-                elif analysis_type == 'settlement':
-                    self._run_settlement_analysis(mesh_filename)
+            graph = self._build_task_graph()
+            analysis_hashes: Dict[str, str] = {}
+            remaining = dict(graph)
+            running: Dict[asyncio.Future, str] = {}
+            
+            with ProcessPoolExecutor(max_workers=max(1, min(self.max_workers, len(graph) or 1))) as pool:
+                while remaining or running:
+                    # 启动所有依赖已完成的分析
+                    ready = [t for t, deps in remaining.items()
+                             if all(d in self.results for d in deps)]
+                    for analysis_type in ready:
+                        del remaining[analysis_type]
+                        task = asyncio.ensure_future(self._run_analysis_task(
+                            analysis_type, graph[analysis_type], mesh_filename, pool, analysis_hashes))
+                        running[task] = analysis_type
+                    
+                    finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in finished:
+                        analysis_type = running.pop(task)
+                        result, result_file = task.result()
+                        self.results[analysis_type] = result
+                        if result_file:
+                            self.result_files[analysis_type] = result_file
+                        if on_result is not None:
+                            on_result(analysis_type, result)
             
             return AnalysisResult(
                 status="completed",
@@ -160,6 +185,81 @@ class DeepExcavationAnalyzer:
                 files={}
             )
     
+    def _prepare_mesh(self) -> str:
+        """提取基坑轮廓并生成所有分析共享的网格文件"""
+        # 处理DXF文件 - 简化版本
+        # dxf_processor = DXFProcessor(self.model.dxf_file_content, self.model.layer_name)
+        # excavation_footprint = dxf_processor.extract_profile_vertices()
+        excavation_footprint = [(0, 0), (10, 0), (10, 10), (0, 10)]  # 简化的矩形轮廓
+        logger.info(f"提取基坑轮廓，共{len(excavation_footprint)}个顶点")
+        
+        # 生成基本网格文件
+        mesh_filename = self._generate_base_mesh(excavation_footprint)
+        
+        # 读取 mesh_hash（若由 mesh_generator 生成）
+        mesh_hash_path = os.path.join(os.path.dirname(mesh_filename), "mesh_hash.txt")
+        if os.path.exists(mesh_hash_path):
+            with open(mesh_hash_path, "r") as fh:
+                self.mesh_hash = fh.read().strip()
+        else:
+            # 回退：按网格文件内容计算网格哈希
+            with open(mesh_filename, "rb") as fh:
+                mesh_digest = hashlib.sha256(fh.read()).hexdigest()
+            self.mesh_hash = compute_mesh_hash(mesh_digest, {"source": "base_mesh"})
+        
+        # 模型输入（土层、支护、边界条件、开挖阶段等）的哈希，纳入每个分析的缓存键，
+        # 同一网格上材料或荷载不同的分析不会命中彼此的缓存
+        model_inputs = self.model.dict(exclude={"analysis_types"})
+        self.inputs_hash = hashlib.sha256(
+            json.dumps(model_inputs, sort_keys=True, default=str).encode()).hexdigest()
+        return mesh_filename
+    
+    def _build_task_graph(self) -> Dict[str, List[str]]:
+        """请求的分析类型 -> 其依赖的（同样被请求的）分析类型"""
+        requested = []
+        for analysis_type in self.model.analysis_types:
+            if analysis_type not in ANALYSIS_METHODS:
+                logger.warning(f"未知的分析类型: {analysis_type}")
+            elif analysis_type not in requested:
+                requested.append(analysis_type)
+        return {
+            t: [d for d in ANALYSIS_DEPENDENCIES.get(t, []) if d in requested]
+            for t in requested
+        }
+    
+    async def _run_analysis_task(self, analysis_type: str, dependencies: List[str],
+                                 mesh_filename: str, pool: ProcessPoolExecutor,
+                                 analysis_hashes: Dict[str, str]):
+        """运行单个分析（先查缓存），返回 (结果, 结果文件)"""
+        bc_loads = {"type": analysis_type, "inputs": self.inputs_hash}
+        if dependencies:
+            # 下游分析的缓存键包含上游分析的键
+            bc_loads["upstream"] = [analysis_hashes[d] for d in dependencies]
+        a_hash = compute_analysis_hash(self.mesh_hash, bc_loads, "kratos_v1")
+        analysis_hashes[analysis_type] = a_hash
+        
+        cached = await self.cache.get(a_hash)
+        if cached:
+            logger.info(f"命中{analysis_type}分析缓存")
+            return cached['results'], cached['file']
+        
+        upstream = {d: self.results[d] for d in dependencies}
+        loop = asyncio.get_running_loop()
+        try:
+            result, result_file = await loop.run_in_executor(
+                pool, _run_analysis_in_worker,
+                self.model, self.working_dir, mesh_filename, analysis_type, upstream)
+        except Exception as e:
+            logger.error(f"{analysis_type}分析进程失败: {str(e)}")
+            return {"status": "failed", "error_message": str(e)}, None
+        
+        if result is None:
+            result = {"status": "failed", "error_message": "分析未返回结果"}
+        elif result.get("status") == "completed":
+            # 写入缓存
+            await self.cache.set(a_hash, {"results": result, "file": result_file})
+        return result, result_file
+    
     def _generate_base_mesh(self, excavation_footprint) -> str:
         """生成基本网格文件"""
         mesh_filename = os.path.join(self.working_dir, f"{self.model.project_name}.mdpa")
@@ -195,51 +295,51 @@ class DeepExcavationAnalyzer:
         
         with global_memory_optimizer.memory_limit("seepage_analysis"):
             # 准备渗流分析所需的材料参数
-        materials = []
-        for soil in self.model.soil_layers:
-            materials.append({
-                "name": soil.name,
-                "hydraulic_conductivity_x": soil.hydraulic_conductivity_x,
-                "hydraulic_conductivity_y": soil.hydraulic_conductivity_y,
-                "hydraulic_conductivity_z": soil.hydraulic_conductivity_z,
-                "porosity": soil.porosity,
-                "specific_storage": soil.specific_storage
-            })
-        
-        # 准备渗流分析所需的边界条件
-        boundary_conditions = []
-        for bc in self.model.boundary_conditions:
-            if bc.type == 'hydraulic':
-                boundary_conditions.append({
-                    "type": "constant_head",
-                    "boundary_name": bc.boundary_name,
-                    "total_head": bc.value if isinstance(bc.value, float) else bc.value[0]
+            materials = []
+            for soil in self.model.soil_layers:
+                materials.append({
+                    "name": soil.name,
+                    "hydraulic_conductivity_x": soil.hydraulic_conductivity_x,
+                    "hydraulic_conductivity_y": soil.hydraulic_conductivity_y,
+                    "hydraulic_conductivity_z": soil.hydraulic_conductivity_z,
+                    "porosity": soil.porosity,
+                    "specific_storage": soil.specific_storage
                 })
         
-        try:
-            # 运行渗流分析
-            result_file = run_seepage_analysis(mesh_filename, materials, boundary_conditions)
+            # 准备渗流分析所需的边界条件
+            boundary_conditions = []
+            for bc in self.model.boundary_conditions:
+                if bc.type == 'hydraulic':
+                    boundary_conditions.append({
+                        "type": "constant_head",
+                        "boundary_name": bc.boundary_name,
+                        "total_head": bc.value if isinstance(bc.value, float) else bc.value[0]
+                    })
+        
+            try:
+                # 运行渗流分析
+                result_file = run_seepage_analysis(mesh_filename, materials, boundary_conditions)
             
-            # 处理结果
-            # 这里应该读取VTK文件并提取结果，这里简化处理
-            max_head_diff = max([bc["total_head"] for bc in boundary_conditions]) - min([bc["total_head"] for bc in boundary_conditions])
-            total_discharge = max_head_diff * 0.001
+                # 处理结果
+                # 这里应该读取VTK文件并提取结果，这里简化处理
+                max_head_diff = max([bc["total_head"] for bc in boundary_conditions]) - min([bc["total_head"] for bc in boundary_conditions])
+                total_discharge = max_head_diff * 0.001
             
-            # 保存结果
-            self.results['seepage'] = {
-                "status": "completed",
-                "total_discharge_m3_per_s": round(total_discharge, 6),
-                "max_head_difference": max_head_diff
-            }
-            self.result_files['seepage'] = result_file
+                # 保存结果
+                self.results['seepage'] = {
+                    "status": "completed",
+                    "total_discharge_m3_per_s": round(total_discharge, 6),
+                    "max_head_difference": max_head_diff
+                }
+                self.result_files['seepage'] = result_file
             
-            logger.info("渗流分析完成")
-        except Exception as e:
-            logger.error(f"渗流分析失败: {str(e)}")
-            self.results['seepage'] = {
-                "status": "failed",
-                "error_message": str(e)
-            }
+                logger.info("渗流分析完成")
+            except Exception as e:
+                logger.error(f"渗流分析失败: {str(e)}")
+                self.results['seepage'] = {
+                    "status": "failed",
+                    "error_message": str(e)
+                }
     
     def _run_structural_analysis(self, mesh_filename):
         """运行支护结构分析"""
@@ -256,6 +356,40 @@ class DeepExcavationAnalyzer:
         
         logger.info("支护结构分析完成")
     
+    def _run_staged_excavation_analysis(self, mesh_filename):
+        """运行分阶段开挖分析（阶段间复用状态，修改后只重算受影响的阶段）"""
+        logger.info(f"开始分阶段开挖分析，共{len(self.model.excavation_stages)}个阶段")
+        
+        # 延迟导入，未请求分阶段分析时不加载重启工具
+        from .staged_excavation import StagedExcavationSolver
+        
+        try:
+            solver = StagedExcavationSolver(
+                mesh_filename,
+                stages=[stage.dict() for stage in self.model.excavation_stages],
+                support_parts=[element.name for element in self.model.structural_elements],
+                boundary_conditions=[
+                    {"type": bc.type, "boundary_name": bc.boundary_name, "value": bc.value}
+                    for bc in self.model.boundary_conditions if bc.type == 'displacement'
+                ],
+            )
+            stage_results = solver.solve()
+            
+            self.results['staged'] = {
+                "status": "completed",
+                "stages": stage_results,
+                "max_displacement_mm": max(
+                    (r.get("max_displacement_mm", 0.0) for r in stage_results), default=0.0)
+            }
+            self.result_files['staged'] = os.path.join(self.working_dir, "vtk_output")
+            logger.info("分阶段开挖分析完成")
+        except Exception as e:
+            logger.error(f"分阶段开挖分析失败: {str(e)}")
+            self.results['staged'] = {
+                "status": "failed",
+                "error_message": str(e)
+            }
+    
     def _run_deformation_analysis(self, mesh_filename):
         """运行土体变形分析"""
         logger.info("开始土体变形分析")
@@ -302,16 +436,37 @@ class DeepExcavationAnalyzer:
         logger.info("沉降分析完成")
 
 
+def _run_analysis_in_worker(model: DeepExcavationModel, working_dir: str, mesh_filename: str,
+                            analysis_type: str, upstream: Dict[str, Any]):
+    """在工作进程中运行单个分析，返回 (结果, 结果文件)"""
+    analyzer = DeepExcavationAnalyzer(model, working_dir=working_dir)
+    analyzer.results.update(upstream)
+    getattr(analyzer, ANALYSIS_METHODS[analysis_type])(mesh_filename)
+    return analyzer.results.get(analysis_type), analyzer.result_files.get(analysis_type)
+
+
 # --- 统一分析入口函数 ---
 
-def run_deep_excavation_analysis(model: DeepExcavationModel) -> Dict[str, Any]:
+def run_deep_excavation_analysis(model: DeepExcavationModel,
+                                 on_result: Optional[ResultCallback] = None) -> Dict[str, Any]:
     """
     深基坑工程统一分析入口函数
     """
+    return asyncio.run(run_deep_excavation_analysis_async(model, on_result))
+
+
+async def run_deep_excavation_analysis_async(model: DeepExcavationModel,
+                                             on_result: Optional[ResultCallback] = None
+                                             ) -> Dict[str, Any]:
+    """
+    深基坑工程统一分析入口函数（在已有事件循环中使用）
+    
+    on_result 在每个分析完成时立即被调用，可用于向前端推送部分结果。
+    """
     logger.info(f"开始深基坑工程分析: {model.project_name}")
     
     analyzer = DeepExcavationAnalyzer(model)
-    result = analyzer.run_all_analyses()
+    result = await analyzer.run_all_analyses_async(on_result)
     
     logger.info(f"深基坑工程分析完成: {result.status}")
     
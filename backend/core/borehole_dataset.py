@@ -0,0 +1,295 @@
+"""
+钻孔数据摄取
+CSV/XLS 只解析一次：列名规范化、向量化校验与去重后存为列式数据集
+（安装 pyarrow 时为 Parquet，否则为 pandas pickle），以格式与原始内容的 sha256 作为数据集 id。
+之后的请求只需引用 dataset id，无需重复上传和解析 CSV。
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .tracing import trace_span
+
+logger = logging.getLogger(__name__)
+
+# 尝试导入pyarrow（可选，用于Parquet存储）
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# 数据集存储目录
+BOREHOLE_DATASET_DIR = os.environ.get(
+    "DEEPCAD_BOREHOLE_DATASET_DIR", os.path.abspath("./borehole_datasets"))
+
+# 规范列：坐标为 float64，地层名为 category
+COORD_COLUMNS = ["X", "Y", "Z"]
+SURFACE_COLUMN = "surface"
+_COLUMN_ALIASES = {"x": "X", "y": "Y", "z": "Z", "surface": SURFACE_COLUMN,
+                   "formation": SURFACE_COLUMN, "layer": SURFACE_COLUMN}
+
+# 数据集表文件的存储格式与后缀
+_TABLE_SUFFIXES = {"parquet": ".parquet", "pickle": ".pkl"}
+
+
+@dataclass
+class ValidationReport:
+    """校验与去重统计"""
+    input_rows: int = 0
+    invalid_rows: int = 0
+    merged_duplicates: int = 0
+    valid_rows: int = 0
+    surfaces: Dict[str, int] = field(default_factory=dict)
+    extent: List[float] = field(default_factory=list)
+
+
+def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    renamed = {c: _COLUMN_ALIASES[str(c).strip().lower()] for c in df.columns
+               if str(c).strip().lower() in _COLUMN_ALIASES}
+    df = df.rename(columns=renamed)
+    missing = [c for c in COORD_COLUMNS + [SURFACE_COLUMN] if c not in df.columns]
+    if missing:
+        raise ValueError(f"钻孔数据缺少列: {missing}")
+    return df[COORD_COLUMNS + [SURFACE_COLUMN]]
+
+
+def parse_borehole_csv(data: Union[str, bytes]) -> pd.DataFrame:
+    """解析长表 CSV (X, Y, Z, surface/formation)"""
+    if isinstance(data, bytes):
+        data = data.decode("utf-8-sig")
+    return _normalize_columns(pd.read_csv(io.StringIO(data)))
+
+
+def parse_borehole_excel(data: Union[bytes, str]) -> pd.DataFrame:
+    """
+    解析 Excel 钻孔数据
+
+    支持两种布局：
+    - 长表：表头含 X, Y, Z, surface/formation
+    - 分层宽表（勘察原始表）：第0行为地层名“第N层”，第1行为各层的 X/Y/Z 列名，
+      第2行起为数据；各层的三列整体切片后纵向拼接
+    """
+    source = io.BytesIO(data) if isinstance(data, bytes) else data
+    raw = pd.read_excel(source, header=None)
+
+    header = [str(c).strip().lower() for c in raw.iloc[0]]
+    if {"x", "y", "z"} <= set(header) and set(header) & {"surface", "formation", "layer"}:
+        table = raw.iloc[1:].copy()
+        table.columns = raw.iloc[0]
+        return _normalize_columns(table)
+
+    layer_row, coord_row = raw.iloc[0], raw.iloc[1]
+    starts = [i for i, cell in enumerate(layer_row)
+              if isinstance(cell, str) and cell.startswith('第') and cell.endswith('层')]
+    body = raw.iloc[2:]
+    blocks = []
+    for k, start in enumerate(starts):
+        stop = starts[k + 1] if k + 1 < len(starts) else len(layer_row)
+        coords = {str(coord_row.iloc[j]).strip(): j for j in range(start, stop)
+                  if str(coord_row.iloc[j]).strip() in COORD_COLUMNS}
+        if len(coords) < 3:
+            continue
+        block = body.iloc[:, [coords[c] for c in COORD_COLUMNS]]
+        block.columns = COORD_COLUMNS
+        block = block.assign(**{SURFACE_COLUMN: layer_row.iloc[start]
+                                .replace('第', 'surface_').replace('层', '')})
+        blocks.append(block)
+    if not blocks:
+        raise ValueError("Excel 中未识别到地层数据")
+    return pd.concat(blocks, ignore_index=True)
+
+
+def deduplicate_points(df: pd.DataFrame, keys: List[str], value: str) -> pd.DataFrame:
+    """同一地层内重复的 (x, y) 取 value 的平均值；所有地层一次完成"""
+    return df.groupby(keys, sort=False, observed=True)[value].mean().reset_index()
+
+
+def validate_boreholes(df: pd.DataFrame) -> Tuple[pd.DataFrame, ValidationReport]:
+    """
+    向量化校验：坐标转为数值，剔除缺失/非有限值与空地层名，
+    再按 (surface, X, Y) 合并重复点
+
+    Returns:
+        (规范化数据, 校验报告)
+    """
+    report = ValidationReport(input_rows=len(df))
+    coords = df[COORD_COLUMNS].apply(pd.to_numeric, errors="coerce").astype(np.float64)
+    surfaces = df[SURFACE_COLUMN].astype("string").str.strip()
+    valid = np.isfinite(coords.to_numpy()).all(axis=1) & surfaces.notna().to_numpy() \
+        & (surfaces != "").fillna(False).to_numpy()
+    clean = coords[valid].assign(**{SURFACE_COLUMN: surfaces[valid].astype(str)})
+    report.invalid_rows = int((~valid).sum())
+
+    # 保持地层首次出现的顺序（地层序列）
+    order = list(dict.fromkeys(clean[SURFACE_COLUMN]))
+    clean[SURFACE_COLUMN] = pd.Categorical(clean[SURFACE_COLUMN], categories=order)
+    deduped = deduplicate_points(clean, [SURFACE_COLUMN, "X", "Y"], "Z")[
+        COORD_COLUMNS + [SURFACE_COLUMN]]
+    report.merged_duplicates = len(clean) - len(deduped)
+    report.valid_rows = len(deduped)
+    report.surfaces = {str(k): int(v) for k, v in
+                       deduped[SURFACE_COLUMN].value_counts(sort=False).items()}
+    if len(deduped):
+        report.extent = [float(v) for c in COORD_COLUMNS
+                         for v in (deduped[c].min(), deduped[c].max())]
+
+    if report.invalid_rows or report.merged_duplicates:
+        logger.warning(f"钻孔数据校验: 剔除 {report.invalid_rows} 行无效数据, "
+                       f"合并 {report.merged_duplicates} 个重复点")
+    return deduped.reset_index(drop=True), report
+
+
+class BoreholeDatasetStore:
+    """
+    钻孔数据集存储
+
+    每个数据集由 <id>.parquet（或 <id>.pkl）与 <id>.json（校验报告，并记录
+    表文件的存储格式）组成，id 为上传格式与原始内容的 sha256；已加载的数据集保留在内存 LRU 中。
+    元数据最后写入，缺失或无法解析的元数据视为数据集不存在。
+    """
+
+    def __init__(self, root: str = None, max_cached: int = 16):
+        self.root = root or BOREHOLE_DATASET_DIR
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_id(data: Union[str, bytes], fmt: str = "csv") -> str:
+        """同一字节内容按不同格式解析得到不同数据，格式参与哈希"""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = hashlib.sha256(fmt.encode("utf-8") + b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _table_path(self, dataset_id: str, storage: str) -> str:
+        return os.path.join(self.root, f"{dataset_id}{_TABLE_SUFFIXES[storage]}")
+
+    def _meta_path(self, dataset_id: str) -> str:
+        return os.path.join(self.root, f"{dataset_id}.json")
+
+    def _read_meta(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        """读取元数据；不存在、不完整或无法解析时返回 None"""
+        try:
+            with open(self._meta_path(dataset_id), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"钻孔数据集元数据不可读，视为不存在: {dataset_id[:12]} ({e})")
+            return None
+        return meta if isinstance(meta, dict) else None
+
+    def _find_table(self, dataset_id: str) -> Optional[Tuple[str, str]]:
+        """
+        返回 (存储格式, 文件路径)；格式取自元数据中记录的 storage，
+        与当前是否安装 pyarrow 无关。旧数据集未记录时依次探测各后缀。
+        """
+        meta = self._read_meta(dataset_id)
+        if meta is None:
+            return None
+        recorded = meta.get("storage")
+        for storage in ([recorded] if recorded in _TABLE_SUFFIXES else list(_TABLE_SUFFIXES)):
+            path = self._table_path(dataset_id, storage)
+            if os.path.exists(path):
+                return storage, path
+        return None
+
+    def has(self, dataset_id: str) -> bool:
+        return self._find_table(dataset_id) is not None
+
+    def ingest(self, data: Union[str, bytes], fmt: str = "csv") -> str:
+        """
+        解析并保存数据集；内容已摄取过时直接返回 id
+
+        Args:
+            data: 原始 CSV 文本或 CSV/XLS/XLSX 字节
+            fmt: "csv"、"xls" 或 "xlsx"
+        """
+        dataset_id = self.content_id(data, fmt)
+        if self.has(dataset_id):
+            return dataset_id
+
+        with trace_span("borehole.ingest", format=fmt) as span:
+            if fmt == "csv":
+                raw = parse_borehole_csv(data)
+            elif fmt in ("xls", "xlsx"):
+                raw = parse_borehole_excel(data)
+            else:
+                raise ValueError(f"不支持的钻孔数据格式: {fmt}")
+            table, report = validate_boreholes(raw)
+            if table.empty:
+                raise ValueError("钻孔数据校验后没有有效数据点")
+            span.set_attribute("row_count", report.valid_rows)
+
+            os.makedirs(self.root, exist_ok=True)
+            storage = "parquet" if PARQUET_AVAILABLE else "pickle"
+            path = self._table_path(dataset_id, storage)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            if storage == "parquet":
+                table.to_parquet(tmp_path, index=False)
+            else:
+                table.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+            meta_path = self._meta_path(dataset_id)
+            tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": fmt, "storage": storage, **asdict(report)},
+                          f, ensure_ascii=False)
+            os.replace(tmp_path, meta_path)
+
+        self._remember(dataset_id, table)
+        logger.info(f"钻孔数据集已摄取: {dataset_id[:12]} ({report.valid_rows} 个点, "
+                    f"{len(report.surfaces)} 个地层)")
+        return dataset_id
+
+    def _remember(self, dataset_id: str, table: pd.DataFrame):
+        with self._lock:
+            self._cache[dataset_id] = table
+            self._cache.move_to_end(dataset_id)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    def load(self, dataset_id: str) -> pd.DataFrame:
+        """按 id 读取规范化数据集 (X, Y, Z, surface)"""
+        with self._lock:
+            table = self._cache.get(dataset_id)
+            if table is not None:
+                self._cache.move_to_end(dataset_id)
+                return table
+        found = self._find_table(dataset_id)
+        if found is None:
+            raise KeyError(f"钻孔数据集不存在: {dataset_id}")
+        storage, path = found
+        table = pd.read_parquet(path) if storage == "parquet" else pd.read_pickle(path)
+        self._remember(dataset_id, table)
+        return table
+
+    def metadata(self, dataset_id: str) -> Dict[str, Any]:
+        meta = self._read_meta(dataset_id)
+        if meta is None or not self.has(dataset_id):
+            raise KeyError(f"钻孔数据集不存在: {dataset_id}")
+        return {"dataset_id": dataset_id, **meta}
+
+    def resolve(self, dataset_id: Optional[str] = None,
+                csv_data: Optional[str] = None) -> pd.DataFrame:
+        """优先按 id 引用数据集，否则摄取随请求上传的 CSV"""
+        if dataset_id:
+            return self.load(dataset_id)
+        if csv_data:
+            return self.load(self.ingest(csv_data, "csv"))
+        raise ValueError("需要提供钻孔数据集 id 或 CSV 数据")
+
+
+# 全局钻孔数据集存储
+borehole_store = BoreholeDatasetStore()
@@ -0,0 +1,197 @@
+"""
+多分辨率 GemPy 地质插值
+- 先用较少的八叉树层级做快速粗算，供交互预览
+- 再提高八叉树层级细化；GemPy 的八叉树只细分被地层界面穿过的单元
+- 插值核的解（权重）只依赖钻孔数据，按数据集哈希缓存；
+  仅改变网格范围或分辨率时直接复用，不重新求解
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import gempy as gp
+import numpy as np
+import pandas as pd
+
+from .tracing import trace_span
+
+logger = logging.getLogger(__name__)
+
+# 预览与细化的八叉树层级
+COARSE_OCTREE_LEVELS = int(os.environ.get("DEEPCAD_GEMPY_COARSE_LEVELS", "3"))
+FINE_OCTREE_LEVELS = int(os.environ.get("DEEPCAD_GEMPY_FINE_LEVELS", "5"))
+
+# 进程内缓存的已插值模型个数
+INTERPOLATION_CACHE_SIZE = int(os.environ.get("DEEPCAD_GEMPY_CACHE_SIZE", "8"))
+
+
+def borehole_dataset_hash(surface_points: pd.DataFrame, orientations: pd.DataFrame,
+                          surface_names: Sequence[str]) -> str:
+    """钻孔数据集哈希：与行顺序无关，地层顺序（地层序列）参与哈希"""
+    digest = hashlib.sha256()
+    digest.update("|".join(surface_names).encode())
+    for df in (surface_points, orientations):
+        columns = sorted(df.columns)
+        canonical = df[columns].sort_values(columns).reset_index(drop=True)
+        digest.update(",".join(columns).encode())
+        digest.update(canonical.to_csv(index=False, float_format="%.6f").encode())
+    return digest.hexdigest()
+
+
+class _CacheEntry:
+    def __init__(self, geo_model):
+        self.geo_model = geo_model
+        self.octree_levels = 0  # 已计算到的八叉树层级
+        self.lock = threading.Lock()
+
+
+class InterpolationCache:
+    """数据集哈希 -> 已插值的 GemPy 模型（LRU）"""
+
+    def __init__(self, max_entries: int = INTERPOLATION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[_CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, geo_model) -> _CacheEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _CacheEntry(geo_model)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def invalidate(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 全局插值缓存
+interpolation_cache = InterpolationCache()
+
+
+def _enable_weight_cache(geo_model):
+    """启用 gempy_engine 的内存权重缓存（版本支持时）"""
+    options = geo_model.interpolation_options
+    cache_mode = getattr(type(options), "CacheMode", None)
+    if cache_mode is not None:
+        options.cache_mode = cache_mode.IN_MEMORY_CACHE
+
+
+class MultiResolutionGeology:
+    """
+    多分辨率地质模型
+
+    插值范围只由钻孔数据决定（数据包围盒 + padding），与网格范围无关，
+    因此同一数据集的插值结果可在不同网格范围/分辨率之间复用。
+    """
+
+    def __init__(self, surface_points: pd.DataFrame, orientations: pd.DataFrame,
+                 surface_names: List[str], project_name: str = "default_project",
+                 padding: float = 100.0, cache: Optional[InterpolationCache] = None):
+        self.surface_points = surface_points
+        self.orientations = orientations
+        self.surface_names = list(surface_names)
+        self.project_name = project_name
+        self.padding = padding
+        self.cache = cache if cache is not None else interpolation_cache
+        self.dataset_hash = borehole_dataset_hash(surface_points, orientations, surface_names)
+        self.timings: Dict[str, float] = {}
+        self.cache_hit = False
+
+    def interpolation_extent(self) -> List[float]:
+        df = self.surface_points
+        p = self.padding
+        return [df['X'].min() - p, df['X'].max() + p, df['Y'].min() - p, df['Y'].max() + p,
+                df['Z'].min() - p, df['Z'].max() + p]
+
+    def _entry(self) -> _CacheEntry:
+        entry = self.cache.get(self.dataset_hash)
+        if entry is not None:
+            self.cache_hit = True
+            logger.info(f"命中 GemPy 插值缓存: {self.dataset_hash[:12]}")
+            return entry
+
+        geo_model = gp.create_geomodel(
+            project_name=self.project_name,
+            extent=self.interpolation_extent(),
+            refinement=COARSE_OCTREE_LEVELS,
+            importer_helper=gp.data.ImporterHelper(
+                surface_points_df=self.surface_points,
+                orientations_df=self.orientations
+            )
+        )
+        gp.map_stack_to_surfaces(
+            gempy_model=geo_model,
+            mapping_object={"Stratigraphic_Stack": tuple(self.surface_names)}
+        )
+        _enable_weight_cache(geo_model)
+        return self.cache.put(self.dataset_hash, geo_model)
+
+    def _compute(self, octree_levels: int):
+        entry = self._entry()
+        with entry.lock:
+            if entry.octree_levels >= octree_levels:
+                return entry.geo_model
+            stage = "coarse" if octree_levels <= COARSE_OCTREE_LEVELS else "fine"
+            start = time.perf_counter()
+            with trace_span("gempy.compute_model", stage=stage, octree_levels=octree_levels,
+                            surface_count=len(self.surface_names),
+                            point_count=len(self.surface_points)):
+                entry.geo_model.interpolation_options.number_octree_levels = octree_levels
+                gp.compute_model(entry.geo_model)
+            entry.octree_levels = octree_levels
+            self.timings[stage] = time.perf_counter() - start
+            logger.info(f"GemPy {stage} 计算完成: {octree_levels} 层八叉树, "
+                        f"{self.timings[stage]:.2f}s")
+            return entry.geo_model
+
+    def preview(self):
+        """快速粗算（交互预览）"""
+        return self._compute(COARSE_OCTREE_LEVELS)
+
+    def refine(self, octree_levels: int = FINE_OCTREE_LEVELS):
+        """细化到指定八叉树层级；只有界面穿过的单元会被继续细分"""
+        return self._compute(max(octree_levels, COARSE_OCTREE_LEVELS))
+
+    def evaluate(self, extent: Sequence[float], resolution: Sequence[int]) -> np.ndarray:
+        """
+        在任意网格范围/分辨率上求岩性编号，复用已求解的插值权重
+
+        Returns:
+            形状为 resolution 的岩性编号数组
+        """
+        entry = self._entry()
+        axes = [np.linspace(extent[2 * i], extent[2 * i + 1], resolution[i]) for i in range(3)]
+        xyz = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+        # compute_model_at 会修改缓存模型的取值网格并重新求解，与细化互斥
+        with entry.lock, trace_span("gempy.compute_model_at", point_count=len(xyz)):
+            lith = gp.compute_model_at(entry.geo_model, at=xyz)
+        return np.asarray(lith).reshape(tuple(resolution))
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "dataset_hash": self.dataset_hash,
+            "cache_hit": self.cache_hit,
+            "interpolation_extent": [float(v) for v in self.interpolation_extent()],
+            "timings": self.timings,
+        }
@@ -10,6 +10,9 @@ import pyvista as pv
 from loguru import logger
 from typing import List, Dict, Any, Optional
 
+from .borehole_dataset import deduplicate_points
+from .profiling import profile_stage
+
 # Ensure PyVista runs in headless mode on servers, crucial for deployment
 pv.OFF_SCREEN = True
 
@@ -38,6 +41,13 @@ def _prepare_geology_data(borehole_data: List[Dict[str, Any]]) -> pd.DataFrame:
     
     if len(df) < initial_count:
         logger.warning(f"Dropped {initial_count - len(df)} rows with invalid or missing data.")
+
+    # Remove duplicate (x, y) coordinates within each formation once, for all
+    # formations at the same time, by averaging Z values.
+    valid_count = len(df)
+    df = deduplicate_points(df, ['formation', 'x', 'y'], 'z')
+    if len(df) < valid_count:
+        logger.warning(f"Merged {valid_count - len(df)} duplicate (x,y) points by averaging Z values.")
     
     logger.info(f"Prepared data with {len(df)} valid points across {df['formation'].nunique()} unique formations.")
     return df
@@ -83,16 +93,9 @@ def _create_delaunay_surface(
     """
     formation_name = formation_df.iloc[0]['formation'] if not formation_df.empty else "Unknown"
 
-    # Pre-process data: remove duplicate (x, y) coordinates. This is critical for
-    # many triangulation algorithms. We average the z values for any duplicates.
-    processed_df = formation_df.groupby(['x', 'y']).agg({'z': 'mean'}).reset_index()
-
-    if len(processed_df) < len(formation_df):
-        msg = (
-            f"Removed {len(formation_df) - len(processed_df)} duplicate (x,y) points "
-            f"for formation '{formation_name}' by averaging Z values."
-        )
-        logger.warning(msg)
+    # Duplicate (x, y) coordinates, which break triangulation, were already merged
+    # for all formations in _prepare_geology_data.
+    processed_df = formation_df
 
     if len(processed_df) < 3:
         logger.warning(f"Skipping '{formation_name}': needs at least 3 unique points for Delaunay triangulation.")
@@ -234,6 +237,7 @@ def _create_vtk_interpolated_surface(
         return None
 
 
+@profile_stage("geology.surfaces")
 def create_geological_model_geometry(
     borehole_data: List[Dict[str, Any]],
     formations: Dict[str, str],
@@ -269,17 +273,18 @@ def create_geological_model_geometry(
     kernel_radius_opt = options.get('kernel_radius', 0.0)
     clip_to_bounds = options.get('clip_to_bounds', False)
     computed_surfaces = {}
+    formation_groups = dict(tuple(df.groupby('formation', sort=False)))
     for name in processing_order:
         # Try robust VTK interpolated surface first
         surface = _create_vtk_interpolated_surface(
-            df[df['formation'] == name],
+            formation_groups[name],
             resolution=grid_res,
             kernel_radius=kernel_radius_opt,
         )
 
         # Fallback to Delaunay if interpolation failed
         if surface is None:
-            surface = _create_delaunay_surface(df[df['formation'] == name], alpha=alpha)
+            surface = _create_delaunay_surface(formation_groups[name], alpha=alpha)
         if surface and clip_to_bounds:
             # Clip surface to model XY bounds to avoid extrapolation artefacts
             bounds_surface = [min_x, max_x, min_y, max_y, min_z - 1.0, max_z + 1.0]
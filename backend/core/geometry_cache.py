@@ -0,0 +1,159 @@
+"""
+OCC/BREP 几何缓存
+按特征参数与地形数据的哈希缓存已构建、已求交的几何体 (BREP)。
+结构特征按顺序链式哈希：第 i 个缓存项代表“土体 + 前 i 个结构”求交后的
+完整状态，修改某个结构时只需从它之前的最长缓存前缀导入几何并重做其后的布尔运算。
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .tracing import trace_span
+
+logger = logging.getLogger(__name__)
+
+# 缓存根目录
+GEOMETRY_CACHE_DIR = os.environ.get(
+    "DEEPCAD_GEOMETRY_CACHE_DIR", os.path.abspath("./geometry_cache"))
+
+# 几何构建逻辑变化时递增，使旧缓存失效
+GEOMETRY_CACHE_VERSION = 2
+
+
+def geometry_key(parent: Optional[str], payload: Any) -> str:
+    """几何缓存键：父状态键 + 特征参数的 sha256"""
+    data = json.dumps({"v": GEOMETRY_CACHE_VERSION, "parent": parent, "payload": payload},
+                      sort_keys=True, separators=(',', ':'), default=str).encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def chain_keys(base_payload: Any, feature_payloads: Sequence[Any]) -> List[str]:
+    """[基础键, 基础+特征1, 基础+特征1+特征2, ...]"""
+    keys = [geometry_key(None, base_payload)]
+    for payload in feature_payloads:
+        keys.append(geometry_key(keys[-1], payload))
+    return keys
+
+
+class BrepGeometryCache:
+    """
+    BREP 几何缓存
+
+    每个缓存项由 <key>.brep 与 <key>.json 组成；JSON 记录各体积的角色
+    （如 soil、tunnel_space_0），顺序与 BREP 中体积的导入顺序一致。
+    """
+
+    def __init__(self, root: str = None):
+        self.root = root or GEOMETRY_CACHE_DIR
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.root, key[:2], key)
+        return f"{base}.brep", f"{base}.json"
+
+    def has(self, key: str) -> bool:
+        return all(os.path.exists(p) for p in self._paths(key))
+
+    def save(self, gmsh, key: str, roles: Dict[str, List[int]]) -> str:
+        """
+        只导出 roles 中的体积到 BREP（借助 OCCExportOnlyVisible）
+
+        Args:
+            gmsh: 已初始化的 gmsh 模块
+            roles: {角色: [体积标签]}
+        """
+        brep_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(brep_path), exist_ok=True)
+        tag_roles = {tag: role for role, tags in roles.items() for tag in tags}
+        ordered = sorted(tag_roles)
+
+        with trace_span("geometry_cache.save", volume_count=len(ordered)):
+            gmsh.model.occ.synchronize()
+            gmsh.model.setVisibility(gmsh.model.getEntities(), 0, recursive=True)
+            gmsh.model.setVisibility([(3, tag) for tag in ordered], 1, recursive=True)
+            previous = gmsh.option.getNumber("Geometry.OCCExportOnlyVisible")
+            gmsh.option.setNumber("Geometry.OCCExportOnlyVisible", 1)
+            tmp_path = f"{brep_path}.{os.getpid()}.tmp.brep"
+            try:
+                gmsh.write(tmp_path)
+            finally:
+                gmsh.option.setNumber("Geometry.OCCExportOnlyVisible", previous)
+                gmsh.model.setVisibility(gmsh.model.getEntities(), 1, recursive=True)
+            os.replace(tmp_path, brep_path)
+
+        # JSON 写在 BREP 之后且原子替换：has() 为真时两个文件都已完整
+        tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({"roles": [tag_roles[tag] for tag in ordered]}, f)
+        os.replace(tmp_meta, meta_path)
+        logger.info(f"几何已缓存: {key[:12]} ({len(ordered)} 个体积)")
+        return brep_path
+
+    def try_save(self, gmsh, key: str, roles: Dict[str, List[int]]) -> bool:
+        """写入缓存（已存在时跳过）；写入失败只记录警告，不影响几何构建"""
+        if self.has(key):
+            return True
+        try:
+            self.save(gmsh, key, roles)
+            return True
+        except Exception as e:
+            logger.warning(f"写入几何缓存失败: {e}")
+            return False
+
+    def load(self, gmsh, key: str) -> Optional[Dict[str, List[int]]]:
+        """
+        导入缓存的几何，返回 {角色: [新体积标签]}
+
+        缓存项损坏或不完整（JSON 无法解析、BREP 导入失败或体积数不符）时
+        删除该项并返回 None，调用方按未命中处理。
+        """
+        brep_path, meta_path = self._paths(key)
+        imported: List[int] = []
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                role_order = [str(role) for role in json.load(f)["roles"]]
+            with trace_span("geometry_cache.load", volume_count=len(role_order)):
+                imported = [tag for dim, tag in gmsh.model.occ.importShapes(brep_path) if dim == 3]
+            if len(imported) != len(role_order):
+                raise ValueError(f"期望 {len(role_order)} 个体积，实际导入 {len(imported)} 个")
+        except Exception as e:
+            logger.warning(f"几何缓存 {key[:12]} 已损坏，按未命中处理: {e}")
+            if imported:
+                gmsh.model.occ.remove([(3, tag) for tag in imported], recursive=True)
+            self.discard(key)
+            return None
+        roles: Dict[str, List[int]] = {}
+        for role, tag in zip(role_order, imported):
+            roles.setdefault(role, []).append(tag)
+        logger.info(f"命中几何缓存: {key[:12]}")
+        return roles
+
+    def restore(self, gmsh, keys: Sequence[str]) -> Tuple[int, Optional[Dict[str, List[int]]]]:
+        """
+        导入 keys 中最长的可用缓存前缀
+
+        Returns:
+            (下标, {角色: [体积标签]})；没有可用缓存时为 (-1, None)
+        """
+        for i in range(len(keys) - 1, -1, -1):
+            if self.has(keys[i]):
+                roles = self.load(gmsh, keys[i])
+                if roles is not None:
+                    return i, roles
+        return -1, None
+
+    def discard(self, key: str):
+        """删除缓存项"""
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def longest_prefix(self, keys: Sequence[str]) -> int:
+        """已缓存的最长前缀在 keys 中的下标；没有任何缓存时返回 -1"""
+        for i in range(len(keys) - 1, -1, -1):
+            if self.has(keys[i]):
+                return i
+        return -1
@@ -3,12 +3,13 @@
 支持多种几何内核：Gmsh、Gmsh(OCC)、PythonOCC
 """
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Optional
 import numpy as np
 from enum import Enum
 
 # Suzaku cache integration
 from .intelligent_cache import compute_geometry_hash
+from .gmsh_parallel import generate_parallel
 
 
 class GeometryEngine(Enum):
@@ -86,11 +87,13 @@ class GmshKernel(GeometryKernel):
         result = self.model.occ.cut([(3, target)], [(3, tool)])
         return result[0][0][1] if result[0] else target
 
-    def generate_mesh(self, geometry: Any, mesh_size: float = 1.0) -> Any:
-        """生成网格"""
+    def generate_mesh(self, geometry: Any, mesh_size: float = 1.0,
+                      threads: Optional[int] = None,
+                      target_elements: Optional[int] = None) -> Any:
+        """生成网格（多线程；threads 为 None 时使用 CPU 预算）"""
         self.model.occ.synchronize()
         self.gmsh.option.setNumber("Mesh.MeshSizeMax", mesh_size)
-        self.model.mesh.generate(3)
+        self.mesh_stats = generate_parallel(self.gmsh, threads, target_elements)
 
         # 1. 提取节点和三角面，用于计算几何哈希
         try:
@@ -195,7 +198,8 @@ class GeometryEngineFactory:
     @staticmethod
     def create_kernel(engine_type: GeometryEngine) -> GeometryKernel:
         """创建指定类型的几何内核"""
-        if engine_type == GeometryEngine.GMSH:
+        if engine_type in (GeometryEngine.GMSH, GeometryEngine.GMSH_OCC):
+            # GmshKernel 的几何操作均基于 OCC 内核
             return GmshKernel()
         elif engine_type == GeometryEngine.PYGMSH:
             return PyGmshKernel()
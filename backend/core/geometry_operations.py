@@ -6,13 +6,15 @@
 import logging
 import tempfile
 import os
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Sequence, Tuple
 import numpy as np
 from enum import Enum
 
+from .geometry_cache import BrepGeometryCache, chain_keys
 from .geometry_engine import (
     GeometryEngineFactory, GeometryKernel, GeometryEngine, GmshKernel
 )
+from .tracing import trace_span
 
 logger = logging.getLogger(__name__)
 
@@ -193,6 +195,82 @@ class GeometryIntersectionEngine:
         logger.info(f"多边形基坑创建完成，标签: {excavation_volume}")
         return excavation_volume
     
+    def create_diaphragm_wall_geometry(self, wall_params: Dict[str, Any]) -> int:
+        """
+        创建地连墙几何：沿 path 两点的竖直墙体，墙顶位于起点标高，向下延伸 height
+        
+        Args:
+            wall_params: {"path": [[x, y, z], [x, y, z]], "thickness": 墙厚, "height": 墙高}
+            
+        Returns:
+            墙体几何的标签
+        """
+        if not isinstance(self.kernel, GmshKernel):
+            raise NotImplementedError("地连墙创建仅支持Gmsh内核")
+        
+        occ = self.kernel.gmsh.model.occ
+        start, end = (np.asarray(p, dtype=float) for p in wall_params["path"])
+        thickness = wall_params["thickness"]
+        height = wall_params["height"]
+        length = float(np.hypot(*(end - start)[:2]))
+        if length <= self.precision:
+            raise ValueError("地连墙路径长度为零")
+        
+        # 在局部坐标系中沿 x 轴建墙，再绕 z 轴旋转到路径方向并平移到起点
+        wall = occ.addBox(0.0, -thickness / 2, -height, length, thickness, height)
+        angle = float(np.arctan2(end[1] - start[1], end[0] - start[0]))
+        occ.rotate([(3, wall)], 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, angle)
+        occ.translate([(3, wall)], *start)
+        
+        self.geometry_registry[f"diaphragm_wall_{wall}"] = {
+            "tag": wall,
+            "type": GeometryType.DIAPHRAGM_WALL,
+            "path": [start.tolist(), end.tolist()],
+            "thickness": thickness,
+            "height": height
+        }
+        
+        logger.info(f"地连墙创建完成，标签: {wall}")
+        return wall
+    
+    def create_pile_geometries(self, pile_params: Dict[str, Any]) -> List[int]:
+        """
+        创建排桩几何：沿 path 按间距布置的竖直圆柱，桩顶位于路径标高
+        
+        Args:
+            pile_params: {"path": [[x, y, z], [x, y, z]], "diameter": 桩径,
+                          "spacing": 桩间距, "length": 桩长}
+            
+        Returns:
+            各桩几何的标签
+        """
+        if not isinstance(self.kernel, GmshKernel):
+            raise NotImplementedError("排桩创建仅支持Gmsh内核")
+        
+        occ = self.kernel.gmsh.model.occ
+        start, end = (np.asarray(p, dtype=float) for p in pile_params["path"])
+        radius = pile_params["diameter"] / 2
+        length = pile_params["length"]
+        span = float(np.hypot(*(end - start)[:2]))
+        count = int(span // pile_params["spacing"]) + 1 if span > self.precision else 1
+        direction = (end - start) / span if span > self.precision else np.zeros(3)
+        
+        piles = []
+        for k in range(count):
+            x, y, _ = start + direction * (k * pile_params["spacing"])
+            piles.append(occ.addCylinder(x, y, start[2], 0.0, 0.0, -length, radius))
+        
+        for tag in piles:
+            self.geometry_registry[f"pile_{tag}"] = {
+                "tag": tag,
+                "type": GeometryType.PILE,
+                "diameter": pile_params["diameter"],
+                "length": length
+            }
+        
+        logger.info(f"排桩创建完成，共 {len(piles)} 根")
+        return piles
+    
     def create_tunnel_geometry(self, tunnel_params: Dict[str, Any]) -> int:
         """
         创建隧道几何（支持马蹄形、圆形等）
@@ -369,23 +447,97 @@ class GeometryIntersectionEngine:
         obj1 = [(3, obj1_tag)]
         obj2 = [(3, obj2_tag)]
         
-        if operation == BooleanOperation.UNION:
-            result = gmsh.model.occ.fuse(obj1, obj2)
-        elif operation == BooleanOperation.INTERSECTION:
-            result = gmsh.model.occ.intersect(obj1, obj2)
-        elif operation == BooleanOperation.DIFFERENCE:
-            result = gmsh.model.occ.cut(obj1, obj2)
-        else:
-            raise ValueError(f"不支持的布尔运算: {operation}")
-        
-        # 同步几何
-        gmsh.model.occ.synchronize()
+        with trace_span("occ.boolean", operation=operation.value,
+                        object_tag=obj1_tag, tool_tag=obj2_tag):
+            if operation == BooleanOperation.UNION:
+                result = gmsh.model.occ.fuse(obj1, obj2)
+            elif operation == BooleanOperation.INTERSECTION:
+                result = gmsh.model.occ.intersect(obj1, obj2)
+            elif operation == BooleanOperation.DIFFERENCE:
+                result = gmsh.model.occ.cut(obj1, obj2)
+            else:
+                raise ValueError(f"不支持的布尔运算: {operation}")
+            
+            # 同步几何
+            with trace_span("occ.synchronize"):
+                gmsh.model.occ.synchronize()
         
         result_tag = result[0][0][1] if result[0] else None
         logger.info(f"布尔运算完成，结果标签: {result_tag}")
         
         return result_tag
     
+    def batch_fragment(self, object_tags: List[int], tools: Dict[str, int],
+                       remove_tools: Sequence[str] = ()) -> Dict[str, Any]:
+        """
+        批量布尔：一次 occ.fragment 把土体与所有工具体（基坑、隧道、
+        地连墙、锚杆等）同时切分，只同步一次几何
+        
+        切分后按工具归属对碎片分类：
+          - 不属于任何工具的土体碎片 = 开挖后的土体（等价于逐个 cut）
+          - 同时属于土体和某工具的碎片 = 该工具与土体的交集（等价于 intersect）
+          - 只属于工具、位于土体外的碎片被删除
+        包围盒与所有土体都不相交的工具不参与切分，直接删除。
+        
+        Args:
+            object_tags: 土体几何标签
+            tools: {工具名称: 几何标签}
+            remove_tools: 需要挖空的工具名称，其内部碎片被删除
+            
+        Returns:
+            {"soil": 土体碎片标签, "tools": {名称: 交集碎片标签}, "skipped": 被跳过的工具}
+        """
+        if not isinstance(self.kernel, GmshKernel):
+            raise RuntimeError("布尔运算需要Gmsh/OCC内核")
+        
+        occ = self.kernel.gmsh.model.occ
+        
+        # 包围盒预筛选
+        soil_boxes = [occ.getBoundingBox(3, tag) for tag in object_tags]
+        active, skipped = [], []
+        for name, tag in tools.items():
+            box = occ.getBoundingBox(3, tag)
+            if any(_boxes_overlap(box, soil_box, self.precision) for soil_box in soil_boxes):
+                active.append((name, tag))
+            else:
+                skipped.append(name)
+        if skipped:
+            logger.info(f"包围盒不相交，跳过 {len(skipped)} 个工具体: {skipped}")
+            occ.remove([(3, tools[name]) for name in skipped], recursive=True)
+        
+        with trace_span("occ.fragment", object_count=len(object_tags),
+                        tool_count=len(active), skipped_count=len(skipped)):
+            if active:
+                _, out_map = occ.fragment(
+                    [(3, tag) for tag in object_tags], [(3, tag) for _, tag in active])
+                soil_pieces = {tag for dim, tag in _flatten(out_map[:len(object_tags)]) if dim == 3}
+                tool_pieces = {
+                    name: {tag for dim, tag in out_map[len(object_tags) + i] if dim == 3}
+                    for i, (name, _) in enumerate(active)
+                }
+            else:
+                soil_pieces, tool_pieces = set(object_tags), {}
+            
+            inside_tools = set().union(*tool_pieces.values()) if tool_pieces else set()
+            removed = inside_tools - soil_pieces  # 位于土体外的工具碎片
+            for name in remove_tools:
+                removed |= tool_pieces.get(name, set())
+            if removed:
+                occ.remove([(3, tag) for tag in sorted(removed)], recursive=True)
+            
+            with trace_span("occ.synchronize"):
+                occ.synchronize()
+        
+        result = {
+            "soil": sorted(soil_pieces - inside_tools),
+            "tools": {name: sorted((pieces & soil_pieces) - removed)
+                      for name, pieces in tool_pieces.items()},
+            "skipped": skipped,
+        }
+        logger.info(f"批量切分完成: 土体碎片 {len(result['soil'])} 个, "
+                    f"参与切分的工具 {len(active)} 个")
+        return result
+    
     def soil_excavation_intersection(self, soil_tag: int, excavation_tag: int) -> int:
         """
         土体与基坑求交（开挖操作）
@@ -420,15 +572,11 @@ class GeometryIntersectionEngine:
         """
         logger.info("执行土体-隧道求交...")
         
-        # 1. 土体减去隧道 = 开挖后的土体
-        excavated_soil = self.perform_boolean_operation(
-            soil_tag, tunnel_tag, BooleanOperation.DIFFERENCE
-        )
-        
-        # 2. 土体与隧道的交集 = 隧道空间（用于边界条件）
-        tunnel_space = self.perform_boolean_operation(
-            soil_tag, tunnel_tag, BooleanOperation.INTERSECTION
-        )
+        # 一次切分同时得到开挖后的土体与隧道空间（用于边界条件），
+        # 二者共享界面，网格协调
+        fragments = self.batch_fragment([soil_tag], {"tunnel": tunnel_tag})
+        excavated_soil = next(iter(fragments["soil"]), None)
+        tunnel_space = next(iter(fragments["tools"].get("tunnel", [])), None)
         
         logger.info(
             f"土体-隧道求交完成，土体: {excavated_soil}, 隧道空间: {tunnel_space}")
@@ -534,6 +682,15 @@ class GeometryIntersectionEngine:
         }
 
 
+def _boxes_overlap(a: Tuple[float, ...], b: Tuple[float, ...], tol: float = 0.0) -> bool:
+    """两个 (xmin, ymin, zmin, xmax, ymax, zmax) 包围盒是否相交"""
+    return all(a[i] <= b[i + 3] + tol and b[i] <= a[i + 3] + tol for i in range(3))
+
+
+def _flatten(groups: List[List[Tuple[int, int]]]) -> List[Tuple[int, int]]:
+    return [item for group in groups for item in group]
+
+
 def create_complex_geometry_intersection(terrain_data: Dict[str, Any],
                                        excavation_params: Dict[str, Any] = None,
                                        tunnel_params: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -549,37 +706,54 @@ def create_complex_geometry_intersection(terrain_data: Dict[str, Any],
         几何求交结果
     """
     engine = GeometryIntersectionEngine(use_occ=True)
+    cache = BrepGeometryCache()
+    
+    # 按 土体 -> 基坑 -> 隧道 链式缓存键；未命中的特征一次 fragment 完成，
+    # 只缓存土体本身与全部特征切分后的最终状态
+    features = [(name, params) for name, params in
+                (("excavation", excavation_params), ("tunnel", tunnel_params)) if params]
+    keys = chain_keys(terrain_data, [{name: params} for name, params in features])
     
     try:
         engine.initialize_gmsh()
+        gmsh = engine.kernel.gmsh
         
-        # 创建土体
-        soil_tag = engine.create_soil_volume(terrain_data)
+        cached_index, roles = cache.restore(gmsh, keys)
+        if cached_index < 0:
+            # 创建土体
+            roles = {"soil": [engine.create_soil_volume(terrain_data)]}
+            cache.try_save(gmsh, keys[0], roles)
         
         result = {
             "status": "success",
-            "soil_tag": soil_tag,
-            "operations": []
+            "soil_tag": roles["soil"][0],
+            "operations": [name for name, _ in features[:max(cached_index, 0)]],
+            "cached_operations": max(cached_index, 0)
         }
         
-        # 处理基坑开挖
+        pending = features[max(cached_index, 0):]
+        if pending:
+            tools = {}
+            for name, params in pending:
+                if name == "excavation":
+                    tools[name] = engine.create_excavation_geometry(params)
+                else:
+                    tools[name] = engine.create_tunnel_geometry(params)
+            # 基坑区域挖空，隧道空间保留用于边界条件
+            fragments = engine.batch_fragment(roles["soil"], tools, remove_tools=["excavation"])
+            roles["soil"] = fragments["soil"]
+            if "tunnel" in tools:
+                roles["tunnel_space"] = fragments["tools"].get("tunnel", [])
+            result["operations"].extend(name for name, _ in pending)
+            cache.try_save(gmsh, keys[-1], roles)
+        
+        soil_after = next(iter(roles["soil"]), None)
         if excavation_params:
-            excavation_tag = engine.create_excavation_geometry(excavation_params)
-            excavated_soil = engine.soil_excavation_intersection(soil_tag, excavation_tag)
-            result["excavated_soil_tag"] = excavated_soil
-            result["operations"].append("excavation")
-        
-        # 处理隧道开挖
+            result["excavated_soil_tag"] = soil_after
         if tunnel_params:
-            tunnel_tag = engine.create_tunnel_geometry(tunnel_params)
-            current_soil = result.get("excavated_soil_tag", soil_tag)
-            (
-                excavated_soil,
-                tunnel_space
-            ) = engine.soil_tunnel_intersection(current_soil, tunnel_tag)
-            result["final_soil_tag"] = excavated_soil
-            result["tunnel_space_tag"] = tunnel_space
-            result["operations"].append("tunnel")
+            result["final_soil_tag"] = soil_after
+            result["tunnel_space_tag"] = next(iter(roles.get("tunnel_space", [])), None)
+        result["soil_fragment_tags"] = roles["soil"]
         
         # 导出几何体
         geometry_file = engine.export_geometry()
@@ -12,6 +12,8 @@ import gmsh
 import numpy as np
 from scipy.interpolate import griddata
 
+from .gmsh_parallel import generate_parallel
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +29,8 @@ class GmshOCCIntegration:
         surfaces: List[pv.PolyData],
         mesh_size: float = 10.0,
         grid_resolution: int = 50,
+        threads: int | None = None,
+        target_elements: int | None = None,
     ):
         """
         Initializes the integration class with the surfaces to be processed.
@@ -37,10 +41,15 @@ class GmshOCCIntegration:
             mesh_size (float): The target characteristic mesh size.
             grid_resolution (int): The resolution (N x N) for the interpolation
                                    grid to create B-Spline surfaces.
+            threads (int | None): Meshing threads; defaults to the job's CPU budget.
+            target_elements (int | None): If set, the mesh size is tuned from a
+                                          coarse trial mesh to hit this tet count.
         """
         self.surfaces = surfaces
         self.mesh_size = mesh_size
         self.grid_resolution = grid_resolution
+        self.threads = threads
+        self.target_elements = target_elements
         self.model = None  # Will be set during run
 
     def create_geological_volumes_and_mesh(self) -> Dict[str, Any]:
@@ -83,7 +92,9 @@ class GmshOCCIntegration:
             volume_tags = self._identify_and_tag_volumes()
             
             self._set_mesh_options()
-            self.model.mesh.generate(3)
+            # Layers are independent volumes: HXT parallelizes inside each volume,
+            # other algorithms mesh the volumes concurrently.
+            parallel = generate_parallel(gmsh, self.threads, self.target_elements)
             logger.info("3D mesh generation completed.")
 
             # --- Final Step: Save mesh to MDPA and extract for visualization ---
@@ -109,6 +120,9 @@ class GmshOCCIntegration:
                     "num_elements": (
                         final_mesh_for_viz.n_cells if final_mesh_for_viz else 0
                     ),
+                    "threads": parallel["threads"],
+                    "algorithm3d": parallel["algorithm3d"],
+                    "size_factor": parallel["size_factor"],
                 },
             }
 
@@ -0,0 +1,141 @@
+"""
+Gmsh 多线程剖分
+- 在 CPU 预算内设置 General.NumThreads 及 1D/2D/3D 最大线程数
+- 几何允许时使用并行 3D 算法 HXT；否则使用 Delaunay，按体积并发剖分各地层
+- 给定目标单元数时，先做一次粗网格试剖分，按 N ∝ h^-3 反推尺寸系数后再正式剖分
+"""
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from .tracing import trace_span
+
+logger = logging.getLogger(__name__)
+
+# 作业调度器分配的剖分线程数；未设置时使用进程可用的 CPU（遵循 taskset/cgroup 亲和性）
+MESH_CPU_BUDGET_ENV = "DEEPCAD_MESH_CPU_BUDGET"
+
+ALGORITHM_3D_DELAUNAY = 1
+ALGORITHM_3D_HXT = 10
+
+# Gmsh 单元类型: 4 节点四面体
+GMSH_TETRAHEDRON = 4
+
+
+def cpu_budget(requested: Optional[int] = None) -> int:
+    """剖分可用的线程数：显式指定 > 环境变量 > 进程 CPU 亲和性"""
+    if requested:
+        return max(1, int(requested))
+    env = os.environ.get(MESH_CPU_BUDGET_ENV)
+    if env:
+        return max(1, int(env))
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def hxt_supported(gmsh) -> bool:
+    """HXT 只生成纯四面体网格，且不支持体内嵌入实体与三维重组"""
+    if gmsh.option.getNumber("Mesh.Recombine3DAll"):
+        return False
+    for dim, tag in gmsh.model.getEntities(3):
+        if gmsh.model.mesh.getEmbedded(dim, tag):
+            return False
+    return True
+
+
+def configure_parallel_meshing(gmsh, threads: int, prefer_hxt: bool = True) -> Dict[str, Any]:
+    """
+    设置多线程剖分选项
+
+    Returns:
+        {"threads", "algorithm3d", "volumes"}
+    """
+    volumes = len(gmsh.model.getEntities(3))
+    use_hxt = prefer_hxt and hxt_supported(gmsh)
+    algorithm3d = ALGORITHM_3D_HXT if use_hxt else ALGORITHM_3D_DELAUNAY
+
+    gmsh.option.setNumber("General.NumThreads", threads)
+    gmsh.option.setNumber("Mesh.MaxNumThreads1D", threads)
+    gmsh.option.setNumber("Mesh.MaxNumThreads2D", threads)
+    # HXT 在单个体积内部并行；其他算法按体积并发，线程数不超过体积数
+    gmsh.option.setNumber("Mesh.MaxNumThreads3D",
+                          threads if use_hxt else max(1, min(threads, volumes)))
+    gmsh.option.setNumber("Mesh.Algorithm3D", algorithm3d)
+
+    logger.info(f"多线程剖分: {threads} 线程, {volumes} 个体积, "
+                f"3D 算法 {'HXT' if use_hxt else 'Delaunay(按体积并发)'}")
+    return {"threads": threads, "algorithm3d": algorithm3d, "volumes": volumes}
+
+
+def count_tetrahedra(gmsh) -> int:
+    tags, _ = gmsh.model.mesh.getElementsByType(GMSH_TETRAHEDRON)
+    return len(tags)
+
+
+def size_factor_for_target(trial_factor: float, trial_count: int, target: int) -> float:
+    """由试剖分结果反推尺寸系数（四面体数近似与尺寸的立方成反比）"""
+    if trial_count <= 0 or target <= 0:
+        return 1.0
+    return trial_factor * (trial_count / target) ** (1.0 / 3.0)
+
+
+def _scale_mesh_size(gmsh, base: Dict[str, float], factor: float):
+    gmsh.option.setNumber("Mesh.MeshSizeFactor", base["factor"] * factor)
+    gmsh.option.setNumber("Mesh.MeshSizeMin", base["min"] * factor)
+    gmsh.option.setNumber("Mesh.MeshSizeMax", base["max"] * factor)
+
+
+def tune_mesh_size_for_target(gmsh, target_elements: int, trial_factor: float = 2.0) -> float:
+    """
+    用放大 trial_factor 倍尺寸的试剖分估计单元数，调整尺寸使正式网格接近目标单元数
+
+    尺寸系数同时作用于 MeshSizeFactor 与 MeshSizeMin/Max，背景尺寸场同样生效。
+
+    Returns:
+        相对原设置的尺寸系数（已写入 Gmsh 选项）
+    """
+    base = {
+        "factor": gmsh.option.getNumber("Mesh.MeshSizeFactor"),
+        "min": gmsh.option.getNumber("Mesh.MeshSizeMin"),
+        "max": gmsh.option.getNumber("Mesh.MeshSizeMax"),
+    }
+    with trace_span("gmsh.tune_mesh_size", target_elements=target_elements,
+                    trial_factor=trial_factor) as span:
+        _scale_mesh_size(gmsh, base, trial_factor)
+        gmsh.model.mesh.generate(3)
+        trial_count = count_tetrahedra(gmsh)
+        gmsh.model.mesh.clear()
+
+        factor = size_factor_for_target(trial_factor, trial_count, target_elements)
+        _scale_mesh_size(gmsh, base, factor)
+        span.set_attribute("trial_elements", trial_count)
+        span.set_attribute("size_factor", factor)
+    logger.info(f"目标单元数 {target_elements}: 试剖分 {trial_count} 个四面体, "
+                f"尺寸系数 {factor:.3f}")
+    return factor
+
+
+def generate_parallel(gmsh, threads: Optional[int] = None,
+                      target_elements: Optional[int] = None,
+                      prefer_hxt: bool = True, dim: int = 3) -> Dict[str, Any]:
+    """
+    在 CPU 预算内多线程剖分当前模型
+
+    Args:
+        threads: 线程数，None 时取 cpu_budget()
+        target_elements: 目标四面体数，设置时先自动调整尺寸
+        prefer_hxt: 几何允许时使用 HXT
+
+    Returns:
+        {"threads", "algorithm3d", "volumes", "size_factor", "elements"}
+    """
+    stats = configure_parallel_meshing(gmsh, cpu_budget(threads), prefer_hxt)
+    stats["size_factor"] = 1.0
+    if target_elements and dim == 3:
+        stats["size_factor"] = tune_mesh_size_for_target(gmsh, target_elements)
+
+    gmsh.model.mesh.generate(dim)
+    stats["elements"] = count_tetrahedra(gmsh)
+    return stats
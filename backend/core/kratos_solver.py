@@ -19,6 +19,9 @@ from KratosMultiphysics.ConvectionDiffusionApplication import (
     convection_diffusion_analysis
 )
 
+from .profiling import profile_stage
+from .tracing import trace_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -185,6 +188,69 @@ class KratosSolverConfig:
         logger.info("动态生成 'ProjectParameters.json' 文件。")
         return params_file_path
 
+    @staticmethod
+    def build_structural_processes(
+        boundary_conditions: List[Dict[str, Any]] = None,
+        loads: List[Dict[str, Any]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """根据边界条件和荷载生成结构分析的过程列表"""
+        # 处理边界条件
+        processes = {}
+        if boundary_conditions:
+            constraints_list = []
+            for bc in boundary_conditions:
+                if bc["type"] == "displacement":
+                    constraint = {
+                        "python_module": "assign_vector_by_direction_process",
+                        "kratos_module": "KratosMultiphysics",
+                        "process_name": "AssignVectorByDirectionProcess",
+                        "Parameters": {
+                            "model_part_name": f"Structure.{bc['boundary_name']}",
+                            "variable_name": "DISPLACEMENT",
+                            "constrained": bc.get("constrained", [True, True, True]),
+                            "value": bc.get("value", [0, 0, 0])
+                        }
+                    }
+                    constraints_list.append(constraint)
+        
+            if constraints_list:
+                processes["constraints_process_list"] = constraints_list
+    
+        # 处理荷载
+        if loads:
+            loads_list = []
+            for load in loads:
+                if load["type"] == "gravity":
+                    load_process = {
+                        "python_module": "apply_gravity_on_bodies_process",
+                        "kratos_module": "KratosMultiphysics.StructuralMechanicsApplication",
+                        "process_name": "ApplyGravityOnBodiesProcess",
+                        "Parameters": {
+                            "model_part_name": f"Structure.{load['target']}",
+                            "variable_name": "VOLUME_ACCELERATION",
+                            "gravity_vector": load.get("value", [0.0, -9.81, 0.0])
+                        }
+                    }
+                    loads_list.append(load_process)
+                elif load["type"] == "pressure":
+                    load_process = {
+                        "python_module": "assign_scalar_variable_to_entities_process",
+                        "kratos_module": "KratosMultiphysics",
+                        "process_name": "AssignScalarVariableToEntitiesProcess",
+                        "Parameters": {
+                            "model_part_name": f"Structure.{load['target']}",
+                            "variable_name": "PRESSURE",
+                            "value": load["value"],
+                            "entity_type": "element"
+                        }
+                    }
+                    loads_list.append(load_process)
+        
+            if loads_list:
+                processes["loads_process_list"] = loads_list
+        
+        return processes
+
     @staticmethod
     def create_seepage_materials_file(working_dir: str, materials):
         """
@@ -334,6 +400,25 @@ class KratosSolver:
         self.current_model = KratosMultiphysics.Model()
         logger.info(f"KratosSolver初始化，工作目录: {self.working_dir}")
     
+    def _run_simulation(self, simulation, analysis_name: str):
+        """
+        按 Initialize / RunSolutionLoop / Finalize 分步运行Kratos分析，
+        等价于 simulation.Run()，但每一步都有独立的追踪span
+        """
+        with trace_span("kratos.run", analysis=analysis_name) as span:
+            with trace_span("kratos.initialize"), profile_stage("kratos.initialize"):
+                simulation.Initialize()
+            try:
+                model_part = simulation._GetSolver().GetComputingModelPart()
+                span.set_attribute("node_count", model_part.NumberOfNodes())
+                span.set_attribute("element_count", model_part.NumberOfElements())
+            except Exception:
+                pass  # 统计信息仅用于追踪，不影响求解
+            with trace_span("kratos.solve"), profile_stage("kratos.solve"):
+                simulation.RunSolutionLoop()
+            with trace_span("kratos.finalize"), profile_stage("kratos.finalize"):
+                simulation.Finalize()
+    
     def run_structural_analysis(
         self, 
         mesh_filename: str, 
@@ -362,60 +447,7 @@ class KratosSolver:
         working_dir = os.path.dirname(mesh_filename)
         project_name = os.path.splitext(os.path.basename(mesh_filename))[0]
         
-        # 处理边界条件
-        processes = {}
-        if boundary_conditions:
-            constraints_list = []
-            for bc in boundary_conditions:
-                if bc["type"] == "displacement":
-                    constraint = {
-                        "python_module": "assign_vector_by_direction_process",
-                        "kratos_module": "KratosMultiphysics",
-                        "process_name": "AssignVectorByDirectionProcess",
-                        "Parameters": {
-                            "model_part_name": f"Structure.{bc['boundary_name']}",
-                            "variable_name": "DISPLACEMENT",
-                            "constrained": bc.get("constrained", [True, True, True]),
-                            "value": bc.get("value", [0, 0, 0])
-                        }
-                    }
-                    constraints_list.append(constraint)
-            
-            if constraints_list:
-                processes["constraints_process_list"] = constraints_list
-        
-        # 处理荷载
-        if loads:
-            loads_list = []
-            for load in loads:
-                if load["type"] == "gravity":
-                    load_process = {
-                        "python_module": "apply_gravity_on_bodies_process",
-                        "kratos_module": "KratosMultiphysics.StructuralMechanicsApplication",
-                        "process_name": "ApplyGravityOnBodiesProcess",
-                        "Parameters": {
-                            "model_part_name": f"Structure.{load['target']}",
-                            "variable_name": "VOLUME_ACCELERATION",
-                            "gravity_vector": load.get("value", [0.0, -9.81, 0.0])
-                        }
-                    }
-                    loads_list.append(load_process)
-                elif load["type"] == "pressure":
-                    load_process = {
-                        "python_module": "assign_scalar_variable_to_entities_process",
-                        "kratos_module": "KratosMultiphysics",
-                        "process_name": "AssignScalarVariableToEntitiesProcess",
-                        "Parameters": {
-                            "model_part_name": f"Structure.{load['target']}",
-                            "variable_name": "PRESSURE",
-                            "value": load["value"],
-                            "entity_type": "element"
-                        }
-                    }
-                    loads_list.append(load_process)
-            
-            if loads_list:
-                processes["loads_process_list"] = loads_list
+        processes = KratosSolverConfig.build_structural_processes(boundary_conditions, loads)
         
         # 创建材料文件
         KratosSolverConfig.create_materials_file(working_dir, materials)
@@ -438,7 +470,7 @@ class KratosSolver:
         simulation = structural_mechanics_analysis.StructuralMechanicsAnalysis(
             self.current_model, project_parameters
         )
-        simulation.Run()
+        self._run_simulation(simulation, "structural")
         logger.info("结构力学分析运行完成。")
         
         # 返回结果文件路径
@@ -501,7 +533,7 @@ class KratosSolver:
         simulation = convection_diffusion_analysis.ConvectionDiffusionAnalysis(
             self.current_model, project_parameters
         )
-        simulation.Run()
+        self._run_simulation(simulation, "seepage")
         logger.info("渗流分析运行完成。")
         
         # 返回结果文件路径
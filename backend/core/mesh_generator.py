@@ -6,10 +6,13 @@
 import os
 import tempfile
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import gmsh
 import meshio
 from .intelligent_cache import compute_mesh_hash
+from .mesh_size_fields import MeshSizeFieldBuilder
+from .gmsh_parallel import generate_parallel
+from .tracing import trace_span
 
 logger = logging.getLogger(__name__)
 
@@ -25,16 +28,34 @@ class TerrainMeshGenerator:
     4. 生成高质量的地质体网格
     """
     
-    def __init__(self, mesh_size: float = 10.0, use_occ: bool = True):
+    def __init__(self, mesh_size: float = 10.0, use_occ: bool = True,
+                 refinement: Optional[List[Dict[str, Any]]] = None,
+                 grading: float = 1.3, interface_size: Optional[float] = None,
+                 threads: Optional[int] = None, target_elements: Optional[int] = None):
         """
         初始化地形网格生成器
         
         Args:
-            mesh_size: 全局网格尺寸
+            mesh_size: 全局网格尺寸（远场尺寸）
             use_occ: 是否使用OpenCASCADE几何内核
+            refinement: 加密特征列表，如
+                {"type": "excavation", "points": [[x, y], ...], "depth": d, "top": z, "size": h}、
+                {"type": "tunnel", "center": [x, y, z], "direction": [1, 0, 0], "length": L,
+                 "radius": r, "size": h}、{"type": "wall", ...}、{"type": "interface", "z": z, "size": h}
+            grading: 加密区向远场过渡时相邻单元的尺寸增长比
+            interface_size: 设置时在各地层分界面处加密到该尺寸
+            threads: 剖分线程数，None 时使用作业分配的 CPU 预算
+            target_elements: 目标四面体数，设置时剖分前自动调整网格尺寸
         """
         self.mesh_size = mesh_size
         self.use_occ = use_occ
+        self.refinement = list(refinement or [])
+        self.grading = grading
+        self.interface_size = interface_size
+        self.threads = threads
+        self.target_elements = target_elements
+        self.size_fields: Optional[MeshSizeFieldBuilder] = None
+        self.mesh_stats: Dict[str, Any] = {}
         self.working_dir = tempfile.mkdtemp(prefix="terrain_mesh_")
         logger.info(f"地形网格生成器初始化，工作目录: {self.working_dir}")
         logger.info(f"使用OpenCASCADE: {self.use_occ}")
@@ -65,6 +86,7 @@ class TerrainMeshGenerator:
             
             # 2. 设置网格参数
             self._setup_terrain_mesh_parameters()
+            self._setup_size_fields(terrain_data)
             
             # 3. 生成网格
             mesh_file = self._generate_terrain_mesh()
@@ -75,7 +97,10 @@ class TerrainMeshGenerator:
                 g_hash = getattr(msh, "geometry_hash", None) or "unknown"
                 mesh_hash = compute_mesh_hash(
                     g_hash,
-                    {"mesh_size": self.mesh_size},
+                    {"mesh_size": self.mesh_size, "grading": self.grading,
+                     "refinement": self.refinement + terrain_data.get("refinement", []),
+                     "interface_size": self.interface_size,
+                     "target_elements": self.target_elements},
                 )
                 with open(os.path.join(self.working_dir, "mesh_hash.txt"), "w") as fh:
                     fh.write(mesh_hash)
@@ -299,27 +324,92 @@ class TerrainMeshGenerator:
         gmsh.option.setNumber("Mesh.MeshSizeFromCurvature", 12)  # 基于曲率的网格细化
         gmsh.option.setNumber("Mesh.MinimumCirclePoints", 8)     # 圆形最小点数
     
+    def _layer_interfaces(self, terrain_data: Dict[str, Any]) -> List[float]:
+        """地层分界面高程（与 _create_terrain_layers_occ 的水平分层一致）"""
+        extent = terrain_data["terrain_extent"]
+        layer_count = len(terrain_data.get("volumes", {}))
+        if layer_count <= 1:
+            return []
+        layer_height = (extent['z_max'] - extent['z_min']) / layer_count
+        return [extent['z_min'] + i * layer_height for i in range(1, layer_count)]
+    
+    def _setup_size_fields(self, terrain_data: Dict[str, Any]):
+        """根据加密特征设置背景尺寸场，并估算单元数"""
+        features = self.refinement + list(terrain_data.get("refinement", []))
+        if self.interface_size:
+            features += [{"type": "interface", "z": z, "size": self.interface_size}
+                         for z in self._layer_interfaces(terrain_data)]
+        if not features:
+            self.size_fields = None
+            return
+        
+        extent = terrain_data["terrain_extent"]
+        builder = MeshSizeFieldBuilder(self.mesh_size, self.grading)
+        for feature in features:
+            if feature.get("type") in ("excavation", "wall"):
+                feature = {"top": extent['z_max'], **feature}
+            builder.add_feature(feature)
+        
+        with trace_span("mesh.size_fields", feature_count=len(features),
+                        grading=self.grading) as span:
+            builder.apply(gmsh)
+            estimated = builder.estimate_element_count(extent)
+            # 对照：全域均采用最小尺寸时的单元数
+            uniform_fine = MeshSizeFieldBuilder(builder.size_min, self.grading) \
+                .estimate_element_count(extent)
+            span.set_attribute("estimated_elements", estimated)
+        
+        self.size_fields = builder
+        self.mesh_stats.update({
+            "size_min": builder.size_min,
+            "size_max": self.mesh_size,
+            "grading": self.grading,
+            "estimated_elements": estimated,
+            "estimated_uniform_elements": uniform_fine,
+        })
+        logger.info(f"尺寸场估算单元数: {estimated} (全域按最小尺寸约 {uniform_fine})")
+    
     def _generate_terrain_mesh(self) -> str:
         """生成地形网格"""
         logger.info("开始地形网格剖分...")
         
         # 生成3D网格
-        gmsh.model.mesh.generate(3)
-        
-        # 获取网格统计信息
-        try:
-            nodes = gmsh.model.mesh.getNodes()
-            elements = gmsh.model.mesh.getElements()
-            
-            node_count = len(nodes[0]) if nodes[0] is not None else 0
-            element_count = sum(len(elem_nodes) for elem_nodes in elements[2])
+        with trace_span("gmsh.generate", mesh_size=self.mesh_size, dim=3) as span:
+            parallel = generate_parallel(gmsh, self.threads, self.target_elements,
+                                         prefer_hxt=self.use_occ)
+            span.set_attribute("threads", parallel["threads"])
+            span.set_attribute("algorithm3d", parallel["algorithm3d"])
+            if parallel["size_factor"] != 1.0:
+                self.mesh_size *= parallel["size_factor"]
+                span.set_attribute("tuned_mesh_size", self.mesh_size)
+            self.mesh_stats.update(parallel)
             
-            logger.info(f"地形网格剖分完成: {node_count} 个节点, {element_count} 个单元")
-        except Exception as e:
-            logger.warning(f"无法获取网格统计信息: {e}")
+            # 获取网格统计信息
+            try:
+                nodes = gmsh.model.mesh.getNodes()
+                elements = gmsh.model.mesh.getElements()
+                
+                node_count = len(nodes[0]) if nodes[0] is not None else 0
+                element_count = sum(len(elem_tags) for elem_tags in elements[1])
+                span.set_attribute("node_count", node_count)
+                span.set_attribute("element_count", element_count)
+                
+                logger.info(f"地形网格剖分完成: {node_count} 个节点, {element_count} 个单元")
+                
+                tet_count = sum(len(tags) for etype, tags in zip(elements[0], elements[1])
+                                if etype == 4)
+                self.mesh_stats.update({"node_count": node_count, "actual_elements": tet_count})
+                if "estimated_elements" in self.mesh_stats:
+                    estimated = self.mesh_stats["estimated_elements"]
+                    span.set_attribute("estimated_elements", estimated)
+                    span.set_attribute("actual_elements", tet_count)
+                    logger.info(f"四面体单元: 估算 {estimated}, 实际 {tet_count}")
+            except Exception as e:
+                logger.warning(f"无法获取网格统计信息: {e}")
         
         # 保存网格文件
-        mesh_files = self._save_mesh_files()
+        with trace_span("mesh.write_files"):
+            mesh_files = self._save_mesh_files()
         
         return mesh_files["mdpa"]  # 返回Kratos格式
     
@@ -352,7 +442,9 @@ class TerrainMeshGenerator:
             mesh = meshio.read(msh_file)
             mdpa_file = os.path.join(self.working_dir, "terrain_mesh.mdpa")
             
-            with open(mdpa_file, 'w') as f:
+            with trace_span("mdpa.write", node_count=len(mesh.points),
+                            element_count=len(mesh.cells_dict.get('tetra', []))), \
+                    open(mdpa_file, 'w') as f:
                 # 文件头
                 f.write("Begin ModelPartData\n")
                 f.write("//  VARIABLE_NAME value\n")
@@ -401,7 +493,11 @@ class TerrainMeshGenerator:
 # 便捷函数
 def create_terrain_mesh(terrain_data: Dict[str, Any], 
                        mesh_size: float = 10.0,
-                       use_occ: bool = True) -> Dict[str, Any]:
+                       use_occ: bool = True,
+                       refinement: Optional[List[Dict[str, Any]]] = None,
+                       grading: float = 1.3,
+                       threads: Optional[int] = None,
+                       target_elements: Optional[int] = None) -> Dict[str, Any]:
     """
     便捷函数：从地形数据创建网格
     
@@ -409,11 +505,16 @@ def create_terrain_mesh(terrain_data: Dict[str, Any],
         terrain_data: GemPy生成的地形数据
         mesh_size: 网格尺寸
         use_occ: 是否使用OpenCASCADE
+        refinement: 加密特征列表（见 TerrainMeshGenerator）
+        grading: 尺寸渐变系数
+        threads: 剖分线程数
+        target_elements: 目标四面体数
         
     Returns:
         包含网格文件路径和统计信息的字典
     """
-    generator = TerrainMeshGenerator(mesh_size, use_occ)
+    generator = TerrainMeshGenerator(mesh_size, use_occ, refinement=refinement, grading=grading,
+                                     threads=threads, target_elements=target_elements)
     
     try:
         mesh_file = generator.generate_terrain_mesh(terrain_data)
@@ -422,7 +523,8 @@ def create_terrain_mesh(terrain_data: Dict[str, Any],
             "status": "success",
             "mesh_file": mesh_file,
             "working_dir": generator.working_dir,
-            "use_occ": use_occ
+            "use_occ": use_occ,
+            "mesh_stats": generator.mesh_stats
         }
     except Exception as e:
         logger.error(f"地形网格生成失败: {e}")
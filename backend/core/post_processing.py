@@ -3,14 +3,151 @@ DeepCAD Pro 后处理模块
 基于 PyVista 的专业科学可视化后处理管道
 """
 import os
+import threading
 import numpy as np
 import pyvista as pv
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
 import logging
 
+from .profiling import profile_stage
+from .result_store import open_result_store, vtk_step_files
+from .spatial_index import ResultSpatialIndex, spatial_index_service
+from .tracing import trace_span
+
 logger = logging.getLogger(__name__)
 
 
+class DeformedMeshView:
+    """
+    变形网格视图
+
+    不复制网格，只保存对原网格和位移场的引用；变形坐标在访问时按
+    比例系数即时计算 (warp on demand)。
+    """
+    
+    def __init__(self, mesh: pv.UnstructuredGrid, displacement_field: str = "DISPLACEMENT",
+                 scale: float = 1.0):
+        self.mesh = mesh
+        self.displacement_field = displacement_field
+        self.scale = scale
+    
+    @property
+    def n_points(self) -> int:
+        return self.mesh.n_points
+    
+    @property
+    def n_cells(self) -> int:
+        return self.mesh.n_cells
+    
+    def deformed_points(self, scale: Optional[float] = None) -> np.ndarray:
+        """返回变形后的节点坐标（新数组，原网格不变）"""
+        factor = self.scale if scale is None else scale
+        return self.mesh.points + factor * self.mesh[self.displacement_field]
+    
+    @property
+    def points(self) -> np.ndarray:
+        return self.deformed_points()
+    
+    def materialize(self, scale: Optional[float] = None) -> pv.UnstructuredGrid:
+        """
+        生成可渲染的变形网格：浅拷贝共享单元与场数据，仅替换坐标数组
+        """
+        deformed = self.mesh.copy(deep=False)
+        deformed.points = self.deformed_points(scale)
+        return deformed
+
+
+class PreviewRendererPool:
+    """
+    按需、带缓存的离屏预览渲染池
+
+    每个工作线程复用自己的离屏 Plotter；同一结果文件和字段的预览只渲染
+    一次，之后直接返回磁盘上的图片。分析任务本身不再渲染任何预览。
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        workers = max_workers or int(os.environ.get("DEEPCAD_RENDER_WORKERS", "1"))
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="preview_renderer")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple, Future] = {}
+    
+    def _plotter(self) -> pv.Plotter:
+        plotter = getattr(self._local, "plotter", None)
+        if plotter is None:
+            plotter = pv.Plotter(off_screen=True)
+            self._local.plotter = plotter
+        return plotter
+    
+    def _render(self, vtk_file: str, output_path: str, scalar_field: Optional[str]) -> str:
+        with trace_span("vtk.preview", vtk_file=os.path.basename(vtk_file)):
+            mesh = pv.read(vtk_file)
+            plotter = self._plotter()
+            plotter.clear()
+            if scalar_field and scalar_field in mesh.array_names:
+                plotter.add_mesh(mesh, scalars=scalar_field, show_edges=True,
+                                 opacity=0.8, cmap='viridis')
+                plotter.add_scalar_bar(scalar_field)
+            else:
+                plotter.add_mesh(mesh, show_edges=True, color='lightblue')
+            plotter.add_axes()
+            plotter.show_grid()
+            plotter.screenshot(output_path, transparent_background=True)
+        logger.info(f"预览图已生成: {output_path}")
+        return output_path
+    
+    def request(self, vtk_file: str, output_path: str,
+                scalar_field: Optional[str] = None) -> Future:
+        """
+        请求预览图，返回 Future；已有且不旧于结果文件的图片会立即返回
+        """
+        if _is_fresh(output_path, vtk_file):
+            future = Future()
+            future.set_result(output_path)
+            return future
+        key = (os.path.abspath(vtk_file), os.path.getmtime(vtk_file),
+               os.path.abspath(output_path), scalar_field)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._render, vtk_file, output_path, scalar_field)
+            self._pending[key] = future
+        # 完成（含失败）后移出，之后的请求命中磁盘上的图片或重新渲染；
+        # 回调可能在本线程立即执行，因此在释放锁之后注册
+        future.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return future
+    
+    def _forget(self, key: Tuple, future: Future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_renderer_pool: Optional[PreviewRendererPool] = None
+_renderer_pool_lock = threading.Lock()
+
+
+def get_renderer_pool() -> PreviewRendererPool:
+    """获取进程级预览渲染池（首次使用时创建）"""
+    global _renderer_pool
+    with _renderer_pool_lock:
+        if _renderer_pool is None:
+            _renderer_pool = PreviewRendererPool()
+        return _renderer_pool
+
+
+def _is_fresh(artifact_path: str, source_path: str) -> bool:
+    """产物存在且不旧于源文件"""
+    return (os.path.exists(artifact_path)
+            and os.path.getmtime(artifact_path) >= os.path.getmtime(source_path))
+
+
 class PostProcessor:
     """PyVista后处理器 - 专业CAE结果可视化"""
     
@@ -41,9 +178,8 @@ class PostProcessor:
         # 添加位移幅值标量场
         mesh[f"{displacement_field}_MAGNITUDE"] = displacement_magnitude
         
-        # 变形后的网格
-        deformed_mesh = mesh.copy()
-        deformed_mesh.points += displacement
+        # 变形后的网格以视图形式提供，需要时再按比例计算坐标
+        deformed_mesh = DeformedMeshView(mesh, displacement_field)
         
         return {
             "original_mesh": mesh,
@@ -108,12 +244,38 @@ class PostProcessor:
         
         return results
     
+    @staticmethod
+    def _spatial_index(mesh: pv.UnstructuredGrid, result_key: Optional[Tuple]):
+        """按结果键 (如 (结果路径, 输出步)) 复用缓存的索引；未给出键时只为本次调用构建"""
+        if result_key is None:
+            return ResultSpatialIndex(mesh)
+        return spatial_index_service.for_mesh(mesh, result_key)
+
     def generate_cross_section(self, mesh: pv.UnstructuredGrid, 
                              plane_origin: Tuple[float, float, float],
-                             plane_normal: Tuple[float, float, float]) -> pv.UnstructuredGrid:
-        """生成横截面"""
-        return mesh.slice(normal=plane_normal, origin=plane_origin)
+                             plane_normal: Tuple[float, float, float],
+                             result_key: Optional[Tuple] = None) -> pv.UnstructuredGrid:
+        """生成横截面（给出 result_key 时复用该结果缓存的空间索引）"""
+        return self._spatial_index(mesh, result_key).slice(plane_origin, plane_normal)
+
+    def probe_points(self, mesh: pv.UnstructuredGrid,
+                     points: List[Tuple[float, float, float]],
+                     fields: Optional[List[str]] = None,
+                     result_key: Optional[Tuple] = None) -> Dict[str, np.ndarray]:
+        """批量点探测，同一组探测点的插值权重在不同物理场间复用"""
+        return self._spatial_index(mesh, result_key).probe(points, fields)
+
+    def sample_borehole(self, mesh: pv.UnstructuredGrid,
+                        top: Tuple[float, float, float],
+                        bottom: Tuple[float, float, float],
+                        resolution: int = 100,
+                        fields: Optional[List[str]] = None,
+                        result_key: Optional[Tuple] = None) -> Dict[str, np.ndarray]:
+        """沿虚拟钻孔采样结果"""
+        return self._spatial_index(mesh, result_key).sample_polyline(
+            [top, bottom], resolution, fields)
     
+    @profile_stage("post.export_visualization")
     def export_visualization_data(self, mesh: pv.UnstructuredGrid, 
                                 output_file: str) -> str:
         """导出可视化数据为前端可读格式"""
@@ -131,7 +293,7 @@ class PostProcessor:
             "points": points.tolist(),
             "cells": cells.tolist() if len(cells) > 0 else [],
             "scalar_fields": scalar_data,
-            "bounds": mesh.bounds.tolist(),
+            "bounds": [float(b) for b in mesh.bounds],
             "n_points": mesh.n_points,
             "n_cells": mesh.n_cells
         }
@@ -167,60 +329,135 @@ class PostProcessor:
         return plotter.export_html(save_path or "visualization.html")
 
 
-def process_kratos_results(working_dir: str, project_name: str) -> Dict[str, Any]:
-    """处理Kratos分析结果的主函数"""
-    processor = PostProcessor(working_dir)
-    
-    # 查找VTK结果文件
+def find_latest_vtk(working_dir: str) -> Optional[str]:
+    """查找工作目录 vtk_output 下最后一个输出步的VTK结果文件"""
     vtk_output_folder = os.path.join(working_dir, "vtk_output")
     if not os.path.exists(vtk_output_folder):
         logger.error(f"VTK输出目录不存在: {vtk_output_folder}")
-        return {"error": "未找到分析结果"}
+        return None
     
-    vtk_files = [f for f in os.listdir(vtk_output_folder) if f.endswith('.vtk')]
+    vtk_files = vtk_step_files(vtk_output_folder)
     if not vtk_files:
         logger.error("未找到VTK结果文件")
-        return {"error": "未找到VTK结果文件"}
+        return None
+    
+    return vtk_files[-1]
+
+
+def get_visualization_data(working_dir: str, project_name: str) -> str:
+    """
+    按需导出前端可视化JSON；已导出且不旧于结果文件时直接返回
+    """
+    latest_vtk = find_latest_vtk(working_dir)
+    if latest_vtk is None:
+        raise FileNotFoundError(f"未找到分析结果: {working_dir}")
+    
+    viz_data_file = os.path.join(working_dir, f"{project_name}_visualization.json")
+    if not _is_fresh(viz_data_file, latest_vtk):
+        with trace_span("vtk.export_json", vtk_file=os.path.basename(latest_vtk)):
+            processor = PostProcessor(working_dir)
+            processor.export_visualization_data(
+                processor.load_vtk_results(latest_vtk), viz_data_file)
+    return viz_data_file
+
+
+def get_preview_image(working_dir: str, project_name: str,
+                      scalar_field: Optional[str] = None,
+                      wait: bool = True, timeout: Optional[float] = None):
+    """
+    按需生成预览图
+
+    Args:
+        wait: True 时阻塞直到渲染完成并返回图片路径；False 时返回 Future
+    """
+    latest_vtk = find_latest_vtk(working_dir)
+    if latest_vtk is None:
+        raise FileNotFoundError(f"未找到分析结果: {working_dir}")
+    
+    suffix = f"_{scalar_field}" if scalar_field else ""
+    preview_image = os.path.join(working_dir, f"{project_name}_preview{suffix}.png")
+    future = get_renderer_pool().request(latest_vtk, preview_image, scalar_field)
+    return future.result(timeout) if wait else future
+
+
+@profile_stage("post.process_results")
+def process_kratos_results(working_dir: str, project_name: str,
+                           eager_exports: bool = False) -> Dict[str, Any]:
+    """
+    处理Kratos分析结果的主函数
+
+    只计算结果摘要与各物理场统计；前端JSON和预览图改为首次请求时通过
+    get_visualization_data / get_preview_image 生成并缓存。
+    eager_exports=True 时保持旧行为，在分析任务内同步生成二者。
+    所有输出步先合并到 HDF5 结果库，最后一步的场从结果库读取。
+    """
+    processor = PostProcessor(working_dir)
     
-    # 使用最新的VTK文件
-    latest_vtk = max([os.path.join(vtk_output_folder, f) for f in vtk_files], 
-                    key=os.path.getctime)
+    latest_vtk = find_latest_vtk(working_dir)
+    if latest_vtk is None:
+        return {"error": "未找到VTK结果文件"}
     
     try:
-        # 加载结果
-        mesh = processor.load_vtk_results(latest_vtk)
-        
-        results = {
-            "mesh_info": {
-                "n_points": mesh.n_points,
-                "n_cells": mesh.n_cells,
-                "bounds": mesh.bounds.tolist(),
-                "available_fields": mesh.array_names
+        with trace_span("vtk.post_process", vtk_file=os.path.basename(latest_vtk)) as span:
+            # 加载结果：优先从合并后的结果库读取最后一步
+            with trace_span("vtk.load"):
+                mesh, store_info = None, None
+                try:
+                    store = open_result_store(working_dir)
+                    if store is not None:
+                        with store:
+                            mesh = store.load_step(-1)
+                            xdmf_path = os.path.splitext(store.store_path)[0] + ".xdmf"
+                            store_info = {
+                                "path": store.store_path,
+                                "xdmf": xdmf_path if os.path.exists(xdmf_path) else None,
+                                "n_steps": store.n_steps,
+                                "times": store.times.tolist(),
+                            }
+                except Exception as e:
+                    # 结果库只是加速读取的副本，合并失败时直接读取最后一个VTK文件
+                    logger.warning(f"结果库合并/读取失败，回退到VTK文件: {e}")
+                    mesh, store_info = None, None
+                if mesh is None:
+                    mesh = processor.load_vtk_results(latest_vtk)
+            span.set_attribute("node_count", mesh.n_points)
+            span.set_attribute("element_count", mesh.n_cells)
+            
+            results = {
+                "mesh_info": {
+                    "n_points": mesh.n_points,
+                    "n_cells": mesh.n_cells,
+                    "bounds": [float(b) for b in mesh.bounds],
+                    "available_fields": mesh.array_names
+                },
+                "result_file": latest_vtk,
+                "result_store": store_info,
+                # 按需生成的产物路径，首次请求时才会写出
+                "on_demand": {
+                    "visualization_data": os.path.join(
+                        working_dir, f"{project_name}_visualization.json"),
+                    "preview_image": os.path.join(
+                        working_dir, f"{project_name}_preview.png"),
+                }
             }
-        }
-        
-        # 处理不同类型的结果
-        if "DISPLACEMENT" in mesh.array_names:
-            displacement_results = processor.create_displacement_visualization(mesh)
-            results["displacement"] = displacement_results
-        
-        if "STRESS" in mesh.array_names:
-            stress_results = processor.create_stress_visualization(mesh)
-            results["stress"] = stress_results
-        
-        if "TOTAL_HEAD" in mesh.array_names:
-            seepage_results = processor.create_seepage_visualization(mesh)
-            results["seepage"] = seepage_results
-        
-        # 导出前端可视化数据
-        viz_data_file = os.path.join(working_dir, f"{project_name}_visualization.json")
-        processor.export_visualization_data(mesh, viz_data_file)
-        results["visualization_data"] = viz_data_file
-        
-        # 生成预览图
-        preview_image = os.path.join(working_dir, f"{project_name}_preview.png")
-        processor.create_interactive_plot(mesh, save_path=preview_image)
-        results["preview_image"] = preview_image
+            
+            # 处理不同类型的结果
+            with trace_span("vtk.fields"):
+                if "DISPLACEMENT" in mesh.array_names:
+                    displacement_results = processor.create_displacement_visualization(mesh)
+                    results["displacement"] = displacement_results
+                
+                if "STRESS" in mesh.array_names:
+                    stress_results = processor.create_stress_visualization(mesh)
+                    results["stress"] = stress_results
+                
+                if "TOTAL_HEAD" in mesh.array_names:
+                    seepage_results = processor.create_seepage_visualization(mesh)
+                    results["seepage"] = seepage_results
+            
+            if eager_exports:
+                results["visualization_data"] = get_visualization_data(working_dir, project_name)
+                results["preview_image"] = get_preview_image(working_dir, project_name)
         
         logger.info("PyVista后处理完成")
         return results
@@ -0,0 +1,223 @@
+"""
+按任务开启的性能剖析
+
+与 tracing 的 span 不同，剖析记录函数级调用统计 (cProfile) 与内存分配
+(tracemalloc)，只在请求显式打开时启用：
+
+    with profile_job(working_dir, job_id, enabled=request.profile):
+        ...
+
+    @profile_stage("geology.surfaces")
+    def create_geological_model_geometry(...): ...
+
+    with profile_stage("kratos.solve"):
+        ...
+
+未启用时 profile_stage 只做一次 ContextVar 查询，不创建任何剖析器。
+启用时：
+- 最外层阶段运行 cProfile（cProfile 不能嵌套），结果写入 <工作目录>/profile/<阶段>.prof；
+- 每个阶段（含嵌套）记录墙钟/CPU 时间与内存峰值；
+- 最外层阶段结束时保存 tracemalloc 快照 <阶段>.snapshot；
+- 任务结束时写出 profile/summary.json（热点函数、各阶段耗时、主要内存分配位置）。
+
+剖析状态按上下文传递，不跨进程；并行分析的工作进程不会被剖析。
+"""
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIRNAME = "profile"
+PROFILE_SUMMARY = "summary.json"
+
+# 汇总中保留的热点函数与内存分配位置个数
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 20
+
+_current_session: contextvars.ContextVar[Optional["ProfileSession"]] = \
+    contextvars.ContextVar("deepcad_profile_session", default=None)
+
+
+class ProfileSession:
+    """单个任务的剖析会话"""
+
+    def __init__(self, working_dir: str, job_id: str, memory: bool = True):
+        self.job_id = job_id
+        self.profile_dir = os.path.join(working_dir, PROFILE_DIRNAME)
+        self.memory = memory
+        self.stages: List[Dict[str, Any]] = []
+        self.profiles: List[str] = []
+        self.snapshots: List[str] = []
+        self._local = threading.local()
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+        os.makedirs(self.profile_dir, exist_ok=True)
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            self._started_tracemalloc = True
+
+    def _file_stem(self, name: str) -> str:
+        stem = re.sub(r"[^\w.-]+", "_", name)
+        with self._lock:
+            index = len(self.profiles) + len(self.snapshots)
+        return os.path.join(self.profile_dir, f"{index:03d}_{stem}")
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        depth = getattr(self._local, "depth", 0)
+        profiler = None
+        if depth == 0:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # 其他线程的阶段正在剖析（Python 3.12+ 同一时间只允许一个剖析器）
+                profiler = None
+        if depth == 0 and self.memory and tracemalloc.is_tracing():
+            # 嵌套阶段的峰值按其所属最外层阶段开始以来统计
+            tracemalloc.reset_peak()
+        self._local.depth = depth + 1
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self._local.depth = depth
+            record = {"name": name, "depth": depth, "wall_s": wall, "cpu_s": cpu,
+                      "thread": threading.current_thread().name}
+            if self.memory and tracemalloc.is_tracing():
+                record["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            if profiler is not None:
+                profiler.disable()
+                stem = self._file_stem(name)
+                profiler.dump_stats(f"{stem}.prof")
+                with self._lock:
+                    self.profiles.append(f"{stem}.prof")
+                if self.memory and tracemalloc.is_tracing():
+                    tracemalloc.take_snapshot().dump(f"{stem}.snapshot")
+                    with self._lock:
+                        self.snapshots.append(f"{stem}.snapshot")
+            with self._lock:
+                self.stages.append(record)
+
+    def _top_functions(self) -> List[Dict[str, Any]]:
+        if not self.profiles:
+            return []
+        stats = pstats.Stats(*self.profiles, stream=io.StringIO())
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+            rows.append({"function": f"{func} ({os.path.basename(filename)}:{line})",
+                         "calls": nc, "tottime_s": tt, "cumtime_s": ct})
+        rows.sort(key=lambda r: r["cumtime_s"], reverse=True)
+        return rows[:TOP_FUNCTIONS]
+
+    def _top_allocations(self) -> List[Dict[str, Any]]:
+        if not self.snapshots:
+            return []
+        snapshot = tracemalloc.Snapshot.load(self.snapshots[-1])
+        return [{"location": str(stat.traceback[0]), "size_mb": stat.size / 2 ** 20,
+                 "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]]
+
+    def finish(self) -> Dict[str, Any]:
+        summary = {
+            "job_id": self.job_id,
+            "stages": self.stages,
+            "top_functions": self._top_functions(),
+            "top_allocations": self._top_allocations(),
+            "profiles": [os.path.basename(p) for p in self.profiles],
+            "snapshots": [os.path.basename(p) for p in self.snapshots],
+        }
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        with open(os.path.join(self.profile_dir, PROFILE_SUMMARY), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        logger.info(f"任务 {self.job_id} 剖析结果已写入: {self.profile_dir}")
+        return summary
+
+
+@contextmanager
+def profile_job(working_dir: str, job_id: str, enabled: bool = False,
+                memory: bool = True) -> Iterator[Optional[ProfileSession]]:
+    """
+    为一次任务开启剖析；enabled 为 False 时不做任何事情
+
+    Args:
+        working_dir: 任务工作目录，剖析结果写入其 profile 子目录
+        job_id: 任务 id，记录在汇总中；/jobs/{id}/profile 经任务工作目录登记找到结果
+        memory: 是否同时用 tracemalloc 记录内存分配
+    """
+    if not enabled:
+        yield None
+        return
+    session = ProfileSession(working_dir, job_id, memory)
+    session.start()
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+        try:
+            session.finish()
+        except Exception as e:
+            logger.warning(f"写出剖析结果失败: {e}")
+
+
+class profile_stage:
+    """
+    剖析阶段：既可作为上下文管理器，也可作为装饰器
+
+    当前上下文没有开启剖析时直接执行被包装的代码。
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._cm = None
+
+    def __enter__(self):
+        session = _current_session.get()
+        if session is not None:
+            self._cm = session.stage(self.name)
+            self._cm.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        cm, self._cm = self._cm, None
+        if cm is not None:
+            return cm.__exit__(*exc_info)
+        return False
+
+    def __call__(self, func):
+        name = self.name
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            session = _current_session.get()
+            if session is None:
+                return func(*args, **kwargs)
+            with session.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def load_profile_summary(working_dir: str) -> Optional[Dict[str, Any]]:
+    """读取任务工作目录下的剖析汇总；任务未开启剖析或尚未结束时返回 None"""
+    path = os.path.join(working_dir, PROFILE_DIRNAME, PROFILE_SUMMARY)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
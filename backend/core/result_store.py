@@ -0,0 +1,351 @@
+"""
+时间序列结果库 (HDF5 + XDMF)
+把 Kratos 每个输出步写出的 legacy .vtk 文件合并为单个分块 HDF5 文件：
+网格只存一次，每个物理场为 (步数, 节点/单元数[, 分量]) 的数据集，
+按单步分块；同时生成 XDMF 描述文件供 ParaView 直接打开。
+读取时只加载请求的场和步，未压缩的分块直接内存映射。
+"""
+import logging
+import os
+import re
+from typing import List, Optional, Sequence
+
+import h5py
+import numpy as np
+import pyvista as pv
+
+from .tracing import trace_span
+
+logger = logging.getLogger(__name__)
+
+RESULT_STORE_NAME = "results.h5"
+
+# VTK 单元类型 -> XDMF 拓扑 (名称, 混合拓扑编号, 节点重排)
+# 二次单元的节点顺序 VTK 与 XDMF 一致；像素/体素按轴序编号，需重排为四边形/六面体的环绕顺序
+_XDMF_TOPOLOGY = {
+    1: ("Polyvertex", 1, None),
+    3: ("Polyline", 2, None),
+    5: ("Triangle", 4, None),
+    8: ("Quadrilateral", 5, (0, 1, 3, 2)),
+    9: ("Quadrilateral", 5, None),
+    10: ("Tetrahedron", 6, None),
+    11: ("Hexahedron", 9, (0, 1, 3, 2, 4, 5, 7, 6)),
+    12: ("Hexahedron", 9, None),
+    13: ("Wedge", 8, None),
+    14: ("Pyramid", 7, None),
+    21: ("Edge_3", 34, None),
+    22: ("Triangle_6", 36, None),
+    23: ("Quadrilateral_8", 37, None),
+    24: ("Tetrahedron_10", 38, None),
+    25: ("Hexahedron_20", 48, None),
+    26: ("Wedge_15", 40, None),
+    27: ("Pyramid_13", 39, None),
+}
+
+# 分量数 -> XDMF 属性类型
+_XDMF_ATTRIBUTE = {3: "Vector", 6: "Tensor6", 9: "Tensor"}
+
+_STEP_PATTERN = re.compile(r"(\d+)(?=\.vtk$)")
+
+
+def vtk_step_files(vtk_dir: str) -> List[str]:
+    """按输出步编号（文件名末尾数字）排序的 VTK 文件列表"""
+    if not os.path.isdir(vtk_dir):
+        return []
+    files = [os.path.join(vtk_dir, f) for f in os.listdir(vtk_dir) if f.endswith(".vtk")]
+
+    def step_key(path):
+        match = _STEP_PATTERN.search(os.path.basename(path))
+        return (int(match.group(1)) if match else -1, os.path.getmtime(path))
+
+    return sorted(files, key=step_key)
+
+
+def _is_stale(store_path: str, sources: Sequence[str]) -> bool:
+    if not os.path.exists(store_path):
+        return True
+    with h5py.File(store_path, "r") as f:
+        recorded = [s.decode() if isinstance(s, bytes) else s for s in f["sources"][()]]
+    if recorded != [os.path.basename(s) for s in sources]:
+        return True
+    store_mtime = os.path.getmtime(store_path)
+    return any(os.path.getmtime(s) > store_mtime for s in sources)
+
+
+def consolidate_vtk_output(working_dir: str, store_path: Optional[str] = None,
+                           force: bool = False) -> Optional[str]:
+    """
+    把 working_dir/vtk_output 下的逐步 VTK 文件合并为 HDF5 结果库
+
+    已存在且不旧于 VTK 文件时直接返回；没有 VTK 文件时返回 None。
+    """
+    sources = vtk_step_files(os.path.join(working_dir, "vtk_output"))
+    if not sources:
+        return None
+    store_path = store_path or os.path.join(working_dir, RESULT_STORE_NAME)
+    if not force and not _is_stale(store_path, sources):
+        return store_path
+
+    tmp_path = f"{store_path}.{os.getpid()}.tmp"
+    try:
+        with trace_span("results.consolidate", step_count=len(sources)):
+            first = pv.read(sources[0])
+            n_steps = len(sources)
+            with h5py.File(tmp_path, "w") as f:
+                _write_mesh(f, first)
+                f.create_dataset("sources", data=np.array(
+                    [os.path.basename(s) for s in sources], dtype=h5py.string_dtype()))
+                times = f.create_dataset("time", shape=(n_steps,), dtype="f8")
+
+                for step, path in enumerate(sources):
+                    mesh = first if step == 0 else pv.read(path)
+                    if mesh.n_points != first.n_points or mesh.n_cells != first.n_cells:
+                        raise ValueError(f"{os.path.basename(path)} 的网格与第一步不一致，"
+                                         "无法合并为单一网格的结果库")
+                    times[step] = float(np.ravel(mesh.field_data["TIME"])[0]) \
+                        if "TIME" in mesh.field_data else float(step)
+                    for association, data in (("point", mesh.point_data), ("cell", mesh.cell_data)):
+                        for name in data.keys():
+                            _write_field(f, association, name, np.asarray(data[name]), step, n_steps)
+            # XDMF 在发布结果库之前写出：失败时结果库不会被视为已合并，下次重新生成
+            write_xdmf(tmp_path, xdmf_path=_xdmf_path(store_path),
+                       h5_name=os.path.basename(store_path))
+            os.replace(tmp_path, store_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    logger.info(f"已合并 {len(sources)} 个输出步到结果库: {store_path}")
+    return store_path
+
+
+def _write_mesh(f: h5py.File, mesh: pv.UnstructuredGrid):
+    grp = f.create_group("mesh")
+    grp.create_dataset("points", data=np.asarray(mesh.points, dtype=np.float64))
+    grp.create_dataset("connectivity", data=np.asarray(mesh.cell_connectivity, dtype=np.int64))
+    grp.create_dataset("offsets", data=np.asarray(mesh.cell_offsets, dtype=np.int64))
+    grp.create_dataset("celltypes", data=np.asarray(mesh.celltypes, dtype=np.uint8))
+
+
+def _write_field(f: h5py.File, association: str, name: str, values: np.ndarray,
+                 step: int, n_steps: int):
+    path = f"fields/{association}/{name}"
+    if path not in f:
+        # 每步一个连续分块，不压缩，便于直接内存映射
+        fill = np.nan if np.issubdtype(values.dtype, np.floating) else 0
+        f.create_dataset(path, shape=(n_steps,) + values.shape, dtype=values.dtype,
+                         chunks=(1,) + values.shape, fillvalue=fill)
+    f[path][step] = values
+
+
+def _xdmf_path(store_path: str) -> str:
+    return os.path.splitext(store_path)[0] + ".xdmf"
+
+
+def write_xdmf(store_path: str, xdmf_path: Optional[str] = None,
+               h5_name: Optional[str] = None) -> Optional[str]:
+    """
+    为结果库生成 XDMF 时间序列描述文件
+
+    h5_name 为 XDMF 中引用的结果库文件名（默认 store_path 的文件名），
+    用于在临时文件发布为结果库之前写出描述文件。
+    含 XDMF 无法表示的单元类型时不写出（删除旧的描述文件）并返回 None。
+    """
+    xdmf_path = xdmf_path or _xdmf_path(store_path)
+    h5_name = h5_name or os.path.basename(store_path)
+    with h5py.File(store_path, "r") as f:
+        n_points = f["mesh/points"].shape[0]
+        celltypes = f["mesh/celltypes"][()]
+        offsets = f["mesh/offsets"][()]
+        connectivity = f["mesh/connectivity"][()]
+        times = f["time"][()]
+        fields = [(assoc, name, f[f"fields/{assoc}/{name}"].shape)
+                  for assoc in ("point", "cell") if f"fields/{assoc}" in f
+                  for name in f[f"fields/{assoc}"]]
+    topology = _xdmf_topology(celltypes, offsets, connectivity)
+
+    if topology is None:
+        unsupported = sorted({int(t) for t in celltypes} - set(_XDMF_TOPOLOGY))
+        logger.warning(f"结果库含 XDMF 不支持的单元类型 {unsupported}，跳过 XDMF 描述文件")
+        if os.path.exists(xdmf_path):
+            os.remove(xdmf_path)
+        return None
+
+    topology_name, n_nodes, topology_array = topology
+    if topology_array is not None:
+        # 混合拓扑或需重排节点时，把 XDMF 用的连接数组写入结果库
+        with h5py.File(store_path, "a") as f:
+            if "mesh/xdmf_topology" in f:
+                del f["mesh/xdmf_topology"]
+            f.create_dataset("mesh/xdmf_topology", data=topology_array)
+    topology_source = "xdmf_topology" if topology_array is not None else "connectivity"
+    if topology_name == "Mixed":
+        dimensions = f"{len(topology_array)}"
+    else:
+        dimensions = f"{len(celltypes)} {n_nodes}"
+    topo_xml = (f'<Topology TopologyType="{topology_name}" NumberOfElements="{len(celltypes)}">'
+                f'<DataItem Dimensions="{dimensions}" NumberType="Int" Precision="8" '
+                f'Format="HDF">{h5_name}:/mesh/{topology_source}</DataItem></Topology>')
+    geo_xml = (f'<Geometry GeometryType="XYZ"><DataItem Dimensions="{n_points} 3" '
+               f'NumberType="Float" Precision="8" Format="HDF">{h5_name}:/mesh/points'
+               f'</DataItem></Geometry>')
+
+    grids = []
+    for step, t in enumerate(times):
+        attrs = []
+        for assoc, name, shape in fields:
+            center = "Node" if assoc == "point" else "Cell"
+            kind = "Scalar" if len(shape) == 2 else _XDMF_ATTRIBUTE.get(shape[2], "Matrix")
+            dims = " ".join(str(d) for d in shape[1:])
+            full = " ".join(str(d) for d in shape)
+            rank = len(shape)
+            # 超平面: 起点 / 步长 / 数量
+            start = " ".join([str(step)] + ["0"] * (rank - 1))
+            stride = " ".join(["1"] * rank)
+            attrs.append(
+                f'<Attribute Name="{name}" AttributeType="{kind}" Center="{center}">'
+                f'<DataItem ItemType="HyperSlab" Dimensions="{dims}" Type="HyperSlab">'
+                f'<DataItem Dimensions="3 {rank}" Format="XML">'
+                f'{start} {stride} 1 {dims}</DataItem>'
+                f'<DataItem Dimensions="{full}" Format="HDF">{h5_name}:/fields/{assoc}/{name}'
+                f'</DataItem></DataItem></Attribute>')
+        grids.append(f'<Grid Name="step_{step}" GridType="Uniform"><Time Value="{t}"/>'
+                     f'{topo_xml}{geo_xml}{"".join(attrs)}</Grid>')
+
+    with open(xdmf_path, "w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" ?>\n<Xdmf Version="3.0"><Domain>'
+                  '<Grid Name="results" GridType="Collection" CollectionType="Temporal">\n')
+        out.write("\n".join(grids))
+        out.write("\n</Grid></Domain></Xdmf>\n")
+    return xdmf_path
+
+
+def _xdmf_topology(celltypes: np.ndarray, offsets: np.ndarray, connectivity: np.ndarray):
+    """
+    返回 (拓扑名称, 每单元节点数, XDMF 连接数组或 None)；
+    连接数组为 None 时直接引用 mesh/connectivity。含不支持的单元类型时返回 None。
+    """
+    unique = np.unique(celltypes)
+    if any(int(t) not in _XDMF_TOPOLOGY for t in unique):
+        return None
+    # 折线/点集的单元节点数不固定，总是按混合拓扑写出
+    if len(unique) == 1 and int(unique[0]) not in (1, 3):
+        name, _, permutation = _XDMF_TOPOLOGY[int(unique[0])]
+        n_nodes = int(offsets[1] - offsets[0])
+        if permutation is None:
+            return name, n_nodes, None
+        cells = connectivity.reshape(-1, n_nodes)[:, permutation]
+        return name, n_nodes, np.ascontiguousarray(cells, dtype=np.int64)
+    parts = []
+    for i, ctype in enumerate(celltypes):
+        _, code, permutation = _XDMF_TOPOLOGY[int(ctype)]
+        ids = connectivity[offsets[i]:offsets[i + 1]]
+        if permutation is not None:
+            ids = ids[list(permutation)]
+        header = [code, len(ids)] if code in (1, 2) else [code]
+        parts.append(np.concatenate([header, ids]))
+    return "Mixed", None, np.concatenate(parts).astype(np.int64)
+
+
+class ResultStore:
+    """HDF5 结果库的只读访问；网格在首次需要时读取并缓存"""
+
+    def __init__(self, store_path: str):
+        if not os.path.exists(store_path):
+            raise FileNotFoundError(f"结果库不存在: {store_path}")
+        self.store_path = store_path
+        self._file = h5py.File(store_path, "r")
+        self._mesh: Optional[pv.UnstructuredGrid] = None
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def n_steps(self) -> int:
+        return len(self._file["time"])
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._file["time"][()]
+
+    def field_names(self, association: str = "point") -> List[str]:
+        group = self._file.get(f"fields/{association}")
+        return list(group.keys()) if group is not None else []
+
+    def _step_index(self, step: int) -> int:
+        index = step if step >= 0 else self.n_steps + step
+        if not 0 <= index < self.n_steps:
+            raise IndexError(f"输出步 {step} 超出范围 (共 {self.n_steps} 步)")
+        return index
+
+    def read_field(self, name: str, step: int = -1, association: str = "point") -> np.ndarray:
+        """
+        读取单个场在单个输出步的值
+
+        未压缩且按步分块的数据集直接内存映射对应分块，其他情况按切片读取。
+        """
+        dset = self._file[f"fields/{association}/{name}"]
+        index = self._step_index(step)
+        mapped = self._mmap_chunk(dset, index)
+        return mapped if mapped is not None else dset[index]
+
+    def _mmap_chunk(self, dset, index: int) -> Optional[np.ndarray]:
+        if dset.compression is not None or dset.chunks != (1,) + dset.shape[1:]:
+            return None
+        try:
+            info = dset.id.get_chunk_info_by_coord((index,) + (0,) * (dset.ndim - 1))
+        except (AttributeError, RuntimeError, ValueError):
+            return None
+        if info.byte_offset is None:
+            return None  # 该步未写入
+        return np.memmap(self.store_path, dtype=dset.dtype, mode="r",
+                         offset=info.byte_offset, shape=dset.shape[1:])
+
+    def mesh(self) -> pv.UnstructuredGrid:
+        """不含场数据的网格（只读一次）"""
+        if self._mesh is None:
+            grp = self._file["mesh"]
+            offsets = grp["offsets"][()]
+            connectivity = grp["connectivity"][()]
+            sizes = np.diff(offsets)
+            cells = np.insert(connectivity, offsets[:-1], sizes)
+            self._mesh = pv.UnstructuredGrid(cells, grp["celltypes"][()], grp["points"][()])
+        return self._mesh
+
+    def load_step(self, step: int = -1, fields: Optional[Sequence[str]] = None
+                  ) -> pv.UnstructuredGrid:
+        """
+        组装某一步的网格，只加载请求的场（默认全部）。
+        返回浅拷贝，各步共享同一份几何与拓扑。
+        """
+        grid = self.mesh().copy(deep=False)
+        with trace_span("results.load_step", step=step):
+            for association, target in (("point", grid.point_data), ("cell", grid.cell_data)):
+                for name in self.field_names(association):
+                    if fields is None or name in fields:
+                        target[name] = self.read_field(name, step, association)
+        return grid
+
+    def time_series(self, name: str, ids: Sequence[int],
+                    association: str = "point") -> np.ndarray:
+        """指定节点/单元在所有输出步上的历程 (步数, len(ids)[, 分量])"""
+        dset = self._file[f"fields/{association}/{name}"]
+        ids = np.asarray(ids)
+        order = np.argsort(ids)
+        # h5py 要求花式索引递增
+        values = dset[:, ids[order]]
+        result = np.empty_like(values)
+        result[:, order] = values
+        return result
+
+
+def open_result_store(working_dir: str) -> Optional[ResultStore]:
+    """合并（如有需要）并打开工作目录的结果库；无VTK输出时返回 None"""
+    store_path = consolidate_vtk_output(working_dir)
+    return ResultStore(store_path) if store_path else None
@@ -13,6 +13,7 @@
 // System includes
 
 // External includes
+#include <pybind11/numpy.h>
 
 // Project includes
 #include "includes/define.h"
@@ -21,9 +22,68 @@
 #include "spaces/ublas_space.h"
 #include "custom_utilities/feti_dynamic_coupling_utilities.h"
 #include "custom_utilities/conversion_utilities.h"
+#include "custom_utilities/coupling_interface_data_utilities.h"
 
 namespace Kratos::Python {
 
+namespace {
+
+using DoubleBufferType = pybind11::array_t<double, pybind11::array::c_style>;
+
+template<class TContainerType>
+void CheckBufferSize(const TContainerType& rContainer, const std::size_t Dimension, const DoubleBufferType& rBuffer)
+{
+    KRATOS_ERROR_IF(static_cast<std::size_t>(rBuffer.size()) != rContainer.size()*Dimension)
+        << "The size of the buffer (" << rBuffer.size() << ") does not match the size of the data ("
+        << rContainer.size()*Dimension << ")!" << std::endl;
+}
+
+template<class TDataType>
+void GetSolutionStepValues(const ModelPart::NodesContainerType& rNodes, const Variable<TDataType>& rVariable, const std::size_t SolutionStepIndex, const std::size_t Dimension, DoubleBufferType& rBuffer)
+{
+    CheckBufferSize(rNodes, Dimension, rBuffer);
+    CouplingInterfaceDataUtilities::GetSolutionStepValues(rNodes, rVariable, SolutionStepIndex, Dimension, rBuffer.mutable_data());
+}
+
+template<class TDataType>
+void SetSolutionStepValues(ModelPart::NodesContainerType& rNodes, const Variable<TDataType>& rVariable, const std::size_t SolutionStepIndex, const std::size_t Dimension, const DoubleBufferType& rBuffer)
+{
+    CheckBufferSize(rNodes, Dimension, rBuffer);
+    CouplingInterfaceDataUtilities::SetSolutionStepValues(rNodes, rVariable, SolutionStepIndex, Dimension, rBuffer.data());
+}
+
+template<class TContainerType, class TDataType>
+void GetValues(const TContainerType& rContainer, const Variable<TDataType>& rVariable, const std::size_t Dimension, DoubleBufferType& rBuffer)
+{
+    CheckBufferSize(rContainer, Dimension, rBuffer);
+    CouplingInterfaceDataUtilities::GetValues(rContainer, rVariable, Dimension, rBuffer.mutable_data());
+}
+
+template<class TContainerType, class TDataType>
+void SetValues(TContainerType& rContainer, const Variable<TDataType>& rVariable, const std::size_t Dimension, const DoubleBufferType& rBuffer)
+{
+    CheckBufferSize(rContainer, Dimension, rBuffer);
+    CouplingInterfaceDataUtilities::SetValues(rContainer, rVariable, Dimension, rBuffer.data());
+}
+
+void GetNodalCoordinates(const ModelPart::NodesContainerType& rNodes, DoubleBufferType& rBuffer)
+{
+    CheckBufferSize(rNodes, 3, rBuffer);
+    CouplingInterfaceDataUtilities::GetNodalCoordinates(rNodes, rBuffer.mutable_data());
+}
+
+template<class TContainerType, class TDataType, class TClassType>
+void AddNonHistoricalAccess(TClassType& rClass)
+{
+    // the buffer is written in place, hence it must not be converted (copied) by pybind
+    rClass
+        .def_static("GetValues", &GetValues<TContainerType, TDataType>, pybind11::arg("container"), pybind11::arg("variable"), pybind11::arg("dimension"), pybind11::arg("buffer").noconvert())
+        .def_static("SetValues", &SetValues<TContainerType, TDataType>, pybind11::arg("container"), pybind11::arg("variable"), pybind11::arg("dimension"), pybind11::arg("buffer"))
+        ;
+}
+
+} // anonymous namespace
+
     void  AddCustomUtilitiesToPython(pybind11::module& m)
     {
         typedef UblasSpace<double, CompressedMatrix, boost::numeric::ublas::vector<double>> SparseSpaceType;
@@ -66,6 +126,20 @@ namespace Kratos::Python {
             .def_static("ConvertNodalDataToElementalDataTranspose", &ConversionUtilities::ConvertNodalDataToElementalDataTranspose<array_1d<double, 3>>)
             ;
 
+        auto coupling_interface_data_utilities = pybind11::class_< CouplingInterfaceDataUtilities>(m, "CouplingInterfaceDataUtilities")
+            .def_static("GetSolutionStepValues", &GetSolutionStepValues<double>, pybind11::arg("nodes"), pybind11::arg("variable"), pybind11::arg("solution_step_index"), pybind11::arg("dimension"), pybind11::arg("buffer").noconvert())
+            .def_static("GetSolutionStepValues", &GetSolutionStepValues<array_1d<double, 3>>, pybind11::arg("nodes"), pybind11::arg("variable"), pybind11::arg("solution_step_index"), pybind11::arg("dimension"), pybind11::arg("buffer").noconvert())
+            .def_static("SetSolutionStepValues", &SetSolutionStepValues<double>, pybind11::arg("nodes"), pybind11::arg("variable"), pybind11::arg("solution_step_index"), pybind11::arg("dimension"), pybind11::arg("buffer"))
+            .def_static("SetSolutionStepValues", &SetSolutionStepValues<array_1d<double, 3>>, pybind11::arg("nodes"), pybind11::arg("variable"), pybind11::arg("solution_step_index"), pybind11::arg("dimension"), pybind11::arg("buffer"))
+            .def_static("GetNodalCoordinates", &GetNodalCoordinates, pybind11::arg("nodes"), pybind11::arg("buffer").noconvert())
+            ;
+        AddNonHistoricalAccess<ModelPart::NodesContainerType, double>(coupling_interface_data_utilities);
+        AddNonHistoricalAccess<ModelPart::NodesContainerType, array_1d<double, 3>>(coupling_interface_data_utilities);
+        AddNonHistoricalAccess<ModelPart::ElementsContainerType, double>(coupling_interface_data_utilities);
+        AddNonHistoricalAccess<ModelPart::ElementsContainerType, array_1d<double, 3>>(coupling_interface_data_utilities);
+        AddNonHistoricalAccess<ModelPart::ConditionsContainerType, double>(coupling_interface_data_utilities);
+        AddNonHistoricalAccess<ModelPart::ConditionsContainerType, array_1d<double, 3>>(coupling_interface_data_utilities);
+
     }
 
 }  // namespace Kratos::Python.
@@ -0,0 +1,167 @@
+//    |  /           |
+//    ' /   __| _` | __|  _ \   __|
+//    . \  |   (   | |   (   |\__ `
+//   _|\_\_|  \__,_|\__|\___/ ____/
+//                   Multi-Physics
+//
+//  License:		 BSD License
+//					 Kratos default license: kratos/license.txt
+//
+
+// System includes
+#include <type_traits>
+
+// External includes
+
+// Project includes
+#include "utilities/parallel_utilities.h"
+#include "coupling_interface_data_utilities.h"
+
+namespace Kratos {
+
+namespace {
+
+template<class TDataType>
+void CopyToBuffer(const TDataType& rValue, const std::size_t Dimension, double* pData)
+{
+    if constexpr(std::is_same_v<TDataType, double>) {
+        *pData = rValue;
+    } else if constexpr(std::is_same_v<TDataType, array_1d<double, 3>>) {
+        for (std::size_t i=0; i<Dimension; ++i) {
+            pData[i] = rValue[i];
+        }
+    } else {
+        static_assert(!std::is_same_v<TDataType, TDataType>, "Unsupported data type.");
+    }
+}
+
+template<class TDataType>
+void CopyFromBuffer(TDataType& rValue, const std::size_t Dimension, const double* pData)
+{
+    if constexpr(std::is_same_v<TDataType, double>) {
+        rValue = *pData;
+    } else if constexpr(std::is_same_v<TDataType, array_1d<double, 3>>) {
+        // apply "padding", same as when setting the values from python
+        rValue = ZeroVector(3);
+        for (std::size_t i=0; i<Dimension; ++i) {
+            rValue[i] = pData[i];
+        }
+    } else {
+        static_assert(!std::is_same_v<TDataType, TDataType>, "Unsupported data type.");
+    }
+}
+
+template<class TDataType>
+void CheckDimension(const std::size_t Dimension)
+{
+    if constexpr(std::is_same_v<TDataType, double>) {
+        KRATOS_ERROR_IF(Dimension != 1) << "Dimension must be 1 for scalar variables, got: " << Dimension << std::endl;
+    } else {
+        KRATOS_ERROR_IF(Dimension < 1 || Dimension > 3) << "Dimension must be 1, 2 or 3 for array variables, got: " << Dimension << std::endl;
+    }
+}
+
+} // anonymous namespace
+
+template<class TDataType>
+void CouplingInterfaceDataUtilities::GetSolutionStepValues(
+    const ModelPart::NodesContainerType& rNodes,
+    const Variable<TDataType>& rVariable,
+    const std::size_t SolutionStepIndex,
+    const std::size_t Dimension,
+    double* pData)
+{
+    CheckDimension<TDataType>(Dimension);
+    const auto it_node_begin = rNodes.begin();
+
+    IndexPartition<std::size_t>(rNodes.size()).for_each([&](const std::size_t Index){
+        const auto& r_value = (it_node_begin + Index)->FastGetSolutionStepValue(rVariable, SolutionStepIndex);
+        CopyToBuffer(r_value, Dimension, pData + Index*Dimension);
+    });
+}
+
+template<class TDataType>
+void CouplingInterfaceDataUtilities::SetSolutionStepValues(
+    ModelPart::NodesContainerType& rNodes,
+    const Variable<TDataType>& rVariable,
+    const std::size_t SolutionStepIndex,
+    const std::size_t Dimension,
+    const double* pData)
+{
+    CheckDimension<TDataType>(Dimension);
+    const auto it_node_begin = rNodes.begin();
+
+    IndexPartition<std::size_t>(rNodes.size()).for_each([&](const std::size_t Index){
+        auto& r_value = (it_node_begin + Index)->FastGetSolutionStepValue(rVariable, SolutionStepIndex);
+        CopyFromBuffer(r_value, Dimension, pData + Index*Dimension);
+    });
+}
+
+template<class TContainerType, class TDataType>
+void CouplingInterfaceDataUtilities::GetValues(
+    const TContainerType& rContainer,
+    const Variable<TDataType>& rVariable,
+    const std::size_t Dimension,
+    double* pData)
+{
+    CheckDimension<TDataType>(Dimension);
+    const auto it_entity_begin = rContainer.begin();
+
+    IndexPartition<std::size_t>(rContainer.size()).for_each([&](const std::size_t Index){
+        const auto& r_value = (it_entity_begin + Index)->GetValue(rVariable);
+        CopyToBuffer(r_value, Dimension, pData + Index*Dimension);
+    });
+}
+
+template<class TContainerType, class TDataType>
+void CouplingInterfaceDataUtilities::SetValues(
+    TContainerType& rContainer,
+    const Variable<TDataType>& rVariable,
+    const std::size_t Dimension,
+    const double* pData)
+{
+    CheckDimension<TDataType>(Dimension);
+    const auto it_entity_begin = rContainer.begin();
+
+    IndexPartition<std::size_t>(rContainer.size()).for_each([&](const std::size_t Index){
+        TDataType value;
+        CopyFromBuffer(value, Dimension, pData + Index*Dimension);
+        (it_entity_begin + Index)->SetValue(rVariable, value);
+    });
+}
+
+void CouplingInterfaceDataUtilities::GetNodalCoordinates(
+    const ModelPart::NodesContainerType& rNodes,
+    double* pData)
+{
+    const auto it_node_begin = rNodes.begin();
+
+    IndexPartition<std::size_t>(rNodes.size()).for_each([&](const std::size_t Index){
+        const auto& r_coordinates = (it_node_begin + Index)->Coordinates();
+        for (std::size_t i=0; i<3; ++i) {
+            pData[Index*3 + i] = r_coordinates[i];
+        }
+    });
+}
+
+// template instantiations
+template void KRATOS_API(CO_SIMULATION_APPLICATION) CouplingInterfaceDataUtilities::GetSolutionStepValues<double>(const ModelPart::NodesContainerType&, const Variable<double>&, const std::size_t, const std::size_t, double*);
+template void KRATOS_API(CO_SIMULATION_APPLICATION) CouplingInterfaceDataUtilities::GetSolutionStepValues<array_1d<double, 3>>(const ModelPart::NodesContainerType&, const Variable<array_1d<double, 3>>&, const std::size_t, const std::size_t, double*);
+
+template void KRATOS_API(CO_SIMULATION_APPLICATION) CouplingInterfaceDataUtilities::SetSolutionStepValues<double>(ModelPart::NodesContainerType&, const Variable<double>&, const std::size_t, const std::size_t, const double*);
+template void KRATOS_API(CO_SIMULATION_APPLICATION) CouplingInterfaceDataUtilities::SetSolutionStepValues<array_1d<double, 3>>(ModelPart::NodesContainerType&, const Variable<array_1d<double, 3>>&, const std::size_t, const std::size_t, const double*);
+
+#define KRATOS_INSTANTIATE_COUPLING_INTERFACE_DATA_UTILITIES(TContainerType, TDataType) \
+template void KRATOS_API(CO_SIMULATION_APPLICATION) CouplingInterfaceDataUtilities::GetValues<TContainerType, TDataType>(const TContainerType&, const Variable<TDataType>&, const std::size_t, double*); \
+template void KRATOS_API(CO_SIMULATION_APPLICATION) CouplingInterfaceDataUtilities::SetValues<TContainerType, TDataType>(TContainerType&, const Variable<TDataType>&, const std::size_t, const double*);
+
+KRATOS_INSTANTIATE_COUPLING_INTERFACE_DATA_UTILITIES(ModelPart::NodesContainerType, double)
+KRATOS_INSTANTIATE_COUPLING_INTERFACE_DATA_UTILITIES(ModelPart::NodesContainerType, array_1d<double, 3>)
+KRATOS_INSTANTIATE_COUPLING_INTERFACE_DATA_UTILITIES(ModelPart::ElementsContainerType, double)
+KRATOS_INSTANTIATE_COUPLING_INTERFACE_DATA_UTILITIES(ModelPart::ElementsContainerType, array_1d<double, 3>)
+KRATOS_INSTANTIATE_COUPLING_INTERFACE_DATA_UTILITIES(ModelPart::ConditionsContainerType, double)
+KRATOS_INSTANTIATE_COUPLING_INTERFACE_DATA_UTILITIES(ModelPart::ConditionsContainerType, array_1d<double, 3>)
+
+#undef KRATOS_INSTANTIATE_COUPLING_INTERFACE_DATA_UTILITIES
+
+}  // namespace Kratos.
@@ -0,0 +1,156 @@
+//    |  /           |
+//    ' /   __| _` | __|  _ \   __|
+//    . \  |   (   | |   (   |\__ `
+//   _|\_\_|  \__,_|\__|\___/ ____/
+//                   Multi-Physics
+//
+//  License:		 BSD License
+//					 Kratos default license: kratos/license.txt
+//
+
+#if !defined(KRATOS_COSIM_COUPLING_INTERFACE_DATA_UTILITIES_H_INCLUDED )
+#define  KRATOS_COSIM_COUPLING_INTERFACE_DATA_UTILITIES_H_INCLUDED
+
+// System includes
+
+// External includes
+
+// Project includes
+#include "includes/define.h"
+#include "includes/model_part.h"
+
+namespace Kratos
+{
+///@addtogroup CoSimulationApplication
+///@{
+
+///@name Kratos Classes
+///@{
+
+/// Bulk access to the data of a CouplingInterfaceData.
+/** The values of all entities of a container are read into / written from
+ * one contiguous buffer of size NumberOfEntities*Dimension (entity-major),
+ * which is the layout used by CouplingInterfaceData.GetData/SetData.
+ * The loops over the entities are parallelized, no temporary containers are created.
+*/
+class KRATOS_API(CO_SIMULATION_APPLICATION) CouplingInterfaceDataUtilities
+{
+public:
+    ///@name Type Definitions
+    ///@{
+
+    /// Pointer definition of CouplingInterfaceDataUtilities
+    KRATOS_CLASS_POINTER_DEFINITION(CouplingInterfaceDataUtilities);
+
+    ///@}
+    ///@name Life Cycle
+    ///@{
+
+    /// Default constructor.
+    CouplingInterfaceDataUtilities() = delete;
+
+    /// Assignment operator.
+    CouplingInterfaceDataUtilities& operator=(CouplingInterfaceDataUtilities const& rOther) = delete;
+
+    /// Copy constructor.
+    CouplingInterfaceDataUtilities(CouplingInterfaceDataUtilities const& rOther) = delete;
+
+    ///@}
+    ///@name Operations
+    ///@{
+
+    /**
+     * @brief Copies the historical nodal values of a variable into a contiguous buffer.
+     *
+     * @tparam TDataType The type of the variable (double or array_1d<double, 3>).
+     * @param rNodes The nodes whose values are read.
+     * @param rVariable The variable to be read.
+     * @param SolutionStepIndex The index of the solution step (0 is the current step).
+     * @param Dimension The number of components to be read per node (1 for scalars).
+     * @param pData The buffer, of size rNodes.size()*Dimension.
+     */
+    template<class TDataType>
+    static void GetSolutionStepValues(
+        const ModelPart::NodesContainerType& rNodes,
+        const Variable<TDataType>& rVariable,
+        const std::size_t SolutionStepIndex,
+        const std::size_t Dimension,
+        double* pData);
+
+    /**
+     * @brief Copies a contiguous buffer into the historical nodal values of a variable.
+     *
+     * Components of array_1d variables beyond Dimension are set to zero.
+     *
+     * @tparam TDataType The type of the variable (double or array_1d<double, 3>).
+     * @param rNodes The nodes whose values are set.
+     * @param rVariable The variable to be set.
+     * @param SolutionStepIndex The index of the solution step (0 is the current step).
+     * @param Dimension The number of components to be set per node (1 for scalars).
+     * @param pData The buffer, of size rNodes.size()*Dimension.
+     */
+    template<class TDataType>
+    static void SetSolutionStepValues(
+        ModelPart::NodesContainerType& rNodes,
+        const Variable<TDataType>& rVariable,
+        const std::size_t SolutionStepIndex,
+        const std::size_t Dimension,
+        const double* pData);
+
+    /**
+     * @brief Copies the non-historical values of a variable into a contiguous buffer.
+     *
+     * @tparam TContainerType The container type (nodes, elements or conditions).
+     * @tparam TDataType The type of the variable (double or array_1d<double, 3>).
+     * @param rContainer The entities whose values are read.
+     * @param rVariable The variable to be read.
+     * @param Dimension The number of components to be read per entity (1 for scalars).
+     * @param pData The buffer, of size rContainer.size()*Dimension.
+     */
+    template<class TContainerType, class TDataType>
+    static void GetValues(
+        const TContainerType& rContainer,
+        const Variable<TDataType>& rVariable,
+        const std::size_t Dimension,
+        double* pData);
+
+    /**
+     * @brief Copies a contiguous buffer into the non-historical values of a variable.
+     *
+     * Components of array_1d variables beyond Dimension are set to zero.
+     *
+     * @tparam TContainerType The container type (nodes, elements or conditions).
+     * @tparam TDataType The type of the variable (double or array_1d<double, 3>).
+     * @param rContainer The entities whose values are set.
+     * @param rVariable The variable to be set.
+     * @param Dimension The number of components to be set per entity (1 for scalars).
+     * @param pData The buffer, of size rContainer.size()*Dimension.
+     */
+    template<class TContainerType, class TDataType>
+    static void SetValues(
+        TContainerType& rContainer,
+        const Variable<TDataType>& rVariable,
+        const std::size_t Dimension,
+        const double* pData);
+
+    /**
+     * @brief Copies the current coordinates of the nodes into a contiguous buffer.
+     *
+     * @param rNodes The nodes whose coordinates are read.
+     * @param pData The buffer, of size rNodes.size()*3 (x, y, z per node).
+     */
+    static void GetNodalCoordinates(
+        const ModelPart::NodesContainerType& rNodes,
+        double* pData);
+
+    ///@}
+
+}; // Class CouplingInterfaceDataUtilities
+
+///@}
+
+///@} addtogroup block
+
+}  // namespace Kratos.
+
+#endif // KRATOS_COSIM_COUPLING_INTERFACE_DATA_UTILITIES_H_INCLUDED defined
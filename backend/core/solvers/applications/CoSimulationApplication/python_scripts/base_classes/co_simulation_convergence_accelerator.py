@@ -4,6 +4,7 @@ import KratosMultiphysics as KM
 # CoSimulation imports
 import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
 import KratosMultiphysics.CoSimulationApplication.colors as colors
+from KratosMultiphysics.CoSimulationApplication.utilities.distributed_vector_utilities import GlobalReduction
 
 class CoSimulationConvergenceAccelerator:
     """Baseclass for the convergence acceleratos used for CoSimulation
@@ -17,6 +18,7 @@ class CoSimulationConvergenceAccelerator:
         self.settings.RecursivelyValidateAndAssignDefaults(self._GetDefaultParameters())
 
         self.echo_level = self.settings["echo_level"].GetInt()
+        self.__global_reductions = {}
 
     def Initialize(self):
         pass
@@ -54,6 +56,21 @@ class CoSimulationConvergenceAccelerator:
     def SupportsDistributedData(cls):
         return False
 
+    def SetDataCommunicator(self, data_communicator, data_name=None):
+        '''Sets the DataCommunicator across which the interface data is distributed
+        This is only called for convergence accelerators that support distributed data,
+        the data_name is used by the block convergence accelerators that work on several interface data
+        '''
+        self.__global_reductions[data_name] = GlobalReduction(data_communicator)
+
+    def _GetGlobalReduction(self, data_name=None):
+        '''Returns the GlobalReduction for computing the reduced quantities (e.g. dot products) of distributed data
+        Without a DataCommunicator the data is local and so are the reductions
+        '''
+        if data_name not in self.__global_reductions:
+            self.__global_reductions[data_name] = GlobalReduction()
+        return self.__global_reductions[data_name]
+
     @classmethod
     def _ClassName(cls):
         return cls.__name__
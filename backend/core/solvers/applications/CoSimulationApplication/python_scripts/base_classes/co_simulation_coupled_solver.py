@@ -10,6 +10,7 @@ import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tool
 import KratosMultiphysics.CoSimulationApplication.factories.helpers as factories_helper
 import KratosMultiphysics.CoSimulationApplication.colors as colors
 from KratosMultiphysics.CoSimulationApplication.coupling_interface_data import BaseCouplingInterfaceData
+import KratosMultiphysics.CoSimulationApplication.utilities.timing_utilities as timing_utilities
 
 # Other imports
 from collections import OrderedDict
@@ -86,6 +87,8 @@ class CoSimulationCoupledSolver(CoSimulationSolverWrapper):
         self.process_info[KM.IS_RESTARTED] = False
 
         self.solver_wrappers = self.__CreateSolverWrappers(models)
+        for solver_name, solver in self.solver_wrappers.items():
+            timing_utilities.InstrumentMethods(solver, "solver", solver_name, timing_utilities.SOLVER_METHODS_TO_TIME)
 
         # overwriting the Model created in the BaseClass
         # CoupledSolvers only forward calls to its solvers
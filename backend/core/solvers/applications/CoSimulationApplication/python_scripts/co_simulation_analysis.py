@@ -6,6 +6,7 @@ from KratosMultiphysics.analysis_stage import AnalysisStage
 import KratosMultiphysics.CoSimulationApplication.factories.solver_wrapper_factory as solver_wrapper_factory
 import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
 import KratosMultiphysics.CoSimulationApplication.colors as colors
+from KratosMultiphysics.CoSimulationApplication.utilities import timing_utilities
 
 # Other imports
 import sys
@@ -27,7 +28,8 @@ class CoSimulationAnalysis(AnalysisStage):
         problem_data_defaults = KM.Parameters("""{
             "problem_name" : "default_co_simulation",
             "print_colors" : false,
-            "echo_level"   : 1
+            "echo_level"   : 1,
+            "timing"       : {}
         }""")
 
         problem_data = cosim_settings["problem_data"]
@@ -54,8 +56,17 @@ class CoSimulationAnalysis(AnalysisStage):
             # flush by default only in OpenMP, can decrease performance in MPI
             self.flush_stdout = (self.parallel_type == "OpenMP")
 
+        # the timer has to be active before the solver is created, as the components are instrumented when they are created
+        self.timer = timing_utilities.CoSimulationTimer(problem_data["timing"], problem_data["problem_name"].GetString())
+        if self.timer.IsEnabled():
+            timing_utilities.SetActiveTimer(self.timer)
+
         self._GetSolver() # this creates the solver
 
+        # the exclusive time of the top-level coupled solver is the overhead of the coupling not attributed to any component
+        category = "coupled_solver" if hasattr(self._GetSolver(), "solver_wrappers") else "solver"
+        timing_utilities.InstrumentMethods(self._GetSolver(), category, self._GetSolver().name, timing_utilities.SOLVER_METHODS_TO_TIME)
+
     def Initialize(self):
         self._GetSolver().Initialize()
         self._GetSolver().Check()
@@ -74,10 +85,17 @@ class CoSimulationAnalysis(AnalysisStage):
     def Finalize(self):
         self._GetSolver().Finalize()
 
+        if self.timer.IsEnabled():
+            self.timer.Finalize()
+            timing_utilities.SetActiveTimer(None)
+
     def InitializeSolutionStep(self):
         self.step += 1
         cs_tools.cs_print_info(colors.bold("\ntime={0:.12g}".format(self.time)+ " | step="+ str(self.step)))
 
+        if self.timer.IsEnabled():
+            self.timer.SetTimeStep(self.step, self.time)
+
         self._GetSolver().InitializeSolutionStep()
 
     def FinalizeSolutionStep(self):
@@ -57,8 +57,8 @@ class AitkenConvergenceAccelerator(CoSimulationConvergenceAccelerator):
 
         else:
             r_diff = self.R[0] - self.R[1]
-            numerator = np.inner( self.R[1], r_diff )
-            denominator = np.inner( r_diff, r_diff )
+            ## Both inner products are reduced together in case of distributed data
+            numerator, denominator = self._GetGlobalReduction().Sum( [np.inner( self.R[1], r_diff ), np.inner( r_diff, r_diff )] )
             alpha = -self.alpha_old * numerator/denominator
             if self.echo_level > 3:
                 cs_tools.cs_print_info(self._ClassName(), ": Doing relaxation with factor = {}".format(alpha))
@@ -74,6 +74,10 @@ class AitkenConvergenceAccelerator(CoSimulationConvergenceAccelerator):
             self.alpha_old = alpha
             return delta_x
 
+    @classmethod
+    def SupportsDistributedData(cls):
+        return True
+
     @classmethod
     def _GetDefaultParameters(cls):
         this_defaults = KM.Parameters("""{
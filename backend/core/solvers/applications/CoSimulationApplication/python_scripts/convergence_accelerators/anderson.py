@@ -10,10 +10,10 @@ from KratosMultiphysics.CoSimulationApplication.base_classes.co_simulation_conve
 
 # CoSimulation imports
 import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
+from KratosMultiphysics.CoSimulationApplication.utilities.qr_utilities import LeastSquaresSolve
 
 # Other imports
 import numpy as np
-from copy import deepcopy
 from collections import deque
 
 def Create(settings):
@@ -50,9 +50,8 @@ class AndersonConvergenceAccelerator(CoSimulationConvergenceAccelerator):
 
     def UpdateSolution(self, r, x):
 
-        self.V.appendleft( deepcopy(r) )
-        self.W.appendleft( deepcopy(x) )
-        row = len(r)
+        self.V.appendleft( np.array(r, copy=True) )
+        self.W.appendleft( np.array(x, copy=True) )
         col = len( self.V ) - 1
         k = col
         if k == 0:
@@ -61,30 +60,25 @@ class AndersonConvergenceAccelerator(CoSimulationConvergenceAccelerator):
                 cs_tools.cs_print_info(self._ClassName(), ": Doing relaxation in the first iteration with factor = {}".format(self.alpha))
             return self.alpha * r
         else:
-            self.F = np.empty( shape = (col, row) ) # will be transposed later
-            self.X = np.empty( shape = (col, row) ) # will be transposed later
-            for i in range(0, col):
-                self.F[i] = self.V[i] - self.V[i + 1]
-                self.X[i] = self.W[i] - self.W[i + 1]
-            self.F = self.F.T
-            self.X = self.X.T
-
-            #compute Moore-Penrose inverse of F^T F
-            A = np.linalg.pinv(self.F.T @ self.F)
+            V = np.array( self.V )
+            W = np.array( self.W )
+            self.F = ( V[:-1] - V[1:] ).T
+            self.X = ( W[:-1] - W[1:] ).T
 
             switch = (self.iteration_counter + 1)/self.p
 
             if switch.is_integer():
-                B = self.beta * np.identity(row) - (self.X + self.beta * self.F) @ A @ self.F.T
+                ## B r = beta r - (X + beta F) pinv(F^T F) F^T r, with pinv(F^T F) F^T r = pinv(F) r
+                ## the matrix B is not assembled, only its product with r is computed
+                gamma = LeastSquaresSolve(self.F, r, self._GetGlobalReduction())
+                delta_x = self.beta * r - (self.X + self.beta * self.F) @ gamma
                 if self.echo_level > 3:
                     cs_tools.cs_print_info(self._ClassName(), "Compute B with Anderson")
             else:
-                B = self.alpha * np.identity(row)
+                delta_x = self.alpha * r
                 if self.echo_level > 3:
                     cs_tools.cs_print_info(self._ClassName(), "Constant underrelaxtion")
 
-            delta_x = B @ r
-
             self.iteration_counter += 1
 
             return delta_x
@@ -93,6 +87,10 @@ class AndersonConvergenceAccelerator(CoSimulationConvergenceAccelerator):
         self.V.clear()
         self.W.clear()
 
+    @classmethod
+    def SupportsDistributedData(cls):
+        return True
+
     @classmethod
     def _GetDefaultParameters(cls):
         this_defaults = KM.Parameters("""{
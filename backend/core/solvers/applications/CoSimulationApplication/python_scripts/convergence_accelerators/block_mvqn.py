@@ -11,10 +11,10 @@ from KratosMultiphysics.CoSimulationApplication.base_classes.co_simulation_conve
 
 # CoSimulation imports
 import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
+from KratosMultiphysics.CoSimulationApplication.utilities.low_rank_utilities import LowRankJacobian, SolveIdentityMinusProduct
 
 # Other imports
 import numpy as np
-from copy import deepcopy
 from collections import deque
 
 
@@ -25,28 +25,30 @@ def Create(settings):
 ## Class BLOCKMVQNConvergenceAccelerator.
 # This class contains the implementation of the Block MVQN method and helper functions.
 # Reference: A.E.J. Bogaers et al. "Quasi-Newton methods for implicit black-box FSI coupling", Computational methods in applied mechanics and engineering. 279(2014) 113-132.
+# The Jacobians are stored as their low-rank updates and applied matrix-free, the block system
+# (I - J_x J_y) delta_x = b is solved with the Woodbury identity (see LowRankJacobian)
 class BLOCKMVQNConvergenceAccelerator(CoSimulationConvergenceAccelerator):
     ## The constructor.
     # @param horizon Maximum number of vectors to be stored in each time step.
     # @param alpha Relaxation factor for computing the update, when no vectors available.
+    # @param timestep_horizon Number of time steps whose updates are kept in the Jacobians (all if negative).
     def __init__( self, settings):
         super().__init__(settings)
 
         horizon = self.settings["horizon"].GetInt()
         self.alpha = self.settings["alpha"].GetDouble()
         self.epsilon = self.settings["epsilon"].GetDouble()
+        self.timestep_horizon = self.settings["timestep_horizon"].GetInt()
 
         self.X_tilde = {}
         self.X = {}
         self.J = {}
-        self.J_hat = {}
         self.coupl_data_names = {}
 
         for solver_data in settings["solver_sequence"].values():
             self.X_tilde[solver_data["data_name"].GetString()] = deque( maxlen = horizon )
             self.X[solver_data["data_name"].GetString()] = deque( maxlen = horizon )
             self.J[solver_data["data_name"].GetString()] = None # size will be determined when first time get the input vector
-            self.J_hat[solver_data["data_name"].GetString()] = None
             self.coupl_data_names[solver_data["data_name"].GetString()] = solver_data["coupled_data_name"].GetString()
 
     ## UpdateSolution(r, x, y, data_name, yResidual)
@@ -59,8 +61,8 @@ class BLOCKMVQNConvergenceAccelerator(CoSimulationConvergenceAccelerator):
     def UpdateSolution( self, r, x, y, data_name, yResidual,):
 
         coupled_data_name = self.coupl_data_names[data_name]
-        self.X_tilde[data_name].appendleft( deepcopy(r + x) )
-        self.X[coupled_data_name].appendleft( deepcopy(y) )
+        self.X_tilde[data_name].appendleft( r + x )
+        self.X[coupled_data_name].appendleft( np.array(y, copy=True) )
 
         col = len(self.X[coupled_data_name]) - 1
         row = len(r)
@@ -73,41 +75,34 @@ class BLOCKMVQNConvergenceAccelerator(CoSimulationConvergenceAccelerator):
         if k == 0:
             if self.J[data_name] is None or self.J[coupled_data_name] is None:
                 ## Zero initial Jacobians
-                self.J_hat[data_name] = np.zeros( (row, rowY) )
-                self.J_hat[coupled_data_name] = np.zeros( (rowY, row) )
-                self.J[coupled_data_name] = np.zeros( (rowY, row) )
-                self.J[data_name] = np.zeros( (row, rowY) )
+                self.J[data_name] = LowRankJacobian( row, rowY, timestep_horizon = self.timestep_horizon, reduction = self._GetGlobalReduction(coupled_data_name), row_reduction = self._GetGlobalReduction(data_name) )
+                self.J[coupled_data_name] = LowRankJacobian( rowY, row, timestep_horizon = self.timestep_horizon, reduction = self._GetGlobalReduction(data_name), row_reduction = self._GetGlobalReduction(coupled_data_name) )
                 return self.alpha * r # Initial acceleration to be a constant relaxation
             else:
-
-                blockJacobian = (np.eye(row) - self.J[data_name] @ self.J[coupled_data_name])
-                b = r - self.J[data_name] @ yResidual
-                return np.linalg.solve( blockJacobian, b )
+                b = r - self.J[data_name].Dot( yResidual )
+                return SolveIdentityMinusProduct( self.J[data_name], self.J[coupled_data_name], b, include_current=False )
 
         ## Construct matrix W(differences of intermediate solutions y)
-        W = np.empty( shape = (col, rowY) ) # will be transposed later
-        for i in range(0, col):
-            W[i] = self.X[coupled_data_name][i] - self.X[coupled_data_name][i + 1]
-        W = W.T
+        Y = np.array( self.X[coupled_data_name] )
+        W = ( Y[:-1] - Y[1:] ).T
 
-        ## Construct matrix W(differences of intermediate solutions x~)
-        V = np.empty( shape = (col, row) ) # will be transposed later
-        for i in range(0, col):
-            V[i] = self.X_tilde[data_name][i] - self.X_tilde[data_name][i + 1]
-        V = V.T
+        ## Construct matrix V(differences of intermediate solutions x~)
+        X_tilde = np.array( self.X_tilde[data_name] )
+        V = ( X_tilde[:-1] - X_tilde[1:] ).T
 
-        self.J_hat[data_name] = self.J[data_name] + (V - self.J[data_name] @ W) @ (np.linalg.pinv(W, rcond=self.epsilon))
+        ## J_hat = J + (V - J W) pinv(W)
+        self.J[data_name].ComputeUpdate( V, W, self.epsilon )
 
-        blockJacobian = (np.eye(row) - self.J_hat[data_name] @ self.J_hat[coupled_data_name])
-        b = r - self.J_hat[data_name] @ yResidual
+        b = r - self.J[data_name].Dot( yResidual, include_current=True )
 
-        return np.linalg.solve( blockJacobian, b )
+        return SolveIdentityMinusProduct( self.J[data_name], self.J[coupled_data_name], b )
 
     def FinalizeSolutionStep( self ):
 
         ## Assign J=J_hat
         for data_name in self.J:
-            self.J[data_name] = self.J_hat[data_name].copy()
+            if self.J[data_name] is not None:
+                self.J[data_name].Commit()
 
             ## Clear the buffer
             self.X_tilde[data_name].clear()
@@ -116,13 +111,18 @@ class BLOCKMVQNConvergenceAccelerator(CoSimulationConvergenceAccelerator):
         if self.echo_level > 3:
             cs_tools.cs_print_info(self._ClassName(), "Jacobian matrix updated!")
 
+    @classmethod
+    def SupportsDistributedData(cls):
+        return True
+
     @classmethod
     def _GetDefaultParameters(cls):
         this_defaults = KM.Parameters("""{
-            "horizon" : 15,
-            "alpha"   : 1.0,
-            "epsilon" : 1e-9,
-            "solver_sequence" : []
+            "horizon"          : 15,
+            "alpha"            : 1.0,
+            "epsilon"          : 1e-9,
+            "timestep_horizon" : -1,
+            "solver_sequence"  : []
         }""")
         this_defaults.AddMissingParameters(super()._GetDefaultParameters())
         return this_defaults
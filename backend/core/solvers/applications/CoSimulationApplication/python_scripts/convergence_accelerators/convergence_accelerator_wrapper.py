@@ -14,6 +14,8 @@ class ConvergenceAcceleratorWrapper:
     => this class stores the residual and updates the solutions, such that the
     convergence accelerator can be configured through json
     In case of distributed data, it is checked whether the convergence accelerator supports it.
+    If yes, the accelerator is executed on all ranks with the local part of the data and the DataCommunicator
+    of the data, such that only reduced quantities are communicated.
     If not, the data is gathered / scattered and the accelerator is executed on only one rank
     """
     def __init__(self,
@@ -35,6 +37,8 @@ class ConvergenceAcceleratorWrapper:
             conv_acc_supports_dist_data = self.conv_acc.SupportsDistributedData()
             self.executing_rank = conv_acc_supports_dist_data or (self.interface_data.GetModelPart().GetCommunicator().MyPID() == 0)
             self.gather_scatter_required = self.interface_data.IsDistributed() and not conv_acc_supports_dist_data
+            if conv_acc_supports_dist_data:
+                self.conv_acc.SetDataCommunicator(self.interface_data.GetModelPart().GetCommunicator().GetDataCommunicator())
             if self.gather_scatter_required:
                 self.data_comm = self.interface_data.GetModelPart().GetCommunicator().GetDataCommunicator()
                 self.sizes_from_ranks = np.cumsum(self.data_comm.GatherInts([self.interface_data.Size()], 0))
@@ -124,6 +128,8 @@ class BlockConvergenceAcceleratorWrapper:
                 conv_acc_supports_dist_data = self.conv_acc.SupportsDistributedData()
                 self.executing_rank[data_name] = conv_acc_supports_dist_data or (self.interface_data_dict[data_name].GetModelPart().GetCommunicator().MyPID() == 0)
                 self.gather_scatter_required[data_name] = self.interface_data_dict[data_name].IsDistributed() and not conv_acc_supports_dist_data
+                if conv_acc_supports_dist_data:
+                    self.conv_acc.SetDataCommunicator(self.interface_data_dict[data_name].GetModelPart().GetCommunicator().GetDataCommunicator(), data_name)
                 if self.gather_scatter_required[data_name]:
                     self.data_comm[data_name] = self.interface_data_dict[data_name].GetModelPart().GetCommunicator().GetDataCommunicator()
                     self.sizes_from_ranks[data_name] = np.cumsum(self.data_comm[data_name].GatherInts([self.interface_data_dict[data_name].Size()], 0))
@@ -225,7 +231,7 @@ class DataDifferenceBlockResidual(ConvergenceAcceleratorResidual):
         self.is_block_residual_computer = True
 
     def ComputeResidual(self, input_data, data_name=None):
-        return self.interface_data_dict[data_name].GetData() - input_data
+        return self.interface_data_dict[data_name].GetDataView() - input_data
 
 class DataDifferenceResidual(ConvergenceAcceleratorResidual):
     def __init__(self,
@@ -235,7 +241,7 @@ class DataDifferenceResidual(ConvergenceAcceleratorResidual):
         self.interface_data = interface_data_dict[settings["data_name"].GetString()]
 
     def ComputeResidual(self, input_data, data_name=None):
-        return self.interface_data.GetData() - input_data
+        return self.interface_data.GetDataView() - input_data
 
 class DifferentDataDifferenceResidual(ConvergenceAcceleratorResidual):
     def __init__(self,
@@ -246,7 +252,7 @@ class DifferentDataDifferenceResidual(ConvergenceAcceleratorResidual):
         self.interface_data2 = interface_data_dict[settings["residual_computation"]["data_name2"].GetString()]
 
     def ComputeResidual(self, input_data):
-        return self.interface_data1.GetData() - self.interface_data2.GetData()
+        return self.interface_data1.GetDataView() - self.interface_data2.GetDataView()
 
 def CreateBlockResidualComputation(settings: KratosMultiphysics.Parameters,
                                 interface_data_dict: "dict[str,CouplingInterfaceData]"):
@@ -12,11 +12,10 @@ from KratosMultiphysics.CoSimulationApplication.base_classes.co_simulation_conve
 # CoSimulation imports
 from KratosMultiphysics.CoSimulationApplication.co_simulation_tools import cs_print_info, cs_print_warning, SettingsTypeCheck
 import KratosMultiphysics.CoSimulationApplication.colors as colors
+from KratosMultiphysics.CoSimulationApplication.utilities.qr_utilities import IncrementalQR
 
 # Other imports
 import numpy as np
-from copy import deepcopy
-from collections import deque
 
 def Create(settings):
     SettingsTypeCheck(settings)
@@ -25,145 +24,134 @@ def Create(settings):
 ## Class IQNILSConvergenceAccelerator.
 # This class contains the implementation of the IQN-ILS method and helper functions.
 # Reference: Joris Degroote, PhD thesis "Development of algorithms for the partitioned simulation of strongly coupled fluid-structure interaction problems", 84-91.
+# The QR factorization of V is updated by column insertion/deletion as iterates arrive and leave the horizons,
+# instead of assembling V and W and solving the least-squares problem from scratch in every iteration.
+# Reference for the QR-filtering: Haelterman et al., "Improving the performance of the partitioned QN-ILS procedure for fluid-structure interaction problems: Filtering", Computers & Structures 171 (2016), 9-17.
 class IQNILSConvergenceAccelerator(CoSimulationConvergenceAccelerator):
     ## The constructor.
     # @param iteration_horizon Maximum number of vectors to be stored in each time step.
     # @param timestep_horizon Maximum number of time steps of which the vectors are used.
     # @param alpha Relaxation factor for computing the update, when no vectors available.
+    # @param qr_filter_threshold Columns of V with |R_ii| <= qr_filter_threshold * ||v_i|| are removed.
     def __init__( self, settings):
         super().__init__(settings)
 
-        iteration_horizon = self.settings["iteration_horizon"].GetInt()
+        self.iteration_horizon = self.settings["iteration_horizon"].GetInt()
         timestep_horizon = self.settings["timestep_horizon"].GetInt()
         self.alpha = self.settings["alpha"].GetDouble()
+        # a threshold of zero would keep exactly dependent columns, which makes R singular
+        self.qr_filter_threshold = max(self.settings["qr_filter_threshold"].GetDouble(), 1e3*np.finfo(float).eps)
 
-        self.R = deque( maxlen = iteration_horizon )
-        self.X = deque( maxlen = iteration_horizon )
         self.q = timestep_horizon - 1
-        self.v_old_matrices = deque( maxlen = self.q )
-        self.w_old_matrices = deque( maxlen = self.q )
-        self.V_new = []
-        self.W_new = []
-        self.V_old = []
-        self.W_old = []
+        self.qr = None # QR factorization of V (differences of residuals), newest column first
+        self.W = None  # differences of predictions, columns ordered as in V
+        self.column_ages = np.empty(0, dtype=int) # number of time steps since the column was added
+        self.r_previous = None
+        self.x_tilde_previous = None
 
     ## UpdateSolution(r, x)
     # @param r residual r_k
     # @param x solution x_k
     # Computes the approximated update in each iteration.
     def UpdateSolution( self, r, x ):
-        self.R.appendleft( deepcopy(r) )
-        self.X.appendleft(    x + r    )  # r = x~ - x
-        row = len(r)
-        col = len( self.R ) - 1
-        k = col
-        num_old_matrices = len( self.v_old_matrices )
-
-        if len(self.V_old) == 0 and len(self.W_old) == 0: # No previous vectors to reuse
-            if k == 0:
-                ## For the first iteration in the first time step, do relaxation only
-                if self.echo_level > 3:
-                    cs_print_info(self._ClassName(), "Doing relaxation in the first iteration with factor = ", "{0:.1g}".format(self.alpha))
-                return self.alpha * r
-            else:
-                if self.echo_level > 3:
-                    cs_print_info(self._ClassName(), "Doing multi-vector extrapolation")
-                    cs_print_info(self._ClassName(), "Number of new modes: ", col)
-                self.V_new = np.empty( shape = (col, row) ) # will be transposed later
-                for i in range(0, col):
-                    self.V_new[i] = self.R[i] - self.R[i + 1]
-                self.V_new = self.V_new.T
-                V = self.V_new
-
-                ## Check the dimension of the newly constructed matrix
-                if ( V.shape[0] < V.shape[1] ) and self.echo_level > 0:
-                    cs_print_warning(self._ClassName(), ": "+ colors.red("WARNING: column number larger than row number!"))
-
-                ## Construct matrix W(differences of predictions)
-                self.W_new = np.empty( shape = (col, row) ) # will be transposed later
-                for i in range(0, col):
-                    self.W_new[i] = self.X[i] - self.X[i + 1]
-                self.W_new = self.W_new.T
-                W = self.W_new
-
-                ## Solve least-squares problem
-                delta_r = -self.R[0]
-                c = np.linalg.lstsq(V, delta_r)[0]
-
-                ## Compute the update
-                delta_x = np.dot(W, c) - delta_r
-
-                return delta_x
-        else:  # previous vectors can be reused
-            if k == 0: # first iteration
-                if self.echo_level > 3:
-                    cs_print_info(self._ClassName(), "Using matrices from previous time steps")
-                    cs_print_info(self._ClassName(), "Number of previous matrices: ", num_old_matrices)
-                V = self.V_old
-                W = self.W_old
-                ## Solve least-squares problem
-                delta_r = -self.R[0]
-                c = np.linalg.lstsq(V, delta_r)[0]
-
-                ## Compute the update
-                delta_x = np.dot(W, c) - delta_r
-                return delta_x
-            else:
-                ## For other iterations, construct new V and W matrices and combine them with old ones
-                if self.echo_level > 3:
-                    cs_print_info(self._ClassName(), "Doing multi-vector extrapolation")
-                    cs_print_info(self._ClassName(), "Number of new modes: ", col)
-                    cs_print_info(self._ClassName(), "Number of previous matrices: ", num_old_matrices)
-                ## Construct matrix V (differences of residuals)
-                self.V_new = np.empty( shape = (col, row) ) # will be transposed later
-                for i in range(0, col):
-                    self.V_new[i] = self.R[i] - self.R[i + 1]
-                self.V_new = self.V_new.T
-                V = np.hstack( (self.V_new, self.V_old) )
-                ## Check the dimension of the newly constructed matrix
-                if ( V.shape[0] < V.shape[1] ) and self.echo_level > 0:
-                    cs_print_warning(self._ClassName(), ": "+ colors.red("WARNING: column number larger than row number!"))
-
-                ## Construct matrix W(differences of predictions)
-                self.W_new = np.empty( shape = (col, row) ) # will be transposed later
-                for i in range(0, col):
-                    self.W_new[i] = self.X[i] - self.X[i + 1]
-                self.W_new = self.W_new.T
-                W = np.hstack( (self.W_new, self.W_old) )
-
-                ## Solve least-squares problem
-                delta_r = -self.R[0]
-                c = np.linalg.lstsq(V, delta_r)[0]
-
-                ## Compute the update
-                delta_x = np.dot(W, c) - delta_r
-
-                return delta_x
+        x_tilde = x + r # r = x~ - x
+
+        if self.qr is None or self.__SizeChanged(len(r)):
+            self.__ResetVectors(len(r))
+
+        if self.r_previous is not None and self.iteration_horizon > 1:
+            self.__InsertColumn(r - self.r_previous, x_tilde - self.x_tilde_previous)
+
+        self.r_previous = np.array(r, copy=True)
+        self.x_tilde_previous = x_tilde
+
+        if self.qr.NumberOfColumns() == 0:
+            ## For the first iteration in the first time step, do relaxation only
+            if self.echo_level > 3:
+                cs_print_info(self._ClassName(), "Doing relaxation in the first iteration with factor = ", "{0:.1g}".format(self.alpha))
+            return self.alpha * r
+
+        if self.echo_level > 3:
+            num_new_columns = np.count_nonzero(self.column_ages == 0)
+            cs_print_info(self._ClassName(), "Doing multi-vector extrapolation")
+            cs_print_info(self._ClassName(), "Number of new modes: ", num_new_columns)
+            cs_print_info(self._ClassName(), "Number of modes from previous time steps: ", self.qr.NumberOfColumns() - num_new_columns)
+
+        ## Solve least-squares problem
+        delta_r = -r
+        c = self.qr.Solve(delta_r)
+
+        ## Compute the update
+        delta_x = self.W @ c - delta_r
+
+        return delta_x
 
     ## FinalizeSolutionStep()
     # Finalizes the current time step and initializes the next time step.
     def FinalizeSolutionStep( self ):
-        if len(self.V_new) != 0 and len(self.W_new) != 0:
-            self.v_old_matrices.appendleft( self.V_new )
-            self.w_old_matrices.appendleft( self.W_new )
-        if self.v_old_matrices and self.w_old_matrices:
-            self.V_old = np.concatenate( self.v_old_matrices, 1 )
-            self.W_old = np.concatenate( self.w_old_matrices, 1 )
-        ## Clear the buffer
-        if self.R and self.X:
-            if self.echo_level > 3:
-                cs_print_info(self._ClassName(), "Cleaning")
-            self.R.clear()
-            self.X.clear()
-        self.V_new = []
-        self.W_new = []
+        if self.qr is not None:
+            ## Remove the columns of time steps that are beyond the time step horizon (the oldest ones are the last ones)
+            self.column_ages += 1
+            while self.qr.NumberOfColumns() > 0 and self.column_ages[-1] > self.q:
+                self.__DeleteColumn(self.qr.NumberOfColumns()-1)
+
+        if self.echo_level > 3 and self.r_previous is not None:
+            cs_print_info(self._ClassName(), "Cleaning")
+        self.r_previous = None
+        self.x_tilde_previous = None
+
+    def __InsertColumn(self, v, w):
+        ## Only "iteration_horizon-1" differences of the current time step are used
+        num_new_columns = np.count_nonzero(self.column_ages == 0)
+        if num_new_columns >= self.iteration_horizon - 1:
+            self.__DeleteColumn(num_new_columns-1)
+
+        if self.qr.NumberOfColumns() >= self.qr.global_size:
+            if self.echo_level > 0:
+                cs_print_warning(self._ClassName(), ": "+ colors.red("WARNING: column number larger than row number, removing the oldest column!"))
+            self.__DeleteColumn(self.qr.NumberOfColumns()-1)
+
+        self.qr.InsertColumn(v)
+        self.W = np.column_stack((w, self.W))
+        self.column_ages = np.insert(self.column_ages, 0, 0)
+
+        ## Remove (nearly) linearly dependent columns
+        kept_columns = self.qr.Filter(self.qr_filter_threshold)
+        if not kept_columns.all():
+            if self.echo_level > 2:
+                cs_print_info(self._ClassName(), "QR-filtering removed {} column(s)".format(np.count_nonzero(~kept_columns)))
+            self.W = self.W[:, kept_columns]
+            self.column_ages = self.column_ages[kept_columns]
+
+    def __DeleteColumn(self, index):
+        self.qr.DeleteColumn(index)
+        self.W = np.delete(self.W, index, axis=1)
+        self.column_ages = np.delete(self.column_ages, index)
+
+    def __SizeChanged(self, size):
+        ## In case of distributed data all ranks have to reset the vectors, also if only the local size of some of them changed
+        return self._GetGlobalReduction().Sum(int(self.qr.size != size)) > 0
+
+    def __ResetVectors(self, size):
+        if self.qr is not None and self.echo_level > 0:
+            cs_print_warning(self._ClassName(), "The size of the interface changed, the stored vectors are discarded")
+        self.qr = IncrementalQR(size, self._GetGlobalReduction())
+        self.W = np.empty((size, 0))
+        self.column_ages = np.empty(0, dtype=int)
+        self.r_previous = None
+        self.x_tilde_previous = None
+
+    @classmethod
+    def SupportsDistributedData(cls):
+        return True
 
     @classmethod
     def _GetDefaultParameters(cls):
         this_defaults = KM.Parameters("""{
-            "iteration_horizon" : 20,
-            "timestep_horizon"  : 1,
-            "alpha"             : 0.125
+            "iteration_horizon"   : 20,
+            "timestep_horizon"    : 1,
+            "alpha"               : 0.125,
+            "qr_filter_threshold" : 1e-10
         }""")
         this_defaults.AddMissingParameters(super()._GetDefaultParameters())
         return this_defaults
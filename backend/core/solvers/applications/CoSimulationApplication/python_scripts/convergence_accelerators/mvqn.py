@@ -11,10 +11,10 @@ from KratosMultiphysics.CoSimulationApplication.base_classes.co_simulation_conve
 
 # CoSimulation imports
 import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
+from KratosMultiphysics.CoSimulationApplication.utilities.low_rank_utilities import LowRankJacobian
 
 # Other imports
 import numpy as np
-from copy import deepcopy
 from collections import deque
 import typing
 
@@ -25,28 +25,31 @@ def Create(settings):
 ## Class MVQNConvergenceAccelerator.
 # This class contains the implementation of the MVQN method and helper functions.
 # Reference: A.E.J. Bogaers et al. "Quasi-Newton methods for implicit black-box FSI coupling", Computational methods in applied mechanics and engineering. 279(2014) 113-132.
+# The Jacobian is not stored as a dense matrix, but as the initial (constant relaxation) Jacobian plus the
+# low-rank updates of the time steps, which are applied matrix-free (see LowRankJacobian)
 class MVQNConvergenceAccelerator(CoSimulationConvergenceAccelerator):
     ## The constructor.
     # @param horizon Maximum number of vectors to be stored in each time step.
     # @param alpha Relaxation factor for computing the update, when no vectors available.
+    # @param timestep_horizon Number of time steps whose updates are kept in the Jacobian (all if negative).
     def __init__( self, settings):
         super().__init__(settings)
 
         horizon = self.settings["horizon"].GetInt()
         self.alpha = self.settings["alpha"].GetDouble()
+        self.timestep_horizon = self.settings["timestep_horizon"].GetInt()
 
         self.R = deque( maxlen = horizon )
         self.X = deque( maxlen = horizon )
-        self.J: typing.Optional[np.ndarray] = None # size will be determined when first time get the input vector
-        self.J_hat: typing.Optional[np.ndarray] = None
+        self.J: typing.Optional[LowRankJacobian] = None # size will be determined when first time get the input vector
 
     ## UpdateSolution(r, x)
     # @param r residual r_k
     # @param x solution x_k
     # Computes the approximated update in each iteration.
     def UpdateSolution( self, r, x ):
-        self.R.appendleft( deepcopy(r) )
-        self.X.appendleft( deepcopy(x) )
+        self.R.appendleft( np.array(r, copy=True) )
+        self.X.appendleft( np.array(x, copy=True) )
         col = len(self.R) - 1
         row = len(r)
         k = col
@@ -58,32 +61,22 @@ class MVQNConvergenceAccelerator(CoSimulationConvergenceAccelerator):
             if self.J is None:
                 return self.alpha * r  # if no Jacobian, do relaxation
             else:
-                return np.linalg.solve( self.J, -r ) # use the Jacobian from previous step
+                return self.J.Solve( -r, include_current=False ) # use the Jacobian from previous step
 
         ## Let the initial Jacobian correspond to a constant relaxation
         if self.J is None:
-            self.J = - np.identity( row ) / self.alpha # correspongding to constant relaxation
-
-        ## Construct matrix V (differences of residuals)
-        V = np.empty( shape = (col, row) ) # will be transposed later
-        for i in range(0, col):
-            V[i] = self.R[i] - self.R[i + 1]
-        V = V.T
-
-        ## Construct matrix W(differences of intermediate solutions x)
-        W = np.empty( shape = (col, row) ) # will be transposed later
-        for i in range(0, col):
-            W[i] = self.X[i] - self.X[i + 1]
-        W = W.T
-
-        ## Solve least norm problem
-        rhs = V - np.dot(self.J, W)
-        b = np.identity( row )
-        W_right_inverse = np.linalg.lstsq(W, b, rcond=-1)[0]
-        J_tilde = np.dot(rhs, W_right_inverse)
-        self.J_hat = self.J + J_tilde
+            self.J = LowRankJacobian( row, row, diagonal = -1.0 / self.alpha, timestep_horizon = self.timestep_horizon, reduction = self._GetGlobalReduction() )
+
+        ## Construct matrices V (differences of residuals) and W (differences of intermediate solutions x)
+        R = np.array( self.R )
+        X = np.array( self.X )
+        V = ( R[:-1] - R[1:] ).T
+        W = ( X[:-1] - X[1:] ).T
+
+        ## Solve least norm problem, J_hat = J + (V - J W) pinv(W)
+        self.J.ComputeUpdate( V, W, np.finfo(float).eps )
         delta_r = -self.R[0]
-        delta_x = np.linalg.solve(self.J_hat, delta_r)
+        delta_x = self.J.Solve( delta_r )
 
         return delta_x
 
@@ -93,22 +86,25 @@ class MVQNConvergenceAccelerator(CoSimulationConvergenceAccelerator):
         if self.J is None:
             return
 
-        row = self.J.shape[0]
-        col = self.J.shape[1]
         ## Assign J=J_hat
-        self.J[:row,:col] = self.J_hat[:row,:col]
+        self.J.Commit()
         if self.echo_level > 3:
-            cs_tools.cs_print_info(self._ClassName(), "Jacobian matrix updated!")
+            cs_tools.cs_print_info(self._ClassName(), "Jacobian matrix updated! Rank of the update: ", self.J.Rank())
         ## Clear the buffer
         if self.R and self.X:
             self.R.clear()
             self.X.clear()
 
+    @classmethod
+    def SupportsDistributedData(cls):
+        return True
+
     @classmethod
     def _GetDefaultParameters(cls):
         this_defaults = KM.Parameters("""{
-            "horizon" : 15,
-            "alpha"   : 0.125
+            "horizon"          : 15,
+            "alpha"            : 0.125,
+            "timestep_horizon" : -1
         }""")
         this_defaults.AddMissingParameters(super()._GetDefaultParameters())
         return this_defaults
@@ -62,7 +62,7 @@ class ConvergenceCriteriaWrapper:
 
     def IsConverged(self):
         if self.interface_data.IsDefinedOnThisRank():
-            current_data = self.interface_data.GetData()
+            current_data = self.interface_data.GetDataView()
             residual = current_data - self.input_data
 
             if self.interface_data.IsDistributed():
@@ -8,6 +8,7 @@ from KratosMultiphysics.CoSimulationApplication.coupled_solvers.gauss_seidel_str
 # CoSimulation imports
 import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
 import KratosMultiphysics.CoSimulationApplication.colors as colors
+import KratosMultiphysics.CoSimulationApplication.utilities.timing_utilities as timing_utilities
 
 def Create(settings, models, solver_name):
     return BlockStrongCoupledSolver(settings, models, solver_name)
@@ -20,6 +21,8 @@ class BlockStrongCoupledSolver(GaussSeidelStrongCoupledSolver):
             if self.echo_level > 0:
                 cs_tools.cs_print_info(self._ClassName(), colors.cyan("Coupling iteration:"), colors.bold(str(k+1)+" / " + str(self.num_coupling_iterations)))
 
+            timing_utilities.SetCouplingIteration(k+1)
+
             for coupling_op in self.coupling_operations_dict.values():
                 coupling_op.InitializeCouplingIteration()
 
@@ -9,6 +9,7 @@ from KratosMultiphysics.CoSimulationApplication.base_classes.co_simulation_coupl
 import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
 import KratosMultiphysics.CoSimulationApplication.factories.helpers as factories_helper
 import KratosMultiphysics.CoSimulationApplication.colors as colors
+import KratosMultiphysics.CoSimulationApplication.utilities.timing_utilities as timing_utilities
 
 def Create(settings, models, solver_name):
     return GaussSeidelStrongCoupledSolver(settings, models, solver_name)
@@ -77,6 +78,8 @@ class GaussSeidelStrongCoupledSolver(CoSimulationCoupledSolver):
             if self.echo_level > 0:
                 cs_tools.cs_print_info(self._ClassName(), colors.cyan("Coupling iteration:"), colors.bold(str(k+1)+" / " + str(self.num_coupling_iterations)))
 
+            timing_utilities.SetCouplingIteration(k+1)
+
             for coupling_op in self.coupling_operations_dict.values():
                 coupling_op.InitializeCouplingIteration()
 
@@ -8,6 +8,8 @@ from KratosMultiphysics.CoSimulationApplication.base_classes.co_simulation_coupl
 import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
 import KratosMultiphysics.CoSimulationApplication.factories.helpers as factories_helper
 import KratosMultiphysics.CoSimulationApplication.colors as colors
+import KratosMultiphysics.CoSimulationApplication.utilities.timing_utilities as timing_utilities
+from KratosMultiphysics.CoSimulationApplication.utilities.solver_execution_utilities import SolverExecutor
 
 def Create(settings, models, solver_name):
     return JacobiStrongCoupledSolver(settings, models, solver_name)
@@ -18,6 +20,9 @@ class JacobiStrongCoupledSolver(CoSimulationCoupledSolver):
 
         self.num_coupling_iterations = self.settings["num_coupling_iterations"].GetInt()
 
+        # the solvers do not depend on each other within a coupling iteration, hence they can be solved concurrently
+        self.solver_executor = SolverExecutor(self.solver_wrappers, self.settings["concurrent_solvers"].GetBool(), self._ClassName())
+
     def Initialize(self):
         super().Initialize()
 
@@ -42,6 +47,10 @@ class JacobiStrongCoupledSolver(CoSimulationCoupledSolver):
     def Finalize(self):
         super().Finalize()
 
+        if self.echo_level > 0:
+            self.solver_executor.PrintTiming()
+        self.solver_executor.Finalize()
+
         for conv_acc in self.convergence_accelerators_list:
             conv_acc.Finalize()
 
@@ -72,6 +81,8 @@ class JacobiStrongCoupledSolver(CoSimulationCoupledSolver):
             if self.echo_level > 0:
                 cs_tools.cs_print_info(self._ClassName(), colors.cyan("Coupling iteration:"), colors.bold(str(k+1)+" / " + str(self.num_coupling_iterations)))
 
+            timing_utilities.SetCouplingIteration(k+1)
+
             for coupling_op in self.coupling_operations_dict.values():
                 coupling_op.InitializeCouplingIteration()
 
@@ -84,8 +95,9 @@ class JacobiStrongCoupledSolver(CoSimulationCoupledSolver):
             for solver_name, solver in self.solver_wrappers.items():
                 self._SynchronizeInputData(solver_name)
 
-            for solver_name, solver in self.solver_wrappers.items():
-                solver.SolveSolutionStep()
+            solver_times = self.solver_executor.SolveSolutionStep()
+            if self.echo_level > 1:
+                self.solver_executor.PrintTiming(solver_times)
 
             for solver_name, solver in self.solver_wrappers.items():
                 self._SynchronizeOutputData(solver_name)
@@ -140,7 +152,8 @@ class JacobiStrongCoupledSolver(CoSimulationCoupledSolver):
         this_defaults = KM.Parameters("""{
             "convergence_accelerators" : [],
             "convergence_criteria"     : [],
-            "num_coupling_iterations"  : 10
+            "num_coupling_iterations"  : 10,
+            "concurrent_solvers"       : false
         }""")
         this_defaults.AddMissingParameters(super()._GetDefaultParameters())
 
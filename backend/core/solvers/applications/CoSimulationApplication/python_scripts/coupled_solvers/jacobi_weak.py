@@ -1,10 +1,29 @@
+# Importing the Kratos Library
+import KratosMultiphysics as KM
+
 # Importing the base class
 from KratosMultiphysics.CoSimulationApplication.base_classes.co_simulation_coupled_solver import CoSimulationCoupledSolver
 
+# CoSimulation imports
+from KratosMultiphysics.CoSimulationApplication.utilities.solver_execution_utilities import SolverExecutor
+
 def Create(settings, models, solver_name):
     return JacobiWeakCoupledSolver(settings, models, solver_name)
 
 class JacobiWeakCoupledSolver(CoSimulationCoupledSolver):
+    def __init__(self, settings, models, solver_name):
+        super().__init__(settings, models, solver_name)
+
+        # the solvers do not depend on each other within a coupling iteration, hence they can be solved concurrently
+        self.solver_executor = SolverExecutor(self.solver_wrappers, self.settings["concurrent_solvers"].GetBool(), self._ClassName())
+
+    def Finalize(self):
+        super().Finalize()
+
+        if self.echo_level > 0:
+            self.solver_executor.PrintTiming()
+        self.solver_executor.Finalize()
+
     def SolveSolutionStep(self):
         for coupling_op in self.coupling_operations_dict.values():
             coupling_op.InitializeCouplingIteration()
@@ -12,8 +31,9 @@ class JacobiWeakCoupledSolver(CoSimulationCoupledSolver):
         for solver_name, solver in self.solver_wrappers.items():
             self._SynchronizeInputData(solver_name)
 
-        for solver_name, solver in self.solver_wrappers.items():
-            solver.SolveSolutionStep()
+        solver_times = self.solver_executor.SolveSolutionStep()
+        if self.echo_level > 1:
+            self.solver_executor.PrintTiming(solver_times)
 
         for solver_name, solver in self.solver_wrappers.items():
             self._SynchronizeOutputData(solver_name)
@@ -22,3 +42,12 @@ class JacobiWeakCoupledSolver(CoSimulationCoupledSolver):
             coupling_op.FinalizeCouplingIteration()
 
         return True
+
+    @classmethod
+    def _GetDefaultParameters(cls):
+        this_defaults = KM.Parameters("""{
+            "concurrent_solvers" : false
+        }""")
+        this_defaults.AddMissingParameters(super()._GetDefaultParameters())
+
+        return this_defaults
@@ -2,6 +2,7 @@
 import KratosMultiphysics as KM
 
 # CoSimulation imports
+import KratosMultiphysics.CoSimulationApplication as KratosCoSim
 import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
 
 # Other imports
@@ -107,6 +108,12 @@ class CouplingInterfaceData(BaseCouplingInterfaceData):
         if self.location == "node_historical" and not self.model_part.HasNodalSolutionStepVariable(self.variable):
             self._RaiseException('"{}" is missing as SolutionStepVariable in ModelPart "{}"'.format(self.variable.Name(), self.model_part_name))
 
+        # data of type double on entities is copied in bulk (in C++) from/to one contiguous array
+        # the other types (bool, int) and the data on the ModelPart itself are accessed entity by entity
+        self.__use_bulk_access = self.dtype == np.double and self.location != "model_part"
+        # buffers reused by "GetDataView", one per solution_step_index
+        self.__buffers = {}
+
     def __str__(self):
         self_str =  'CouplingInterfaceData:\n'
         self_str += '\tName: "{}"\n'.format(self.name)
@@ -159,8 +166,14 @@ class CouplingInterfaceData(BaseCouplingInterfaceData):
             return {}
 
     def GetData(self, solution_step_index=0) -> "np.ndarray[typing.Union[bool,np.intc,np.uintc,np.double]]":
+        """Returns a new array with the data, which the caller owns"""
         self.__CheckBufferSize(solution_step_index)
 
+        if self.__use_bulk_access:
+            data = np.empty(self.Size(), dtype=self.dtype)
+            self.__GetDataInBuffer(data, solution_step_index)
+            return data
+
         if self.location == "node_historical":
             data = self.__GetDataFromContainer(self.__GetDataContainer(), GetSolutionStepValue, solution_step_index)
         elif self.location in ["node_non_historical", "element", "condition"]:
@@ -174,6 +187,28 @@ class CouplingInterfaceData(BaseCouplingInterfaceData):
 
         return np.asarray(data, dtype=self.dtype)
 
+    def GetDataView(self, solution_step_index=0) -> "np.ndarray[typing.Union[bool,np.intc,np.uintc,np.double]]":
+        """Returns the data in a read-only array that is owned by this object
+        The array is allocated once and refilled by every call with the same solution_step_index,
+        hence it is only valid until the next call and must not be stored by the caller.
+        Use "GetData" to obtain data that is kept (e.g. the input of an iteration)
+        """
+        self.__CheckBufferSize(solution_step_index)
+
+        if not self.__use_bulk_access:
+            return self.GetData(solution_step_index)
+
+        size = self.Size()
+        buffer = self.__buffers.get(solution_step_index)
+        if buffer is None or buffer.size != size: # the interface can change e.g. after remeshing
+            buffer = np.empty(size, dtype=self.dtype)
+            self.__buffers[solution_step_index] = buffer
+
+        buffer.flags.writeable = True
+        self.__GetDataInBuffer(buffer, solution_step_index)
+        buffer.flags.writeable = False
+        return buffer
+
     def SetData(self, new_data, solution_step_index=0):
         self.__CheckBufferSize(solution_step_index)
 
@@ -181,7 +216,10 @@ class CouplingInterfaceData(BaseCouplingInterfaceData):
         if len(new_data) != self.Size():
             self._RaiseException("The sizes of the data are not matching, got: {}, expected: {}".format(len(new_data), self.Size()))
 
-        if self.location == "node_historical":
+        if self.__use_bulk_access:
+            # no copy is made if the data is already a contiguous array of doubles
+            self.__SetDataFromBuffer(np.ascontiguousarray(new_data, dtype=self.dtype), solution_step_index)
+        elif self.location == "node_historical":
             self.__SetDataOnContainer(self.__GetDataContainer(), SetSolutionStepValue, new_data, solution_step_index)
         elif self.location in ["node_non_historical", "element", "condition"]:
             self.__SetDataOnContainer(self.__GetDataContainer(), SetValue, new_data)
@@ -201,6 +239,18 @@ class CouplingInterfaceData(BaseCouplingInterfaceData):
         elif self.location in "node_non_historical":
             self.GetModelPart().GetCommunicator().SynchronizeNonHistoricalVariable(self.variable)
 
+    def __GetDataInBuffer(self, buffer, solution_step_index):
+        if self.location == "node_historical":
+            KratosCoSim.CouplingInterfaceDataUtilities.GetSolutionStepValues(self.__GetDataContainer(), self.variable, solution_step_index, self.dimension, buffer)
+        else:
+            KratosCoSim.CouplingInterfaceDataUtilities.GetValues(self.__GetDataContainer(), self.variable, self.dimension, buffer)
+
+    def __SetDataFromBuffer(self, buffer, solution_step_index):
+        if self.location == "node_historical":
+            KratosCoSim.CouplingInterfaceDataUtilities.SetSolutionStepValues(self.__GetDataContainer(), self.variable, solution_step_index, self.dimension, buffer)
+        else:
+            KratosCoSim.CouplingInterfaceDataUtilities.SetValues(self.__GetDataContainer(), self.variable, self.dimension, buffer)
+
     def __GetDataFromContainer(self, container, fct_ptr, *args):
         if self.is_scalar_variable:
             return [fct_ptr(entity, self.variable, *args) for entity in container]
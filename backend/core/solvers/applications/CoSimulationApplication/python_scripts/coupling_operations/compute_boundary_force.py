@@ -1,5 +1,6 @@
 # Importing the Kratos Library
 import KratosMultiphysics as KM
+import KratosMultiphysics.CoSimulationApplication as KratosCoSim
 
 # Importing the base class
 from KratosMultiphysics.CoSimulationApplication.base_classes.co_simulation_coupling_operation import CoSimulationCouplingOperation
@@ -10,14 +11,19 @@ from KratosMultiphysics.time_based_ascii_file_writer_utility import TimeBasedAsc
 # CoSimulation imports
 import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
 
+# Other imports
+import numpy as np
+
 def Create(*args):
     return ComputeBoundaryForce(*args)
 
 class ComputeBoundaryForce(CoSimulationCouplingOperation):
     """This operation is used to compute forces in a boundary, based on the pressure.
+    For boundaries consisting of 2-noded lines (2D) or 3-noded triangles (3D) the forces are
+    assembled with numpy from the connectivities, coordinates and pressures of all elements at once,
+    other geometries are computed element by element.
     TODO:
     - add messages with different echo-levels
-    - add tests
     - more cleanup
     """
     def __init__(self, settings, solver_wrappers, process_info, data_communicator):
@@ -37,6 +43,11 @@ class ComputeBoundaryForce(CoSimulationCouplingOperation):
 
         self.interval = KM.IntervalUtility(settings)
 
+        ## the connectivities only change if the mesh changes (e.g. remeshing), hence they are computed once
+        self.connectivities = None
+        self.num_nodes = -1
+        self.num_elements = -1
+
         if(self.model_part.GetCommunicator().MyPID() == 0):
             if(self.write_output_file):
                 output_file_name = self.model_part_name + "_global_force.dat"
@@ -77,6 +88,91 @@ class ComputeBoundaryForce(CoSimulationCouplingOperation):
                     self.output_file.write(' '.join(output_values) + '\n')
 
     def _EvaluateGlobalForces(self):
+        self.__UpdateConnectivities()
+
+        if self.connectivities is None:
+            results = self._EvaluateGlobalForcesPerElement()
+        else:
+            results = self.__EvaluateGlobalForcesVectorized()
+
+        if self.echo_level > 1:
+            info_msg = "Computed boundary forces for model part \"" + self.model_part_name  + "\" in solver: \"" + self.settings["solver"].GetString() + "\""
+            cs_tools.cs_print_info(self._ClassName(), info_msg)
+
+        return results
+
+    def __EvaluateGlobalForcesVectorized(self):
+        nodes = self.model_part.Nodes
+        connectivities = self.connectivities
+        num_nodes_per_element = connectivities.shape[1]
+
+        coordinates = np.empty(3*self.num_nodes)
+        KratosCoSim.CouplingInterfaceDataUtilities.GetNodalCoordinates(nodes, coordinates)
+        coordinates = coordinates.reshape(-1, 3)
+        nodal_pressure = np.empty(self.num_nodes)
+        KratosCoSim.CouplingInterfaceDataUtilities.GetSolutionStepValues(nodes, KM.PRESSURE, 0, 1, nodal_pressure)
+
+        ## area and unit normal of every element, same as Geometry.Area and Geometry.UnitNormal
+        tangent = coordinates[connectivities[:,1]] - coordinates[connectivities[:,0]]
+        if num_nodes_per_element == 2:
+            normal = np.zeros_like(tangent)
+            normal[:,0] = tangent[:,1]
+            normal[:,1] = -tangent[:,0]
+            area = np.linalg.norm(tangent, axis=1)
+            unit_normal = normal / area[:,np.newaxis]
+        else:
+            normal = np.cross(tangent, coordinates[connectivities[:,2]] - coordinates[connectivities[:,0]])
+            norm_normal = np.linalg.norm(normal, axis=1)
+            area = 0.5 * norm_normal
+            unit_normal = normal / norm_normal[:,np.newaxis]
+
+        ## with one integration point the shape functions are 1/num_nodes for all nodes
+        shape_function_value = 1.0 / num_nodes_per_element
+        element_nodal_pressure = nodal_pressure[connectivities]
+        element_pressure = shape_function_value * element_nodal_pressure.sum(axis=1)
+
+        ## scatter-add of the nodal contributions of all elements, then written to the nodes at once
+        nodal_weights = -element_nodal_pressure * (area * shape_function_value * self.width)[:,np.newaxis]
+        reactions = np.empty((self.num_nodes, 3))
+        for i in range(3):
+            reactions[:,i] = np.bincount(connectivities.ravel(), weights=(nodal_weights * unit_normal[:,i,np.newaxis]).ravel(), minlength=self.num_nodes)
+        KratosCoSim.CouplingInterfaceDataUtilities.SetSolutionStepValues(nodes, KM.REACTION, 0, 3, reactions.ravel())
+
+        sum_forces = (unit_normal * (element_pressure * area * self.width)[:,np.newaxis]).sum(axis=0)
+
+        # vel_x, vel_y, vel_z
+        velocity = [0.0, 0.0, 0.0]
+        return velocity + sum_forces.tolist() + [float(element_pressure.sum())]
+
+    def __UpdateConnectivities(self):
+        num_nodes = self.model_part.NumberOfNodes()
+        num_elements = self.model_part.NumberOfElements()
+        if num_nodes == self.num_nodes and num_elements == self.num_elements:
+            return
+
+        self.num_nodes = num_nodes
+        self.num_elements = num_elements
+        self.connectivities = None
+
+        node_indices = {node.Id : index for index, node in enumerate(self.model_part.Nodes)}
+        connectivities = []
+        num_nodes_per_element = None
+        for element in self.model_part.Elements:
+            geometry = element.GetGeometry()
+            points_number = geometry.PointsNumber()
+            is_line = points_number == 2 and geometry.LocalSpaceDimension() == 1 and geometry.WorkingSpaceDimension() == 2
+            is_triangle = points_number == 3 and geometry.LocalSpaceDimension() == 2 and geometry.WorkingSpaceDimension() == 3
+            if not (is_line or is_triangle) or num_nodes_per_element not in (None, points_number):
+                return # not supported, computed per element
+            num_nodes_per_element = points_number
+            connectivities.append([node_indices[node.Id] for node in element.GetNodes()])
+
+        if num_nodes_per_element is None:
+            self.connectivities = np.empty((0, 2), dtype=int)
+        else:
+            self.connectivities = np.array(connectivities, dtype=int)
+
+    def _EvaluateGlobalForcesPerElement(self):
         # vel_x, vel_y, vel_z
         velocity = [0.0, 0.0, 0.0]
         sum_forces = [0.0, 0.0, 0.0]
@@ -113,10 +209,6 @@ class ComputeBoundaryForce(CoSimulationCouplingOperation):
 
             pressure_list[0] += pressure
 
-        if self.echo_level > 1:
-            info_msg = "Computed boundary forces for model part \"" + self.model_part_name  + "\" in solver: \"" + self.settings["solver"].GetString() + "\""
-            cs_tools.cs_print_info(self._ClassName(), info_msg)
-
         return velocity + sum_forces + pressure_list
 
     def _GetFileHeader(self):
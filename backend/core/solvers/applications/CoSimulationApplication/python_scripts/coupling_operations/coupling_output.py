@@ -4,23 +4,35 @@ import KratosMultiphysics as KM
 # Importing the base class
 from KratosMultiphysics.CoSimulationApplication.base_classes.co_simulation_coupling_operation import CoSimulationCouplingOperation
 
+# CoSimulation imports
+from KratosMultiphysics.CoSimulationApplication.utilities.time_series_utilities import TimeSeriesWriter
+
 def Create(*args):
     return CouplingOutput(*args)
 
 class CouplingOutput(CoSimulationCouplingOperation):
     """This operation is used to output at different points in the coupling.
+
+    Available output formats:
+    - "vtk": the ModelPart given in the "output_parameters" is written with the VtkOutput.
+             This is done synchronously, i.e. the coupling waits until the file is written.
+             Use "file_format" : "binary" in the "output_parameters" for smaller files.
+    - "time_series": the interface data given in "data_names" is copied and written in the background
+                     to a single time-series container (see utilities/time_series_utilities.py),
+                     which makes output in every coupling iteration affordable. Settings:
+                     "container"    : "binary" (raw float64 appended to one file + json index) or "json"
+                     "queue_size"   : max number of pending snapshots, the coupling waits if it is exceeded
+                     "asynchronous" : write in a background thread
+                     "file_name"    : default: "<solver>_<execution_point>_<rank>"
     TODO:
-    - add support for json, hdf5, gid
-    - add tests
+    - add support for gid
     - more cleanup
     """
     def __init__(self, settings, solver_wrappers, process_info, data_communicator):
         super().__init__(settings, process_info, data_communicator)
-        self.model = solver_wrappers[self.settings["solver"].GetString()].model
+        solver_name = self.settings["solver"].GetString()
         self.execution_point = self.settings["execution_point"].GetString()
-        model_part_name = self.settings["output_parameters"]["model_part_name"].GetString()
-        model_part = self.model[model_part_name]
-        self.base_output_file_name = "{}_{}_{}_{}_".format(self.settings["solver"].GetString(), model_part_name, self.execution_point, model_part.GetCommunicator().MyPID())
+        self.output_format = self.settings["output_format"].GetString()
 
         available_execution_points = [
             "initialize_solution_step",
@@ -35,34 +47,77 @@ class CouplingOutput(CoSimulationCouplingOperation):
             raise Exception(err_msg)
 
         self.step = 0 # this should come from self.process_info
+        self.coupling_iteration = 0
         # TODO check if restarted. If not delete the folder => check self.process_info
-        self.output = KM.VtkOutput(model_part, self.settings["output_parameters"]) # currently hardcoded to vtk
+
+        if self.output_format == "vtk":
+            self.model = solver_wrappers[solver_name].model
+            model_part_name = self.settings["output_parameters"]["model_part_name"].GetString()
+            model_part = self.model[model_part_name]
+            self.base_output_file_name = "{}_{}_{}_{}_".format(solver_name, model_part_name, self.execution_point, model_part.GetCommunicator().MyPID())
+            self.output = KM.VtkOutput(model_part, self.settings["output_parameters"])
+
+        elif self.output_format == "time_series":
+            output_parameters = self.settings["output_parameters"]
+            output_parameters.ValidateAndAssignDefaults(self._GetDefaultTimeSeriesParameters())
+
+            data_names = output_parameters["data_names"].GetStringArray()
+            if len(data_names) == 0:
+                raise Exception('No "data_names" specified for the "time_series" output of solver "{}"'.format(solver_name))
+            self.interface_data = {data_name : solver_wrappers[solver_name].GetInterfaceData(data_name) for data_name in data_names}
+
+            file_name = output_parameters["file_name"].GetString()
+            if file_name == "":
+                file_name = "{}_{}_{}".format(solver_name, self.execution_point, data_communicator.Rank())
+            elif data_communicator.IsDistributed():
+                file_name += "_{}".format(data_communicator.Rank())
+
+            self.writer = TimeSeriesWriter(
+                file_name,
+                output_parameters["container"].GetString(),
+                output_parameters["queue_size"].GetInt(),
+                output_parameters["asynchronous"].GetBool())
+
+        else:
+            raise Exception('Output format "{}" is not available, only the following options are available: vtk, time_series'.format(self.output_format))
+
+    def Finalize(self):
+        if self.output_format == "time_series":
+            self.writer.Close()
+            if self.echo_level > 0:
+                KM.Logger.PrintInfo(self._ClassName(), 'Wrote {} snapshots to "{}", the coupling had to wait for the writer {} times'.format(
+                    self.writer.num_snapshots, self.writer.file_name, self.writer.num_blocking_writes))
 
     def InitializeSolutionStep(self):
         self.step += 1
         self.coupling_iteration = 0
 
         if self.execution_point == "initialize_solution_step":
-            output_file_name = self.base_output_file_name + str(self.step)
-            self.output.PrintOutput(output_file_name)
+            self.__PrintOutput(str(self.step))
 
     def FinalizeSolutionStep(self):
         if self.execution_point == "finalize_solution_step":
-            output_file_name = self.base_output_file_name + str(self.step)
-            self.output.PrintOutput(output_file_name)
+            self.__PrintOutput(str(self.step))
 
     def InitializeCouplingIteration(self):
         self.coupling_iteration += 1
 
         if self.execution_point == "initialize_coupling_iteration":
-            output_file_name = self.base_output_file_name + "{}_{}".format(self.step, self.coupling_iteration)
-            self.output.PrintOutput(output_file_name)
+            self.__PrintOutput("{}_{}".format(self.step, self.coupling_iteration))
 
     def FinalizeCouplingIteration(self):
         if self.execution_point == "finalize_coupling_iteration":
-            output_file_name = self.base_output_file_name + "{}_{}".format(self.step, self.coupling_iteration)
-            self.output.PrintOutput(output_file_name)
+            self.__PrintOutput("{}_{}".format(self.step, self.coupling_iteration))
+
+    def __PrintOutput(self, file_name_suffix):
+        if self.output_format == "vtk":
+            self.output.PrintOutput(self.base_output_file_name + file_name_suffix)
+            return
 
+        ## GetData returns a copy, hence it can be handed over to the writer without copying it again
+        data = {data_name : interface_data.GetData() for data_name, interface_data in self.interface_data.items()}
+        time = next(iter(self.interface_data.values())).GetModelPart().ProcessInfo[KM.TIME]
+        self.writer.Write(data, self.step, self.coupling_iteration, time, copy=False)
 
     @classmethod
     def _GetDefaultParameters(cls):
@@ -74,3 +129,13 @@ class CouplingOutput(CoSimulationCouplingOperation):
         }""")
         this_defaults.AddMissingParameters(super()._GetDefaultParameters())
         return this_defaults
+
+    @classmethod
+    def _GetDefaultTimeSeriesParameters(cls):
+        return KM.Parameters("""{
+            "data_names"   : [],
+            "container"    : "binary",
+            "queue_size"   : 8,
+            "asynchronous" : true,
+            "file_name"    : ""
+        }""")
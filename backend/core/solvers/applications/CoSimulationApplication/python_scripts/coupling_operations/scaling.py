@@ -56,7 +56,7 @@ class ScalingOperation(CoSimulationCouplingOperation):
 
         if self.echo_level > 0:
             cs_tools.cs_print_info("ScalingOperation", "Scaling-Factor", current_scaling_factor)
-        self.interface_data.SetData(current_scaling_factor*self.interface_data.GetData()) # setting the scaled data
+        self.interface_data.SetData(current_scaling_factor*self.interface_data.GetDataView()) # setting the scaled data
 
     def Check(self):
         if isinstance(self.scaling_factor, str):
@@ -21,7 +21,7 @@ class CopyDataTransferOperator(CoSimulationDataTransferOperator):
         if "swap_sign" in transfer_options_list:
             from_solver_data_array *= (-1)
         if "add_values" in transfer_options.GetStringArray():
-            from_solver_data_array += to_solver_data.GetData()
+            from_solver_data_array += to_solver_data.GetDataView()
 
         to_solver_data.SetData(from_solver_data_array)
 
@@ -15,7 +15,7 @@ class SumDistributedToSingle(CoSimulationDataTransferOperator):
         if not from_solver_data.IsDefinedOnThisRank():
             return
 
-        data_array = from_solver_data.GetData()
+        data_array = from_solver_data.GetDataView()
 
         value = data_array.sum()
         value = from_solver_data.GetModelPart().GetCommunicator().GetDataCommunicator().Sum(value, 0)
@@ -35,7 +35,7 @@ class SumDistributedToSingle(CoSimulationDataTransferOperator):
         if "swap_sign" in transfer_options.GetStringArray():
             summed_data_array *= (-1)
         if "add_values" in transfer_options.GetStringArray():
-            summed_data_array += to_solver_data.GetData()
+            summed_data_array += to_solver_data.GetDataView()
 
         to_solver_data.SetData(summed_data_array)
 
@@ -12,7 +12,7 @@ class SumManyToMany(CoSimulationDataTransferOperator):
         if not from_solver_data.IsDefinedOnThisRank():
             return
 
-        data_values = from_solver_data.GetData()
+        data_values = from_solver_data.GetDataView()
         data_value = data_values.sum()        
 
         if from_solver_data.IsDistributed():
@@ -30,7 +30,7 @@ class SumManyToMany(CoSimulationDataTransferOperator):
         if "distribute_values" in transfer_options.GetStringArray():
             to_solver_values /= self.data_communicator.SumAll(to_solver_data.Size())
         if "add_values" in transfer_options.GetStringArray():
-            to_solver_values += to_solver_data.GetData()
+            to_solver_values += to_solver_data.GetDataView()
 
         to_solver_data.SetData(to_solver_values)
 
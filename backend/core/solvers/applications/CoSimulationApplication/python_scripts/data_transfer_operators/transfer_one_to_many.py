@@ -11,7 +11,7 @@ class TransferOneToMany(CoSimulationDataTransferOperator):
     def _ExecuteTransferData(self, from_solver_data, to_solver_data, transfer_options):
         data_value = 0.0
         if from_solver_data.IsDefinedOnThisRank():
-            data_values = from_solver_data.GetData()
+            data_values = from_solver_data.GetDataView()
             if data_values.size == 1: # this is the rank that actually contains the value
                 data_value = data_values[0]
 
@@ -29,7 +29,7 @@ class TransferOneToMany(CoSimulationDataTransferOperator):
         if "distribute_values" in transfer_options.GetStringArray():
             to_solver_values /= self.data_communicator.SumAll(to_solver_data.Size())
         if "add_values" in transfer_options.GetStringArray():
-            to_solver_values += to_solver_data.GetData()
+            to_solver_values += to_solver_data.GetDataView()
 
         to_solver_data.SetData(to_solver_values)
 
@@ -9,6 +9,7 @@ from KratosMultiphysics.CoSimulationApplication.convergence_criteria.convergence
 from KratosMultiphysics.CoSimulationApplication.factories.convergence_criterion_factory import CreateConvergenceCriterion
 from KratosMultiphysics.CoSimulationApplication.factories.predictor_factory import CreatePredictor
 from ..base_classes.co_simulation_solver_wrapper import CoSimulationSolverWrapper
+import KratosMultiphysics.CoSimulationApplication.utilities.timing_utilities as timing_utilities
 
 # STD Imports
 import collections
@@ -20,12 +21,25 @@ def AddEchoLevelToSettings(settings, echo_level):
     settings.AddMissingParameters(echo_level_params)
 
 
+def GetComponentName(settings):
+    """Name of a component for the timing, e.g. "mvqn(fluid.disp)" """
+    name = settings["type"].GetString()
+    if settings.Has("solver") and settings["solver"].IsString():
+        name += "({}".format(settings["solver"].GetString())
+        if settings.Has("data_name") and settings["data_name"].IsString():
+            name += ".{}".format(settings["data_name"].GetString())
+        name += ")"
+    return name
+
 def CreatePredictors(predictor_settings_list, solvers, parent_echo_level):
     predictors = []
     for predictor_settings in predictor_settings_list.values():
         solver = solvers[predictor_settings["solver"].GetString()]
         AddEchoLevelToSettings(predictor_settings, parent_echo_level)
-        predictors.append(CreatePredictor(predictor_settings, solver))
+        predictor = CreatePredictor(predictor_settings, solver)
+        timing_utilities.InstrumentMethods(predictor, "predictor", GetComponentName(predictor_settings),
+            ["Initialize", "InitializeSolutionStep", "Predict", "FinalizeSolutionStep", "Finalize"])
+        predictors.append(predictor)
     return predictors
 
 def CreateConvergenceAccelerators(convergence_accelerator_settings_list: KM.Parameters,
@@ -35,6 +49,7 @@ def CreateConvergenceAccelerators(convergence_accelerator_settings_list: KM.Para
     convergence_accelerators = []
     for conv_acc_settings in convergence_accelerator_settings_list.values():
         AddEchoLevelToSettings(conv_acc_settings, parent_echo_level)
+        component_name = GetComponentName(conv_acc_settings) # before the wrapper removes the solver and data names from the settings
         if conv_acc_settings["type"].GetString().startswith('block_'):
             interface_data_dict = {}
             for sequence_data in conv_acc_settings["solver_sequence"].values():
@@ -50,6 +65,8 @@ def CreateConvergenceAccelerators(convergence_accelerator_settings_list: KM.Para
             convergence_accelerators.append(ConvergenceAcceleratorWrapper(conv_acc_settings,
                                                                         interface_data_dict,
                                                                         parent_data_communicator))
+        timing_utilities.InstrumentMethods(convergence_accelerators[-1], "convergence_accelerator", component_name,
+            ["InitializeSolutionStep", "InitializeNonLinearIteration", "ComputeAndApplyUpdate", "FinalizeNonLinearIteration", "FinalizeSolutionStep"])
 
     return convergence_accelerators
 
@@ -60,6 +77,7 @@ def CreateConvergenceCriteria(convergence_criterion_settings_list: KM.Parameters
     convergence_criteria = []
     for conv_crit_settings in convergence_criterion_settings_list.values():
         AddEchoLevelToSettings(conv_crit_settings, parent_echo_level)
+        component_name = GetComponentName(conv_crit_settings)
         if conv_crit_settings.Has("use_wrapper") and not conv_crit_settings["use_wrapper"].GetBool():
             convergence_criteria.append(CreateConvergenceCriterion(conv_crit_settings, solvers))
         else:
@@ -68,6 +86,8 @@ def CreateConvergenceCriteria(convergence_criterion_settings_list: KM.Parameters
             convergence_criteria.append(ConvergenceCriteriaWrapper(conv_crit_settings,
                                                                    interface_data,
                                                                    parent_data_communicator))
+        timing_utilities.InstrumentMethods(convergence_criteria[-1], "convergence_criterion", component_name,
+            ["InitializeSolutionStep", "InitializeNonLinearIteration", "IsConverged", "FinalizeNonLinearIteration", "FinalizeSolutionStep"])
 
     return convergence_criteria
 
@@ -76,6 +96,8 @@ def CreateCouplingOperations(coupling_operations_settings_dict, solvers, parent_
     for coupling_operation_name, coupling_operation_settings in coupling_operations_settings_dict.items():
         AddEchoLevelToSettings(coupling_operation_settings, parent_echo_level)
         coupling_operations[coupling_operation_name] = CreateCouplingOperation(coupling_operation_settings, solvers, parent_coupled_solver_process_info, parent_data_communicator)
+        timing_utilities.InstrumentMethods(coupling_operations[coupling_operation_name], "coupling_operation", coupling_operation_name,
+            ["InitializeSolutionStep", "InitializeCouplingIteration", "Execute", "FinalizeCouplingIteration", "FinalizeSolutionStep"])
 
     return coupling_operations
 
@@ -84,5 +106,8 @@ def CreateDataTransferOperators(data_transfer_operators_settings_dict, parent_da
     for data_transfer_operators_name, data_transfer_operators_settings in data_transfer_operators_settings_dict.items():
         AddEchoLevelToSettings(data_transfer_operators_settings, parent_echo_level)
         data_transfer_operators[data_transfer_operators_name] = CreateDataTransferOperator(data_transfer_operators_settings, parent_data_communicator)
+        # the mapping is reported separately, as it usually is the most expensive data transfer
+        category = "mapper" if "mapping" in data_transfer_operators_settings["type"].GetString() else "data_transfer_operator"
+        timing_utilities.InstrumentMethods(data_transfer_operators[data_transfer_operators_name], category, data_transfer_operators_name, ["TransferData"])
 
     return data_transfer_operators
@@ -2,6 +2,8 @@
 
 from math import *
 
+import numpy as np
+
 # list of safe methods that can be used
 safe_methods_list = ['acos', 'asin', 'atan', 'atan2', 'ceil', 'cos',
              'cosh', 'degrees', 'e', 'exp', 'fabs', 'floor',
@@ -39,3 +41,31 @@ def GenericCallFunction(func_string, scope_vars=None, check=True):
                 raise Exception('Argument "{}" in function string "{}" was not recognized!\nOnly the following expressions can be used:\n\t{}'.format(func_arg, func_string, "\n\t".join(sorted(safe_dict.keys()))))
 
     return eval(func_string, {"__builtins__" : None}, safe_dict)
+
+# numpy versions of the safe methods, for evaluating a function for arrays of values at once
+safe_numpy_dict = {
+    'acos' : np.arccos, 'asin' : np.arcsin, 'atan' : np.arctan, 'atan2' : np.arctan2,
+    'ceil' : np.ceil, 'cos' : np.cos, 'cosh' : np.cosh, 'degrees' : np.degrees,
+    'e' : np.e, 'exp' : np.exp, 'fabs' : np.fabs, 'floor' : np.floor,
+    'fmod' : np.fmod, 'frexp' : np.frexp, 'hypot' : np.hypot, 'ldexp' : np.ldexp,
+    'log' : np.log, 'log10' : np.log10, 'modf' : np.modf, 'pi' : np.pi,
+    'pow' : np.power, 'radians' : np.radians, 'sin' : np.sin, 'sinh' : np.sinh,
+    'sqrt' : np.sqrt, 'tan' : np.tan, 'tanh' : np.tanh
+}
+
+def GenericCallVectorizedFunction(func_string, scope_vars=None, check=True):
+    """Same as GenericCallFunction, but the variables in scope_vars can be numpy arrays
+    The function is evaluated elementwise for all values at once
+    """
+    scope_dict = dict(safe_numpy_dict)
+    if scope_vars is not None:
+        scope_dict.update(scope_vars)
+
+    if check:
+        splitted_func_args = GetWordsFromString(func_string)
+
+        for func_arg in splitted_func_args:
+            if not func_arg == "" and not func_arg in scope_dict:
+                raise Exception('Argument "{}" in function string "{}" was not recognized!\nOnly the following expressions can be used:\n\t{}'.format(func_arg, func_string, "\n\t".join(sorted(scope_dict.keys()))))
+
+    return eval(func_string, {"__builtins__" : None}, scope_dict)
@@ -0,0 +1,97 @@
+# Importing the Kratos Library
+import KratosMultiphysics as KM
+
+# Importing the base class
+from KratosMultiphysics.CoSimulationApplication.base_classes.co_simulation_predictor import CoSimulationPredictor
+
+# Other imports
+import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
+import numpy as np
+
+def Create(settings, solver_wrapper):
+    cs_tools.SettingsTypeCheck(settings)
+    return LeastSquaresPredictor(settings, solver_wrapper)
+
+class LeastSquaresPredictor(CoSimulationPredictor):
+    """This predictor extrapolates the converged solutions of the last "number_of_steps" time steps
+    with a polynomial of order "order", which is fitted in the least-squares sense
+    (exactly if number_of_steps == order+1). A constant time step is assumed.
+    With order 1 and 2 steps it is the same as the linear predictor.
+
+    The converged solutions are stored by the predictor itself (in a ring buffer),
+    hence it can also be used for data that is not historical, e.g. of the SDoF solver.
+    In the first steps the order is reduced to the number of available solutions minus one.
+    """
+    def __init__(self, settings, solver_wrapper):
+        super().__init__(settings, solver_wrapper)
+        self.order = self.settings["order"].GetInt()
+        self.number_of_steps = self.settings["number_of_steps"].GetInt()
+
+        if self.order < 1:
+            raise Exception('"order" has to be at least 1, got {}'.format(self.order))
+        if self.number_of_steps < self.order+1:
+            raise Exception('"number_of_steps" has to be at least "order"+1 ({}), got {}'.format(self.order+1, self.number_of_steps))
+
+        self.history = None
+        self.num_stored_steps = 0
+        self.next_index = 0 # position in the ring buffer where the next solution is stored
+        self.weights = {} # extrapolation weights for the number of used steps
+
+    def Predict(self):
+        if not self.interface_data.IsDefinedOnThisRank(): return
+
+        if self.num_stored_steps < 2: # a constant prediction is the current value of the data
+            return
+
+        num_used_steps = min(self.num_stored_steps, self.number_of_steps)
+
+        ## the weights are arranged like the solutions in the ring buffer, entries of unused solutions are zero
+        ring_weights = np.zeros(self.number_of_steps)
+        ring_indices = (self.next_index - num_used_steps + np.arange(num_used_steps)) % self.number_of_steps
+        ring_weights[ring_indices] = self.__GetWeights(num_used_steps)
+
+        self._UpdateData(ring_weights @ self.history)
+
+    def FinalizeSolutionStep(self):
+        if not self.interface_data.IsDefinedOnThisRank(): return
+
+        current_data = self.interface_data.GetData()
+
+        if self.history is None or self.history.shape[1] != current_data.size:
+            # the size of the interface changed (or first step), the previous solutions cannot be used
+            self.history = np.zeros((self.number_of_steps, current_data.size))
+            self.num_stored_steps = 0
+            self.next_index = 0
+
+        self.history[self.next_index] = current_data
+        self.next_index = (self.next_index + 1) % self.number_of_steps
+        self.num_stored_steps = min(self.num_stored_steps + 1, self.number_of_steps)
+
+    def __GetWeights(self, num_used_steps):
+        """Returns w such that w @ [x_(n-m+1), ..., x_n] is the value of the fitted polynomial at the next step
+        The steps are located at s = -m+1, ..., 0, the prediction at s = 1
+        """
+        if num_used_steps not in self.weights:
+            order = min(self.order, num_used_steps-1)
+            steps = np.arange(-num_used_steps+1, 1, dtype=float)
+            vandermonde = np.vander(steps, order+1, increasing=True)
+            # value of the basis at s = 1, i.e. [1, 1, ..., 1]
+            self.weights[num_used_steps] = np.ones(order+1) @ np.linalg.pinv(vandermonde)
+
+            if self.echo_level > 2:
+                cs_tools.cs_print_info(self._ClassName(), "Extrapolating {} steps with order {}, weights: {}".format(num_used_steps, order, self.weights[num_used_steps]))
+
+        return self.weights[num_used_steps]
+
+    def _GetMinimumBufferSize(self):
+        # the previous solutions are stored in the predictor
+        return 1
+
+    @classmethod
+    def _GetDefaultParameters(cls):
+        this_defaults = KM.Parameters("""{
+            "order"           : 2,
+            "number_of_steps" : 4
+        }""")
+        this_defaults.AddMissingParameters(super()._GetDefaultParameters())
+        return this_defaults
@@ -1,10 +1,12 @@
 # CoSimulation imports
-from KratosMultiphysics.CoSimulationApplication.function_callback_utility import GenericCallFunction
+from KratosMultiphysics.CoSimulationApplication.function_callback_utility import GenericCallFunction, GenericCallVectorizedFunction
+from KratosMultiphysics.CoSimulationApplication.utilities.time_series_utilities import TimeSeriesWriter
 
 # Other imports
 import numpy as np
 import json
 import os
+import copy
 
 class SDoFSolver(object):
     """ This class implements an SDof solver, independent of Kratos
@@ -26,39 +28,7 @@ class SDoFSolver(object):
         else:
             raise Exception("The input has to be provided as a dict or a string")
 
-        default_settings = {
-                "system_parameters":{
-                    "mass"      : 100.0,
-                    "stiffness" : 4000.0,
-                    "damping"   : 0.0,
-                    "modulus_self_weight": 9.81
-                },
-                "time_integration_parameters":{
-                    "alpha_m"   : -0.3,
-                    "start_time": 0.0,
-                    "time_step" : 0.05,
-                },
-                "initial_values":{
-                    "displacement"  : 0.0,
-                    "velocity"      : 0.0,
-                    "acceleration"  : 0.0
-                },
-                "boundary_conditions":{
-                    "load_impulse" : 0.0,
-                    "omega_force"        : 0.0,
-                    "omega_root_point_displacement"        : 0.0,
-                    "excitation_function_force": "A * sin(omega * t)",
-                    "excitation_function_root_point_displacement": "A * sin(omega * t)",
-                    "amplitude_root_point_displacement": 0.0,
-                    "amplitude_force": 0.0
-                },
-                "solver_parameters": {
-                    "buffer_size"   : 2
-                },
-                "output_parameters":{
-                    "write_output_file": True,
-                    "file_name" : "sdof_solver/results_sdof.dat"
-                }}
+        default_settings = GetDefaultSettings()
 
         RecursivelyValidateAndAssignDefaults(default_settings, parameters)
 
@@ -249,6 +219,262 @@ class SDoFSolver(object):
         else:
             raise Exception("Identifier is unknown!")
 
+class SDoFEnsembleSolver(object):
+    """ This class advances an ensemble of independent SDof systems at once, e.g. for parameter studies
+    It uses the same settings and time integration as the SDoFSolver, but the following settings
+    can be given as lists with one value per system (scalars are used for all systems):
+    - system_parameters: mass, stiffness, damping, modulus_self_weight
+    - initial_values: displacement, velocity
+    - boundary_conditions: load_impulse, omega_force, omega_root_point_displacement, amplitude_force, amplitude_root_point_displacement
+    The time step and the excitation functions are the same for all systems. Each system gives the same results
+    as an SDoFSolver with its parameters, the values are numpy arrays with one entry per system.
+    The results of all systems are written in one snapshot per step to a time series (see utilities/time_series_utilities.py)
+    """
+    ensemble_parameters = {
+        "system_parameters"   : ["mass", "stiffness", "damping", "modulus_self_weight"],
+        "initial_values"      : ["displacement", "velocity"],
+        "boundary_conditions" : ["load_impulse", "omega_force", "omega_root_point_displacement", "amplitude_force", "amplitude_root_point_displacement"]
+    }
+
+    def __init__(self, input_name):
+
+        # mimicing two constructors
+        if isinstance(input_name, dict):
+            parameters = copy.deepcopy(input_name)
+
+        elif isinstance(input_name, str):
+            if not input_name.endswith(".json"):
+                input_name += ".json"
+
+            with open(input_name,'r') as ProjectParameters:
+                parameters = json.load(ProjectParameters)
+
+        else:
+            raise Exception("The input has to be provided as a dict or a string")
+
+        # the lists are replaced by a scalar such that the settings can be validated
+        ensemble_values = {}
+        for group, keys in self.ensemble_parameters.items():
+            for key in keys:
+                value = parameters.get(group, {}).get(key)
+                if isinstance(value, list):
+                    ensemble_values[key] = np.array(value, dtype=float)
+                    parameters[group][key] = 0.0
+
+        sizes = {values.size for values in ensemble_values.values()}
+        if len(sizes) > 1:
+            raise Exception("All parameters given as lists must have the same length, got: {}".format({key : values.size for key, values in ensemble_values.items()}))
+        self.number_of_systems = sizes.pop() if sizes else 1
+        if self.number_of_systems < 1:
+            raise Exception("The ensemble has to contain at least one system")
+
+        default_settings = GetDefaultSettings()
+        default_settings["output_parameters"]["file_name"] = "sdof_solver/results_sdof_ensemble"
+        default_settings["output_parameters"]["container"] = "binary"
+        default_settings["output_parameters"]["queue_size"] = 8
+
+        RecursivelyValidateAndAssignDefaults(default_settings, parameters)
+
+        def GetValues(group, key):
+            if key in ensemble_values:
+                return ensemble_values[key]
+            return np.full(self.number_of_systems, float(parameters[group][key]))
+
+        self.mass = GetValues("system_parameters", "mass")
+        self.stiffness = GetValues("system_parameters", "stiffness")
+        self.damping = GetValues("system_parameters", "damping")
+        self.modulus_self_weight = GetValues("system_parameters", "modulus_self_weight")
+
+        self.alpha_m = parameters["time_integration_parameters"]["alpha_m"]
+        self.delta_t = parameters["time_integration_parameters"]["time_step"]
+        self.start_time = parameters["time_integration_parameters"]["start_time"]
+
+        self.initial_displacement = GetValues("initial_values", "displacement")
+        self.initial_velocity = GetValues("initial_values", "velocity")
+
+        self.excitation_function_force = parameters["boundary_conditions"]["excitation_function_force"]
+        self.excitation_function_root_point_displacement = parameters["boundary_conditions"]["excitation_function_root_point_displacement"]
+        self.load_impulse = GetValues("boundary_conditions", "load_impulse")
+        self.omega_force = GetValues("boundary_conditions", "omega_force")
+        self.omega_root_point_displacement = GetValues("boundary_conditions", "omega_root_point_displacement")
+        self.amplitude_root_point_displacement = GetValues("boundary_conditions", "amplitude_root_point_displacement")
+        self.amplitude_force = GetValues("boundary_conditions", "amplitude_force")
+
+        #calculate initial acceleration
+        self.initial_acceleration = (self.load_impulse - self.stiffness * self.initial_displacement) / self.mass
+
+        self.beta = 0.25 * (1- self.alpha_m)**2
+        self.gamma =  0.50 - self.alpha_m
+
+        # the system of the SDoFSolver (LHS) is solved by eliminating displacement and velocity
+        self.effective_mass = self.stiffness * self.delta_t**2 * self.beta + self.damping * self.delta_t * self.gamma + (1-self.alpha_m) * self.mass
+
+        self.buffer_size = parameters["solver_parameters"]["buffer_size"]
+        self.output_file_name = parameters["output_parameters"]["file_name"]
+        self.write_output_file = parameters["output_parameters"]["write_output_file"]
+        self.output_container = parameters["output_parameters"]["container"]
+        self.output_queue_size = parameters["output_parameters"]["queue_size"]
+        self.writer = None
+
+    def Initialize(self):
+        #solution buffer, [displacement, velocity, acceleration] x buffer x systems
+        self.x = np.zeros((3, self.buffer_size, self.number_of_systems))
+        #values at the root point buffer
+        self.x_f = np.zeros((3, self.buffer_size, self.number_of_systems))
+
+        self.dx = np.array([self.initial_displacement,
+                            self.initial_velocity,
+                            self.initial_acceleration])
+        self.dx_f = np.zeros((3, self.number_of_systems))
+        self.time = self.start_time
+        self.step = 0
+
+        self.root_point_displacement = np.zeros(self.number_of_systems)
+
+        #apply external load as an initial impulse
+        self.load = self.load_impulse.copy()
+
+        if self.write_output_file:
+            self.writer = TimeSeriesWriter(self.output_file_name, self.output_container, self.output_queue_size)
+            self.OutputSolutionStep()
+
+    def Finalize(self):
+        if self.writer is not None:
+            self.writer.Close()
+            self.writer = None
+
+    def OutputSolutionStep(self):
+        if self.writer is not None:
+            self.writer.Write(self.GetResults(), self.step, 0, self.time)
+
+    def GetResults(self):
+        """Returns the current results of all systems, same quantities as in the output of the SDoFSolver"""
+        return {
+            "displacement"            : self.dx[0],
+            "velocity"                : self.dx[1],
+            "acceleration"            : self.dx[2],
+            "root_point_displacement" : self.dx_f[0],
+            "root_point_velocity"     : self.dx_f[1],
+            "root_point_acceleration" : self.dx_f[2],
+            "reaction"                : self.CalculateReaction()
+        }
+
+    def AdvanceInTime(self, current_time):
+        self.x = np.roll(self.x,1,axis=1)
+        self.x_f = np.roll(self.x_f,1,axis=1)
+        self.x[:,0] = self.dx
+        self.x_f[:,0] = self.dx_f
+
+        self.time = current_time + self.delta_t
+        self.step += 1
+        return self.time
+
+    def CalculateEquivalentForceFromRootPointExcitation(self, d_f):
+        v_f = self.x_f[1,0] + self.delta_t * (self.gamma * d_f + (1-self.gamma) * self.x_f[2,0])
+        a_f = 1/(self.delta_t**2 * self.beta) * (d_f - self.x_f[0,1])\
+            - 1/(self.delta_t * self.beta) * self.x_f[1,0]\
+            + (1-1/(2*self.beta)) * self.x_f[2,0]
+        self.dx_f = np.array([d_f, v_f, a_f])
+        return d_f * self.stiffness + v_f * self.damping
+
+    def ApplyRootPointExcitation(self):
+        scope_vars = {'t' : self.time, 'omega': self.omega_root_point_displacement, 'A': self.amplitude_root_point_displacement}
+        return GenericCallVectorizedFunction(self.excitation_function_root_point_displacement, scope_vars, check=False)
+
+    def ApplyForceExcitation(self):
+        scope_vars = {'t' : self.time, 'omega': self.omega_force, 'A': self.amplitude_force}
+        return GenericCallVectorizedFunction(self.excitation_function_force, scope_vars, check=False)
+
+    def SolveSolutionStep(self):
+        displacement, velocity, acceleration = self.x[:,0]
+        # RHS of the SDoFSolver
+        b_0 = displacement + self.delta_t * velocity + self.delta_t**2 * (0.5 - self.beta) * acceleration
+        b_1 = velocity + self.delta_t * (1-self.gamma) * acceleration
+        b_2 = -self.alpha_m * self.mass * acceleration
+        #external load
+        self.load += self.ApplyForceExcitation()
+        b_2 = b_2 + self.load
+        #root point displacement
+        d_f = self.ApplyRootPointExcitation() + self.root_point_displacement
+        b_2 = b_2 + self.CalculateEquivalentForceFromRootPointExcitation(d_f)
+
+        new_acceleration = (b_2 - self.stiffness * b_0 - self.damping * b_1) / self.effective_mass
+        self.dx = np.array([b_0 + self.delta_t**2 * self.beta * new_acceleration,
+                            b_1 + self.delta_t * self.gamma * new_acceleration,
+                            new_acceleration])
+
+    def CalculateReaction(self, buffer_idx=0):
+        reaction = self.damping * ( self.dx[1] - self.dx_f[1]) \
+                 + self.stiffness * (self.dx[0] - self.dx_f[0])
+        return reaction
+
+    def CalculateSelfWeight(self):
+        return self.mass * self.modulus_self_weight
+
+    def GetSolutionStepValue(self, identifier, buffer_idx=0):
+        if identifier == "DISPLACEMENT":
+            return self.x[0,buffer_idx].copy()
+        elif identifier == "VELOCITY":
+            return self.x[1,buffer_idx].copy()
+        elif identifier == "ACCELERATION":
+            return self.x[2,buffer_idx].copy()
+        elif identifier == "REACTION":
+            return self.CalculateReaction()
+        elif identifier == "VOLUME_ACCELERATION":
+            return self.CalculateSelfWeight()
+        else:
+            raise Exception("Identifier is unknown!")
+
+    def SetSolutionStepValue(self, identifier, value, buffer_idx=0):
+        # value can be a scalar (for all systems) or an array with one value per system
+        if identifier == "DISPLACEMENT":
+            self.x[0,buffer_idx] = value
+        elif identifier == "VELOCITY":
+            self.x[1,buffer_idx] = value
+        elif identifier == "ACCELERATION":
+            self.x[2,buffer_idx] = value
+        elif identifier == "LOAD":
+            self.load = np.broadcast_to(np.asarray(value, dtype=float), (self.number_of_systems,)).copy()
+        elif identifier == "ROOT_POINT_DISPLACEMENT":
+            self.root_point_displacement = np.broadcast_to(np.asarray(value, dtype=float), (self.number_of_systems,)).copy()
+        else:
+            raise Exception("Identifier is unknown!")
+
+def GetDefaultSettings():
+    return {
+        "system_parameters":{
+            "mass"      : 100.0,
+            "stiffness" : 4000.0,
+            "damping"   : 0.0,
+            "modulus_self_weight": 9.81
+        },
+        "time_integration_parameters":{
+            "alpha_m"   : -0.3,
+            "start_time": 0.0,
+            "time_step" : 0.05,
+        },
+        "initial_values":{
+            "displacement"  : 0.0,
+            "velocity"      : 0.0,
+            "acceleration"  : 0.0
+        },
+        "boundary_conditions":{
+            "load_impulse" : 0.0,
+            "omega_force"        : 0.0,
+            "omega_root_point_displacement"        : 0.0,
+            "excitation_function_force": "A * sin(omega * t)",
+            "excitation_function_root_point_displacement": "A * sin(omega * t)",
+            "amplitude_root_point_displacement": 0.0,
+            "amplitude_force": 0.0
+        },
+        "solver_parameters": {
+            "buffer_size"   : 2
+        },
+        "output_parameters":{
+            "write_output_file": True,
+            "file_name" : "sdof_solver/results_sdof.dat"
+        }}
+
 def ValidateAndAssignDefaults(defaults, settings, recursive=False):
     for key, val in settings.items():
         # check if the current entry also exists in the defaults
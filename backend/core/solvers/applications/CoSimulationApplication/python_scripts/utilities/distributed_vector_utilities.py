@@ -0,0 +1,53 @@
+# Other imports
+import numpy as np
+
+class GlobalReduction:
+    '''Reductions of vectors and matrices whose rows are distributed across the ranks of a DataCommunicator
+
+    The convergence accelerators only exchange the results of these reductions (e.g. the small matrix V^T r),
+    the (long) interface vectors stay on the ranks that own them.
+    Without a DataCommunicator, or with one that is not distributed, all reductions are local.
+    '''
+    def __init__(self, data_communicator=None):
+        self.data_communicator = data_communicator
+        self.is_distributed = data_communicator is not None and data_communicator.IsDistributed()
+
+    def IsDistributed(self):
+        return self.is_distributed
+
+    def Sum(self, local_values):
+        '''Sum over all ranks, for scalars or elementwise for arrays. The result is available on all ranks'''
+        if not self.is_distributed:
+            return local_values
+
+        if np.ndim(local_values) == 0:
+            if isinstance(local_values, (int, np.integer)):
+                return self.data_communicator.SumAll(int(local_values))
+            return self.data_communicator.SumAll(float(local_values))
+
+        local_values = np.asarray(local_values, dtype=float)
+        if local_values.size == 0:
+            return local_values
+        return np.array(self.data_communicator.SumAll(local_values.ravel().tolist())).reshape(local_values.shape)
+
+    def Dot(self, a, b):
+        '''Global product a^T @ b, for vectors and matrices with distributed rows'''
+        return self.Sum(a.T @ b)
+
+    def Norm(self, v):
+        return np.sqrt(self.Dot(v, v))
+
+    def MinLocation(self, local_values):
+        '''Returns whether the global minimum of the distributed vector is located on this rank and its local index
+        In case of ties the rank with the lowest id owns the minimum
+        '''
+        local_index = int(np.argmin(local_values)) if len(local_values) > 0 else -1
+        if not self.is_distributed:
+            return local_index >= 0, local_index
+
+        local_min = float(local_values[local_index]) if local_index >= 0 else np.inf
+        global_min = self.data_communicator.MinAll(local_min)
+        my_rank = self.data_communicator.Rank()
+        candidate_rank = my_rank if (local_index >= 0 and local_min == global_min) else self.data_communicator.Size()
+        owning_rank = self.data_communicator.MinAll(candidate_rank)
+        return owning_rank == my_rank, local_index
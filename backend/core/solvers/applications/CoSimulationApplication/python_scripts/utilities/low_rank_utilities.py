@@ -0,0 +1,194 @@
+# CoSimulation imports
+from KratosMultiphysics.CoSimulationApplication.utilities.distributed_vector_utilities import GlobalReduction
+from KratosMultiphysics.CoSimulationApplication.utilities.qr_utilities import IncrementalQR
+
+# Other imports
+import numpy as np
+from collections import deque
+
+def PseudoInverseFactors(W, rcond, reduction=None):
+    '''Returns the factors (Z, U) of the pseudo-inverse pinv(W) = Z @ U.T, computed by a thin SVD of W
+    Singular values smaller than rcond times the largest one are treated as zero (as in np.linalg.pinv)
+    For distributed rows W is first factorized as W = Q R, the SVD of the small matrix R gives the one of W
+    '''
+    if reduction is not None and reduction.IsDistributed():
+        qr = IncrementalQR(W.shape[0], reduction)
+        for i in range(W.shape[1]-1, -1, -1): # inserting in reverse order keeps the order of the columns
+            qr.InsertColumn(W[:, i])
+        U_R, s, Vt = np.linalg.svd(qr.R)
+        U = qr.Q @ U_R
+    else:
+        U, s, Vt = np.linalg.svd(W, full_matrices=False)
+    if s.size == 0:
+        return np.empty((W.shape[1], 0)), np.empty((W.shape[0], 0))
+    keep = s > rcond * s[0]
+    return Vt[keep].T / s[keep], U[:, keep]
+
+def OrthonormalFactors(M, reduction=None):
+    '''Returns (Q, R) with M = Q @ R and orthonormal columns of Q, the number of columns is at most the rank of M
+    For distributed rows Q is computed from the (small) Gram matrix M^T M, as the IncrementalQR cannot have
+    more columns than the global number of rows. Directions whose singular value is below about sqrt(eps) times the
+    largest one are dropped, which does not change M beyond the accuracy of the factors.
+    '''
+    if reduction is not None and reduction.IsDistributed():
+        eigenvalues, eigenvectors = np.linalg.eigh(reduction.Dot(M, M))
+        if eigenvalues.size == 0 or eigenvalues[-1] <= 0.0:
+            return np.empty((M.shape[0], 0)), np.empty((0, M.shape[1]))
+        keep = eigenvalues > np.finfo(float).eps * M.shape[1] * eigenvalues[-1]
+        singular_values = np.sqrt(eigenvalues[keep])
+        Q = M @ (eigenvectors[:, keep] / singular_values)
+        # a second orthogonalization improves the orthogonality that is lost by squaring the condition number
+        dR = reduction.Dot(Q, Q)
+        L = np.linalg.cholesky(dR)
+        Q = np.linalg.solve(L, Q.T).T
+        return Q, L.T @ (singular_values[:, None] * eigenvectors[:, keep].T)
+    return np.linalg.qr(M)
+
+
+class LowRankJacobian:
+    '''Jacobian J = diagonal*I + A @ B.T of a multi-vector quasi-Newton method, stored as its low-rank factors
+
+    Every time step adds the update (V - J W) pinv(W) of the MVQN method, with V and W the differences
+    of the current time step. Instead of a dense matrix the update is stored as two factors with as many
+    columns as the rank of W, such that the memory and the cost of a product are linear in the size of the interface.
+    The update of the current time step is kept separately until "Commit" is called (i.e. J = J_hat).
+    Only the updates of the last "timestep_horizon" time steps are kept, all of them if it is negative.
+    If all updates are kept, the factors are recompressed in "Commit" as soon as their number of columns exceeds
+    the size of J (the rank of A @ B.T cannot be larger), such that the rank stays bounded by the size of J
+    instead of growing with the number of time steps and coupling iterations.
+    For distributed data the rows of A and B are distributed, "reduction" is the GlobalReduction of the
+    space of the columns of J (i.e. of B), the products B^T y are the only reduced quantities.
+    "row_reduction" is the one of the space of the rows of J (i.e. of A), only needed for the recompression
+    and by default the same as "reduction".
+    '''
+    def __init__(self, num_rows, num_cols, diagonal=0.0, timestep_horizon=-1, reduction=None, row_reduction=None):
+        if diagonal != 0.0 and num_rows != num_cols:
+            raise Exception("A diagonal can only be used for square Jacobians!")
+
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.diagonal = diagonal
+        self.timestep_horizon = timestep_horizon
+        self.reduction = GlobalReduction() if reduction is None else reduction
+        self.row_reduction = self.reduction if row_reduction is None else row_reduction
+        # the rank of J is at most the smaller one of its global dimensions
+        self.max_rank = min(self.row_reduction.Sum(num_rows), self.reduction.Sum(num_cols))
+
+        # updates of the previous time steps, the oldest ones first
+        self.A = np.empty((num_rows, 0))
+        self.B = np.empty((num_cols, 0))
+        self.ranks = deque()
+        self.BtA = np.empty((0, 0)) # B.T @ A, for solving with the Woodbury identity
+
+        # update of the current time step
+        self.A_new = np.empty((num_rows, 0))
+        self.B_new = np.empty((num_cols, 0))
+
+    def Rank(self, include_current=True):
+        return self.A.shape[1] + (self.A_new.shape[1] if include_current else 0)
+
+    def Dot(self, y, include_current=False):
+        '''Matrix-free product J @ y, y can be a vector or a matrix'''
+        if include_current and self.A_new.shape[1] > 0:
+            # both products are reduced together
+            rank_old = self.B.shape[1]
+            By = self.reduction.Sum(np.concatenate((self.B.T @ y, self.B_new.T @ y)))
+            result = self.A @ By[:rank_old] + self.A_new @ By[rank_old:]
+        else:
+            result = self.A @ self.reduction.Dot(self.B, y)
+        if self.diagonal != 0.0:
+            result += self.diagonal * y
+        return result
+
+    def ComputeUpdate(self, V, W, rcond):
+        '''Computes the update of the current time step J_hat = J + (V - J W) pinv(W)'''
+        Z, U = PseudoInverseFactors(W, rcond, self.reduction)
+        self.A_new = (V - self.Dot(W)) @ Z
+        self.B_new = U
+
+    def Factors(self, include_current=True):
+        '''Returns A, B with J = diagonal*I + A @ B.T'''
+        if not include_current or self.A_new.shape[1] == 0:
+            return self.A, self.B
+        return np.hstack((self.A, self.A_new)), np.hstack((self.B, self.B_new))
+
+    def Solve(self, b, include_current=True):
+        '''Solves J @ x = b with the Woodbury identity:
+        (c I + A B^T)^-1 = (I - A (c I + B^T A)^-1 B^T) / c
+        '''
+        if self.diagonal == 0.0:
+            raise Exception("Solving requires a non-zero diagonal!")
+
+        A, B = self.Factors(include_current)
+        if A.shape[1] == 0:
+            return b / self.diagonal
+
+        capacitance = self.__GramMatrix(include_current)
+        capacitance[np.diag_indices_from(capacitance)] += self.diagonal
+        return (b - A @ np.linalg.solve(capacitance, self.reduction.Dot(B, b))) / self.diagonal
+
+    def Commit(self):
+        '''Adds the update of the current time step to the Jacobian'''
+        rank_new = self.A_new.shape[1]
+        if rank_new > 0:
+            if self.num_rows == self.num_cols:
+                self.BtA = self.__GramMatrix(True)
+            self.A = np.hstack((self.A, self.A_new))
+            self.B = np.hstack((self.B, self.B_new))
+            self.ranks.append(rank_new)
+
+            if self.timestep_horizon > 0 and len(self.ranks) > self.timestep_horizon:
+                rank_old = self.ranks.popleft()
+                self.A = self.A[:, rank_old:]
+                self.B = self.B[:, rank_old:]
+                self.BtA = self.BtA[rank_old:, rank_old:]
+            elif self.timestep_horizon <= 0 and self.Rank() > self.max_rank:
+                self.__Recompress()
+
+        self.A_new = np.empty((self.num_rows, 0))
+        self.B_new = np.empty((self.num_cols, 0))
+
+    def __Recompress(self):
+        '''Replaces A, B by factors of A @ B.T with at most max_rank columns:
+        A = Q_A R_A, B = Q_B R_B => A B^T = Q_A (R_A R_B^T) Q_B^T, with the SVD of the small core R_A R_B^T = U S Y^T
+        the new factors are Q_A U S and Q_B Y. The updates of the single time steps cannot be separated afterwards,
+        which is why this is only done if all of them are kept.
+        '''
+        Q_A, R_A = OrthonormalFactors(self.A, self.row_reduction)
+        Q_B, R_B = OrthonormalFactors(self.B, self.reduction)
+        U, s, Yt = np.linalg.svd(R_A @ R_B.T, full_matrices=False)
+        keep = s > np.finfo(float).eps * self.max_rank * (s[0] if s.size > 0 else 0.0)
+        self.A = Q_A @ (U[:, keep] * s[keep])
+        self.B = Q_B @ Yt[keep].T
+        self.ranks = deque([self.A.shape[1]])
+        if self.num_rows == self.num_cols:
+            self.BtA = self.reduction.Dot(self.B, self.A)
+
+    def __GramMatrix(self, include_current):
+        # the block of the previous time steps is stored, only the blocks of the current update are computed
+        if not include_current or self.A_new.shape[1] == 0:
+            return self.BtA.copy()
+        rank_old = self.B.shape[1]
+        Bt_A_new = self.reduction.Dot(np.hstack((self.B, self.B_new)), self.A_new)
+        B_new_t_A = self.reduction.Dot(self.B_new, self.A)
+        return np.block([
+            [self.BtA,   Bt_A_new[:rank_old]],
+            [B_new_t_A,  Bt_A_new[rank_old:]]
+        ])
+
+
+def SolveIdentityMinusProduct(J1, J2, b, include_current=True):
+    '''Solves (I - J1 @ J2) x = b for two low-rank Jacobians without a diagonal, with the Woodbury identity:
+    J1 J2 = P Q^T with P = A1 (B1^T A2), Q = B2 => (I - P Q^T)^-1 = I + P (I - Q^T P)^-1 Q^T
+    '''
+    A1, B1 = J1.Factors(include_current)
+    A2, B2 = J2.Factors(include_current)
+    if A1.shape[1] == 0 or A2.shape[1] == 0:
+        return np.array(b, copy=True)
+
+    # B1 lives in the space of the rows of J2 and B2 in the one of the rows of J1 (= the columns of J2)
+    P = A1 @ J1.reduction.Dot(B1, A2)
+    B2_t_P_b = J2.reduction.Sum(np.column_stack((B2.T @ P, B2.T @ b)))
+    capacitance = -B2_t_P_b[:, :-1]
+    capacitance[np.diag_indices_from(capacitance)] += 1.0
+    return b + P @ np.linalg.solve(capacitance, B2_t_P_b[:, -1])
@@ -0,0 +1,157 @@
+# CoSimulation imports
+from KratosMultiphysics.CoSimulationApplication.utilities.distributed_vector_utilities import GlobalReduction
+
+# Other imports
+import numpy as np
+
+def GivensRotation(a, b):
+    '''Returns the rotation G = [[c, s], [-s, c]] with G @ [a, b] = [r, 0]'''
+    r = np.hypot(a, b)
+    if r == 0.0:
+        return np.eye(2)
+    c = a / r
+    s = b / r
+    return np.array([[c, s], [-s, c]])
+
+
+class IncrementalQR:
+    '''Thin QR factorization V = Q R of a matrix that changes by single columns
+
+    Columns are inserted in front of the existing ones (i.e. the newest column is the first one)
+    and can be deleted at any position. Instead of factorizing V again, Q and R are updated
+    with Givens rotations, which costs O(n*k) for n rows and k columns (a new factorization costs O(n*k^2)).
+    V itself is not stored, the norm of its i-th column is the norm of the i-th column of R.
+    With a distributed GlobalReduction the rows of V and Q are distributed (size is the local number of rows),
+    R is small and identical on all ranks. Only the products Q^T v are reduced across the ranks.
+    '''
+    def __init__(self, size, reduction=None):
+        self.size = size
+        self.reduction = GlobalReduction() if reduction is None else reduction
+        self.global_size = self.reduction.Sum(size)
+        self.Q = np.empty((size, 0), order="F")
+        self.R = np.empty((0, 0))
+
+    def NumberOfColumns(self):
+        return self.R.shape[1]
+
+    def Clear(self):
+        self.Q = np.empty((self.size, 0), order="F")
+        self.R = np.empty((0, 0))
+
+    def InsertColumn(self, v):
+        '''Inserts v as first column of V'''
+        num_cols = self.NumberOfColumns()
+        if num_cols >= self.global_size:
+            raise Exception("Cannot insert a column, the number of columns ({}) would exceed the number of rows ({})!".format(num_cols+1, self.global_size))
+
+        # orthogonalize v w.r.t. Q, Gram-Schmidt is done twice for stability
+        # the norm of v is reduced together with the first projection
+        w_and_norm = self.reduction.Sum(np.append(self.Q.T @ v, v @ v))
+        w = w_and_norm[:-1]
+        norm_v = np.sqrt(w_and_norm[-1])
+        q = v - self.Q @ w
+        dw = self.reduction.Dot(self.Q, q)
+        q -= self.Q @ dw
+        w += dw
+        rho = self.reduction.Norm(q)
+
+        if rho > np.finfo(float).eps * norm_v:
+            q /= rho
+        else:
+            # v lies in the span of Q, an arbitrary orthonormal complement keeps Q orthonormal
+            # the corresponding diagonal entry of R will be zero (=> to be removed by "Filter")
+            q = self.__OrthonormalComplement()
+            rho = 0.0
+
+        # V_new = [Q, q] @ H, with H = [[w, R], [rho, 0]]
+        H = np.zeros((num_cols+1, num_cols+1))
+        H[:num_cols, 0] = w
+        H[num_cols, 0] = rho
+        H[:num_cols, 1:] = self.R
+
+        Q = np.empty((self.size, num_cols+1), order="F")
+        Q[:, :num_cols] = self.Q
+        Q[:, num_cols] = q
+
+        # eliminating the first column below the diagonal makes H upper triangular
+        for i in range(num_cols, 0, -1):
+            G = GivensRotation(H[i-1, 0], H[i, 0])
+            H[i-1:i+1, :] = G @ H[i-1:i+1, :]
+            Q[:, i-1:i+1] = Q[:, i-1:i+1] @ G.T
+            H[i, 0] = 0.0
+
+        self.Q = Q
+        self.R = H
+
+    def DeleteColumn(self, index):
+        '''Removes the column with the given index from V'''
+        num_cols = self.NumberOfColumns()
+        R = np.delete(self.R, index, axis=1) # upper Hessenberg from "index" on
+        Q = self.Q
+
+        for i in range(index, num_cols-1):
+            G = GivensRotation(R[i, i], R[i+1, i])
+            R[i:i+2, i:] = G @ R[i:i+2, i:]
+            Q[:, i:i+2] = Q[:, i:i+2] @ G.T
+            R[i+1, i] = 0.0
+
+        self.R = R[:num_cols-1, :]
+        self.Q = np.asfortranarray(Q[:, :num_cols-1])
+
+    def Filter(self, epsilon):
+        '''QR-filtering: removes the columns that are (nearly) linearly dependent on the columns before them,
+        i.e. with |R_ii| <= epsilon * ||v_i||
+        Returns a boolean mask of the columns (before filtering) that were kept
+        '''
+        kept = list(range(self.NumberOfColumns()))
+        mask = np.ones(len(kept), dtype=bool)
+        i = 0
+        while i < self.NumberOfColumns():
+            if abs(self.R[i, i]) <= epsilon * np.linalg.norm(self.R[:i+1, i]):
+                self.DeleteColumn(i)
+                mask[kept.pop(i)] = False
+            else:
+                i += 1
+        return mask
+
+    def Solve(self, b):
+        '''Returns the least-squares solution c of V c = b'''
+        if self.NumberOfColumns() == 0:
+            return np.empty(0)
+        return BackSubstitution(self.R, self.reduction.Dot(self.Q, b))
+
+    def __OrthonormalComplement(self):
+        # the unit vector with the smallest projection onto the span of Q is the best conditioned choice
+        is_owner, index = self.reduction.MinLocation(np.einsum("ij,ij->i", self.Q, self.Q))
+        q_index = self.reduction.Sum(self.Q[index, :] if is_owner else np.zeros(self.NumberOfColumns()))
+        q = -self.Q @ q_index
+        if is_owner:
+            q[index] += 1.0
+        q -= self.Q @ self.reduction.Dot(self.Q, q)
+        return q / self.reduction.Norm(q)
+
+
+def LeastSquaresSolve(V, b, reduction=None, epsilon=1e3*np.finfo(float).eps):
+    '''Returns the least-squares solution c of V c = b
+    For distributed rows the thin QR factorization is used instead of np.linalg.lstsq, such that only reduced
+    products are communicated. Columns that are (nearly) linearly dependent on the ones before them are
+    filtered out, their coefficients are zero.
+    '''
+    if reduction is None or not reduction.IsDistributed():
+        return np.linalg.lstsq(V, b, rcond=None)[0]
+
+    qr = IncrementalQR(V.shape[0], reduction)
+    for i in range(V.shape[1]-1, -1, -1): # inserting in reverse order keeps the order of the columns
+        qr.InsertColumn(V[:, i])
+    kept_columns = qr.Filter(epsilon)
+    c = np.zeros(V.shape[1])
+    c[kept_columns] = qr.Solve(b)
+    return c
+
+
+def BackSubstitution(R, b):
+    '''Solves R x = b for an upper triangular R'''
+    x = np.empty(R.shape[1])
+    for i in range(R.shape[1]-1, -1, -1):
+        x[i] = (b[i] - R[i, i+1:] @ x[i+1:]) / R[i, i]
+    return x
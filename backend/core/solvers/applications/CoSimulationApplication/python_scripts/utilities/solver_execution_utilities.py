@@ -0,0 +1,105 @@
+# Importing the Kratos Library
+import KratosMultiphysics as KM
+
+# CoSimulation imports
+import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
+import KratosMultiphysics.CoSimulationApplication.colors as colors
+
+# Other imports
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+class SolverExecutor:
+    """This class executes "SolveSolutionStep" of solvers that do not depend on each other within
+    a coupling iteration (Jacobi-type coupling), either one after the other or concurrently in threads.
+
+    Solvers overlap in threads as far as they release the GIL while solving, which is the case
+    for solvers running in their own process (e.g. remote controlled solvers and solvers coupled through CoSimIO)
+    and for C++ solvers that release the GIL. Solvers implemented in pure Python are effectively serialized.
+    The wall time of every call is recorded together with the time of each solver, such that the achieved
+    overlap can be reported: the wall time is between max(solver) (full overlap) and sum(solver) (no overlap).
+    """
+    def __init__(self, solver_wrappers, concurrent, label="SolverExecutor"):
+        self.solver_wrappers = solver_wrappers
+        self.label = label
+        self.concurrent = concurrent and len(solver_wrappers) > 1
+
+        if self.concurrent and KM.IsDistributedRun():
+            # the solvers would call MPI concurrently from several threads, which is not supported in general
+            cs_tools.cs_print_warning(self.label, "Concurrent execution of the solvers is not supported in distributed runs, they are executed sequentially")
+            self.concurrent = False
+
+        self.thread_pool = None
+        self.num_calls = 0
+        self.wall_time = 0.0
+        self.max_solver_time = 0.0 # sum over the calls of the slowest solver, i.e. the wall time with full overlap
+        self.solver_times = {solver_name : 0.0 for solver_name in solver_wrappers}
+
+    def SolveSolutionStep(self):
+        """Solves all solvers and returns the time of each of them (in seconds)
+        Exceptions of the solvers are raised after all of them finished
+        """
+        start_time = time.perf_counter()
+        if self.concurrent:
+            if self.thread_pool is None:
+                self.thread_pool = ThreadPoolExecutor(max_workers=len(self.solver_wrappers), thread_name_prefix="cosim_solver")
+            futures = {solver_name : self.thread_pool.submit(self.__TimedSolve, solver) for solver_name, solver in self.solver_wrappers.items()}
+            # waiting for all solvers before raising, such that no solver is still running afterwards
+            wait(futures.values())
+            for solver_name, future in futures.items():
+                if future.exception() is not None:
+                    raise Exception('Solver "{}" failed while being executed concurrently'.format(solver_name)) from future.exception()
+            times = {solver_name : future.result() for solver_name, future in futures.items()}
+        else:
+            times = {solver_name : self.__TimedSolve(solver) for solver_name, solver in self.solver_wrappers.items()}
+        wall_time = time.perf_counter() - start_time
+
+        self.num_calls += 1
+        self.wall_time += wall_time
+        self.max_solver_time += max(times.values())
+        for solver_name, solver_time in times.items():
+            self.solver_times[solver_name] += solver_time
+
+        return times
+
+    def GetTimingSummary(self):
+        """Returns the accumulated times
+        "overlap" is 0 if the solvers were executed one after the other and 1 if the wall time equals the time of the slowest solver
+        """
+        sum_solver_time = sum(self.solver_times.values())
+        possible_saving = sum_solver_time - self.max_solver_time
+        overlap = (sum_solver_time - self.wall_time) / possible_saving if possible_saving > 0.0 else 0.0
+        return {
+            "concurrent"      : self.concurrent,
+            "num_calls"       : self.num_calls,
+            "wall_time"       : self.wall_time,
+            "sum_solver_time" : sum_solver_time,
+            "max_solver_time" : self.max_solver_time,
+            "overlap"         : min(max(overlap, 0.0), 1.0),
+            "solver_times"    : dict(self.solver_times)
+        }
+
+    def PrintTiming(self, times=None):
+        """Prints the times of the given call, or the accumulated times if none are given"""
+        if times is not None:
+            info = ", ".join('"{}": {:.3f} s'.format(colors.blue(solver_name), solver_time) for solver_name, solver_time in times.items())
+            cs_tools.cs_print_info(self.label, "Solver times:", info)
+            return
+
+        summary = self.GetTimingSummary()
+        cs_tools.cs_print_info(self.label, "Solver execution ({}) in {} calls:".format("concurrent" if summary["concurrent"] else "sequential", summary["num_calls"]))
+        for solver_name, solver_time in summary["solver_times"].items():
+            cs_tools.cs_print_info("  Solver", '"{}": {:.3f} s'.format(colors.blue(solver_name), solver_time))
+        cs_tools.cs_print_info("  Wall time", "{:.3f} s (sum of solvers: {:.3f} s, slowest solvers: {:.3f} s, overlap: {:.0f} %)".format(
+            summary["wall_time"], summary["sum_solver_time"], summary["max_solver_time"], 100*summary["overlap"]))
+
+    def Finalize(self):
+        if self.thread_pool is not None:
+            self.thread_pool.shutdown(wait=True)
+            self.thread_pool = None
+
+    @staticmethod
+    def __TimedSolve(solver):
+        start_time = time.perf_counter()
+        solver.SolveSolutionStep()
+        return time.perf_counter() - start_time
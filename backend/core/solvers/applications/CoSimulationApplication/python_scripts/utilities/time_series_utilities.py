@@ -0,0 +1,187 @@
+# Other imports
+import json
+import os
+import queue
+import threading
+import numpy as np
+
+# version of the layout of the files, to be increased if it changes
+FORMAT_VERSION = 1
+
+AVAILABLE_CONTAINERS = ["binary", "json"]
+
+class TimeSeriesWriter:
+    """This class writes snapshots of interface data (numpy arrays) to a compact time-series container
+
+    The snapshots are copied when they are passed to "Write" (unless the caller hands over arrays it does not
+    use anymore, see "Write") and written by a background thread, such that
+    the coupled simulation does not wait for the file system. The number of pending snapshots is bounded by
+    "queue_size": if the writer falls behind, "Write" blocks until there is space again (backpressure),
+    which limits the memory used for the snapshots.
+
+    Available containers:
+    - "binary": the arrays are appended as raw little-endian float64 to "<file_name>.bin", the layout
+                (time step, coupling iteration, time, offset and shape of every array) is stored in "<file_name>.json".
+                The arrays can be read without parsing, "ReadTimeSeries" maps them with np.memmap
+    - "json":   one JSON object per snapshot and line ("JSON Lines") in "<file_name>.jsonl", for small data
+    Both can be read with "ReadTimeSeries".
+    Errors of the background thread are raised in the next call of "Write", "Flush" or "Close".
+    """
+    def __init__(self, file_name, container="binary", queue_size=8, asynchronous=True):
+        if container not in AVAILABLE_CONTAINERS:
+            raise Exception('Container "{}" is not available, only the following options are available: {}'.format(container, ", ".join(AVAILABLE_CONTAINERS)))
+        if queue_size < 1:
+            raise Exception('"queue_size" has to be larger than 0, got {}'.format(queue_size))
+
+        self.file_name = file_name
+        self.container = container
+        self.asynchronous = asynchronous
+        self.num_snapshots = 0
+        self.num_blocking_writes = 0 # number of calls of "Write" that had to wait for the background thread
+        self.records = []
+        self.exception = None
+        self.is_closed = False
+
+        if container == "binary":
+            self.data_file = open(file_name + ".bin", "wb")
+        else:
+            self.data_file = open(file_name + ".jsonl", "w")
+
+        if asynchronous:
+            self.queue = queue.Queue(maxsize=queue_size)
+            self.thread = threading.Thread(target=self.__WriteLoop, name="cosim_time_series_writer", daemon=True)
+            self.thread.start()
+
+    def Write(self, data, time_step, coupling_iteration=0, time=0.0, copy=True):
+        """Adds a snapshot of the given arrays (dict of name: array)
+        With "copy=False" the arrays are handed over to the writer, e.g. fresh copies the caller does not use anymore.
+        They must not be changed afterwards and are only converted if they are not float64 already.
+        """
+        self.__CheckState()
+        if copy:
+            arrays = {name : np.array(values, dtype=np.float64, copy=True) for name, values in data.items()}
+        else:
+            arrays = {name : np.asarray(values, dtype=np.float64) for name, values in data.items()}
+        snapshot = {
+            "time_step"          : time_step,
+            "coupling_iteration" : coupling_iteration,
+            "time"               : time,
+            "data"               : arrays
+        }
+        self.num_snapshots += 1
+
+        if not self.asynchronous:
+            self.__WriteSnapshot(snapshot)
+            return
+
+        try:
+            self.queue.put_nowait(snapshot)
+        except queue.Full:
+            self.num_blocking_writes += 1
+            self.queue.put(snapshot)
+
+    def Flush(self):
+        """Waits until all snapshots are written and makes the files readable"""
+        self.__CheckState()
+        if self.asynchronous:
+            self.queue.join()
+        self.__CheckState()
+        self.data_file.flush()
+        self.__WriteIndex()
+
+    def Close(self):
+        if self.is_closed:
+            return
+        try:
+            if self.asynchronous:
+                self.queue.put(None) # stops the background thread after all pending snapshots
+                self.thread.join()
+            self.data_file.close()
+            self.__WriteIndex()
+        finally:
+            self.is_closed = True
+        if self.exception is not None:
+            raise Exception('Writing the time series "{}" failed'.format(self.file_name)) from self.exception
+
+    def __CheckState(self):
+        if self.is_closed:
+            raise Exception('The time series "{}" is already closed'.format(self.file_name))
+        if self.exception is not None:
+            raise Exception('Writing the time series "{}" failed'.format(self.file_name)) from self.exception
+
+    def __WriteLoop(self):
+        while True:
+            snapshot = self.queue.get()
+            try:
+                if snapshot is None:
+                    return
+                if self.exception is None: # after an error the remaining snapshots are discarded
+                    self.__WriteSnapshot(snapshot)
+            except BaseException as e:
+                self.exception = e
+            finally:
+                self.queue.task_done()
+
+    def __WriteSnapshot(self, snapshot):
+        record = {key : snapshot[key] for key in ("time_step", "coupling_iteration", "time")}
+        if self.container == "binary":
+            record["arrays"] = {}
+            for name, values in snapshot["data"].items():
+                record["arrays"][name] = {"offset" : self.data_file.tell(), "shape" : list(values.shape)}
+                self.data_file.write(values.astype("<f8", copy=False).tobytes())
+            self.records.append(record)
+        else:
+            record["data"] = {name : values.tolist() for name, values in snapshot["data"].items()}
+            self.data_file.write(json.dumps(record) + "\n")
+
+    def __WriteIndex(self):
+        if self.container != "binary":
+            return
+        index = {
+            "format_version" : FORMAT_VERSION,
+            "container"      : self.container,
+            "dtype"          : "<f8",
+            "data_file"      : self.file_name + ".bin",
+            "records"        : list(self.records)
+        }
+        with open(self.file_name + ".json", "w") as index_file:
+            json.dump(index, index_file)
+
+
+def ReadTimeSeries(file_name, container="binary"):
+    """Reads a time series written by the TimeSeriesWriter
+    Returns a list of the snapshots as dicts with "time_step", "coupling_iteration", "time" and "data" (dict of name: array)
+    In the "binary" container the arrays are read-only views of a np.memmap of "<file_name>.bin",
+    i.e. only the data that is accessed is read from the file
+    """
+    snapshots = []
+    if container == "binary":
+        with open(file_name + ".json", "r") as index_file:
+            index = json.load(index_file)
+        if index["format_version"] > FORMAT_VERSION:
+            raise Exception('The time series "{}" was written with a newer version ({}) of the format'.format(file_name, index["format_version"]))
+        dtype = np.dtype(index["dtype"])
+        data_file_name = file_name + ".bin"
+        # an empty file cannot be mapped, it only occurs if all arrays are empty
+        if os.path.getsize(data_file_name) > 0:
+            buffer = np.memmap(data_file_name, dtype=dtype, mode="r")
+        else:
+            buffer = np.empty(0, dtype=dtype)
+        for record in index["records"]:
+            data = {}
+            for name, layout in record["arrays"].items():
+                count = int(np.prod(layout["shape"]))
+                begin = layout["offset"] // dtype.itemsize
+                data[name] = buffer[begin:begin+count].reshape(layout["shape"])
+            snapshots.append({key : record[key] for key in ("time_step", "coupling_iteration", "time")})
+            snapshots[-1]["data"] = data
+    elif container == "json":
+        with open(file_name + ".jsonl", "r") as data_file:
+            for line in data_file:
+                record = json.loads(line)
+                record["data"] = {name : np.array(values) for name, values in record["data"].items()}
+                snapshots.append(record)
+    else:
+        raise Exception('Container "{}" is not available, only the following options are available: {}'.format(container, ", ".join(AVAILABLE_CONTAINERS)))
+
+    return snapshots
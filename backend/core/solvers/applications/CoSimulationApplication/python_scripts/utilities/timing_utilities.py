@@ -0,0 +1,271 @@
+# Importing the Kratos Library
+import KratosMultiphysics as KM
+
+# CoSimulation imports
+import KratosMultiphysics.CoSimulationApplication.co_simulation_tools as cs_tools
+import KratosMultiphysics.CoSimulationApplication.colors as colors
+
+# Other imports
+import json
+import time
+import threading
+import functools
+from collections import defaultdict
+
+# the timer of the running CoSimulationAnalysis, None if the timing is disabled
+_active_timer = None
+
+# the methods of the solvers whose calls are measured
+SOLVER_METHODS_TO_TIME = [
+    "Initialize",
+    "Finalize",
+    "AdvanceInTime",
+    "Predict",
+    "InitializeSolutionStep",
+    "SolveSolutionStep",
+    "FinalizeSolutionStep",
+    "OutputSolutionStep",
+    "ImportData",
+    "ExportData"
+]
+
+def GetActiveTimer():
+    return _active_timer
+
+def SetActiveTimer(timer):
+    global _active_timer
+    _active_timer = timer
+
+def InstrumentMethods(obj, category, name, method_names):
+    """Wraps the given methods of obj (of this instance only) such that their calls are measured by the active timer
+    Does nothing if the timing is disabled
+    """
+    if _active_timer is not None:
+        _active_timer.InstrumentMethods(obj, category, name, method_names)
+
+def SetCouplingIteration(iteration):
+    """To be called by the coupled solvers at the beginning of every coupling iteration (starting with 1)"""
+    if _active_timer is not None:
+        _active_timer.SetCouplingIteration(iteration)
+
+
+class CoSimulationTimer:
+    """This class measures the time spent in the components of a coupled simulation
+    (solvers, data transfer operators, mappers, predictors, convergence accelerators and criteria, coupling operations)
+
+    The methods of the components are wrapped when they are created (see "InstrumentMethods"), every call is recorded
+    with the time step and the coupling iteration in which it happened. Besides the total ("inclusive") time of a call,
+    also its exclusive time is computed, i.e. without the time of nested measured calls (e.g. the data transfer inside
+    of a coupled solver that is itself a solver of another coupled solver).
+    At the end of the run a summary table is printed and a trace in the "Trace Event Format" is written,
+    which can be opened with chrome://tracing or https://ui.perfetto.dev and also contains the aggregated times.
+    """
+    def __init__(self, settings, problem_name):
+        default_settings = KM.Parameters("""{
+            "enabled"         : false,
+            "print_summary"   : true,
+            "trace_file_name" : ""
+        }""")
+        settings.ValidateAndAssignDefaults(default_settings)
+
+        self.enabled = settings["enabled"].GetBool()
+        self.print_summary = settings["print_summary"].GetBool()
+        self.trace_file_name = settings["trace_file_name"].GetString()
+        if self.trace_file_name == "":
+            self.trace_file_name = problem_name + "_timing_trace.json"
+
+        self.data_communicator = KM.ParallelEnvironment.GetDefaultDataCommunicator()
+        self.start_time = time.perf_counter()
+        self.end_time = None
+        self.time_step = 0
+        self.simulation_time = 0.0
+        self.coupling_iteration = 0
+        self.events = []
+        self.thread_local = threading.local()
+
+    def IsEnabled(self):
+        return self.enabled
+
+    def SetTimeStep(self, time_step, simulation_time):
+        self.time_step = time_step
+        self.simulation_time = simulation_time
+        self.coupling_iteration = 0
+
+    def SetCouplingIteration(self, iteration):
+        self.coupling_iteration = iteration
+
+    def InstrumentMethods(self, obj, category, name, method_names):
+        for method_name in method_names:
+            method = getattr(obj, method_name, None)
+            if callable(method):
+                setattr(obj, method_name, self.__TimedMethod(method, category, name, method_name))
+
+    def Measure(self, category, name, method_name):
+        """Context manager for measuring a block of code"""
+        return _MeasuredBlock(self, category, name, method_name)
+
+    def GetSummary(self):
+        """Returns the accumulated times of the components, sorted by their exclusive time"""
+        total_wall_time = self.__WallTime()
+        summary = defaultdict(lambda: {"calls" : 0, "total_time" : 0.0, "exclusive_time" : 0.0, "max_time" : 0.0})
+        for event in self.events:
+            entry = summary[(event["category"], event["name"], event["method"])]
+            entry["calls"] += 1
+            entry["total_time"] += event["duration"]
+            entry["exclusive_time"] += event["exclusive"]
+            entry["max_time"] = max(entry["max_time"], event["duration"])
+
+        rows = []
+        for (category, name, method), entry in summary.items():
+            entry.update({
+                "category" : category,
+                "name"     : name,
+                "method"   : method,
+                "share"    : entry["exclusive_time"] / total_wall_time if total_wall_time > 0.0 else 0.0
+            })
+            rows.append(entry)
+        return sorted(rows, key=lambda row: row["exclusive_time"], reverse=True)
+
+    def GetTimesPerTimeStep(self):
+        """Returns the exclusive times per category for every time step"""
+        return self.__Aggregate(lambda event: (event["time_step"],))
+
+    def GetTimesPerCouplingIteration(self):
+        """Returns the exclusive times per category for every coupling iteration (iteration 0 are the calls outside of the coupling loop)"""
+        return self.__Aggregate(lambda event: (event["time_step"], event["coupling_iteration"]))
+
+    def PrintSummary(self):
+        total_wall_time = self.__WallTime()
+        rows = self.GetSummary()
+        measured_time = sum(row["exclusive_time"] for row in rows)
+
+        cs_tools.cs_print_info(colors.bold("CoSimulation Timing"), "Wall time: {:.3f} s, thereof measured: {:.3f} s in {} time steps".format(total_wall_time, measured_time, self.time_step))
+        header = "{:<24} {:<28} {:<30} {:>8} {:>11} {:>11} {:>10} {:>6}".format("Category", "Name", "Method", "Calls", "Excl. [s]", "Total [s]", "Max [s]", "Share")
+        KM.Logger.PrintInfo("", header)
+        KM.Logger.PrintInfo("", "-"*len(header))
+        for row in rows:
+            KM.Logger.PrintInfo("", "{:<24} {:<28} {:<30} {:>8} {:>11.4f} {:>11.4f} {:>10.4f} {:>5.1f}%".format(
+                row["category"], row["name"][:28], row["method"][:30], row["calls"], row["exclusive_time"], row["total_time"], row["max_time"], 100*row["share"]))
+
+        per_category = defaultdict(float)
+        for row in rows:
+            per_category[row["category"]] += row["exclusive_time"]
+        KM.Logger.PrintInfo("", "-"*len(header))
+        for category, category_time in sorted(per_category.items(), key=lambda item: item[1], reverse=True):
+            share = category_time / total_wall_time if total_wall_time > 0.0 else 0.0
+            KM.Logger.PrintInfo("", "{:<24} {:>11.4f} s {:>5.1f}%".format(category, category_time, 100*share))
+
+    def WriteTrace(self, file_name=None):
+        """Writes the measured calls and the aggregated times in the "Trace Event Format" (JSON)"""
+        if file_name is None:
+            file_name = self.trace_file_name
+        if self.data_communicator.IsDistributed():
+            base_name, dot, extension = file_name.rpartition(".")
+            file_name = "{}_rank{}.{}".format(base_name, self.data_communicator.Rank(), extension) if dot else "{}_rank{}".format(file_name, self.data_communicator.Rank())
+
+        trace_events = [{
+            "name" : "{}.{}".format(event["name"], event["method"]),
+            "cat"  : event["category"],
+            "ph"   : "X",
+            "ts"   : 1e6*(event["start"] - self.start_time), # in microseconds
+            "dur"  : 1e6*event["duration"],
+            "pid"  : self.data_communicator.Rank(),
+            "tid"  : event["thread"],
+            "args" : {
+                "time_step"          : event["time_step"],
+                "simulation_time"    : event["simulation_time"],
+                "coupling_iteration" : event["coupling_iteration"],
+                "exclusive_us"       : 1e6*event["exclusive"]
+            }
+        } for event in self.events]
+
+        trace = {
+            "traceEvents"     : trace_events,
+            "displayTimeUnit" : "ms",
+            "otherData" : {
+                "wall_time"                   : self.__WallTime(),
+                "num_time_steps"              : self.time_step,
+                "summary"                     : self.GetSummary(),
+                "times_per_time_step"         : self.GetTimesPerTimeStep(),
+                "times_per_coupling_iteration": self.GetTimesPerCouplingIteration()
+            }
+        }
+        with open(file_name, "w") as trace_file:
+            json.dump(trace, trace_file)
+
+        return file_name
+
+    def Finalize(self):
+        self.end_time = time.perf_counter()
+        if self.print_summary and self.data_communicator.Rank() == 0:
+            self.PrintSummary()
+        file_name = self.WriteTrace()
+        if self.print_summary and self.data_communicator.Rank() == 0:
+            cs_tools.cs_print_info(colors.bold("CoSimulation Timing"), 'Trace written to "{}"'.format(file_name))
+
+    def _BeginEvent(self):
+        stack = self.__GetStack()
+        stack.append(0.0) # accumulates the time of the nested calls
+        return time.perf_counter()
+
+    def _EndEvent(self, start, category, name, method_name):
+        duration = time.perf_counter() - start
+        stack = self.__GetStack()
+        nested_time = stack.pop()
+        if stack:
+            stack[-1] += duration
+        self.events.append({
+            "category"           : category,
+            "name"               : name,
+            "method"             : method_name,
+            "start"              : start,
+            "duration"           : duration,
+            "exclusive"          : max(duration - nested_time, 0.0),
+            "time_step"          : self.time_step,
+            "simulation_time"    : self.simulation_time,
+            "coupling_iteration" : self.coupling_iteration,
+            "thread"             : threading.get_ident()
+        })
+
+    def __TimedMethod(self, method, category, name, method_name):
+        @functools.wraps(method)
+        def timed_method(*args, **kwargs):
+            start = self._BeginEvent()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._EndEvent(start, category, name, method_name)
+        return timed_method
+
+    def __GetStack(self):
+        # the stack of the nested calls is kept per thread, as solvers can be solved concurrently
+        if not hasattr(self.thread_local, "stack"):
+            self.thread_local.stack = []
+        return self.thread_local.stack
+
+    def __WallTime(self):
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        return end_time - self.start_time
+
+    def __Aggregate(self, key_function):
+        aggregated = defaultdict(lambda: defaultdict(float))
+        for event in self.events:
+            aggregated[key_function(event)][event["category"]] += event["exclusive"]
+        key_names = ("time_step", "coupling_iteration")
+        return [dict(zip(key_names, key), times=dict(times)) for key, times in sorted(aggregated.items())]
+
+
+class _MeasuredBlock:
+    def __init__(self, timer, category, name, method_name):
+        self.timer = timer
+        self.category = category
+        self.name = name
+        self.method_name = method_name
+
+    def __enter__(self):
+        self.start = self.timer._BeginEvent()
+        return self
+
+    def __exit__(self, *args):
+        self.timer._EndEvent(self.start, self.category, self.name, self.method_name)
+        return False
@@ -11,12 +11,22 @@ from test_mok_fsi import TestMokFSI
 from test_coupling_interface_data import TestCouplingInterfaceData
 from test_data_transfer_operators import TestDataTransferOperators
 from test_coupling_operations import TestScalingOperation
+from test_coupling_operations import TestCouplingOutputOperation
+from test_coupling_operations import TestComputeBoundaryForceOperation
 from test_flower_coupling import TestFLOWerCoupling
-from test_sdof_solver import TestSdofSolver
+from test_sdof_solver import TestSdofSolver, TestSdofEnsembleSolver
 from test_sdof_static_solver import TestSdofStaticSolver
 from test_convergence_criteria import TestConvergenceCriteria
 from test_convergence_criteria import TestConvergenceCriteriaWrapper
-from test_convergence_accelerators import TestConvergenceAcceleratorWrapper
+from test_convergence_accelerators import TestConvergenceAcceleratorWrapper, TestDistributedConvergenceAccelerators
+from test_qr_utilities import TestIncrementalQR
+from test_qr_utilities import TestIQNILSIncrementalQR
+from test_low_rank_utilities import TestLowRankJacobian
+from test_low_rank_utilities import TestMVQNLowRank
+from test_solver_execution_utilities import TestSolverExecutor
+from test_timing_utilities import TestCoSimulationTimer
+from test_time_series_utilities import TestTimeSeriesWriter
+from test_predictors import TestLeastSquaresPredictor
 from test_co_simulation_coupled_solver import TestCoupledSolverGetSolver
 from test_co_simulation_coupled_solver import TestCoupledSolverModelAccess
 from test_co_simulation_coupled_solver import TestCoupledSolverPassingModel
@@ -54,7 +64,10 @@ def AssembleTestSuites():
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestCouplingInterfaceData]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestDataTransferOperators]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestScalingOperation]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestCouplingOutputOperation]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestComputeBoundaryForceOperation]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestSdofSolver]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestSdofEnsembleSolver]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestSdofStaticSolver]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestConvergenceCriteria]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestConvergenceCriteriaWrapper]))
@@ -65,6 +78,15 @@ def AssembleTestSuites():
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestModelPartUtiliites]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestPingPong]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestConvergenceAcceleratorWrapper]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestDistributedConvergenceAccelerators]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestIncrementalQR]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestIQNILSIncrementalQR]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestLowRankJacobian]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestMVQNLowRank]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestSolverExecutor]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestCoSimulationTimer]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestTimeSeriesWriter]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestLeastSquaresPredictor]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestTinyFetiCoSimulationCases]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestThermalRomCoSim]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([Test3D1DDataTransferProcessBlock]))
@@ -9,7 +9,7 @@ import KratosMultiphysics.KratosUnittest as KratosUnittest
 
 # Import tests
 from test_convergence_criteria import TestConvergenceCriteriaWrapper
-from test_convergence_accelerators import TestConvergenceAcceleratorWrapper
+from test_convergence_accelerators import TestConvergenceAcceleratorWrapper, TestDistributedConvergenceAccelerators
 from test_processes import TestCreatePointBasedEntitiesProcess
 from co_simulation_test_factory import TestCoSimulationCases
 
@@ -31,6 +31,7 @@ def AssembleTestSuites():
     smallSuite = suites['mpi_small'] # These tests are executed by the continuous integration tool
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestConvergenceCriteriaWrapper]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestConvergenceAcceleratorWrapper]))
+    smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestDistributedConvergenceAccelerators]))
     smallSuite.addTests(KratosUnittest.TestLoader().loadTestsFromTestCases([TestCreatePointBasedEntitiesProcess]))
 
     ################################################################################
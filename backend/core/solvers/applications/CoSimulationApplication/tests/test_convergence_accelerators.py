@@ -3,6 +3,7 @@ import KratosMultiphysics.KratosUnittest as KratosUnittest
 
 from KratosMultiphysics.CoSimulationApplication.coupling_interface_data import CouplingInterfaceData
 from KratosMultiphysics.CoSimulationApplication.convergence_accelerators.convergence_accelerator_wrapper import ConvergenceAcceleratorWrapper
+from KratosMultiphysics.CoSimulationApplication.factories.convergence_accelerator_factory import CreateConvergenceAccelerator
 from testing_utilities import DummySolverWrapper
 
 from unittest.mock import Mock, patch
@@ -139,5 +140,73 @@ class TestConvergenceAcceleratorWrapper(KratosUnittest.TestCase):
         np.testing.assert_array_equal(exp_inp + update_solution_return_value, self.interface_data.GetData())
 
 
+class TestDistributedConvergenceAccelerators(KratosUnittest.TestCase):
+    """Checks that the convergence accelerators give the same update with distributed data
+    (i.e. executed on all ranks with only reduced quantities being communicated)
+    as when they are executed on one rank with the complete data
+    """
+
+    def setUp(self):
+        self.data_comm = KM.Testing.GetDefaultDataCommunicator()
+        local_sizes = [rank % 5 + 3 for rank in range(self.data_comm.Size())]
+        if len(local_sizes) > 4:
+            local_sizes[4] = 0 # in order to emulate one partition not having local data
+        offsets = np.cumsum([0] + local_sizes)
+        my_pid = self.data_comm.Rank()
+        self.local_slice = slice(offsets[my_pid], offsets[my_pid+1])
+        self.global_size = max(offsets[-1], 20)
+        if my_pid == self.data_comm.Size()-1: # the last rank takes the remaining entries
+            self.local_slice = slice(offsets[my_pid], self.global_size)
+
+    def test_aitken(self):
+        self.__RunAndCompare('{"type" : "aitken"}')
+
+    def test_iqnils(self):
+        self.__RunAndCompare('{"type" : "iqnils", "timestep_horizon" : 2}')
+
+    def test_mvqn(self):
+        self.__RunAndCompare('{"type" : "mvqn"}')
+
+    def test_anderson(self):
+        self.__RunAndCompare('{"type" : "anderson", "p" : 1}')
+
+    def test_block_mvqn(self):
+        self.__RunAndCompare("""{
+            "type" : "block_mvqn",
+            "solver_sequence" : [
+                { "data_name" : "disp",  "coupled_data_name" : "load" },
+                { "data_name" : "load",  "coupled_data_name" : "disp" }
+            ]
+        }""", ["disp", "load"])
+
+    def __RunAndCompare(self, settings, block_data_names=None):
+        serial_acc = CreateConvergenceAccelerator(KM.Parameters(settings))
+        distributed_acc = CreateConvergenceAccelerator(KM.Parameters(settings))
+        self.assertTrue(distributed_acc.SupportsDistributedData())
+        for data_name in (block_data_names or [None]):
+            distributed_acc.SetDataCommunicator(self.data_comm, data_name)
+
+        # the same global data is generated on all ranks, each rank only passes its part to the distributed accelerator
+        rng = np.random.default_rng(11)
+        local = self.local_slice
+        for _ in range(2):
+            serial_acc.InitializeSolutionStep()
+            distributed_acc.InitializeSolutionStep()
+            for _ in range(4):
+                if block_data_names:
+                    for data_name in block_data_names:
+                        r, x, y, y_residual = rng.random((4, self.global_size))
+                        exp_update = serial_acc.UpdateSolution(r, x, y, data_name, y_residual)
+                        update = distributed_acc.UpdateSolution(r[local], x[local], y[local], data_name, y_residual[local])
+                        self.assertVectorAlmostEqual(update, exp_update[local])
+                else:
+                    r, x = rng.random((2, self.global_size))
+                    exp_update = serial_acc.UpdateSolution(r, x)
+                    update = distributed_acc.UpdateSolution(r[local], x[local])
+                    self.assertVectorAlmostEqual(update, exp_update[local])
+            serial_acc.FinalizeSolutionStep()
+            distributed_acc.FinalizeSolutionStep()
+
+
 if __name__ == '__main__':
     KratosUnittest.main()
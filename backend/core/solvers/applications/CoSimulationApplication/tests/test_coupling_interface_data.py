@@ -1,6 +1,8 @@
 import KratosMultiphysics as KM
 import KratosMultiphysics.KratosUnittest as KratosUnittest
 
+import numpy as np
+
 from KratosMultiphysics.CoSimulationApplication.coupling_interface_data import CouplingInterfaceData
 
 # The expected definitions are here to make the handling of the
@@ -449,6 +451,36 @@ class TestCouplingInterfaceData(KratosUnittest.TestCase):
         self.__CheckSetGetData(set_data_scal, coupling_data_scal)
         self.__CheckSetGetData(set_data_vec, coupling_data_vec)
 
+    def test_GetDataView(self):
+        settings = KM.Parameters("""{
+            "model_part_name" : "mp_4_test",
+            "variable_name"   : "DISPLACEMENT",
+            "dimension"       : 2
+        }""")
+
+        coupling_data = CouplingInterfaceData(settings, self.model)
+
+        view_cur = coupling_data.GetDataView()
+        view_prev = coupling_data.GetDataView(1)
+        self.__CheckData(GetVectorValues(self.mp.Nodes, NodeVectorHistValueCurrent, 2), view_cur)
+        self.__CheckData(GetVectorValues(self.mp.Nodes, NodeVectorHistValuePrevious, 2), view_prev)
+
+        # the view is read-only and refilled in place, whereas GetData returns a copy
+        self.assertFalse(view_cur.flags.writeable)
+        with self.assertRaises(ValueError):
+            view_cur[0] = 1.0
+        data_before = coupling_data.GetData()
+        self.assertTrue(data_before.flags.writeable)
+
+        set_data = GetVectorValues(self.mp.Nodes, ElementVectorValue, 2)
+        coupling_data.SetData(np.array(set_data))
+        self.assertIs(view_cur, coupling_data.GetDataView())
+        self.__CheckData(set_data, view_cur)
+        self.__CheckData(GetVectorValues(self.mp.Nodes, NodeVectorHistValueCurrent, 2), data_before)
+
+        # the buffer of the other solution step is untouched
+        self.__CheckData(GetVectorValues(self.mp.Nodes, NodeVectorHistValuePrevious, 2), view_prev)
+
     def __CheckData(self, exp_data, data):
         self.assertEqual(len(exp_data), len(data))
 
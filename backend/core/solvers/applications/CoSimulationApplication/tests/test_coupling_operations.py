@@ -3,9 +3,11 @@ import KratosMultiphysics.KratosUnittest as KratosUnittest
 
 from KratosMultiphysics.CoSimulationApplication.coupling_interface_data import CouplingInterfaceData
 from KratosMultiphysics.CoSimulationApplication.factories import coupling_operation_factory
+from KratosMultiphysics.CoSimulationApplication.utilities.time_series_utilities import ReadTimeSeries
+import KratosMultiphysics.kratos_utilities as kratos_utils
 from testing_utilities import DummySolverWrapper
 
-from math import sqrt, pi
+from math import sqrt, pi, sin, cos
 
 class TestScalingOperation(KratosUnittest.TestCase):
 
@@ -421,5 +423,120 @@ class TestConversionOperation(KratosUnittest.TestCase):
         self.assertVectorAlmostEqual(expected_elemental_values, elemental_data_output.GetData())
         self.assertVectorAlmostEqual(expected_nodal_values, self.nodal_data.GetData())
 
+
+class TestCouplingOutputOperation(KratosUnittest.TestCase):
+
+    def setUp(self):
+        self.model = KM.Model()
+        self.model_part = self.model.CreateModelPart("default")
+        self.model_part.AddNodalSolutionStepVariable(KM.PRESSURE)
+        self.model_part.ProcessInfo[KM.TIME] = 0.0
+
+        for i in range(5):
+            self.model_part.CreateNewNode(i+1, i*0.1, 0.0, 0.0)
+
+        data_settings = KM.Parameters("""{
+            "model_part_name" : "default",
+            "variable_name"   : "PRESSURE"
+        }""")
+        self.interface_data = CouplingInterfaceData(data_settings, self.model)
+        self.solver_wrappers = {"dummy_solver" : DummySolverWrapper({"data_4_testing" : self.interface_data})}
+        self.file_name = "test_coupling_output_time_series"
+
+    def tearDown(self):
+        kratos_utils.DeleteFileIfExisting(self.file_name + ".bin")
+        kratos_utils.DeleteFileIfExisting(self.file_name + ".json")
+
+    def test_time_series_output_in_coupling_iterations(self):
+        output_op_settings = KM.Parameters("""{
+            "type"              : "coupling_output",
+            "solver"            : "dummy_solver",
+            "execution_point"   : "finalize_coupling_iteration",
+            "output_format"     : "time_series",
+            "output_parameters" : {
+                "data_names" : ["data_4_testing"],
+                "file_name"  : "test_coupling_output_time_series",
+                "queue_size" : 2
+            }
+        }""")
+
+        output_op = coupling_operation_factory.CreateCouplingOperation(output_op_settings, self.solver_wrappers, KM.ProcessInfo(), KM.Testing.GetDefaultDataCommunicator())
+
+        output_op.Initialize()
+        for step in range(1, 3):
+            self.model_part.ProcessInfo[KM.TIME] = 0.5*step
+            output_op.InitializeSolutionStep()
+            for iteration in range(1, 4):
+                output_op.InitializeCouplingIteration()
+                self.interface_data.SetData([10.0*step + iteration] * 5)
+                output_op.FinalizeCouplingIteration()
+            output_op.FinalizeSolutionStep()
+        output_op.Finalize()
+
+        snapshots = ReadTimeSeries(self.file_name)
+        self.assertEqual(len(snapshots), 6)
+        for snapshot, (step, iteration) in zip(snapshots, [(s, i) for s in range(1, 3) for i in range(1, 4)]):
+            self.assertEqual(snapshot["time_step"], step)
+            self.assertEqual(snapshot["coupling_iteration"], iteration)
+            self.assertAlmostEqual(snapshot["time"], 0.5*step)
+            self.assertVectorAlmostEqual(snapshot["data"]["data_4_testing"], [10.0*step + iteration] * 5)
+
+
+class TestComputeBoundaryForceOperation(KratosUnittest.TestCase):
+
+    def test_boundary_force_lines_2d(self):
+        self.__ExecuteTest(2)
+
+    def test_boundary_force_triangles_3d(self):
+        self.__ExecuteTest(3)
+
+    def __ExecuteTest(self, domain_size):
+        model = KM.Model()
+        model_part = model.CreateModelPart("boundary")
+        model_part.AddNodalSolutionStepVariable(KM.PRESSURE)
+        model_part.AddNodalSolutionStepVariable(KM.REACTION)
+        model_part.ProcessInfo[KM.DOMAIN_SIZE] = domain_size
+        model_part.ProcessInfo[KM.TIME] = 0.0
+        props = model_part.GetProperties()[1]
+
+        if domain_size == 2:
+            for i in range(9):
+                model_part.CreateNewNode(i+1, cos(0.3*i), sin(0.3*i), 0.0)
+            for i in range(8):
+                model_part.CreateNewElement("Element2D2N", i+1, [i+1, i+2], props)
+        else:
+            for i in range(16):
+                model_part.CreateNewNode(i+1, i%4, i//4, 0.1*sin(i))
+            for i in range(3):
+                for j in range(3):
+                    n = 4*i + j + 1
+                    model_part.CreateNewElement("Element3D3N", 2*(3*i+j)+1, [n, n+1, n+5], props)
+                    model_part.CreateNewElement("Element3D3N", 2*(3*i+j)+2, [n, n+5, n+4], props)
+
+        for node in model_part.Nodes:
+            node.SetSolutionStepValue(KM.PRESSURE, 0, 1.0 + 0.5*node.X - 0.3*node.Y)
+
+        solver_wrapper = DummySolverWrapper({})
+        solver_wrapper.model = model
+        boundary_force_settings = KM.Parameters("""{
+            "type"              : "compute_boundary_force",
+            "solver"            : "dummy_solver",
+            "model_part_name"   : "boundary",
+            "width"             : 2.5,
+            "write_output_file" : false
+        }""")
+        boundary_force_op = coupling_operation_factory.CreateCouplingOperation(boundary_force_settings, {"dummy_solver" : solver_wrapper}, KM.ProcessInfo(), KM.Testing.GetDefaultDataCommunicator())
+
+        expected_results = boundary_force_op._EvaluateGlobalForcesPerElement()
+        expected_reactions = [node.GetSolutionStepValue(KM.REACTION)[i] for node in model_part.Nodes for i in range(3)]
+
+        KM.VariableUtils().SetVariable(KM.REACTION, KM.Array3([1.0, 2.0, 3.0]), model_part.Nodes)
+        results = boundary_force_op._EvaluateGlobalForces()
+        reactions = [node.GetSolutionStepValue(KM.REACTION)[i] for node in model_part.Nodes for i in range(3)]
+
+        self.assertVectorAlmostEqual(expected_results, results)
+        self.assertVectorAlmostEqual(expected_reactions, reactions)
+        self.assertNotAlmostEqual(results[-1], 0.0)
+
 if __name__ == '__main__':
     KratosUnittest.main()
\ No newline at end of file
@@ -1,8 +1,9 @@
 import KratosMultiphysics.KratosUnittest as KratosUnittest
 
-from KratosMultiphysics.CoSimulationApplication.function_callback_utility import GenericCallFunction
+from KratosMultiphysics.CoSimulationApplication.function_callback_utility import GenericCallFunction, GenericCallVectorizedFunction
 
 from math import pi
+import numpy as np
 
 class TestGenericCallFunction(KratosUnittest.TestCase):
 
@@ -39,6 +40,15 @@ class TestGenericCallFunction(KratosUnittest.TestCase):
         func_str = "(sin((t/0.006289)/100*pi/2))**2"
         self.assertAlmostEqual(1.0, GenericCallFunction(func_str, scope))
 
+    def test_vectorized_eval(self):
+        scope = {"t" : 0.3, "omega" : np.array([1.0, 2.0, 3.0]), "A" : np.array([10.0, -1.0, 0.5])}
+        func_str = "A * sin(omega * t) + pow(t, 2)"
+        expected = [GenericCallFunction(func_str, {"t" : 0.3, "omega" : omega, "A" : A}) for omega, A in zip(scope["omega"], scope["A"])]
+        self.assertVectorAlmostEqual(expected, GenericCallVectorizedFunction(func_str, scope))
+
+        with self.assertRaisesRegex(Exception, 'Argument "x" in function string "sin\\(x\\)" was not recognized!'):
+            GenericCallVectorizedFunction("sin(x)", scope)
+
 
 if __name__ == '__main__':
     KratosUnittest.main()
@@ -0,0 +1,172 @@
+import KratosMultiphysics as KM
+import KratosMultiphysics.KratosUnittest as KratosUnittest
+
+from KratosMultiphysics.CoSimulationApplication.utilities.low_rank_utilities import LowRankJacobian, SolveIdentityMinusProduct
+from KratosMultiphysics.CoSimulationApplication.convergence_accelerators import mvqn
+
+import numpy as np
+
+class TestLowRankJacobian(KratosUnittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+
+    def test_updates_match_dense_jacobian(self):
+        size = 25
+        diagonal = -8.0
+        J = LowRankJacobian(size, size, diagonal=diagonal)
+        J_dense = diagonal * np.eye(size)
+
+        for num_cols in [4, 6, 3]:
+            V = self.rng.random((size, num_cols))
+            W = self.rng.random((size, num_cols))
+            J.ComputeUpdate(V, W, np.finfo(float).eps)
+            J_hat_dense = J_dense + (V - J_dense @ W) @ np.linalg.pinv(W)
+
+            y = self.rng.random(size)
+            self.assertVectorAlmostEqual(J.Dot(y, include_current=True), J_hat_dense @ y)
+            self.assertVectorAlmostEqual(J.Dot(y), J_dense @ y)
+            self.assertVectorAlmostEqual(J.Solve(y), np.linalg.solve(J_hat_dense, y))
+
+            J.Commit()
+            J_dense = J_hat_dense
+            self.assertVectorAlmostEqual(J.Solve(y, include_current=False), np.linalg.solve(J_dense, y))
+
+        self.assertEqual(J.Rank(), 13)
+
+    def test_timestep_horizon(self):
+        size = 10
+        J = LowRankJacobian(size, size, diagonal=1.0, timestep_horizon=2)
+        for num_cols in [2, 3, 4]:
+            J.ComputeUpdate(self.rng.random((size, num_cols)), self.rng.random((size, num_cols)), 1e-12)
+            J.Commit()
+        self.assertEqual(J.Rank(), 7) # only the updates of the last two time steps are kept
+
+        A, B = J.Factors()
+        y = self.rng.random(size)
+        self.assertVectorAlmostEqual(J.Solve(y), np.linalg.solve(np.eye(size) + A @ B.T, y))
+
+    def test_rank_bounded_over_many_time_steps(self):
+        # all updates are kept, the factors are recompressed such that the rank does not exceed the size
+        size = 10
+        diagonal = -8.0
+        J = LowRankJacobian(size, size, diagonal=diagonal)
+        J_dense = diagonal * np.eye(size)
+
+        for _ in range(200):
+            V = self.rng.random((size, 5))
+            W = self.rng.random((size, 5))
+            J.ComputeUpdate(V, W, np.finfo(float).eps)
+            J_dense = J_dense + (V - J_dense @ W) @ np.linalg.pinv(W)
+            J.Commit()
+            self.assertLessEqual(J.Rank(), size)
+
+        A, B = J.Factors()
+        self.assertMatrixAlmostEqual(diagonal * np.eye(size) + A @ B.T, J_dense, 6)
+        y = self.rng.random(size)
+        self.assertVectorAlmostEqual(J.Solve(y), np.linalg.solve(J_dense, y))
+
+    def test_rank_bounded_non_square(self):
+        size_x, size_y = 6, 9
+        J = LowRankJacobian(size_x, size_y)
+        J_dense = np.zeros((size_x, size_y))
+        for _ in range(50):
+            V = self.rng.random((size_x, 4))
+            W = self.rng.random((size_y, 4))
+            J.ComputeUpdate(V, W, 1e-12)
+            J_dense = J_dense + (V - J_dense @ W) @ np.linalg.pinv(W)
+            J.Commit()
+            self.assertLessEqual(J.Rank(), size_x)
+
+        y = self.rng.random(size_y)
+        self.assertVectorAlmostEqual(J.Dot(y), J_dense @ y)
+
+    def test_solve_identity_minus_product(self):
+        size_x, size_y = 12, 9
+        J_x = LowRankJacobian(size_x, size_y)
+        J_y = LowRankJacobian(size_y, size_x)
+        J_x.ComputeUpdate(0.3*self.rng.random((size_x, 3)), self.rng.random((size_y, 3)), 1e-9)
+        J_y.ComputeUpdate(0.3*self.rng.random((size_y, 4)), self.rng.random((size_x, 4)), 1e-9)
+
+        A_x, B_x = J_x.Factors()
+        A_y, B_y = J_y.Factors()
+        b = self.rng.random(size_x)
+        expected = np.linalg.solve(np.eye(size_x) - (A_x @ B_x.T) @ (A_y @ B_y.T), b)
+        self.assertVectorAlmostEqual(SolveIdentityMinusProduct(J_x, J_y, b), expected)
+
+        # without an update of the current time step the Jacobians are zero
+        self.assertVectorAlmostEqual(SolveIdentityMinusProduct(J_x, J_y, b, include_current=False), b)
+
+
+class TestMVQNLowRank(KratosUnittest.TestCase):
+
+    def test_update_matches_dense_jacobian(self):
+        rng = np.random.default_rng(3)
+        size = 20
+        alpha = 0.125
+        Q, _ = np.linalg.qr(rng.random((size, size)))
+        M = Q @ np.diag(np.linspace(-1.5, 0.9, size)) @ Q.T
+
+        accelerator = mvqn.Create(KM.Parameters("""{
+            "type"  : "mvqn",
+            "alpha" : 0.125
+        }"""))
+
+        x = np.zeros(size)
+        J_dense = None
+        for _ in range(3):
+            b = rng.random(size)
+            residuals, solutions = [], []
+            for _ in range(6):
+                r = (M @ x + b) - x
+                residuals.insert(0, r)
+                solutions.insert(0, x.copy())
+                delta_x = accelerator.UpdateSolution(r, x)
+
+                # reference: dense Jacobian as in the original formulation
+                if len(residuals) == 1:
+                    expected_delta_x = alpha * r if J_dense is None else np.linalg.solve(J_dense, -r)
+                else:
+                    if J_dense is None:
+                        J_dense = -np.eye(size) / alpha
+                    V = np.column_stack([residuals[i] - residuals[i+1] for i in range(len(residuals)-1)])
+                    W = np.column_stack([solutions[i] - solutions[i+1] for i in range(len(solutions)-1)])
+                    J_hat_dense = J_dense + (V - J_dense @ W) @ np.linalg.pinv(W)
+                    expected_delta_x = np.linalg.solve(J_hat_dense, -r)
+
+                self.assertVectorAlmostEqual(delta_x, expected_delta_x)
+                x += delta_x
+            accelerator.FinalizeSolutionStep()
+            J_dense = J_hat_dense
+
+    def test_many_time_steps_small_interface(self):
+        rng = np.random.default_rng(5)
+        size = 10
+        alpha = 0.125
+        Q, _ = np.linalg.qr(rng.random((size, size)))
+        M = Q @ np.diag(np.linspace(-1.5, 0.9, size)) @ Q.T
+
+        accelerator = mvqn.Create(KM.Parameters("""{
+            "type"  : "mvqn",
+            "alpha" : 0.125
+        }"""))
+
+        x = np.zeros(size)
+        for _ in range(100):
+            b = rng.random(size)
+            for _ in range(5):
+                r = (M @ x + b) - x
+                x += accelerator.UpdateSolution(r, x)
+            accelerator.FinalizeSolutionStep()
+            self.assertLessEqual(accelerator.J.Rank(), size)
+
+        # the Jacobian approximates the one of the linear problem, the fixed point is found in few iterations
+        b = rng.random(size)
+        for _ in range(5):
+            r = (M @ x + b) - x
+            x += accelerator.UpdateSolution(r, x)
+        self.assertVectorAlmostEqual(x, np.linalg.solve(np.eye(size) - M, b), 6)
+
+
+if __name__ == '__main__':
+    KratosUnittest.main()
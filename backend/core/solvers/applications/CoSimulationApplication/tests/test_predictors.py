@@ -0,0 +1,95 @@
+import KratosMultiphysics as KM
+import KratosMultiphysics.KratosUnittest as KratosUnittest
+
+from KratosMultiphysics.CoSimulationApplication.factories.predictor_factory import CreatePredictor
+from testing_utilities import DummySolverWrapper
+
+import numpy as np
+
+class HistoryFreeInterfaceData:
+    """Interface data that only stores the current values, like the data of the SDoF solver"""
+    def __init__(self, data):
+        self.data = np.array(data, dtype=float)
+
+    def IsDefinedOnThisRank(self):
+        return True
+
+    def GetData(self, solution_step_index=0):
+        if solution_step_index != 0:
+            raise Exception("accessing data from previous steps is only possible with historical nodal data!")
+        return self.data.copy()
+
+    def SetData(self, new_data, solution_step_index=0):
+        self.data = np.array(new_data, dtype=float)
+
+
+class TestLeastSquaresPredictor(KratosUnittest.TestCase):
+
+    def test_order_one_is_linear_extrapolation(self):
+        solutions = [np.array([1.0, -2.0]), np.array([1.5, -1.0]), np.array([2.5, 0.5])]
+        predictions = self.__RunPredictor(1, 2, solutions)
+
+        self.assertVectorAlmostEqual(predictions[0], [123.0, 123.0]) # no solution available yet, the data is not changed
+        self.assertVectorAlmostEqual(predictions[1], solutions[0]) # constant
+        self.assertVectorAlmostEqual(predictions[2], 2*solutions[1] - solutions[0])
+
+    def test_quadratic_is_extrapolated_exactly(self):
+        def Solution(step):
+            return np.array([0.5*step**2 - step + 3.0, -2.0*step**2 + 0.1])
+
+        solutions = [Solution(step) for step in range(8)]
+        predictions = self.__RunPredictor(2, 4, solutions)
+
+        for step in range(3, 8):
+            self.assertVectorAlmostEqual(predictions[step], Solution(step))
+
+        # reduced order in the second step (only two solutions available)
+        self.assertVectorAlmostEqual(predictions[2], 2*solutions[1] - solutions[0])
+
+    def test_least_squares_fit(self):
+        rng = np.random.default_rng(42)
+        solutions = [np.array([np.sin(0.3*step) + 0.01*rng.standard_normal()]) for step in range(10)]
+        predictions = self.__RunPredictor(2, 5, solutions)
+
+        for step in range(5, 10):
+            # fitting the last 5 (in the ring buffer) of the previous solutions
+            coefficients = np.polyfit(np.arange(step-5, step), [solution[0] for solution in solutions[step-5:step]], 2)
+            self.assertAlmostEqual(predictions[step][0], np.polyval(coefficients, step))
+
+    def test_invalid_settings(self):
+        with self.assertRaisesRegex(Exception, '"order" has to be at least 1'):
+            self.__CreatePredictor(0, 4, [0.0])
+        with self.assertRaisesRegex(Exception, r'"number_of_steps" has to be at least "order"\+1'):
+            self.__CreatePredictor(3, 3, [0.0])
+
+    def __RunPredictor(self, order, number_of_steps, solutions):
+        """Emulates the time loop: predicting the solution of every step, then setting the converged solution
+        Returns the data after the prediction of every step
+        """
+        predictor, interface_data = self.__CreatePredictor(order, number_of_steps, np.zeros_like(solutions[0]) + 123.0)
+        predictor.Initialize()
+        predictions = []
+        for solution in solutions:
+            predictor.InitializeSolutionStep()
+            predictor.Predict()
+            predictions.append(interface_data.GetData())
+
+            interface_data.SetData(solution) # the converged solution of this step
+            predictor.FinalizeSolutionStep()
+        predictor.Finalize()
+        return predictions
+
+    def __CreatePredictor(self, order, number_of_steps, initial_data):
+        interface_data = HistoryFreeInterfaceData(initial_data)
+        settings = KM.Parameters("""{
+            "type"            : "least_squares",
+            "solver"          : "dummy_solver",
+            "data_name"       : "data_4_testing",
+            "order"           : %d,
+            "number_of_steps" : %d
+        }""" % (order, number_of_steps))
+        return CreatePredictor(settings, DummySolverWrapper({"data_4_testing" : interface_data})), interface_data
+
+
+if __name__ == '__main__':
+    KratosUnittest.main()
@@ -0,0 +1,111 @@
+import KratosMultiphysics as KM
+import KratosMultiphysics.KratosUnittest as KratosUnittest
+
+from KratosMultiphysics.CoSimulationApplication.utilities.qr_utilities import IncrementalQR
+from KratosMultiphysics.CoSimulationApplication.convergence_accelerators import iqnils
+
+import numpy as np
+
+class TestIncrementalQR(KratosUnittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(42)
+        self.size = 30
+
+    def test_insert_and_delete_columns(self):
+        qr = IncrementalQR(self.size)
+        columns = []
+        for _ in range(8):
+            v = self.rng.random(self.size)
+            qr.InsertColumn(v)
+            columns.insert(0, v) # newest column first
+            self.__CheckFactorization(qr, columns)
+
+        for index in [3, 0, 5]:
+            qr.DeleteColumn(index)
+            del columns[index]
+            self.__CheckFactorization(qr, columns)
+
+        b = self.rng.random(self.size)
+        V = np.column_stack(columns)
+        self.assertVectorAlmostEqual(qr.Solve(b), np.linalg.lstsq(V, b, rcond=None)[0])
+
+    def test_filter_dependent_column(self):
+        qr = IncrementalQR(self.size)
+        columns = []
+        for _ in range(4):
+            columns.insert(0, self.rng.random(self.size))
+            qr.InsertColumn(columns[0])
+
+        # the new column is a combination of older ones, one of the older ones has to be removed
+        dependent = columns[1] - 2.0*columns[3]
+        qr.InsertColumn(dependent)
+        columns.insert(0, dependent)
+        self.__CheckFactorization(qr, columns)
+
+        kept_columns = qr.Filter(1e-10)
+        self.assertEqual(np.count_nonzero(~kept_columns), 1)
+        self.assertTrue(kept_columns[0]) # the newest column is kept
+        self.__CheckFactorization(qr, [c for c, kept in zip(columns, kept_columns) if kept])
+
+    def test_too_many_columns(self):
+        qr = IncrementalQR(2)
+        qr.InsertColumn(np.array([1.0, 0.0]))
+        qr.InsertColumn(np.array([1.0, 1.0]))
+        with self.assertRaisesRegex(Exception, "would exceed the number of rows"):
+            qr.InsertColumn(np.array([0.0, 1.0]))
+
+    def __CheckFactorization(self, qr, columns):
+        V = np.column_stack(columns)
+        num_cols = len(columns)
+        self.assertEqual(qr.NumberOfColumns(), num_cols)
+        self.assertMatrixAlmostEqual(qr.Q @ qr.R, V)
+        self.assertMatrixAlmostEqual(qr.Q.T @ qr.Q, np.eye(num_cols))
+        self.assertMatrixAlmostEqual(np.tril(qr.R, -1), np.zeros((num_cols, num_cols)))
+
+
+class TestIQNILSIncrementalQR(KratosUnittest.TestCase):
+
+    def test_update_matches_least_squares(self):
+        rng = np.random.default_rng(0)
+        size = 40
+        Q, _ = np.linalg.qr(rng.random((size, size)))
+        M = Q @ np.diag(np.linspace(-1.5, 0.9, size)) @ Q.T
+
+        accelerator = iqnils.Create(KM.Parameters("""{
+            "type"              : "iqnils",
+            "iteration_horizon" : 20,
+            "timestep_horizon"  : 2
+        }"""))
+
+        x = np.zeros(size)
+        residuals, predictions = [], []
+        old_V, old_W = np.empty((size, 0)), np.empty((size, 0))
+        for _ in range(3):
+            b = rng.random(size)
+            residuals.clear()
+            predictions.clear()
+            for _ in range(8):
+                r = (M @ x + b) - x
+                residuals.insert(0, r)
+                predictions.insert(0, x + r)
+                delta_x = accelerator.UpdateSolution(r, x)
+
+                # reference: V and W assembled from all iterates, solved from scratch
+                V_new = np.column_stack([residuals[i] - residuals[i+1] for i in range(len(residuals)-1)] or [np.empty((size, 0))])
+                W_new = np.column_stack([predictions[i] - predictions[i+1] for i in range(len(predictions)-1)] or [np.empty((size, 0))])
+                V = np.hstack((V_new, old_V))
+                W = np.hstack((W_new, old_W))
+                if V.shape[1] == 0:
+                    expected_delta_x = 0.125 * r
+                else:
+                    c = np.linalg.lstsq(V, -r, rcond=None)[0]
+                    expected_delta_x = W @ c + r
+                self.assertVectorAlmostEqual(delta_x, expected_delta_x)
+                x += delta_x
+            accelerator.FinalizeSolutionStep()
+            old_V, old_W = V_new, W_new
+
+
+if __name__ == '__main__':
+    KratosUnittest.main()
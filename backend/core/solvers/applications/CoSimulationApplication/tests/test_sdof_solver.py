@@ -1,10 +1,12 @@
 import KratosMultiphysics as KM
 from KratosMultiphysics import kratos_utilities
 import KratosMultiphysics.KratosUnittest as KratosUnittest
-from KratosMultiphysics.CoSimulationApplication.solver_wrappers.sdof.sdof_solver import SDoFSolver
+from KratosMultiphysics.CoSimulationApplication.solver_wrappers.sdof.sdof_solver import SDoFSolver, SDoFEnsembleSolver
+from KratosMultiphysics.CoSimulationApplication.utilities.time_series_utilities import ReadTimeSeries
 from KratosMultiphysics.CoSimulationApplication.solver_wrappers.sdof.sdof_solver_wrapper import Create as CreateSDofSolverWrapper
 
 import os
+import copy
 import numpy as np
 
 class TestSdofSolver(KratosUnittest.TestCase):
@@ -167,5 +169,121 @@ class TestSdofSolver(KratosUnittest.TestCase):
         with self.assertRaisesRegex(Exception, 'Variable "DISPLACEMENT" of interface data "disp" of solver "custom_sdof_solver_wrapper" cannot be used for the SDof Solver!'):
             sdof_solver_wrapper.Check()
 
+class TestSdofEnsembleSolver(KratosUnittest.TestCase):
+
+    def setUp(self):
+        # the ensemble contains the systems of the tests of the SDoFSolver, in the same order as the reference files
+        self.ensemble_settings = {
+        "system_parameters":{
+            "mass"      : 10.0,
+            "stiffness" : 1579.14,
+            "damping"   : 10.0
+            },
+        "time_integration_parameters":{
+                    "alpha_m"   : -0.3,
+                    "start_time": 0.0,
+                    "time_step" : 0.01
+                },
+        "initial_values":{
+            "displacement"  : [1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+            "velocity"      : [0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+            },
+        "boundary_conditions":{
+            "load_impulse"                      : [0.0, 0.0, 1000.0, 0.0, 0.0, 0.0, 10.0],
+            "omega_force"                       : [0.0, 0.0, 0.0, 12.57, 0.0, 3.0, 3.0],
+            "omega_root_point_displacement"     : [0.0, 0.0, 0.0, 0.0, 12.57, 12.57, 12.57],
+            "amplitude_root_point_displacement" : [0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0],
+            "amplitude_force"                   : [0.0, 0.0, 0.0, 1000.0, 0.0, 1000.0, 1000.0]
+            },
+        "output_parameters":{
+            "write_output_file": True,
+            "file_name" : "result_ensemble"
+            }
+        }
+        self.reference_files = [
+            "ref_sdof_initial_displacement.dat",
+            "ref_sdof_initial_velocity.dat",
+            "ref_sdof_impulse.dat",
+            "ref_sdof_force_excitation.dat",
+            "ref_sdof_root_point_displacement.dat",
+            "ref_sdof_root_point_displacement_external_force.dat",
+            "ref_sdof_root_point_displacement_impulse.dat"
+        ]
+        self.end_time = 1.0
+
+    def tearDown(self):
+        kratos_utilities.DeleteFileIfExisting("result_ensemble.bin")
+        kratos_utilities.DeleteFileIfExisting("result_ensemble.json")
+
+    def __Run(self, system):
+        system.Initialize()
+        time = 0.0
+        while(time <= self.end_time):
+            time = system.AdvanceInTime(time)
+            system.SolveSolutionStep()
+            system.OutputSolutionStep()
+        system.Finalize()
+
+    def test_reference_results(self):
+        self.__Run(SDoFEnsembleSolver(self.ensemble_settings))
+
+        snapshots = ReadTimeSeries("result_ensemble")
+        result_names = ["displacement", "velocity", "acceleration", "root_point_displacement", "root_point_velocity", "root_point_acceleration"]
+        for i_system, ref_file_name in enumerate(self.reference_files):
+            ref = np.loadtxt(os.path.join("reference_files", ref_file_name), skiprows=1)
+            self.assertEqual(len(ref), len(snapshots))
+            for line_ref, snapshot in zip(ref, snapshots):
+                self.assertAlmostEqual(line_ref[0], snapshot["time"])
+                for entry_ref, name in zip(line_ref[1:7], result_names):
+                    self.assertAlmostEqual(entry_ref, snapshot["data"][name][i_system])
+                self.assertAlmostEqual(line_ref[-1], snapshot["data"]["reaction"][i_system])
+
+    def test_coupling_values(self):
+        # the values that are exchanged with other solvers are the same as for the individual systems
+        settings = copy.deepcopy(self.ensemble_settings)
+        settings["output_parameters"]["write_output_file"] = False
+        settings["system_parameters"]["stiffness"] = [1579.14, 800.0, 400.0]
+        settings["boundary_conditions"]["amplitude_force"] = 1000.0
+        settings["boundary_conditions"]["omega_force"] = 3.0
+        settings["boundary_conditions"]["excitation_function_force"] = "A * sin(omega * t) * exp(-t)"
+        del settings["initial_values"]
+        del settings["boundary_conditions"]["load_impulse"]
+        del settings["boundary_conditions"]["omega_root_point_displacement"]
+        del settings["boundary_conditions"]["amplitude_root_point_displacement"]
+
+        ensemble = SDoFEnsembleSolver(settings)
+        self.assertEqual(ensemble.number_of_systems, 3)
+        systems = []
+        for stiffness in settings["system_parameters"]["stiffness"]:
+            single_settings = copy.deepcopy(settings)
+            single_settings["system_parameters"]["stiffness"] = stiffness
+            systems.append(SDoFSolver(single_settings))
+
+        ensemble.Initialize()
+        for system in systems:
+            system.Initialize()
+
+        time = 0.0
+        while(time <= self.end_time):
+            root_point_displacement = 0.01 * np.sin(5.0 * time) * np.arange(1, 4)
+            time = ensemble.AdvanceInTime(time)
+            ensemble.SetSolutionStepValue("ROOT_POINT_DISPLACEMENT", root_point_displacement)
+            ensemble.SolveSolutionStep()
+            for system, value in zip(systems, root_point_displacement):
+                system.AdvanceInTime(time - ensemble.delta_t)
+                system.SetSolutionStepValue("ROOT_POINT_DISPLACEMENT", value)
+                system.SolveSolutionStep()
+
+            for identifier in ["DISPLACEMENT", "VELOCITY", "ACCELERATION", "REACTION"]:
+                self.assertVectorAlmostEqual(ensemble.GetSolutionStepValue(identifier),
+                                             [system.GetSolutionStepValue(identifier) for system in systems])
+
+        self.assertVectorAlmostEqual(ensemble.GetSolutionStepValue("VOLUME_ACCELERATION"), [98.1, 98.1, 98.1])
+
+    def test_inconsistent_sizes(self):
+        self.ensemble_settings["system_parameters"]["mass"] = [1.0, 2.0]
+        with self.assertRaisesRegex(Exception, "All parameters given as lists must have the same length"):
+            SDoFEnsembleSolver(self.ensemble_settings)
+
 if __name__ == '__main__':
     KratosUnittest.main()
@@ -0,0 +1,82 @@
+import KratosMultiphysics as KM
+import KratosMultiphysics.KratosUnittest as KratosUnittest
+
+from KratosMultiphysics.CoSimulationApplication.utilities.solver_execution_utilities import SolverExecutor
+
+import time
+import threading
+
+class SleepingSolver:
+    """Emulates a solver that releases the GIL while solving (e.g. a solver running in its own process)"""
+    def __init__(self, solve_time, fail=False):
+        self.solve_time = solve_time
+        self.fail = fail
+        self.num_solves = 0
+        self.thread_names = set()
+
+    def SolveSolutionStep(self):
+        time.sleep(self.solve_time)
+        self.thread_names.add(threading.current_thread().name)
+        self.num_solves += 1
+        if self.fail:
+            raise RuntimeError("solver failed")
+
+
+class TestSolverExecutor(KratosUnittest.TestCase):
+
+    def test_sequential_execution(self):
+        solvers = {"fluid" : SleepingSolver(0.05), "structure" : SleepingSolver(0.02)}
+        executor = SolverExecutor(solvers, False)
+
+        times = executor.SolveSolutionStep()
+        executor.Finalize()
+
+        self.assertEqual(list(times.keys()), ["fluid", "structure"])
+        self.assertGreaterEqual(times["fluid"], 0.05)
+        self.assertEqual(solvers["fluid"].thread_names, {threading.current_thread().name})
+
+        summary = executor.GetTimingSummary()
+        self.assertFalse(summary["concurrent"])
+        self.assertEqual(summary["num_calls"], 1)
+        self.assertGreaterEqual(summary["wall_time"], summary["sum_solver_time"])
+        self.assertEqual(summary["overlap"], 0.0)
+
+    @KratosUnittest.skipIf(KM.IsDistributedRun(), "Concurrent execution is disabled in distributed runs")
+    def test_concurrent_execution(self):
+        solvers = {"fluid" : SleepingSolver(0.2), "structure" : SleepingSolver(0.2), "thermal" : SleepingSolver(0.1)}
+        executor = SolverExecutor(solvers, True)
+
+        for _ in range(2):
+            executor.SolveSolutionStep()
+        executor.Finalize()
+
+        for solver in solvers.values():
+            self.assertEqual(solver.num_solves, 2)
+            self.assertNotIn(threading.current_thread().name, solver.thread_names)
+
+        summary = executor.GetTimingSummary()
+        self.assertTrue(summary["concurrent"])
+        self.assertEqual(summary["num_calls"], 2)
+        self.assertAlmostEqual(summary["max_solver_time"], 0.4, delta=0.1)
+        self.assertLess(summary["wall_time"], summary["sum_solver_time"])
+        self.assertGreater(summary["overlap"], 0.5)
+
+    @KratosUnittest.skipIf(KM.IsDistributedRun(), "Concurrent execution is disabled in distributed runs")
+    def test_concurrent_execution_failing_solver(self):
+        solvers = {"fluid" : SleepingSolver(0.01, fail=True), "structure" : SleepingSolver(0.1)}
+        executor = SolverExecutor(solvers, True)
+
+        with self.assertRaisesRegex(Exception, 'Solver "fluid" failed while being executed concurrently'):
+            executor.SolveSolutionStep()
+        executor.Finalize()
+
+        # the other solver is not interrupted
+        self.assertEqual(solvers["structure"].num_solves, 1)
+
+    def test_single_solver_is_not_executed_concurrently(self):
+        executor = SolverExecutor({"fluid" : SleepingSolver(0.0)}, True)
+        self.assertFalse(executor.GetTimingSummary()["concurrent"])
+
+
+if __name__ == '__main__':
+    KratosUnittest.main()
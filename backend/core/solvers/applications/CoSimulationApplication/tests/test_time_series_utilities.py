@@ -0,0 +1,138 @@
+import KratosMultiphysics.KratosUnittest as KratosUnittest
+import KratosMultiphysics.kratos_utilities as kratos_utils
+
+from KratosMultiphysics.CoSimulationApplication.utilities.time_series_utilities import TimeSeriesWriter, ReadTimeSeries
+
+import numpy as np
+import threading
+
+class BlockingFile:
+    """Emulates a slow file system: writing waits until the test releases it"""
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.release = threading.Event()
+
+    def write(self, data):
+        self.release.wait()
+        return self.data_file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.data_file, name)
+
+
+class FailingFile(BlockingFile):
+    def write(self, data):
+        raise IOError("disk full")
+
+
+class TestTimeSeriesWriter(KratosUnittest.TestCase):
+
+    def setUp(self):
+        self.file_name = "test_time_series_writer"
+
+    def tearDown(self):
+        for extension in (".bin", ".json", ".jsonl"):
+            kratos_utils.DeleteFileIfExisting(self.file_name + extension)
+
+    def test_binary_container(self):
+        self.__WriteAndRead("binary", True)
+
+    def test_json_container(self):
+        self.__WriteAndRead("json", True)
+
+    def test_synchronous_writing(self):
+        self.__WriteAndRead("binary", False)
+
+    def test_snapshot_is_copied(self):
+        writer = TimeSeriesWriter(self.file_name)
+        values = np.ones(4)
+        writer.Write({"disp" : values}, 1)
+        values[:] = 5.0 # changing the data afterwards must not affect the output
+        writer.Close()
+
+        snapshots = ReadTimeSeries(self.file_name)
+        self.assertVectorAlmostEqual(snapshots[0]["data"]["disp"], np.ones(4))
+
+    def test_handed_over_arrays(self):
+        writer = TimeSeriesWriter(self.file_name)
+        writer.Write({"disp" : np.linspace(0.0, 1.0, 4), "ids" : np.arange(3)}, 1, copy=False)
+        writer.Close()
+
+        data = ReadTimeSeries(self.file_name)[0]["data"]
+        self.assertIsInstance(data["disp"], np.memmap) # mapped, not read into memory
+        self.assertVectorAlmostEqual(data["disp"], np.linspace(0.0, 1.0, 4))
+        self.assertEqual(data["ids"].dtype, np.float64) # converted although not copied
+        self.assertVectorAlmostEqual(data["ids"], np.arange(3.0))
+
+    def test_flush(self):
+        writer = TimeSeriesWriter(self.file_name)
+        writer.Write({"disp" : np.arange(3.0)}, 1)
+        writer.Flush()
+        self.assertEqual(len(ReadTimeSeries(self.file_name)), 1) # readable before closing
+
+        writer.Write({"disp" : np.arange(3.0)}, 2)
+        writer.Close()
+        self.assertEqual(len(ReadTimeSeries(self.file_name)), 2)
+
+    def test_backpressure(self):
+        writer = TimeSeriesWriter(self.file_name, queue_size=1)
+        blocking_file = BlockingFile(writer.data_file)
+        writer.data_file = blocking_file
+
+        writer.Write({"disp" : np.zeros(2)}, 1) # taken by the background thread, which blocks in writing
+        write_thread = threading.Thread(target=lambda: [writer.Write({"disp" : np.zeros(2)}, step) for step in (2, 3)])
+        write_thread.start()
+        write_thread.join(0.2)
+        self.assertTrue(write_thread.is_alive()) # the queue is full, the third snapshot has to wait
+
+        blocking_file.release.set()
+        write_thread.join()
+        writer.Close()
+
+        self.assertGreaterEqual(writer.num_blocking_writes, 1)
+        self.assertEqual([snapshot["time_step"] for snapshot in ReadTimeSeries(self.file_name)], [1, 2, 3])
+
+    def test_error_in_background_thread(self):
+        writer = TimeSeriesWriter(self.file_name)
+        writer.data_file = FailingFile(writer.data_file)
+
+        writer.Write({"disp" : np.zeros(2)}, 1)
+        with self.assertRaisesRegex(Exception, 'Writing the time series "test_time_series_writer" failed'):
+            writer.Flush()
+        with self.assertRaisesRegex(Exception, 'Writing the time series "test_time_series_writer" failed'):
+            writer.Close()
+
+    def test_unknown_container(self):
+        with self.assertRaisesRegex(Exception, 'Container "hdf5" is not available'):
+            TimeSeriesWriter(self.file_name, container="hdf5")
+
+    def __WriteAndRead(self, container, asynchronous):
+        writer = TimeSeriesWriter(self.file_name, container, queue_size=2, asynchronous=asynchronous)
+        expected = []
+        for step in range(1, 4):
+            for iteration in range(1, 3):
+                data = {
+                    "disp" : np.linspace(0.0, 1.0, 6) * step + iteration,
+                    "load" : np.arange(4.0).reshape(2, 2) * iteration
+                }
+                writer.Write(data, step, iteration, 0.1*step)
+                expected.append((step, iteration, data))
+        writer.Close()
+        writer.Close() # closing twice is allowed
+
+        snapshots = ReadTimeSeries(self.file_name, container)
+        self.assertEqual(len(snapshots), len(expected))
+        for snapshot, (step, iteration, data) in zip(snapshots, expected):
+            self.assertEqual(snapshot["time_step"], step)
+            self.assertEqual(snapshot["coupling_iteration"], iteration)
+            self.assertAlmostEqual(snapshot["time"], 0.1*step)
+            self.assertVectorAlmostEqual(snapshot["data"]["disp"], data["disp"])
+            self.assertEqual(snapshot["data"]["load"].shape, (2, 2))
+            self.assertVectorAlmostEqual(snapshot["data"]["load"].ravel(), data["load"].ravel())
+
+        with self.assertRaisesRegex(Exception, "is already closed"):
+            writer.Write(data, 4)
+
+
+if __name__ == '__main__':
+    KratosUnittest.main()
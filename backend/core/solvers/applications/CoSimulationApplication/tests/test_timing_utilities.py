@@ -0,0 +1,98 @@
+import KratosMultiphysics as KM
+import KratosMultiphysics.KratosUnittest as KratosUnittest
+
+from KratosMultiphysics.CoSimulationApplication.utilities import timing_utilities
+
+import os
+import json
+import time
+
+class DummyComponent:
+    def __init__(self, sleep_time, nested_component=None):
+        self.sleep_time = sleep_time
+        self.nested_component = nested_component
+
+    def Execute(self):
+        time.sleep(self.sleep_time)
+        if self.nested_component:
+            self.nested_component.Execute()
+        return 42
+
+
+class TestCoSimulationTimer(KratosUnittest.TestCase):
+
+    def setUp(self):
+        self.trace_file_name = "test_timing_utilities_trace.json"
+        self.timer = timing_utilities.CoSimulationTimer(KM.Parameters("""{
+            "enabled"         : true,
+            "print_summary"   : false,
+            "trace_file_name" : "%s"
+        }""" % self.trace_file_name), "test")
+        timing_utilities.SetActiveTimer(self.timer)
+
+    def tearDown(self):
+        timing_utilities.SetActiveTimer(None)
+        data_comm = KM.ParallelEnvironment.GetDefaultDataCommunicator()
+        if data_comm.IsDistributed():
+            self.trace_file_name = "test_timing_utilities_trace_rank{}.json".format(data_comm.Rank())
+        if os.path.isfile(self.trace_file_name):
+            os.remove(self.trace_file_name)
+
+    def test_disabled_timer_does_not_instrument(self):
+        timing_utilities.SetActiveTimer(None)
+        component = DummyComponent(0.0)
+        timing_utilities.InstrumentMethods(component, "mapper", "map", ["Execute"])
+        self.assertNotIn("Execute", vars(component))
+
+    def test_nested_calls_and_aggregation(self):
+        mapper = DummyComponent(0.02)
+        solver = DummyComponent(0.05, nested_component=mapper)
+        timing_utilities.InstrumentMethods(mapper, "mapper", "fluid_to_structure", ["Execute", "NonExistingMethod"])
+        timing_utilities.InstrumentMethods(solver, "solver", "fluid", ["Execute"])
+
+        for step in [1, 2]:
+            self.timer.SetTimeStep(step, 0.1*step)
+            for iteration in [1, 2, 3]:
+                timing_utilities.SetCouplingIteration(iteration)
+                self.assertEqual(solver.Execute(), 42) # the return value is passed through
+
+        summary = {row["category"] : row for row in self.timer.GetSummary()}
+        self.assertEqual(summary["solver"]["calls"], 6)
+        self.assertEqual(summary["mapper"]["calls"], 6)
+        # the time of the nested mapper is not part of the exclusive time of the solver
+        self.assertGreaterEqual(summary["mapper"]["exclusive_time"], 6*0.02)
+        self.assertGreaterEqual(summary["solver"]["total_time"], 6*0.07)
+        self.assertAlmostEqual(summary["solver"]["exclusive_time"], summary["solver"]["total_time"] - summary["mapper"]["total_time"], delta=1e-3)
+
+        per_time_step = self.timer.GetTimesPerTimeStep()
+        self.assertEqual([entry["time_step"] for entry in per_time_step], [1, 2])
+        self.assertEqual(set(per_time_step[0]["times"].keys()), {"solver", "mapper"})
+
+        per_iteration = self.timer.GetTimesPerCouplingIteration()
+        self.assertEqual(len(per_iteration), 6)
+        self.assertEqual((per_iteration[-1]["time_step"], per_iteration[-1]["coupling_iteration"]), (2, 3))
+
+    def test_write_trace(self):
+        component = DummyComponent(0.0)
+        timing_utilities.InstrumentMethods(component, "coupling_operation", "compute_force", ["Execute"])
+        self.timer.SetTimeStep(1, 0.5)
+        with self.timer.Measure("predictor", "linear", "Predict"):
+            component.Execute()
+
+        self.timer.Finalize()
+
+        with open(self.timer.WriteTrace(), "r") as trace_file:
+            trace = json.load(trace_file)
+
+        self.assertEqual(len(trace["traceEvents"]), 2)
+        event = trace["traceEvents"][0]
+        self.assertEqual(event["name"], "compute_force.Execute")
+        self.assertEqual(event["cat"], "coupling_operation")
+        self.assertEqual(event["ph"], "X")
+        self.assertEqual(event["args"]["time_step"], 1)
+        self.assertEqual(len(trace["otherData"]["summary"]), 2)
+        self.assertEqual(trace["otherData"]["num_time_steps"], 1)
+
+
+if __name__ == '__main__':
+    KratosUnittest.main()
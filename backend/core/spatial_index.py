@@ -0,0 +1,355 @@
+"""
+结果空间索引服务
+为每个分析结果构建一次单元定位器 (vtkStaticCellLocator) 并缓存，
+探测点由一次 vtkProbeFilter 在原网格上批量定位，
+支持批量点探测、钻孔/折线采样与平面切片。探测点的插值权重被缓存，
+同一组探测点在不同物理场、不同时间步上求值时无需再次定位。
+索引按结果文件路径/输出步缓存，不按网格对象身份。
+"""
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pyvista as pv
+import vtk
+
+from .result_store import ResultStore
+from .tracing import trace_span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProbeWeights:
+    """一组探测点的插值权重（与物理场无关，可跨场、跨时间步复用）"""
+    points: np.ndarray        # (n, 3) 探测点坐标
+    cell_ids: np.ndarray      # (n,) 所在单元，-1 表示在网格外
+    point_ids: np.ndarray     # (n, k) 单元节点编号，不足 k 的位置填 0
+    weights: np.ndarray       # (n, k) 插值权重，填充位置为 0
+
+    @property
+    def valid(self) -> np.ndarray:
+        return self.cell_ids >= 0
+
+    def interpolate(self, values: np.ndarray) -> np.ndarray:
+        """
+        用缓存的权重插值节点场
+
+        Args:
+            values: (n_points,) 或 (n_points, m) 节点场
+
+        Returns:
+            (n,) 或 (n, m)，网格外的探测点为 NaN
+        """
+        values = np.asarray(values)
+        gathered = values[self.point_ids]
+        if values.ndim == 1:
+            result = np.einsum("nk,nk->n", gathered, self.weights)
+        else:
+            result = np.einsum("nkm,nk->nm", gathered, self.weights)
+        result = result.astype(np.float64, copy=False)
+        result[~self.valid] = np.nan
+        return result
+
+
+class ResultSpatialIndex:
+    """单个结果网格的空间索引"""
+
+    def __init__(self, mesh: pv.UnstructuredGrid, max_cached_probes: int = 32,
+                 max_cached_slices: int = 16):
+        self.mesh = mesh
+        with trace_span("spatial_index.build", element_count=mesh.n_cells):
+            # 浅拷贝共享节点与单元，只多一个单元编号数组，探测时据此得到所在单元
+            self._probe_source = mesh.copy(deep=False)
+            self._probe_source.cell_data["_cell_id"] = np.arange(mesh.n_cells, dtype=np.int64)
+            self.locator = vtk.vtkStaticCellLocator()
+            self.locator.SetDataSet(self._probe_source)
+            self.locator.BuildLocator()
+            self.node_colors = self._color_nodes(mesh)
+            # 单元包围盒 (n_cells, 6)，用于切片前快速筛选与平面相交的单元
+            self.cell_bounds = self._compute_cell_bounds(mesh)
+        self._probe_cache: "OrderedDict[str, ProbeWeights]" = OrderedDict()
+        self._slice_cache: "OrderedDict[Tuple, pv.PolyData]" = OrderedDict()
+        self._max_cached_probes = max_cached_probes
+        self._max_cached_slices = max_cached_slices
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _color_nodes(mesh: pv.UnstructuredGrid) -> np.ndarray:
+        """
+        节点着色：同一单元内的节点颜色互不相同 (Jones-Plassmann，按轮向量化)
+
+        每轮选出在其所在各单元内随机优先级最大的未着色节点（互不共单元），
+        赋予所在单元中尚未使用的最小颜色；前 64 种颜色用位掩码判定，
+        全部被占用时使用该轮独有的颜色。节点的 one-hot 颜色场插值后，
+        即可按颜色读出单元内每个节点的插值权重（不支持多面体单元）。
+        """
+        n_points = mesh.n_points
+        colors = np.full(n_points, -1, dtype=np.int64)
+        offsets = np.asarray(mesh.cell_offsets)
+        connectivity = np.asarray(mesh.cell_connectivity)
+        if mesh.n_cells == 0:
+            colors[:] = 0
+            return colors.astype(np.int32)
+        starts = offsets[:-1]
+        sizes = np.diff(offsets)
+        priority = np.random.default_rng(0).permutation(n_points)
+        one = np.uint64(1)
+        round_index = 0
+        while (colors < 0).any():
+            uncolored = colors < 0
+            cell_max = np.maximum.reduceat(np.where(uncolored, priority, -1)[connectivity], starts)
+            # 只保留仍含未着色节点的单元，后续轮次的工作量随之减少
+            active = cell_max >= 0
+            if not active.all():
+                connectivity = connectivity[np.repeat(active, sizes)]
+                sizes = sizes[active]
+                starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+                cell_max = cell_max[active]
+            node_max = np.full(n_points, -1, dtype=np.int64)
+            if len(sizes):
+                np.maximum.at(node_max, connectivity, np.repeat(cell_max, sizes))
+            selected = np.flatnonzero(uncolored & (priority >= node_max))
+
+            used = np.where((colors >= 0) & (colors < 64),
+                            np.left_shift(one, np.clip(colors, 0, 63).astype(np.uint64)),
+                            np.uint64(0))
+            forbidden = np.zeros(n_points, dtype=np.uint64)
+            if len(sizes):
+                cell_used = np.bitwise_or.reduceat(used[connectivity], starts)
+                np.bitwise_or.at(forbidden, connectivity, np.repeat(cell_used, sizes))
+            free = ~forbidden[selected]
+            lowest = free & (~free + one)
+            first_free = np.log2(np.maximum(lowest, one).astype(np.float64)).astype(np.int64)
+            colors[selected] = np.where(free == 0, 64 + round_index, first_free)
+            round_index += 1
+        # 重新编号为连续颜色
+        return np.unique(colors, return_inverse=True)[1].astype(np.int32).reshape(-1)
+
+    @staticmethod
+    def _compute_cell_bounds(mesh: pv.UnstructuredGrid) -> np.ndarray:
+        points = np.asarray(mesh.points)
+        offsets = np.asarray(mesh.cell_offsets)
+        connectivity = np.asarray(mesh.cell_connectivity)
+        coords = points[connectivity]
+        # 按单元分段求最小/最大值
+        starts = offsets[:-1]
+        mins = np.minimum.reduceat(coords, starts, axis=0)
+        maxs = np.maximum.reduceat(coords, starts, axis=0)
+        return np.column_stack([mins[:, 0], maxs[:, 0], mins[:, 1],
+                                maxs[:, 1], mins[:, 2], maxs[:, 2]])
+
+    # --- 点探测 ---
+
+    @staticmethod
+    def _probe_key(points: np.ndarray) -> str:
+        return hashlib.sha1(np.ascontiguousarray(points, dtype=np.float64)).hexdigest()
+
+    def probe_weights(self, points: Sequence[Sequence[float]]) -> ProbeWeights:
+        """定位探测点并计算插值权重；相同点集直接命中缓存"""
+        points = np.ascontiguousarray(np.asarray(points, dtype=np.float64).reshape(-1, 3))
+        key = self._probe_key(points)
+        with self._lock:
+            cached = self._probe_cache.get(key)
+            if cached is not None:
+                self._probe_cache.move_to_end(key)
+                return cached
+
+        with trace_span("spatial_index.locate", probe_count=len(points)):
+            weights = self._locate(points)
+
+        with self._lock:
+            self._probe_cache[key] = weights
+            if len(self._probe_cache) > self._max_cached_probes:
+                self._probe_cache.popitem(last=False)
+        return weights
+
+    def _locate(self, points: np.ndarray) -> ProbeWeights:
+        """一次 vtkProbeFilter 定位全部探测点（复用已建好的定位器）"""
+        n = len(points)
+        offsets = np.asarray(self.mesh.cell_offsets)
+        sizes = np.diff(offsets)
+        max_points = int(sizes.max()) if self.mesh.n_cells else 1
+        cell_ids = np.full(n, -1, dtype=np.int64)
+        point_ids = np.zeros((n, max_points), dtype=np.int64)
+        weights = np.zeros((n, max_points), dtype=np.float64)
+        if n == 0 or self.mesh.n_cells == 0:
+            return ProbeWeights(points, cell_ids, point_ids, weights)
+
+        # 探测源：原网格的浅拷贝，附加按节点颜色 one-hot 的临时节点场，
+        # 插值得到的每一列即该颜色节点的插值权重；用完即释放，不随索引缓存
+        source = self._probe_source.copy(deep=False)
+        n_colors = int(self.node_colors.max()) + 1
+        one_hot = np.zeros((self.mesh.n_points, n_colors))
+        one_hot[np.arange(self.mesh.n_points), self.node_colors] = 1.0
+        source.point_data["_color_weights"] = one_hot
+
+        probe = vtk.vtkProbeFilter()
+        probe.SetInputData(pv.PolyData(points))
+        probe.SetSourceData(source)
+        if hasattr(probe, "SetCellLocator"):  # VTK >= 9.7
+            probe.SetCellLocator(self.locator)
+        else:
+            strategy = vtk.vtkCellLocatorStrategy()
+            strategy.SetCellLocator(self.locator)
+            probe.SetFindCellStrategy(strategy)
+        probe.ComputeToleranceOff()
+        probe.SetTolerance(1e-6)
+        probe.Update()
+        probed = pv.wrap(probe.GetOutput())
+
+        valid = np.asarray(probed.point_data[probe.GetValidPointMaskArrayName()]).astype(bool)
+        cell_ids[valid] = np.asarray(probed.point_data["_cell_id"])[valid]
+        color_weights = np.asarray(probed.point_data["_color_weights"]).reshape(n, n_colors)[valid]
+        # 所在单元的节点编号，不足 max_points 的位置保持 0（权重也为 0）
+        located = cell_ids[valid]
+        local = np.arange(max_points)
+        in_cell = local < sizes[located][:, None]
+        entries = np.where(in_cell, offsets[located][:, None] + local, 0)
+        nodes = np.where(in_cell, np.asarray(self.mesh.cell_connectivity)[entries], 0)
+        point_ids[valid] = nodes
+        node_weights = np.take_along_axis(color_weights, self.node_colors[nodes], axis=1)
+        weights[valid] = np.where(in_cell, node_weights, 0.0)
+        return ProbeWeights(points, cell_ids, point_ids, weights)
+
+    def probe(self, points: Sequence[Sequence[float]],
+              fields: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        批量点探测
+
+        Returns:
+            {字段名: 插值结果}，另含 "valid" 掩码
+        """
+        w = self.probe_weights(points)
+        names = fields or [name for name in self.mesh.point_data.keys()]
+        result = {name: w.interpolate(self.mesh.point_data[name]) for name in names}
+        result["valid"] = w.valid
+        return result
+
+    def sample_polyline(self, vertices: Sequence[Sequence[float]], resolution: int = 100,
+                        fields: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        沿折线（如钻孔轴线）等间距采样
+
+        Returns:
+            probe 的结果，另含 "distance" (沿线距离) 与 "points"
+        """
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        segment_lengths = np.linalg.norm(np.diff(vertices, axis=0), axis=1)
+        cumulative = np.concatenate([[0.0], np.cumsum(segment_lengths)])
+        distance = np.linspace(0.0, cumulative[-1], resolution)
+        points = np.column_stack([
+            np.interp(distance, cumulative, vertices[:, axis]) for axis in range(3)
+        ])
+        result = self.probe(points, fields)
+        result["distance"] = distance
+        result["points"] = points
+        return result
+
+    # --- 平面切片 ---
+
+    def slice(self, origin: Sequence[float], normal: Sequence[float]) -> pv.PolyData:
+        """
+        平面切片：先用缓存的单元包围盒筛出与平面相交的单元，只对这部分
+        子网格执行切片；相同平面的结果直接命中缓存
+        """
+        normal = np.asarray(normal, dtype=np.float64)
+        normal = normal / np.linalg.norm(normal)
+        origin = np.asarray(origin, dtype=np.float64)
+        # 网格上新增的场（如后续计算的 VON_MISES_STRESS）会使旧切片失效
+        key = (tuple(np.round(origin, 9)), tuple(np.round(normal, 9)),
+               tuple(self.mesh.point_data.keys()), tuple(self.mesh.cell_data.keys()))
+        with self._lock:
+            cached = self._slice_cache.get(key)
+            if cached is not None:
+                self._slice_cache.move_to_end(key)
+                return cached
+
+        with trace_span("spatial_index.slice") as span:
+            b = self.cell_bounds
+            # 包围盒在法向上的投影区间与平面相交
+            center = np.column_stack([(b[:, 0] + b[:, 1]), (b[:, 2] + b[:, 3]),
+                                      (b[:, 4] + b[:, 5])]) * 0.5
+            half = np.column_stack([(b[:, 1] - b[:, 0]), (b[:, 3] - b[:, 2]),
+                                    (b[:, 5] - b[:, 4])]) * 0.5
+            distance = (center - origin) @ normal
+            radius = half @ np.abs(normal)
+            candidates = np.flatnonzero(np.abs(distance) <= radius)
+            span.set_attribute("candidate_cells", len(candidates))
+            if len(candidates) == 0:
+                section = pv.PolyData()
+            else:
+                section = self.mesh.extract_cells(candidates).slice(
+                    normal=tuple(normal), origin=tuple(origin))
+
+        with self._lock:
+            self._slice_cache[key] = section
+            if len(self._slice_cache) > self._max_cached_slices:
+                self._slice_cache.popitem(last=False)
+        return section
+
+
+class SpatialIndexService:
+    """按结果缓存空间索引（LRU）"""
+
+    def __init__(self, max_indices: int = 8):
+        self._indices: "OrderedDict[Tuple, ResultSpatialIndex]" = OrderedDict()
+        self._max_indices = max_indices
+        self._lock = threading.Lock()
+
+    def _get_or_build(self, key: Tuple, mesh_factory) -> ResultSpatialIndex:
+        with self._lock:
+            index = self._indices.get(key)
+            if index is not None:
+                self._indices.move_to_end(key)
+                return index
+        index = ResultSpatialIndex(mesh_factory())
+        with self._lock:
+            self._indices[key] = index
+            if len(self._indices) > self._max_indices:
+                self._indices.popitem(last=False)
+        return index
+
+    def for_file(self, result_file: str, step: Optional[int] = None) -> ResultSpatialIndex:
+        """
+        结果文件的索引；文件被覆盖 (mtime变化) 时自动重建
+
+        Args:
+            result_file: 单个 VTK 结果文件，或 step 不为空时的 HDF5 结果库
+            step: 结果库中的输出步（负数从末尾计）
+        """
+        path = os.path.abspath(result_file)
+        key = ("file", path, os.path.getmtime(path), step)
+        if step is None:
+            return self._get_or_build(key, lambda: pv.read(path))
+
+        def load_step():
+            with ResultStore(path) as store:
+                return store.load_step(step)
+
+        return self._get_or_build(key, load_step)
+
+    def for_mesh(self, mesh: pv.UnstructuredGrid, key: Tuple) -> ResultSpatialIndex:
+        """
+        已加载网格的索引，按调用方给出的结果键 (如 (结果路径, 输出步)) 缓存；
+        没有稳定键的网格应直接构建 ResultSpatialIndex，不进入缓存
+        """
+        return self._get_or_build(("mesh",) + tuple(key), lambda: mesh)
+
+    def invalidate(self, result_file: Optional[str] = None):
+        with self._lock:
+            if result_file is None:
+                self._indices.clear()
+                return
+            path = os.path.abspath(result_file)
+            for key in [k for k in self._indices if k[0] == "file" and k[1] == path]:
+                del self._indices[key]
+
+
+# 进程级索引服务
+spatial_index_service = SpatialIndexService()
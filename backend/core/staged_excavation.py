@@ -0,0 +1,309 @@
+"""
+分阶段开挖增量求解器
+在同一个内存中的 Kratos 模型上逐阶段激活/停用单元组（开挖土体、支护构件），
+位移与应力状态自然延续到下一阶段。每个阶段结束后保存 Kratos 重启文件作为
+检查点；修改第 k 阶段后只需从第 k-1 阶段的检查点恢复并重算 k..N 阶段。
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+
+import KratosMultiphysics
+from KratosMultiphysics.StructuralMechanicsApplication import (
+    structural_mechanics_analysis
+)
+from KratosMultiphysics.restart_utility import RestartUtility
+
+from .kratos_solver import KratosSolver, KratosSolverConfig
+from .tracing import trace_span
+
+logger = logging.getLogger(__name__)
+
+# 检查点根目录；同一项目跨多次运行复用，才能只重算被修改的阶段
+CHECKPOINT_ROOT = os.environ.get(
+    "DEEPCAD_STAGE_CHECKPOINT_DIR",
+    os.path.join(tempfile.gettempdir(), "deepcad_stage_checkpoints"))
+
+MANIFEST_NAME = "manifest.json"
+
+_DISPLACEMENT_COMPONENTS = (
+    KratosMultiphysics.DISPLACEMENT_X,
+    KratosMultiphysics.DISPLACEMENT_Y,
+    KratosMultiphysics.DISPLACEMENT_Z,
+)
+
+
+def _digest(payload: Any) -> str:
+    data = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def stage_digests(base_digest: str, stages: Sequence[Dict[str, Any]]) -> List[str]:
+    """
+    阶段链式哈希：第 i 阶段的哈希包含之前所有阶段，
+    因此第 k 阶段被修改时 k..N 的哈希全部改变
+    """
+    digests = []
+    previous = base_digest
+    for stage in stages:
+        previous = _digest({"prev": previous, "stage": stage})
+        digests.append(previous)
+    return digests
+
+
+def resume_stage_index(old_digests: Sequence[str], new_digests: Sequence[str]) -> int:
+    """第一个需要重新求解的阶段编号；全部一致时等于阶段数"""
+    for i, digest in enumerate(new_digests):
+        if i >= len(old_digests) or old_digests[i] != digest:
+            return i
+    return len(new_digests)
+
+
+class StagedExcavationSolver(KratosSolver):
+    """
+    分阶段开挖求解器
+
+    每个开挖阶段对应一个求解步（时间 = 阶段序号 + 1）。单元组按
+    SubModelPart 名称指定：
+      - stage["excavated_groups"]: 截至该阶段已开挖的土体子模型部件（累计）
+      - 未显式列出时，按 stage["depth"] 停用 excavation_part 中
+        形心高于 ground_level - depth 的单元
+      - support_parts 中未出现在 stage["active_supports"] 的支护构件被停用
+    """
+
+    def __init__(
+        self,
+        mesh_filename: str,
+        stages: List[Dict[str, Any]],
+        support_parts: Sequence[str] = (),
+        materials: List[Dict[str, Any]] = None,
+        boundary_conditions: List[Dict[str, Any]] = None,
+        loads: List[Dict[str, Any]] = None,
+        solver_settings: Dict[str, Any] = None,
+        excavation_part: str = "EXCAVATION_ZONE",
+        ground_level: float = 0.0,
+        vertical_axis: int = 1,
+        checkpoint_dir: Optional[str] = None,
+    ):
+        super().__init__(os.path.dirname(mesh_filename))
+        self.mesh_filename = mesh_filename
+        self.project_name = os.path.splitext(os.path.basename(mesh_filename))[0]
+        self.stages = stages
+        self.support_parts = list(support_parts)
+        self.materials = materials
+        self.boundary_conditions = boundary_conditions
+        self.loads = loads
+        self.solver_settings = solver_settings
+        self.excavation_part = excavation_part
+        self.ground_level = ground_level
+        # 竖向坐标轴，默认与配置中的重力方向 [0, -9.81, 0] 一致
+        self.vertical_axis = vertical_axis
+        self.checkpoint_dir = checkpoint_dir or os.path.join(CHECKPOINT_ROOT, self.project_name)
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+    # --- 检查点 ---
+
+    def _base_digest(self) -> str:
+        """网格与阶段无关输入的哈希；变化时所有检查点作废"""
+        h = hashlib.sha256()
+        with open(self.mesh_filename, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return _digest({
+            "mesh": h.hexdigest(),
+            "materials": self.materials,
+            "boundary_conditions": self.boundary_conditions,
+            "loads": self.loads,
+            "solver_settings": self.solver_settings,
+            "support_parts": self.support_parts,
+            "excavation_part": self.excavation_part,
+            "ground_level": self.ground_level,
+            "vertical_axis": self.vertical_axis,
+        })
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.checkpoint_dir, MANIFEST_NAME)
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        path = self._manifest_path()
+        if not os.path.exists(path):
+            return {"stages": []}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = f"{self._manifest_path()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self._manifest_path())
+
+    @staticmethod
+    def _stage_label(stage_index: int) -> str:
+        # RestartUtility 以 TIME 作为文件标签
+        return str(float(stage_index + 1))
+
+    def _restart_settings(self, load_label: Optional[str] = None) -> Dict[str, Any]:
+        settings = {
+            "input_filename": os.path.join(self.checkpoint_dir, self.project_name),
+            "save_restart_files_in_folder": False,
+            "serializer_trace": "no_trace",
+        }
+        if load_label is not None:
+            settings["restart_load_file_label"] = load_label
+            settings["load_restart_files_from_folder"] = False
+        return settings
+
+    def _checkpoint_file(self, stage_index: int) -> str:
+        return os.path.join(self.checkpoint_dir,
+                            f"{self.project_name}_{self._stage_label(stage_index)}.rest")
+
+    # --- 单元激活 ---
+
+    def _stage_inactive_elements(self, root, stage_index: int) -> set:
+        stage = self.stages[stage_index]
+        inactive = set()
+
+        groups = set()
+        for previous in self.stages[:stage_index + 1]:
+            groups.update(previous.get("excavated_groups") or [])
+        for name in groups:
+            if root.HasSubModelPart(name):
+                inactive.update(e.Id for e in root.GetSubModelPart(name).Elements)
+            else:
+                logger.warning(f"阶段 {stage['name']}: 未找到开挖单元组 {name}")
+
+        if not stage.get("excavated_groups") and root.HasSubModelPart(self.excavation_part):
+            level = self.ground_level - stage["depth"]
+            for element in root.GetSubModelPart(self.excavation_part).Elements:
+                if element.GetGeometry().Center()[self.vertical_axis] >= level:
+                    inactive.add(element.Id)
+
+        active_supports = set(stage.get("active_supports") or [])
+        for name in self.support_parts:
+            if name not in active_supports and root.HasSubModelPart(name):
+                inactive.update(e.Id for e in root.GetSubModelPart(name).Elements)
+        return inactive
+
+    def _apply_stage_activation(self, root, stage_index: int) -> Dict[str, int]:
+        """设置单元/条件的 ACTIVE 标志，并固定不再与任何激活单元相连的节点"""
+        inactive = self._stage_inactive_elements(root, stage_index)
+        variable_utils = KratosMultiphysics.VariableUtils()
+        variable_utils.SetFlag(KratosMultiphysics.ACTIVE, True, root.Elements)
+        variable_utils.SetFlag(KratosMultiphysics.ACTIVE, True, root.Conditions)
+        for element_id in inactive:
+            root.GetElement(element_id).Set(KratosMultiphysics.ACTIVE, False)
+
+        active_nodes = set()
+        for element in root.Elements:
+            if element.Is(KratosMultiphysics.ACTIVE):
+                active_nodes.update(node.Id for node in element.GetNodes())
+
+        # 先释放所有节点，约束过程会在 InitializeSolutionStep 中重新施加边界约束
+        for component in _DISPLACEMENT_COMPONENTS:
+            variable_utils.ApplyFixity(component, False, root.Nodes)
+        free_nodes = 0
+        for node in root.Nodes:
+            if node.Id not in active_nodes:
+                for component in _DISPLACEMENT_COMPONENTS:
+                    node.Fix(component)
+                free_nodes += 1
+
+        for condition in root.Conditions:
+            if any(node.Id not in active_nodes for node in condition.GetNodes()):
+                condition.Set(KratosMultiphysics.ACTIVE, False)
+
+        return {"inactive_elements": len(inactive), "inactive_nodes": free_nodes}
+
+    # --- 求解 ---
+
+    def _build_parameters(self, start_stage: int) -> "KratosMultiphysics.Parameters":
+        processes = KratosSolverConfig.build_structural_processes(
+            self.boundary_conditions, self.loads)
+        KratosSolverConfig.create_materials_file(self.working_dir, self.materials)
+        params_path = KratosSolverConfig.create_project_parameters_file(
+            self.working_dir, self.project_name, "static", self.solver_settings,
+            processes=processes)
+        with open(params_path, "r") as f:
+            parameters = json.load(f)
+
+        # 每个阶段一个时间步
+        parameters["problem_data"]["start_time"] = float(start_stage)
+        parameters["problem_data"]["end_time"] = float(len(self.stages))
+        parameters["solver_settings"]["time_stepping"] = {"time_step": 1.0}
+        if start_stage > 0:
+            import_settings = {"input_type": "rest"}
+            import_settings.update(self._restart_settings(self._stage_label(start_stage - 1)))
+            parameters["solver_settings"]["model_import_settings"] = import_settings
+        return KratosMultiphysics.Parameters(json.dumps(parameters))
+
+    @staticmethod
+    def _stage_summary(root) -> Dict[str, Any]:
+        max_displacement = 0.0
+        for node in root.Nodes:
+            d = node.GetSolutionStepValue(KratosMultiphysics.DISPLACEMENT)
+            max_displacement = max(max_displacement, (d[0] ** 2 + d[1] ** 2 + d[2] ** 2) ** 0.5)
+        return {"max_displacement_mm": round(max_displacement * 1000.0, 3)}
+
+    def solve(self, force: bool = False) -> List[Dict[str, Any]]:
+        """
+        求解所有阶段，返回每个阶段的结果摘要
+
+        Args:
+            force: 忽略检查点，从第一阶段开始重算
+        """
+        new_digests = stage_digests(self._base_digest(), self.stages)
+        manifest = self._load_manifest()
+        old_stages = manifest.get("stages", [])
+        start = 0 if force else resume_stage_index(
+            [s["digest"] for s in old_stages], new_digests)
+        # 恢复点的检查点文件必须存在
+        while start > 0 and not os.path.exists(self._checkpoint_file(start - 1)):
+            start -= 1
+
+        stage_results = old_stages[:start]
+        if start == len(self.stages):
+            logger.info("所有开挖阶段均命中检查点，无需重新求解")
+            return [s["results"] for s in stage_results]
+
+        logger.info(f"分阶段开挖: 复用 {start} 个阶段检查点，求解第 {start + 1}-{len(self.stages)} 阶段")
+        with trace_span("staged.run", stage_count=len(self.stages), resumed_from=start):
+            simulation = structural_mechanics_analysis.StructuralMechanicsAnalysis(
+                self.current_model, self._build_parameters(start))
+            with trace_span("kratos.initialize"):
+                simulation.Initialize()
+            solver = simulation._GetSolver()
+            root = solver.GetComputingModelPart().GetRootModelPart()
+            restart = RestartUtility(root, KratosMultiphysics.Parameters(
+                json.dumps(self._restart_settings())))
+
+            for stage_index in range(start, len(self.stages)):
+                stage = self.stages[stage_index]
+                with trace_span("staged.stage", stage=stage["name"]) as span:
+                    activation = self._apply_stage_activation(root, stage_index)
+                    span.set_attribute("inactive_elements", activation["inactive_elements"])
+                    simulation.time = solver.AdvanceInTime(simulation.time)
+                    simulation.InitializeSolutionStep()
+                    solver.Predict()
+                    with trace_span("kratos.solve"):
+                        converged = solver.SolveSolutionStep()
+                    simulation.FinalizeSolutionStep()
+                    simulation.OutputSolutionStep()
+                    with trace_span("staged.checkpoint"):
+                        restart.SaveRestart()
+
+                results = {"stage": stage["name"], "converged": bool(converged),
+                           **activation, **self._stage_summary(root)}
+                stage_results.append({"name": stage["name"],
+                                      "digest": new_digests[stage_index],
+                                      "results": results})
+                # 每个阶段完成后立即落盘，中断后下次可从最后完成的阶段继续
+                self._save_manifest({"stages": stage_results})
+                logger.info(f"开挖阶段 {stage['name']} 完成: {results}")
+
+            with trace_span("kratos.finalize"):
+                simulation.Finalize()
+
+        return [s["results"] for s in stage_results]
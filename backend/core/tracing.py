@@ -0,0 +1,414 @@
+"""
+V5流水线分阶段追踪模块
+
+在请求级追踪 (services/*/infrastructure/tracing.py) 之外，为分析流水线的
+每个阶段与子步骤 (GemPy计算、OCC布尔运算、Gmsh剖分、MDPA写出、
+Kratos Initialize/Solve/Finalize、VTK后处理) 记录嵌套span。
+
+span 既可以镜像到 OpenTelemetry（若已安装并配置），也可以在没有任何
+采集器的情况下写入本地文件 (JSONL 或 Chrome trace 格式)，便于在离线
+环境中事后分析慢任务。
+
+命令行用法:
+    python -m backend.core.tracing flame <trace.jsonl> [--min-ms 1.0]
+    python -m backend.core.tracing chrome <trace.jsonl> <out.json>
+"""
+import argparse
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 尝试导入OpenTelemetry（可选）
+try:
+    from opentelemetry import trace as otel_trace
+    OPENTELEMETRY_AVAILABLE = True
+except ImportError:
+    OPENTELEMETRY_AVAILABLE = False
+
+# 环境变量：设置后每个V5任务都会在其工作目录写出追踪文件 ("jsonl" 或 "chrome")
+TRACE_EXPORT_ENV = "DEEPCAD_TRACE_EXPORT"
+
+
+@dataclass
+class SpanRecord:
+    """单个span记录"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    pid: int = field(default_factory=os.getpid)
+    tid: int = field(default_factory=threading.get_ident)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any):
+        """设置span属性（仅保留可JSON序列化的值）"""
+        if not isinstance(value, (str, int, float, bool)) and value is not None:
+            value = str(value)
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "pid": self.pid,
+            "tid": self.tid,
+        }
+
+
+class _NoopSpan:
+    """追踪关闭时使用的空span，保证调用方无需判断"""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class FileSpanExporter:
+    """
+    基于文件的span导出器，不依赖任何采集器
+
+    - jsonl: 每个结束的span追加一行JSON，进程崩溃时已完成的span不会丢失
+    - chrome: Chrome trace (chrome://tracing / Perfetto) 的 JSON 数组格式，
+      在 shutdown 时一次性写出
+    """
+
+    def __init__(self, path: str, fmt: str = "jsonl"):
+        if fmt not in ("jsonl", "chrome"):
+            raise ValueError(f"不支持的追踪导出格式: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self._lock = threading.Lock()
+        self._buffer: List[SpanRecord] = []
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if fmt == "jsonl":
+            # 追加模式打开，同一文件可以容纳多次运行
+            self._fh = open(path, "a", encoding="utf-8")
+        else:
+            self._fh = None
+
+    def export(self, span: SpanRecord):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.write(json.dumps(span.to_dict(), ensure_ascii=False) + "\n")
+                self._fh.flush()
+            else:
+                self._buffer.append(span)
+
+    def shutdown(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            elif self._buffer:
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(spans_to_chrome_trace(self._buffer), f, ensure_ascii=False)
+                self._buffer = []
+
+
+_current_span: contextvars.ContextVar[Optional[SpanRecord]] = contextvars.ContextVar(
+    "deepcad_current_span", default=None
+)
+_current_exporter: contextvars.ContextVar[Optional[FileSpanExporter]] = contextvars.ContextVar(
+    "deepcad_span_exporter", default=None
+)
+_global_exporter: Optional[FileSpanExporter] = None
+
+
+def configure_file_exporter(path: str, fmt: str = "jsonl") -> FileSpanExporter:
+    """设置进程级文件导出器"""
+    global _global_exporter
+    if _global_exporter is not None:
+        _global_exporter.shutdown()
+    _global_exporter = FileSpanExporter(path, fmt)
+    logger.info(f"已启用文件追踪导出: {path} ({fmt})")
+    return _global_exporter
+
+
+def shutdown_tracing():
+    """关闭进程级文件导出器"""
+    global _global_exporter
+    if _global_exporter is not None:
+        _global_exporter.shutdown()
+        _global_exporter = None
+
+
+def _active_exporter() -> Optional[FileSpanExporter]:
+    return _current_exporter.get() or _global_exporter
+
+
+def tracing_enabled() -> bool:
+    """当前上下文是否有span接收方"""
+    return _active_exporter() is not None or OPENTELEMETRY_AVAILABLE
+
+
+@contextmanager
+def file_trace(path: str, fmt: str = "jsonl") -> Iterator[FileSpanExporter]:
+    """
+    在当前上下文内把span写入指定文件（用于单个任务的工作目录）
+
+    Args:
+        path: 追踪文件路径
+        fmt: "jsonl" 或 "chrome"
+    """
+    exporter = FileSpanExporter(path, fmt)
+    token = _current_exporter.set(exporter)
+    try:
+        yield exporter
+    finally:
+        _current_exporter.reset(token)
+        exporter.shutdown()
+
+
+@contextmanager
+def job_trace(working_dir: str, name: str = "v5_trace") -> Iterator[None]:
+    """
+    按环境变量 DEEPCAD_TRACE_EXPORT 为一次任务开启文件追踪
+
+    未设置环境变量时不做任何事情。
+    """
+    fmt = os.environ.get(TRACE_EXPORT_ENV, "").strip().lower()
+    if fmt not in ("jsonl", "chrome"):
+        yield
+        return
+    ext = "jsonl" if fmt == "jsonl" else "json"
+    with file_trace(os.path.join(working_dir, f"{name}.{ext}"), fmt):
+        yield
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any):
+    """
+    创建嵌套span的上下文管理器
+
+    用法:
+        with trace_span("gmsh.generate", mesh_size=10.0) as span:
+            ...
+            span.set_attribute("element_count", n)
+    """
+    exporter = _active_exporter()
+    if exporter is None and not OPENTELEMETRY_AVAILABLE:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    span = SpanRecord(
+        name=name,
+        trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+    )
+    for key, value in attributes.items():
+        span.set_attribute(key, value)
+
+    token = _current_span.set(span)
+    otel_cm = None
+    otel_span = None
+    if OPENTELEMETRY_AVAILABLE:
+        otel_cm = otel_trace.get_tracer(__name__).start_as_current_span(name)
+        otel_span = otel_cm.__enter__()
+    exc_info = (None, None, None)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = f"error: {type(e).__name__}"
+        exc_info = (type(e), e, e.__traceback__)
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _current_span.reset(token)
+        if otel_cm is not None:
+            for key, value in span.attributes.items():
+                if value is not None:
+                    otel_span.set_attribute(key, value)
+            otel_cm.__exit__(*exc_info)
+        if exporter is not None:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"导出span失败: {e}")
+
+
+def traced(name: Optional[str] = None, **attributes: Any):
+    """把整个函数调用包装为一个span的装饰器"""
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- 读取与渲染 ---
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """读取JSONL或Chrome trace格式的追踪文件"""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read().strip()
+    if not content:
+        return []
+    if content.startswith("["):
+        spans = []
+        for event in json.loads(content):
+            if event.get("ph") != "X":
+                continue
+            args = dict(event.get("args", {}))
+            spans.append({
+                "name": event["name"],
+                "span_id": args.pop("span_id", None),
+                "parent_id": args.pop("parent_id", None),
+                "trace_id": args.pop("trace_id", None),
+                "start_ns": int(event["ts"] * 1000),
+                "end_ns": int((event["ts"] + event["dur"]) * 1000),
+                "duration_ms": event["dur"] / 1000.0,
+                "attributes": args,
+                "pid": event.get("pid"),
+                "tid": event.get("tid"),
+            })
+        return spans
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def spans_to_chrome_trace(spans: List[Any]) -> List[Dict[str, Any]]:
+    """把span列表转换为Chrome trace的完整事件 (ph="X") 列表"""
+    events = []
+    for span in spans:
+        s = span.to_dict() if isinstance(span, SpanRecord) else span
+        args = dict(s.get("attributes", {}))
+        args.update({
+            "span_id": s.get("span_id"),
+            "parent_id": s.get("parent_id"),
+            "trace_id": s.get("trace_id"),
+        })
+        events.append({
+            "name": s["name"],
+            "cat": s["name"].split(".")[0],
+            "ph": "X",
+            "ts": s["start_ns"] / 1000.0,
+            "dur": (s["end_ns"] - s["start_ns"]) / 1000.0,
+            "pid": s.get("pid", 0),
+            "tid": s.get("tid", 0),
+            "args": args,
+        })
+    return events
+
+
+def summarize_flame(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    按调用路径聚合span，得到火焰图摘要
+
+    Returns:
+        每条调用路径一行: path, depth, count, total_ms, self_ms
+    """
+    by_id = {s["span_id"]: s for s in spans}
+    children_ms: Dict[str, float] = {}
+    for s in spans:
+        parent_id = s.get("parent_id")
+        if parent_id in by_id:
+            children_ms[parent_id] = children_ms.get(parent_id, 0.0) + s["duration_ms"]
+
+    def path_of(s):
+        names = [s["name"]]
+        parent = by_id.get(s.get("parent_id"))
+        while parent is not None:
+            names.append(parent["name"])
+            parent = by_id.get(parent.get("parent_id"))
+        return tuple(reversed(names))
+
+    rows: Dict[tuple, Dict[str, Any]] = {}
+    for s in spans:
+        path = path_of(s)
+        row = rows.setdefault(path, {
+            "path": path, "depth": len(path) - 1,
+            "count": 0, "total_ms": 0.0, "self_ms": 0.0,
+        })
+        row["count"] += 1
+        row["total_ms"] += s["duration_ms"]
+        row["self_ms"] += max(s["duration_ms"] - children_ms.get(s["span_id"], 0.0), 0.0)
+
+    # 深度优先排序：父路径在前，同级按耗时降序
+    ordered = []
+
+    def visit(prefix):
+        level = [r for p, r in rows.items() if len(p) == len(prefix) + 1 and p[:-1] == prefix]
+        for row in sorted(level, key=lambda r: -r["total_ms"]):
+            ordered.append(row)
+            visit(row["path"])
+
+    visit(())
+    return ordered
+
+
+def render_flame(rows: List[Dict[str, Any]], min_ms: float = 0.0, width: int = 40) -> str:
+    """把火焰图摘要渲染为文本"""
+    if not rows:
+        return "(no spans)"
+    root_total = sum(r["total_ms"] for r in rows if r["depth"] == 0) or 1.0
+    lines = [f"{'span':<56} {'count':>6} {'total ms':>12} {'self ms':>12}  share"]
+    for row in rows:
+        if row["total_ms"] < min_ms:
+            continue
+        label = ("  " * row["depth"] + row["path"][-1])[:56]
+        share = row["total_ms"] / root_total
+        bar = "#" * max(1, int(round(share * width)))
+        lines.append(
+            f"{label:<56} {row['count']:>6} {row['total_ms']:>12.1f} "
+            f"{row['self_ms']:>12.1f}  {bar} {share * 100:.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="DeepCAD 离线追踪文件工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    flame = sub.add_parser("flame", help="输出按调用路径聚合的火焰图摘要")
+    flame.add_argument("trace_file")
+    flame.add_argument("--min-ms", type=float, default=0.0, help="隐藏耗时低于该值的路径")
+
+    chrome = sub.add_parser("chrome", help="把JSONL追踪转换为Chrome trace格式")
+    chrome.add_argument("trace_file")
+    chrome.add_argument("output_file")
+
+    args = parser.parse_args(argv)
+    spans = load_spans(args.trace_file)
+    if args.command == "flame":
+        print(render_flame(summarize_flame(spans), min_ms=args.min_ms))
+    else:
+        with open(args.output_file, "w", encoding="utf-8") as f:
+            json.dump(spans_to_chrome_trace(spans), f, ensure_ascii=False)
+        print(f"已写出 {len(spans)} 个span: {args.output_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
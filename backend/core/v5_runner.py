@@ -1,7 +1,11 @@
 """
 Core logic for the V5 analysis pipeline, integrating GemPy, PyGMSH, and Kratos.
 """
+import glob
 import io
+import json
+import logging
+import re
 import ezdxf
 from pydantic import BaseModel, Field
 from typing import List, Tuple, Dict, Any, Optional
@@ -9,6 +13,7 @@ import pygmsh
 import meshio
 import numpy as np
 import tempfile
+import uuid
 import os
 import gempy as gp
 import pandas as pd
@@ -28,12 +33,20 @@ from ..api.routes.analysis_router import (
 )
 
 from .post_processing import process_kratos_results
+from .geometry_cache import BrepGeometryCache, chain_keys
+from .geology_interpolation import InterpolationCache, MultiResolutionGeology
+from .borehole_dataset import borehole_store
+from .geometry_operations import GeometryIntersectionEngine
 from ..services.geology_service import (
     create_terrain_model_from_csv,
     create_geology_mesh,
     TerrainMeshGenerator
 )
 from .kratos_solver import run_seepage_analysis
+from .tracing import job_trace, trace_span
+from .profiling import profile_job, profile_stage
+
+logger = logging.getLogger(__name__)
 
 # --- V4 Data Models: Modular & Advanced ---
 
@@ -111,9 +124,22 @@ class DXFProcessor:
 
 class KratosV5Adapter:
     """Generates geometry, meshes it, and then runs a Kratos analysis."""
-    def __init__(self, features: List[AnyFeature], project_name: str = "default_project"):
+    def __init__(self, features: List[AnyFeature], project_name: str = "default_project",
+                 extent: Optional[List[float]] = None,
+                 resolution: Optional[List[int]] = None,
+                 geology_cache: Optional[InterpolationCache] = None):
+        """
+        Args:
+            extent: 网格范围 [xmin, xmax, ymin, ymax, zmin, zmax]；只影响取值网格，
+                    不影响 GemPy 插值（插值范围由钻孔数据决定）
+            resolution: 网格范围内岩性取值分辨率 [nx, ny, nz]
+            geology_cache: GemPy 插值缓存，默认使用进程内全局缓存
+        """
         self.features = features
         self.project_name = project_name
+        self.extent = extent
+        self.resolution = resolution
+        self.geology_cache = geology_cache
         self.working_dir = tempfile.mkdtemp(prefix=f"kratos_v5_{self.project_name}_")
         print(f"\nKratosV5Adapter: Initialized. Working directory: {self.working_dir}")
 
@@ -130,21 +156,15 @@ class KratosV5Adapter:
                 "Could not find 'CreateGeologicalModel' feature in the scene."
             )
 
-        csv_data = geo_model_feature.parameters.csvData
-        csv_file = io.StringIO(csv_data)
+        # 已校验、去重的列式数据集：按 datasetId 引用，或首次随请求上传 CSV
+        params = geo_model_feature.parameters
+        df = borehole_store.resolve(dataset_id=params.datasetId, csv_data=params.csvData)
         
-        df = pd.read_csv(csv_file)
-        
-        if not all(col in df.columns for col in ['X', 'Y', 'Z', 'surface']):
-            raise ValueError(
-                "CSV data must contain 'X', 'Y', 'Z', and 'surface' columns."
-            )
-            
-        surface_points_df = df[['X', 'Y', 'Z', 'surface']].copy()
-        surface_names = list(surface_points_df['surface'].unique())
+        surface_points_df = df[['X', 'Y', 'Z', 'surface']].astype({'surface': str})
+        surface_names = list(dict.fromkeys(surface_points_df['surface']))
         
         print(
-            f"    -> Parsed CSV. Found {len(surface_points_df)} points and "
+            f"    -> Loaded boreholes. Found {len(surface_points_df)} points and "
             f"{len(surface_names)} surfaces: {surface_names}"
         )
 
@@ -154,14 +174,45 @@ class KratosV5Adapter:
         
         return surface_points_df, orientations_df, surface_names
 
-    def _get_extent_from_points(
-        self, df: pd.DataFrame, padding: float = 100.0
-    ) -> List[float]:
-        """Calculates the model extent from points with added padding."""
-        xmin, xmax = df['X'].min(), df['X'].max()
-        ymin, ymax = df['Y'].min(), df['Y'].max()
-        zmin, zmax = df['Z'].min(), df['Z'].max()
-        return [xmin - padding, xmax + padding, ymin - padding, ymax + padding, zmin - padding, zmax + padding]
+    def _build_geology(self) -> MultiResolutionGeology:
+        surface_points_df, orientations_df, surface_names = self._prepare_gempy_input_from_feature()
+        return MultiResolutionGeology(
+            surface_points_df, orientations_df, surface_names,
+            project_name=self.project_name, cache=self.geology_cache
+        )
+
+    def _evaluate_lithology(self, geology: MultiResolutionGeology) -> Optional[str]:
+        """在给定网格范围/分辨率上求岩性（复用插值权重），保存为 npz"""
+        if not (self.extent and self.resolution):
+            return None
+        lithology = geology.evaluate(self.extent, self.resolution)
+        path = os.path.join(self.working_dir, "lithology_grid.npz")
+        np.savez(path, lithology=lithology, extent=np.asarray(self.extent, dtype=float))
+        return path
+
+    def run_preview(self) -> dict:
+        """只做 GemPy 粗算，快速返回供交互预览"""
+        try:
+            geology = self._build_geology()
+            geo_model = geology.preview()
+            surfaces = {}
+            for surface_name in geology.surface_names:
+                mesh = gp.get_surface_mesh(geo_model, surface_name)
+                if mesh is not None and len(mesh.points) > 0:
+                    surfaces[surface_name] = {
+                        "points": np.asarray(mesh.points).tolist(),
+                        "triangles": np.asarray(mesh.cells_dict['triangle']).tolist(),
+                    }
+            return {
+                "status": "preview",
+                "surfaces": surfaces,
+                "lithology_file": self._evaluate_lithology(geology),
+                "geology": geology.info(),
+                "working_dir": self.working_dir
+            }
+        except Exception as e:
+            logger.error(f"GemPy 预览失败: {e}")
+            return {"status": "failed", "message": str(e), "working_dir": self.working_dir}
 
     def run_analysis(self) -> dict:
         print("KratosV5Adapter: Starting real analysis setup with GemPy...")
@@ -170,30 +221,16 @@ class KratosV5Adapter:
             # ==================================================================
             # 步骤 1: 使用 GemPy 创建地质模型
             # ==================================================================
-            surface_points_df, orientations_df, surface_names = self._prepare_gempy_input_from_feature()
-            
-            extent = self._get_extent_from_points(surface_points_df)
-
-            print("  - Initializing GemPy model...")
-            geo_model = gp.create_geomodel(
-                project_name=self.project_name,
-                extent=extent,
-                importer_helper=gp.data.ImporterHelper(
-                    surface_points_df=surface_points_df,
-                    orientations_df=orientations_df
-                )
-            )
-
-            print("  - Mapping stratigraphic stack to surfaces...")
             # Assuming the layers in soil_profile are ordered from top to bottom
-            gp.map_stack_to_surfaces(
-                gempy_model=geo_model,
-                mapping_object={"Stratigraphic_Stack": tuple(surface_names)}
-            )
+            geology = self._build_geology()
+            surface_names = geology.surface_names
 
+            # 分析只用细化结果；已预览过的数据集从缓存的粗算模型继续细化
             print("  - Computing GemPy geological model...")
-            gp.compute_model(geo_model)
-            print("    -> GemPy model computation complete.")
+            geo_model = geology.refine()
+            lithology_file = self._evaluate_lithology(geology)
+            print(f"    -> GemPy model computation complete "
+                  f"(cache hit: {geology.cache_hit}, timings: {geology.timings}).")
 
             # ==================================================================
             # 步骤 2: 从GemPy提取几何, 并在PyGMSH中处理
@@ -293,7 +330,11 @@ class KratosV5Adapter:
                 # ==================================================================
                 print("\n  - Step 3: Generating mesh...")
                 geom.set_mesh_size_callback(lambda dim, tag, x, y, z: 25.0) # Coarse mesh
-                mesh_result = geom.generate_mesh()
+                with trace_span("gmsh.generate", mesh_size=25.0) as span:
+                    mesh_result = geom.generate_mesh()
+                    span.set_attribute("node_count", len(mesh_result.points))
+                    span.set_attribute(
+                        "element_count", sum(len(c.data) for c in mesh_result.cells))
                 
                 mesh_file = os.path.join(self.working_dir, f"{self.project_name}_out.vtk")
                 meshio.write(mesh_file, mesh_result)
@@ -312,6 +353,8 @@ class KratosV5Adapter:
                     "num_points": len(mesh_result.points),
                     "num_cells": sum(len(c.data) for c in mesh_result.cells),
                 },
+                "geology": geology.info(),
+                "lithology_file": lithology_file,
                 "working_dir": self.working_dir
             }
 
@@ -855,22 +898,37 @@ def _create_kratos_project_parameters(proj_name, working_dir):
     params["output_processes"]["gid_output"][0]["Parameters"]["output_name"].SetString(os.path.join(working_dir, proj_name + "_gid"))
     return params 
 
+# 结构类型 -> 操作日志中的名称
+_STRUCTURE_LABELS = {"excavation": "基坑开挖", "tunnel": "隧道",
+                     "diaphragm_wall": "地连墙", "pile": "排桩"}
+
+
+def _path_points(path: List[Any]) -> List[List[float]]:
+    """把 Point3D 字典或 [x, y, z] 列表形式的路径统一为坐标列表"""
+    return [[p["x"], p["y"], p["z"]] if isinstance(p, dict) else list(p) for p in path]
+
+
 class ComplexGeometryProcessor:
     """
     复杂几何处理器
     专门处理土体与工程结构的几何求交
     """
     
-    def __init__(self, working_dir: str):
+    def __init__(self, working_dir: str, geometry_cache: Optional[BrepGeometryCache] = None):
         self.working_dir = working_dir
         self.geometry_engine = GeometryIntersectionEngine(use_occ=True)
-        
+        self.geometry_cache = geometry_cache or BrepGeometryCache()
+    
     def process_geological_model_with_structures(self, 
                                                geological_data: Dict[str, Any],
                                                structures: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         处理地质模型与工程结构的复杂求交
         
+        未命中缓存的结构（基坑、隧道、地连墙、排桩）先全部创建为工具体，
+        再与土体做一次 OCC fragment；只缓存土体与全部结构求交后的最终状态。
+        修改某个结构时从最长的已缓存前缀（通常是土体本身）重新切分其后的全部结构。
+        
         Args:
             geological_data: 地质模型数据
             structures: 工程结构列表（基坑、隧道等）
@@ -883,39 +941,80 @@ class ComplexGeometryProcessor:
         try:
             self.geometry_engine.initialize_gmsh()
             
-            # 1. 创建地质体
+            gmsh = self.geometry_engine.kernel.gmsh
             terrain_data = self._prepare_terrain_data(geological_data)
-            soil_tag = self.geometry_engine.create_soil_volume(terrain_data)
+            
+            # 土体 + 前 i 个结构的状态键；从最长的已缓存前缀继续
+            keys = chain_keys(terrain_data, structures)
+            cached_index, roles = self.geometry_cache.restore(gmsh, keys)
             
             result = {
                 "status": "success",
-                "original_soil_tag": soil_tag,
                 "processed_geometries": [],
-                "operations_log": []
+                "operations_log": [],
+                "geometry_cache": {"reused_structures": max(cached_index, 0),
+                                   "total_structures": len(structures)}
             }
             
-            current_soil_tag = soil_tag
+            if cached_index >= 0:
+                soil_tags = roles.pop("soil")
+                structure_roles = roles
+                result["original_soil_tag"] = soil_tags[0]
+                result["operations_log"].append(
+                    f"从几何缓存导入土体及前 {cached_index} 个结构")
+                for structure in structures[:cached_index]:
+                    result["processed_geometries"].append(
+                        {"type": structure.get("type"), "cached": True})
+            else:
+                # 1. 创建地质体
+                soil_tags = [self.geometry_engine.create_soil_volume(terrain_data)]
+                result["original_soil_tag"] = soil_tags[0]
+                structure_roles = {}
+                self.geometry_cache.try_save(gmsh, keys[0], {"soil": soil_tags})
             
-            # 2. 依次处理各种工程结构
-            for i, structure in enumerate(structures):
-                structure_type = structure.get("type")
-                
-                if structure_type == "excavation":
-                    current_soil_tag = self._process_excavation(
-                        current_soil_tag, structure, result)
-                        
-                elif structure_type == "tunnel":
-                    current_soil_tag = self._process_tunnel(
-                        current_soil_tag, structure, result)
-                        
-                elif structure_type == "diaphragm_wall":
-                    current_soil_tag = self._process_diaphragm_wall(
-                        current_soil_tag, structure, result)
-                        
-                else:
-                    logger.warning(f"未知结构类型: {structure_type}")
+            # 2. 创建未命中缓存的结构的工具体，一次切分
+            tools: Dict[str, int] = {}
+            hollow: List[str] = []
+            created = []
+            for i in range(max(cached_index, 0), len(structures)):
+                record, structure_tools, is_hollow = self._create_structure_tools(
+                    i, structures[i])
+                if record is None:
+                    continue
+                tools.update(structure_tools)
+                if is_hollow:
+                    hollow.extend(structure_tools)
+                created.append((i, record, list(structure_tools)))
+            
+            if tools:
+                fragments = self.geometry_engine.batch_fragment(
+                    soil_tags, tools, remove_tools=hollow)
+                soil_tags = fragments["soil"]
+                for i, record, names in created:
+                    pieces = [tag for name in names for tag in fragments["tools"].get(name, [])]
+                    record["result_tag"] = next(iter(soil_tags), None)
+                    if record["type"] == "tunnel":
+                        record["tunnel_space_tag"] = next(iter(pieces), None)
+                        role = f"tunnel_space_{i}"
+                    elif record["type"] in ("diaphragm_wall", "pile"):
+                        record["volume_tags"] = pieces
+                        role = f"{record['type']}_{i}"
+                    else:
+                        role = None
+                    if role and pieces:
+                        structure_roles[role] = pieces
+                    result["processed_geometries"].append(record)
+                    result["operations_log"].append(
+                        f"{_STRUCTURE_LABELS.get(record['type'], record['type'])}求交完成")
+                if soil_tags:
+                    self.geometry_cache.try_save(gmsh, keys[-1], {"soil": soil_tags, **structure_roles})
             
-            result["final_soil_tag"] = current_soil_tag
+            result["final_soil_tag"] = next(iter(soil_tags), None)
+            result["soil_fragment_tags"] = soil_tags
+            result["tunnel_space_tags"] = {role: tags for role, tags in structure_roles.items()
+                                           if role.startswith("tunnel_space_")}
+            result["structure_volume_tags"] = {role: tags for role, tags in structure_roles.items()
+                                               if not role.startswith("tunnel_space_")}
             
             # 3. 导出最终几何体
             geometry_file = self.geometry_engine.export_geometry(
@@ -934,6 +1033,26 @@ class ComplexGeometryProcessor:
         finally:
             self.geometry_engine.finalize_gmsh()
     
+    def _create_structure_tools(self, index: int, structure: Dict[str, Any]
+                                ) -> Tuple[Optional[Dict[str, Any]], Dict[str, int], bool]:
+        """
+        创建单个结构的工具体
+        
+        Returns:
+            (结果记录, {工具名称: 几何标签}, 是否挖空)；未知结构类型返回 (None, {}, False)
+        """
+        structure_type = structure.get("type")
+        if structure_type == "excavation":
+            return self._create_excavation_tool(index, structure)
+        if structure_type == "tunnel":
+            return self._create_tunnel_tool(index, structure)
+        if structure_type == "diaphragm_wall":
+            return self._create_diaphragm_wall_tool(index, structure)
+        if structure_type == "pile":
+            return self._create_pile_tools(index, structure)
+        logger.warning(f"未知结构类型: {structure_type}")
+        return None, {}, False
+    
     def _prepare_terrain_data(self, geological_data: Dict[str, Any]) -> Dict[str, Any]:
         """准备地形数据"""
         # 从地质数据中提取地形信息
@@ -979,37 +1098,23 @@ class ComplexGeometryProcessor:
             'z_min': z_min, 'z_max': z_max
         }
     
-    def _process_excavation(self, soil_tag: int, excavation: Dict[str, Any], 
-                          result: Dict[str, Any]) -> int:
-        """处理基坑开挖"""
-        logger.info("处理基坑开挖求交...")
+    def _create_excavation_tool(self, index: int, excavation: Dict[str, Any]):
+        """基坑工具体：切分后挖空"""
+        logger.info("创建基坑开挖几何...")
         
         excavation_params = {
             "type": "polygon",
             "points": excavation.get("points", []),
             "depth": excavation.get("depth", 10.0)
         }
-        
-        # 创建基坑几何
         excavation_tag = self.geometry_engine.create_excavation_geometry(excavation_params)
         
-        # 土体与基坑求交（开挖）
-        excavated_soil = self.geometry_engine.soil_excavation_intersection(
-            soil_tag, excavation_tag)
-        
-        result["processed_geometries"].append({
-            "type": "excavation",
-            "original_tag": excavation_tag,
-            "result_tag": excavated_soil
-        })
-        result["operations_log"].append("基坑开挖求交完成")
-        
-        return excavated_soil
+        record = {"type": "excavation", "original_tag": excavation_tag}
+        return record, {f"excavation_{index}": excavation_tag}, True
     
-    def _process_tunnel(self, soil_tag: int, tunnel: Dict[str, Any], 
-                       result: Dict[str, Any]) -> int:
-        """处理隧道开挖"""
-        logger.info(f"处理{tunnel.get('shape', '未知')}隧道求交...")
+    def _create_tunnel_tool(self, index: int, tunnel: Dict[str, Any]):
+        """隧道工具体：隧道空间保留用于边界条件"""
+        logger.info(f"创建{tunnel.get('shape', '未知')}隧道几何...")
         
         tunnel_params = {
             "shape": tunnel.get("shape", "horseshoe"),
@@ -1028,46 +1133,90 @@ class ComplexGeometryProcessor:
             tunnel_params["radius"] = tunnel.get("radius", 
                                                tunnel_params["width"] / 2)
         
-        # 创建隧道几何
         tunnel_tag = self.geometry_engine.create_tunnel_geometry(tunnel_params)
         
-        # 土体与隧道求交
-        excavated_soil, tunnel_space = self.geometry_engine.soil_tunnel_intersection(
-            soil_tag, tunnel_tag)
+        record = {"type": "tunnel", "shape": tunnel_params["shape"], "tunnel_tag": tunnel_tag}
+        return record, {f"tunnel_{index}": tunnel_tag}, False
+    
+    def _create_diaphragm_wall_tool(self, index: int, wall: Dict[str, Any]):
+        """地连墙工具体：墙体作为独立体积保留，与土体共享界面"""
+        logger.info("创建地连墙几何...")
+        if len(wall.get("path") or []) < 2:
+            logger.warning("地连墙缺少路径，跳过")
+            return None, {}, False
         
-        result["processed_geometries"].append({
-            "type": "tunnel",
-            "shape": tunnel_params["shape"],
-            "tunnel_tag": tunnel_tag,
-            "tunnel_space_tag": tunnel_space,
-            "result_tag": excavated_soil
+        wall_tag = self.geometry_engine.create_diaphragm_wall_geometry({
+            "path": wall.get("path"),
+            "thickness": wall.get("thickness", 0.8),
+            "height": wall.get("height", 20.0)
         })
-        result["operations_log"].append(f"{tunnel_params['shape']}隧道求交完成")
         
-        return excavated_soil
+        record = {"type": "diaphragm_wall", "original_tag": wall_tag}
+        return record, {f"diaphragm_wall_{index}": wall_tag}, False
     
-    def _process_diaphragm_wall(self, soil_tag: int, wall: Dict[str, Any], 
-                              result: Dict[str, Any]) -> int:
-        """处理地连墙（简化实现）"""
-        logger.info("处理地连墙求交...")
+    def _create_pile_tools(self, index: int, pile: Dict[str, Any]):
+        """排桩工具体：每根桩作为独立体积保留"""
+        logger.info("创建排桩几何...")
+        if len(pile.get("path") or []) < 2:
+            logger.warning("排桩缺少路径，跳过")
+            return None, {}, False
         
-        # 这里可以实现地连墙与土体的求交
-        # 暂时返回原始土体
-        result["operations_log"].append("地连墙处理（简化）")
-        return soil_tag
+        pile_tags = self.geometry_engine.create_pile_geometries({
+            "path": pile.get("path"),
+            "diameter": pile.get("diameter", 1.0),
+            "spacing": pile.get("spacing", 2.0),
+            "length": pile.get("length", 20.0)
+        })
+        
+        record = {"type": "pile", "original_tags": pile_tags}
+        return record, {f"pile_{index}_{k}": tag for k, tag in enumerate(pile_tags)}, False
+
+
+# 任务 id -> 工作目录，供按需生成可视化JSON/预览图、查询剖析结果的接口查找结果
+_job_working_dirs: Dict[str, str] = {}
 
+# 工作目录名为 <前缀><job_id>_<随机后缀>，进程重启后仍可按 job_id 找回
+_JOB_DIR_PREFIX = "kratos_v5_complex_"
 
-def run_v5_analysis(scene_data: Dict[str, Any]) -> Dict[str, Any]:
+
+def job_working_dir(job_id: str) -> Optional[str]:
+    """任务的工作目录；本进程未登记时按目录名查找，未知任务或目录已删除时返回 None"""
+    working_dir = _job_working_dirs.get(job_id)
+    if working_dir is None and re.fullmatch(r"[A-Za-z0-9-]+", job_id):
+        pattern = os.path.join(tempfile.gettempdir(), f"{_JOB_DIR_PREFIX}{job_id}_*")
+        matches = glob.glob(pattern)
+        working_dir = max(matches, key=os.path.getmtime) if matches else None
+    return working_dir if working_dir and os.path.isdir(working_dir) else None
+
+
+def run_v5_analysis(scene_data: Dict[str, Any], job_id: Optional[str] = None,
+                    profile: bool = False) -> Dict[str, Any]:
     """
     V5分析引擎主入口
     支持复杂几何求交的完整工作流程
+
+    Args:
+        job_id: 任务 id，开启剖析时用于 /jobs/{id}/profile 查询
+        profile: 是否对本任务进行 cProfile/tracemalloc 剖析
     """
     logger.info("=== V5分析引擎启动 ===")
     
     # 创建工作目录
-    working_dir = tempfile.mkdtemp(prefix="kratos_v5_complex_")
+    job_id = job_id or uuid.uuid4().hex
+    working_dir = tempfile.mkdtemp(prefix=f"{_JOB_DIR_PREFIX}{job_id}_")
+    _job_working_dirs[job_id] = working_dir
     logger.info(f"工作目录: {working_dir}")
     
+    # 设置 DEEPCAD_TRACE_EXPORT 时，分阶段追踪写入工作目录
+    with job_trace(working_dir), trace_span("v5.run_analysis", working_dir=working_dir), \
+            profile_job(working_dir, job_id, enabled=profile):
+        result = _run_v5_pipeline(scene_data, working_dir)
+    result["results"]["job_id"] = job_id
+    return result
+
+
+def _run_v5_pipeline(scene_data: Dict[str, Any], working_dir: str) -> Dict[str, Any]:
+    """V5分析流程的各个阶段，每个阶段对应一个追踪span"""
     try:
         # 解析场景数据
         features = scene_data.get("features", [])
@@ -1098,6 +1247,23 @@ def run_v5_analysis(scene_data: Dict[str, Any]) -> Dict[str, Any]:
                     "length": feature.get("parameters", {}).get("length", 100.0),
                     "center": feature.get("parameters", {}).get("center", [50, 50, -20])
                 })
+            elif feature_type == "CreateDiaphragmWall":
+                params = feature.get("parameters", {})
+                structure_features.append({
+                    "type": "diaphragm_wall",
+                    "path": _path_points(params.get("path", [])),
+                    "thickness": params.get("thickness", 0.8),
+                    "height": params.get("height", 20.0)
+                })
+            elif feature_type == "CreatePileRaft":
+                params = feature.get("parameters", {})
+                structure_features.append({
+                    "type": "pile",
+                    "path": _path_points(params.get("path", [])),
+                    "diameter": params.get("pile_diameter", 1.0),
+                    "spacing": params.get("pile_spacing", 2.0),
+                    "length": params.get("pile_length", 20.0)
+                })
         
         result = {"status": "success", "analysis_steps": []}
         
@@ -1110,26 +1276,32 @@ def run_v5_analysis(scene_data: Dict[str, Any]) -> Dict[str, Any]:
             if structure_features:
                 logger.info("检测到工程结构，启动复杂几何求交...")
                 
-                processor = ComplexGeometryProcessor(working_dir)
-                geometry_result = processor.process_geological_model_with_structures(
-                    geological_data, structure_features)
+                with trace_span("v5.geometry", structure_count=len(structure_features)), \
+                        profile_stage("v5.geometry"):
+                    processor = ComplexGeometryProcessor(working_dir)
+                    geometry_result = processor.process_geological_model_with_structures(
+                        geological_data, structure_features)
                 
                 if geometry_result["status"] == "success":
                     result["geometry_intersection"] = geometry_result
                     result["analysis_steps"].append("复杂几何求交完成")
                     
                     # 使用求交后的几何进行网格生成
-                    mesh_file = _generate_mesh_from_complex_geometry(
-                        geometry_result, mesh_settings, working_dir)
+                    with trace_span("v5.mesh", source="complex_geometry"), \
+                            profile_stage("v5.mesh"):
+                        mesh_file = _generate_mesh_from_complex_geometry(
+                            geometry_result, mesh_settings, working_dir)
                     
                 else:
                     logger.error("复杂几何求交失败，回退到简化模式")
-                    mesh_file = _generate_simple_mesh(
-                        geological_data, mesh_settings, working_dir)
+                    with trace_span("v5.mesh", source="fallback"), profile_stage("v5.mesh"):
+                        mesh_file = _generate_simple_mesh(
+                            geological_data, mesh_settings, working_dir)
             else:
                 # 没有工程结构，使用标准地质建模
-                mesh_file = _generate_geological_mesh(
-                    geological_data, mesh_settings, working_dir)
+                with trace_span("v5.mesh", source="geology"), profile_stage("v5.mesh"):
+                    mesh_file = _generate_geological_mesh(
+                        geological_data, mesh_settings, working_dir)
             
             result["mesh_file"] = mesh_file
             result["analysis_steps"].append("网格生成完成")
@@ -1137,25 +1309,28 @@ def run_v5_analysis(scene_data: Dict[str, Any]) -> Dict[str, Any]:
         else:
             # 没有地质特征，生成简单网格
             logger.info("没有地质特征，生成简单网格...")
-            mesh_file = _generate_default_mesh(mesh_settings, working_dir)
+            with trace_span("v5.mesh", source="default"), profile_stage("v5.mesh"):
+                mesh_file = _generate_default_mesh(mesh_settings, working_dir)
             result["mesh_file"] = mesh_file
         
         # 3. 运行Kratos分析
         if result.get("mesh_file"):
             logger.info("运行Kratos有限元分析...")
             
-            kratos_result = _run_kratos_with_complex_geometry(
-                result.get("mesh_file"), 
-                result.get("geometry_intersection"),
-                analysis_settings, 
-                working_dir
-            )
+            with trace_span("v5.kratos"), profile_stage("v5.kratos"):
+                kratos_result = _run_kratos_with_complex_geometry(
+                    result.get("mesh_file"), 
+                    result.get("geometry_intersection"),
+                    analysis_settings, 
+                    working_dir
+                )
             
             result["kratos_analysis"] = kratos_result
             result["analysis_steps"].append("Kratos分析完成")
         
         # 4. 后处理和结果输出
-        _post_process_results(result, working_dir)
+        with trace_span("v5.post_process"), profile_stage("v5.post_process"):
+            _post_process_results(result, working_dir)
         
         logger.info("=== V5分析引擎完成 ===")
         return {"results": result}
@@ -1206,6 +1381,8 @@ def _generate_geological_mesh(geological_data: Dict[str, Any],
     # 使用现有的地质建模流程
     csv_data = geological_data.get("csvData", "")
     terrain_params = geological_data.get("terrainParams", {})
+    if not csv_data and geological_data.get("datasetId"):
+        csv_data = borehole_store.load(geological_data["datasetId"]).to_csv(index=False)
     
     if csv_data:
         # 使用GemPy地质建模
@@ -11,6 +11,7 @@ from sqlalchemy.orm import sessionmaker, Session
 from .models.base import Base
 from .models.user import User
 from .models.project import Project
+from .migrations import run_migrations
 
 # 配置数据库连接
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./deepcad.db")
@@ -32,6 +33,7 @@ def initialize_database():
     try:
         Base.metadata.create_all(bind=engine)
         logger.info("数据库表创建完成。")
+        run_migrations(engine)
     except Exception as e:
         logger.error(f"创建数据库表失败: {e}")
         raise
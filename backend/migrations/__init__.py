@@ -0,0 +1,33 @@
+"""
+数据库迁移模块
+
+迁移以 alembic revision 的形式放在 versions/ 下（配置见 backend/alembic.ini）。
+initialize_database 在 create_all 之后调用 run_migrations 升级到最新版本；
+命令行下也可直接使用: alembic -c backend/alembic.ini upgrade head
+"""
+import os
+
+from alembic import command
+from alembic.config import Config
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+ALEMBIC_INI = os.path.join(os.path.dirname(MIGRATIONS_DIR), "alembic.ini")
+
+
+def alembic_config(engine=None) -> Config:
+    """构造 alembic 配置；传入 engine 时迁移复用该引擎而不是 DATABASE_URL"""
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    if engine is not None:
+        config.attributes["engine"] = engine
+    return config
+
+
+def run_migrations(engine, revision: str = "head"):
+    """把数据库升级到指定版本（默认最新）"""
+    command.upgrade(alembic_config(engine), revision)
+
+
+def rollback_migration(engine, revision: str):
+    """把数据库回退到指定版本（如 "base" 或 "-1"）"""
+    command.downgrade(alembic_config(engine), revision)
@@ -0,0 +1,47 @@
+"""
+alembic 运行环境
+数据库地址与应用一致取自 DATABASE_URL；由 run_migrations 调用时复用应用的引擎。
+"""
+import os
+import sys
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+# 命令行运行 alembic 时保证可以导入 backend 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models.base import Base  # noqa: E402
+
+config = context.config
+if config.config_file_name and "engine" not in config.attributes:
+    fileConfig(config.config_file_name)  # 仅命令行运行时配置日志，不覆盖应用的日志设置
+
+target_metadata = Base.metadata
+
+
+def _database_url() -> str:
+    return os.environ.get("DATABASE_URL", "sqlite:///./deepcad.db")
+
+
+def run_migrations_offline():
+    context.configure(url=_database_url(), target_metadata=target_metadata,
+                      literal_binds=True, render_as_batch=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    engine = config.attributes.get("engine") or create_engine(_database_url())
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata,
+                          render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
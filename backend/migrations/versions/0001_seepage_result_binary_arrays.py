@@ -0,0 +1,134 @@
+"""
+SeepageResult 的节点数组从JSON列迁移到二进制存储
+
+Revision ID: 0001_seepage_result_binary_arrays
+Revises:
+Create Date: 2026-10-18
+
+upgrade:
+    1. 为 seepage_results 增加汇总列、*_blob 与 *_ref 列
+    2. 逐行把 head_data/pressure_data/velocity_data 的JSON转换为
+       压缩blob或外部数组文件，并计算汇总值
+    3. 清空旧JSON列（保留列本身，SQLite旧版本不支持 DROP COLUMN）
+downgrade:
+    把二进制数组重新展开写回JSON列
+"""
+import json
+import logging
+
+from alembic import op
+from sqlalchemy import Float, Integer, LargeBinary, String, inspect, text
+
+from backend.models.array_storage import as_result_array, load_array, store_array
+from backend.models.project import SEEPAGE_ARRAY_FIELDS, seepage_field_summary
+
+revision = "0001_seepage_result_binary_arrays"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger(__name__)
+
+TABLE = "seepage_results"
+
+NEW_COLUMNS = [
+    ("node_count", Integer()),
+    ("head_min", Float()),
+    ("head_max", Float()),
+    ("pressure_min", Float()),
+    ("pressure_max", Float()),
+    ("velocity_max", Float()),
+] + [
+    column
+    for name in SEEPAGE_ARRAY_FIELDS
+    for column in ((f"{name}_blob", LargeBinary()), (f"{name}_ref", String(64)))
+]
+
+
+def _columns(conn) -> set:
+    insp = inspect(conn)
+    if TABLE not in insp.get_table_names():
+        return set()
+    return {c["name"] for c in insp.get_columns(TABLE)}
+
+
+def _add_column(conn, name: str, column_type):
+    type_sql = column_type.compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN {name} {type_sql}"))
+
+
+def upgrade():
+    conn = op.get_bind()
+    columns = _columns(conn)
+    if not columns:
+        return  # 表尚未创建，create_all 会直接建出新结构
+
+    for name, column_type in NEW_COLUMNS:
+        if name not in columns:
+            _add_column(conn, name, column_type)
+
+    legacy = [name for name in SEEPAGE_ARRAY_FIELDS if f"{name}_data" in columns]
+    if not legacy:
+        return
+
+    select_sql = text(
+        f"SELECT {', '.join(f'{name}_data' for name in legacy)} FROM {TABLE} WHERE id = :id")
+    ids = [row[0] for row in conn.execute(text(f"SELECT id FROM {TABLE}"))]
+    migrated = 0
+    # 逐行转换，避免一次性把所有结果的JSON读入内存
+    for row_id in ids:
+        row = conn.execute(select_sql, {"id": row_id}).one()
+        values = {}
+        for name, raw in zip(legacy, row):
+            if raw is None:
+                continue
+            try:
+                data = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+                array = as_result_array(data)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"seepage_results.id={row_id} 的 {name}_data 无法转换: {e}")
+                continue
+            blob, ref = store_array(array)
+            values[f"{name}_blob"] = blob
+            values[f"{name}_ref"] = ref
+            values[f"{name}_data"] = None
+            values.update(seepage_field_summary(name, array))
+        if values:
+            assignments = ", ".join(f"{key} = :{key}" for key in values)
+            conn.execute(text(f"UPDATE {TABLE} SET {assignments} WHERE id = :id"),
+                         {**values, "id": row_id})
+            migrated += 1
+    logger.info(f"已迁移 {migrated} 条渗流结果到二进制数组存储")
+
+
+def downgrade():
+    conn = op.get_bind()
+    columns = _columns(conn)
+    if not columns:
+        return
+
+    for name in SEEPAGE_ARRAY_FIELDS:
+        if f"{name}_data" not in columns:
+            conn.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN {name}_data JSON"))
+
+    present = [name for name in SEEPAGE_ARRAY_FIELDS if f"{name}_blob" in columns]
+    if not present:
+        return
+
+    select_sql = text(
+        "SELECT " + ", ".join(f"{name}_blob, {name}_ref" for name in present)
+        + f" FROM {TABLE} WHERE id = :id")
+    ids = [row[0] for row in conn.execute(text(f"SELECT id FROM {TABLE}"))]
+    for row_id in ids:
+        row = conn.execute(select_sql, {"id": row_id}).one()
+        values = {}
+        for i, name in enumerate(present):
+            array = load_array(row[2 * i], row[2 * i + 1])
+            if array is not None:
+                values[f"{name}_data"] = json.dumps(array.tolist())
+                values[f"{name}_blob"] = None
+                values[f"{name}_ref"] = None
+        if values:
+            assignments = ", ".join(f"{key} = :{key}" for key in values)
+            conn.execute(text(f"UPDATE {TABLE} SET {assignments} WHERE id = :id"),
+                         {**values, "id": row_id})
@@ -0,0 +1,104 @@
+"""
+结果数组的二进制存储
+大数组不再以JSON列存储：小数组压缩为二进制blob内联在行中，
+大数组写入按内容哈希寻址的外部 .npy 文件，读取时可直接内存映射。
+"""
+import hashlib
+import io
+import os
+import zlib
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+# 超过该字节数的数组写入外部文件而不是数据库blob
+INLINE_LIMIT_BYTES = int(os.environ.get("DEEPCAD_INLINE_ARRAY_LIMIT", 4 * 1024 * 1024))
+
+# 外部数组文件根目录
+ARTIFACT_DIR = os.environ.get("DEEPCAD_ARTIFACT_DIR", os.path.abspath("./artifacts"))
+
+
+def as_result_array(values: Any) -> np.ndarray:
+    """把列表或数组统一转换为连续的 float64 数组"""
+    return np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+
+
+def encode_array(array: np.ndarray, level: int = 1) -> bytes:
+    """把数组编码为 zlib 压缩的 .npy 字节串（保留 dtype 与形状）"""
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return zlib.compress(buffer.getvalue(), level)
+
+
+def decode_array(blob: bytes) -> np.ndarray:
+    """解码 encode_array 生成的字节串"""
+    return np.load(io.BytesIO(zlib.decompress(blob)), allow_pickle=False)
+
+
+class ArtifactStore:
+    """按内容哈希寻址的数组文件仓库"""
+
+    def __init__(self, root: str = None):
+        self.root = root or ARTIFACT_DIR
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}.npy")
+
+    def put(self, array: np.ndarray) -> str:
+        """写入数组并返回其 sha256；相同内容只存储一次"""
+        digest = array_digest(array)
+        path = self.path_for(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, array, allow_pickle=False)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str, mmap: bool = True) -> np.ndarray:
+        """读取数组；默认只读内存映射，仅在访问切片时才读磁盘"""
+        path = self.path_for(digest)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"结果数组文件不存在: {path}")
+        return np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+
+    def delete(self, digest: str) -> bool:
+        """删除数组文件；文件不存在时返回 False"""
+        try:
+            os.remove(self.path_for(digest))
+        except FileNotFoundError:
+            return False
+        return True
+
+
+def array_digest(array: np.ndarray) -> str:
+    """数组内容（含dtype与形状）的 sha256"""
+    h = hashlib.sha256()
+    h.update(str(array.dtype).encode())
+    h.update(str(array.shape).encode())
+    h.update(memoryview(np.ascontiguousarray(array)).cast("B"))
+    return h.hexdigest()
+
+
+def store_array(array: np.ndarray, store: ArtifactStore = None
+                ) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    根据大小选择存储方式
+
+    Returns:
+        (内联blob, 外部文件哈希)，二者只有一个非空
+    """
+    if array.nbytes <= INLINE_LIMIT_BYTES:
+        return encode_array(array), None
+    return None, (store or ArtifactStore()).put(array)
+
+
+def load_array(blob: Optional[bytes], ref: Optional[str],
+               store: ArtifactStore = None) -> Optional[np.ndarray]:
+    """按 store_array 的约定读取数组"""
+    if blob is not None:
+        return decode_array(blob)
+    if ref:
+        return (store or ArtifactStore()).get(ref)
+    return None
@@ -1,13 +1,19 @@
 """
 项目模型定义
 """
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, JSON, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Float, ForeignKey, JSON, Text, LargeBinary,
+    event, inspect, or_, select
+)
+from sqlalchemy.orm import relationship, deferred, Session, object_session
 from pydantic import BaseModel, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+import numpy as np
+
 from .base import Base
+from .array_storage import ArtifactStore, as_result_array, load_array, store_array
 
 
 class Project(Base):
@@ -57,8 +63,34 @@ class SeepageModel(Base):
     results = relationship("SeepageResult", back_populates="model", uselist=False, cascade="all, delete-orphan")
 
 
+# 渗流结果中按二进制存储的数组字段
+SEEPAGE_ARRAY_FIELDS = ("head", "pressure", "velocity")
+
+
+def seepage_field_summary(name: str, array: Optional[np.ndarray]) -> Dict[str, Any]:
+    """计算数组字段对应的汇总列"""
+    if name == "velocity":
+        if array is None or array.size == 0:
+            return {"velocity_max": None}
+        magnitude = np.linalg.norm(array, axis=1) if array.ndim == 2 else np.abs(array)
+        return {"velocity_max": float(magnitude.max())}
+    if array is None or array.size == 0:
+        summary = {f"{name}_min": None, f"{name}_max": None}
+    else:
+        summary = {f"{name}_min": float(array.min()), f"{name}_max": float(array.max())}
+    if name == "head":
+        summary["node_count"] = int(len(array)) if array is not None else None
+    return summary
+
+
 class SeepageResult(Base):
-    """渗流分析结果数据库模型"""
+    """
+    渗流分析结果数据库模型
+
+    节点数组 (head_data/pressure_data/velocity_data) 不再存为JSON列：
+    小数组压缩为延迟加载的二进制blob，大数组写入按哈希寻址的外部文件
+    (*_ref)。汇总指标存于普通列，列表查询不会加载任何数组。
+    """
     __tablename__ = "seepage_results"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -66,12 +98,24 @@ class SeepageResult(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     status = Column(String(20), default="pending")
     
-    # 存储计算结果，可能很大
-    head_data = Column(JSON)
-    pressure_data = Column(JSON)
-    velocity_data = Column(JSON)
     flow_rate = Column(Float)
     
+    # 结果汇总
+    node_count = Column(Integer)
+    head_min = Column(Float)
+    head_max = Column(Float)
+    pressure_min = Column(Float)
+    pressure_max = Column(Float)
+    velocity_max = Column(Float)
+    
+    # 结果数组：仅在访问对应属性时才从数据库或外部文件加载
+    head_blob = deferred(Column(LargeBinary))
+    head_ref = Column(String(64))
+    pressure_blob = deferred(Column(LargeBinary))
+    pressure_ref = Column(String(64))
+    velocity_blob = deferred(Column(LargeBinary))
+    velocity_ref = Column(String(64))
+    
     # 安全评估指标
     safety_factor = Column(Float)
     gradient_ratio = Column(Float)
@@ -79,6 +123,92 @@ class SeepageResult(Base):
     # 关联到模型
     model = relationship("SeepageModel", back_populates="results")
 
+    def _get_array(self, name: str) -> Optional[np.ndarray]:
+        cache = self.__dict__.setdefault("_array_cache", {})
+        if name not in cache:
+            cache[name] = load_array(
+                getattr(self, f"{name}_blob"), getattr(self, f"{name}_ref"))
+        return cache[name]
+
+    def _set_array(self, name: str, values: Any):
+        array = None if values is None else as_result_array(values)
+        blob, ref = (None, None) if array is None else store_array(array)
+        setattr(self, f"{name}_blob", blob)
+        setattr(self, f"{name}_ref", ref)
+        for column, value in seepage_field_summary(name, array).items():
+            setattr(self, column, value)
+        self.__dict__.setdefault("_array_cache", {})[name] = array
+
+    head_data = property(
+        lambda self: self._get_array("head"),
+        lambda self, values: self._set_array("head", values),
+        doc="节点总水头数组 (n,)")
+    pressure_data = property(
+        lambda self: self._get_array("pressure"),
+        lambda self, values: self._set_array("pressure", values),
+        doc="节点孔隙水压力数组 (n,)")
+    velocity_data = property(
+        lambda self: self._get_array("velocity"),
+        lambda self, values: self._set_array("velocity", values),
+        doc="节点渗流速度数组 (n, 3)")
+
+
+# 外部数组文件的回收：
+# 删除渗流结果或替换其数组时，记下不再被该行引用的文件哈希；每次 flush 后
+# 检查它们是否仍被其他行引用（相同内容只存一份），事务提交后删除无人引用的文件，
+# 回滚则放弃。通过 Query.delete() 等批量语句删除的行不会触发回收。
+_ARTIFACT_CANDIDATES = "seepage_artifact_candidates"
+_ARTIFACT_ORPHANS = "seepage_artifact_orphans"
+
+
+def _mark_released_artifacts(target: "SeepageResult", refs):
+    refs = {ref for ref in refs if ref}
+    session = object_session(target)
+    if refs and session is not None:
+        session.info.setdefault(_ARTIFACT_CANDIDATES, set()).update(refs)
+
+
+@event.listens_for(SeepageResult, "after_delete")
+def _release_deleted_artifacts(mapper, connection, target):
+    _mark_released_artifacts(target, (getattr(target, f"{name}_ref") for name in SEEPAGE_ARRAY_FIELDS))
+
+
+@event.listens_for(SeepageResult, "after_update")
+def _release_replaced_artifacts(mapper, connection, target):
+    state = inspect(target)
+    replaced = []
+    for name in SEEPAGE_ARRAY_FIELDS:
+        history = state.attrs[f"{name}_ref"].history
+        replaced.extend(ref for ref in history.deleted if ref not in history.added)
+    _mark_released_artifacts(target, replaced)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_orphaned_artifacts(session, flush_context):
+    orphans = session.info.get(_ARTIFACT_ORPHANS, set()) | session.info.pop(_ARTIFACT_CANDIDATES, set())
+    if not orphans:
+        return
+    ref_columns = [getattr(SeepageResult, f"{name}_ref") for name in SEEPAGE_ARRAY_FIELDS]
+    rows = session.connection().execute(
+        select(*ref_columns).where(or_(*(column.in_(orphans) for column in ref_columns))))
+    referenced = {ref for row in rows for ref in row}
+    session.info[_ARTIFACT_ORPHANS] = orphans - referenced
+
+
+@event.listens_for(Session, "after_commit")
+def _delete_orphaned_artifacts(session):
+    orphans = session.info.pop(_ARTIFACT_ORPHANS, None)
+    if orphans:
+        store = ArtifactStore()
+        for digest in orphans:
+            store.delete(digest)
+
+
+@event.listens_for(Session, "after_rollback")
+def _keep_artifacts_on_rollback(session):
+    session.info.pop(_ARTIFACT_CANDIDATES, None)
+    session.info.pop(_ARTIFACT_ORPHANS, None)
+
 
 # Pydantic模型，用于API请求和响应
 
@@ -156,6 +286,12 @@ class SeepageResultBase(BaseModel):
     """渗流结果基础模型"""
     status: str
     flow_rate: Optional[float] = None
+    node_count: Optional[int] = None
+    head_min: Optional[float] = None
+    head_max: Optional[float] = None
+    pressure_min: Optional[float] = None
+    pressure_max: Optional[float] = None
+    velocity_max: Optional[float] = None
     safety_factor: Optional[float] = None
     gradient_ratio: Optional[float] = None
 
@@ -0,0 +1,4 @@
+"""
+性能基准测试
+不在常规 pytest 运行中收集 (文件以 bench_ 开头)，需要单独执行。
+"""
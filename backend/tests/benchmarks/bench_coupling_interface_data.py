@@ -0,0 +1,88 @@
+"""
+CoSimulation 界面数据读写基准：逐实体 Python 循环 vs 批量连续缓冲区
+
+每种规模比较三种读取方式（逐节点 GetSolutionStepValue、GetData、复用缓冲区的
+GetDataView）与两种写入方式（逐节点 SetSolutionStepValue、SetData）。
+需要已编译的 KratosMultiphysics 与 CoSimulationApplication。
+
+用法:
+    python -m backend.tests.benchmarks.bench_coupling_interface_data [--nodes 1000 100000 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+import KratosMultiphysics as KM
+from KratosMultiphysics.CoSimulationApplication.coupling_interface_data import CouplingInterfaceData
+
+
+def _create_interface(model: "KM.Model", n_nodes: int) -> "KM.ModelPart":
+    model_part = model.CreateModelPart(f"interface_{n_nodes}", 2)
+    model_part.AddNodalSolutionStepVariable(KM.DISPLACEMENT)
+    model_part.ProcessInfo[KM.DOMAIN_SIZE] = 3
+    for i in range(n_nodes):
+        model_part.CreateNewNode(i + 1, float(i), 0.0, 0.0)
+    return model_part
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(node_counts, repeat: int = 5) -> list:
+    rows = []
+    for n in node_counts:
+        model = KM.Model()
+        model_part = _create_interface(model, n)
+        interface_data = CouplingInterfaceData(KM.Parameters("""{
+            "model_part_name" : "%s",
+            "variable_name"   : "DISPLACEMENT",
+            "dimension"       : 3
+        }""" % model_part.Name), model)
+        nodes = model_part.Nodes
+        values = np.random.default_rng(0).random(3 * n)
+
+        def loop_get():
+            data = []
+            for node in nodes:
+                vals = node.GetSolutionStepValue(KM.DISPLACEMENT, 0)
+                data.extend((vals[0], vals[1], vals[2]))
+            return np.asarray(data)
+
+        def loop_set():
+            for i, node in enumerate(nodes):
+                node.SetSolutionStepValue(KM.DISPLACEMENT, 0, list(values[3 * i:3 * i + 3]))
+
+        rows.append({
+            "nodes": n,
+            "loop_get_s": _best_of(loop_get, repeat),
+            "get_data_s": _best_of(interface_data.GetData, repeat),
+            "get_view_s": _best_of(interface_data.GetDataView, repeat),
+            "loop_set_s": _best_of(loop_set, repeat),
+            "set_data_s": _best_of(lambda: interface_data.SetData(values), repeat),
+        })
+        np.testing.assert_allclose(interface_data.GetDataView(), values)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{'节点数':>8} {'逐节点读':>10} {'GetData':>10} {'GetDataView':>12} "
+          f"{'逐节点写':>10} {'SetData':>10}")
+    for row in run(args.nodes, args.repeat):
+        print(f"{row['nodes']:>8} {row['loop_get_s'] * 1000:>8.2f}ms {row['get_data_s'] * 1000:>8.2f}ms "
+              f"{row['get_view_s'] * 1000:>10.2f}ms {row['loop_set_s'] * 1000:>8.2f}ms "
+              f"{row['set_data_s'] * 1000:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+CoSimulation 预测器基准：最小二乘高阶外推 vs 线性外推的耦合迭代次数
+
+两个 SDoF 求解器（CoSimulationApplication 测试中使用的 solver_wrappers.sdof）串联为强耦合问题：
+a 受简谐力激励，其位移作为 b 的根点位移，b 的反力作为 a 的载荷；
+Gauss-Seidel 强耦合 + 常数松弛，按相对残差收敛。对 a 的载荷使用不同预测器，统计全部时间步的耦合迭代次数。
+线性基准使用 order=1、number_of_steps=2 的 least_squares 预测器，与 linear 预测器的外推相同
+（linear 预测器需要历史节点数据，不能用于 SDoF 的 model_part 数据）。
+tests/fsi_sdof 中的算例与流体求解器弱耦合，没有耦合迭代，因此不在此统计。
+需要已编译的 KratosMultiphysics 与 CoSimulationApplication。
+
+用法:
+    python -m backend.tests.benchmarks.bench_least_squares_predictor [--end-time 2.0] [--alpha 0.4]
+"""
+import argparse
+import json
+import os
+import tempfile
+
+import KratosMultiphysics as KM
+from KratosMultiphysics.CoSimulationApplication.co_simulation_analysis import CoSimulationAnalysis
+
+# (名称, 预测器设置)，None 表示不使用预测器
+PREDICTORS = [
+    ("none", None),
+    ("linear", {"order": 1, "number_of_steps": 2}),
+    ("least_squares", {"order": 2, "number_of_steps": 3}),
+    ("least_squares", {"order": 2, "number_of_steps": 4}),
+    ("least_squares", {"order": 2, "number_of_steps": 6}),
+    ("least_squares", {"order": 3, "number_of_steps": 4}),
+    ("least_squares", {"order": 3, "number_of_steps": 6}),
+]
+
+SDOF_PARAMETERS = {
+    "a": {
+        "system_parameters": {"mass": 1.0, "stiffness": 400.0, "damping": 0.5},
+        "time_integration_parameters": {"time_step": 0.01},
+        "boundary_conditions": {"amplitude_force": 10.0, "omega_force": 7.0},
+        "output_parameters": {"write_output_file": False},
+    },
+    "b": {
+        "system_parameters": {"mass": 2.0, "stiffness": 800.0, "damping": 0.0},
+        "time_integration_parameters": {"time_step": 0.01},
+        "output_parameters": {"write_output_file": False},
+    },
+}
+
+
+def _cosim_parameters(directory: str, predictor, end_time: float, alpha: float, tolerance: float) -> dict:
+    def solver(name, data):
+        return {
+            "type": "solver_wrappers.sdof.sdof_solver_wrapper",
+            "solver_wrapper_settings": {"input_file": os.path.join(directory, name)},
+            "data": {data_name: {"model_part_name": "Sdof", "variable_name": variable, "location": "model_part"}
+                     for data_name, variable in data.items()},
+        }
+
+    predictors = []
+    if predictor is not None:
+        predictors.append(dict(type="least_squares", solver="a", data_name="load", **predictor))
+
+    return {
+        "problem_data": {"start_time": 0.0, "end_time": end_time, "echo_level": 0, "parallel_type": "OpenMP"},
+        "solver_settings": {
+            "type": "coupled_solvers.gauss_seidel_strong",
+            "echo_level": 0,
+            "num_coupling_iterations": 100,
+            "predictors": predictors,
+            "convergence_accelerators": [{"type": "constant_relaxation", "solver": "a", "data_name": "load", "alpha": alpha}],
+            "convergence_criteria": [{"type": "relative_norm_previous_residual", "solver": "a", "data_name": "load",
+                                      "abs_tolerance": 1e-12, "rel_tolerance": tolerance}],
+            "data_transfer_operators": {"copy": {"type": "copy"}},
+            "coupling_sequence": [
+                {"name": "a", "input_data_list": [],
+                 "output_data_list": [{"data": "disp", "to_solver": "b", "to_solver_data": "root_disp", "data_transfer_operator": "copy"}]},
+                {"name": "b", "input_data_list": [],
+                 "output_data_list": [{"data": "reaction", "to_solver": "a", "to_solver_data": "load", "data_transfer_operator": "copy"}]},
+            ],
+            "solvers": {
+                "a": solver("a", {"load": "SCALAR_FORCE", "disp": "SCALAR_DISPLACEMENT"}),
+                "b": solver("b", {"root_disp": "SCALAR_ROOT_POINT_DISPLACEMENT", "reaction": "SCALAR_REACTION"}),
+            },
+        },
+    }
+
+
+def _count_coupling_iterations(parameters: dict) -> tuple:
+    analysis = CoSimulationAnalysis(KM.Parameters(json.dumps(parameters)))
+    solver_a = analysis._GetSolver("a")
+    solve = solver_a.SolveSolutionStep
+    counter = {"solves": 0}
+
+    def counted_solve():
+        counter["solves"] += 1
+        solve()
+
+    solver_a.SolveSolutionStep = counted_solve
+    analysis.Initialize()
+    analysis.RunSolutionLoop()
+    analysis.Finalize()
+    return counter["solves"], analysis.step
+
+
+def run(end_time: float = 2.0, alpha: float = 0.4, tolerance: float = 1e-6) -> list:
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, settings in SDOF_PARAMETERS.items():
+            with open(os.path.join(directory, name + ".json"), "w") as parameter_file:
+                json.dump(settings, parameter_file)
+
+        for name, predictor in PREDICTORS:
+            iterations, steps = _count_coupling_iterations(_cosim_parameters(directory, predictor, end_time, alpha, tolerance))
+            rows.append({
+                "predictor": name,
+                "order": predictor["order"] if predictor else "-",
+                "number_of_steps": predictor["number_of_steps"] if predictor else "-",
+                "iterations": iterations,
+                "steps": steps,
+            })
+
+    linear_iterations = next(row["iterations"] for row in rows if row["predictor"] == "linear")
+    for row in rows:
+        row["saved_vs_linear"] = 1.0 - row["iterations"] / linear_iterations
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--end-time", type=float, default=2.0)
+    parser.add_argument("--alpha", type=float, default=0.4, help="常数松弛系数")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="相对残差收敛容差")
+    args = parser.parse_args()
+    print(f"{'预测器':>14} {'阶数':>4} {'步数':>4} {'总迭代数':>8} {'平均每步':>8} {'相对线性节省':>12}")
+    for row in run(args.end_time, args.alpha, args.tolerance):
+        print(f"{row['predictor']:>14} {row['order']:>4} {row['number_of_steps']:>4} {row['iterations']:>8} "
+              f"{row['iterations'] / row['steps']:>8.2f} {100 * row['saved_vs_linear']:>11.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+OCC 批量切分基准：逐个工具 cut vs 一次 fragment
+
+用法:
+    python -m backend.tests.benchmarks.bench_occ_fragment [--features 1 10 50]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.core.geometry_operations import BooleanOperation, GeometryIntersectionEngine
+
+SOIL_EXTENT = (0.0, 0.0, -40.0, 200.0, 200.0, 0.0)
+
+
+def _add_features(occ, n_features: int, seed: int = 0) -> dict:
+    """
+    生成 n 个结构特征：基坑、地连墙、锚杆交替出现；
+    约 1/5 的特征放在土体之外，用于检验包围盒预筛选
+    """
+    rng = np.random.default_rng(seed)
+    tools = {}
+    for i in range(n_features):
+        x, y = rng.uniform(20.0, 180.0, 2)
+        if i % 5 == 4:
+            x += 400.0  # 土体之外
+        kind = i % 3
+        if kind == 0:
+            tag = occ.addBox(x - 5.0, y - 5.0, -8.0, 10.0, 10.0, 8.0)
+            name = f"excavation_{i}"
+        elif kind == 1:
+            tag = occ.addBox(x - 6.0, y - 0.4, -20.0, 12.0, 0.8, 20.0)
+            name = f"wall_{i}"
+        else:
+            tag = occ.addCylinder(x, y, -3.0, 12.0, 0.0, -4.0, 0.15)
+            name = f"anchor_{i}"
+        tools[name] = tag
+    return tools
+
+
+def _add_soil(occ) -> int:
+    x0, y0, z0, x1, y1, z1 = SOIL_EXTENT
+    return occ.addBox(x0, y0, z0, x1 - x0, y1 - y0, z1 - z0)
+
+
+def run(feature_counts) -> list:
+    engine = GeometryIntersectionEngine(use_occ=True)
+    engine.initialize_gmsh()
+    gmsh = engine.kernel.gmsh
+    occ = gmsh.model.occ
+    rows = []
+    try:
+        for n in feature_counts:
+            # 逐个工具 cut，每次同步
+            gmsh.clear()
+            soil = _add_soil(occ)
+            tools = _add_features(occ, n)
+            start = time.perf_counter()
+            for tag in tools.values():
+                soil = engine.perform_boolean_operation(
+                    soil, tag, BooleanOperation.DIFFERENCE) or soil
+            sequential = time.perf_counter() - start
+
+            # 一次 fragment，同步一次
+            gmsh.clear()
+            soil = _add_soil(occ)
+            tools = _add_features(occ, n)
+            start = time.perf_counter()
+            fragments = engine.batch_fragment([soil], tools, remove_tools=list(tools))
+            batch = time.perf_counter() - start
+
+            rows.append({
+                "features": n,
+                "sequential_s": sequential,
+                "batch_s": batch,
+                "skipped": len(fragments["skipped"]),
+                "volumes": len(gmsh.model.getEntities(3)),
+            })
+    finally:
+        engine.finalize_gmsh()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--features", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+    print(f"{'特征数':>6} {'逐个cut':>12} {'批量fragment':>14} {'跳过':>6} {'体数':>6}")
+    for row in run(args.features):
+        print(f"{row['features']:>6} {row['sequential_s'] * 1000:>10.1f}ms "
+              f"{row['batch_s'] * 1000:>12.1f}ms {row['skipped']:>6} {row['volumes']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+全流程性能基准：地层面构建、OCC 求交、网格剖分、MDPA 写出、结果后处理、JSON/二进制导出
+
+用法:
+    python -m backend.tests.benchmarks.bench_pipeline run [--scenarios small medium large]
+                                                       [--repeat 3] [--output results.json] [--keep]
+    python -m backend.tests.benchmarks.bench_pipeline compare base.json new.json [--threshold 0.10]
+
+run 的结果为 JSON（每个场景、每个阶段记录最短耗时与全部耗时）；
+compare 比较两份结果，任一阶段变慢超过阈值、或基线中有耗时而当前结果缺失/失败时
+以退出码 1 结束，便于在发布前拦截性能回退。run 结束后删除临时工作目录，--keep 时保留。
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from backend.tests.benchmarks.scenarios import (
+    SCENARIOS, Scenario, generate_boreholes, surface_order, terrain_data, terrain_extent)
+
+RESULT_FORMAT_VERSION = 1
+STAGES = ["geology_surfaces", "occ_intersection", "meshing", "mdpa_write",
+          "result_consolidate", "result_query", "export_json", "export_binary"]
+
+
+def _timed(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {"seconds": min(runs), "runs": runs}
+
+
+# --- 各阶段 ---
+
+def bench_geology_surfaces(boreholes, scenario: Scenario, repeat: int) -> Dict[str, Any]:
+    from backend.core.geology_modeler import create_geological_model_geometry
+
+    records = boreholes.rename(columns={"X": "x", "Y": "y", "Z": "z", "surface": "formation"}) \
+        .to_dict("records")
+    formations = {"DefaultSeries": ",".join(surface_order(boreholes))}
+    options = {"resolution": [scenario.surface_resolution] * 2}
+    layers = []
+
+    def run():
+        layers[:] = create_geological_model_geometry(records, formations, options)
+
+    return {**_timed(run, repeat), "layers": len(layers)}
+
+
+def bench_occ_intersection(boreholes, scenario: Scenario, repeat: int) -> Dict[str, Any]:
+    from backend.core.geometry_operations import GeometryIntersectionEngine
+
+    extent = terrain_extent(boreholes)
+    dx = extent["x_max"] - extent["x_min"]
+    dy = extent["y_max"] - extent["y_min"]
+    dz = extent["z_max"] - extent["z_min"]
+    rng = np.random.default_rng(0)
+    anchors = rng.uniform(0.1, 0.9, (scenario.structure_count, 2))
+
+    engine = GeometryIntersectionEngine(use_occ=True)
+    engine.initialize_gmsh()
+    gmsh = engine.kernel.gmsh
+    occ = gmsh.model.occ
+    volumes = []
+    try:
+        def run():
+            gmsh.clear()
+            soil = occ.addBox(extent["x_min"], extent["y_min"], extent["z_min"], dx, dy, dz)
+            tools = {}
+            for i, (u, v) in enumerate(anchors):
+                x = extent["x_min"] + u * dx
+                y = extent["y_min"] + v * dy
+                if i % 2 == 0:
+                    tools[f"excavation_{i}"] = occ.addBox(
+                        x - 5.0, y - 5.0, extent["z_max"] - 8.0, 10.0, 10.0, 8.0)
+                else:
+                    tools[f"wall_{i}"] = occ.addBox(
+                        x - 6.0, y - 0.4, extent["z_max"] - 20.0, 12.0, 0.8, 20.0)
+            engine.batch_fragment([soil], tools)
+            volumes[:] = gmsh.model.getEntities(3)
+
+        return {**_timed(run, repeat), "volumes": len(volumes)}
+    finally:
+        engine.finalize_gmsh()
+
+
+def bench_meshing(boreholes, scenario: Scenario, repeat: int, workdir: str,
+                  scratch_dirs: List[str]) -> Dict[str, Any]:
+    """剖分与 MDPA 写出在同一流程中，借助追踪 span 分别计时；生成器的工作目录记入 scratch_dirs"""
+    from backend.core.mesh_generator import TerrainMeshGenerator
+    from backend.core.tracing import file_trace, load_spans
+
+    data = terrain_data(boreholes)
+    meshing, mdpa, info = [], [], {}
+    for k in range(repeat):
+        trace_path = os.path.join(workdir, f"mesh_trace_{k}.jsonl")
+        generator = TerrainMeshGenerator(mesh_size=scenario.mesh_size)
+        scratch_dirs.append(generator.working_dir)
+        with file_trace(trace_path):
+            generator.generate_terrain_mesh(data)
+        spans = {s["name"]: s for s in load_spans(trace_path)}
+        meshing.append(spans["gmsh.generate"]["duration_ms"] / 1000.0)
+        mdpa.append(spans["mdpa.write"]["duration_ms"] / 1000.0)
+        info = {
+            "nodes": spans["gmsh.generate"]["attributes"].get("node_count"),
+            "elements": spans["gmsh.generate"]["attributes"].get("element_count"),
+            "vtk_file": os.path.join(generator.working_dir, "terrain_mesh.vtk"),
+        }
+    return {
+        "meshing": {"seconds": min(meshing), "runs": meshing,
+                    "nodes": info["nodes"], "elements": info["elements"]},
+        "mdpa_write": {"seconds": min(mdpa), "runs": mdpa},
+        "vtk_file": info["vtk_file"],
+    }
+
+
+def _synthetic_results(vtk_file: str, steps: int, workdir: str):
+    """在剖分结果上生成逐步位移/孔压场，按 Kratos 的命名写入 vtk_output"""
+    import pyvista as pv
+
+    mesh = pv.read(vtk_file)
+    mesh = mesh.extract_cells_by_type(pv.CellType.TETRA)
+    out_dir = os.path.join(workdir, "vtk_output")
+    os.makedirs(out_dir, exist_ok=True)
+    z = mesh.points[:, 2]
+    for step in range(1, steps + 1):
+        factor = step / steps
+        mesh.point_data["DISPLACEMENT"] = np.column_stack(
+            [np.zeros_like(z), np.zeros_like(z), -1e-3 * factor * (z.max() - z)])
+        mesh.point_data["WATER_PRESSURE"] = 9.81e3 * factor * (z.max() - z)
+        mesh.save(os.path.join(out_dir, f"Structure_0_{step}.vtk"), binary=True)
+    return mesh
+
+
+def bench_results(vtk_file: str, scenario: Scenario, repeat: int, workdir: str) -> Dict[str, Any]:
+    from backend.core.post_processing import PostProcessor
+    from backend.core.result_store import ResultStore, consolidate_vtk_output
+    from backend.core.spatial_index import SpatialIndexService
+    from backend.models.array_storage import encode_array
+
+    mesh = _synthetic_results(vtk_file, scenario.result_steps, workdir)
+    processor = PostProcessor(workdir)
+    center = np.asarray(mesh.center)
+    bounds = mesh.bounds
+    store_path = os.path.join(workdir, "results.h5")
+
+    consolidate = _timed(lambda: consolidate_vtk_output(workdir, store_path, force=True), repeat)
+
+    def query():
+        # 每次使用新的索引服务，计入索引构建
+        service = SpatialIndexService()
+        with ResultStore(store_path) as store:
+            store.time_series("WATER_PRESSURE", [0])
+        index = service.for_file(store_path, step=-1)
+        index.slice(tuple(center), (1.0, 0.0, 0.0))
+        index.sample_polyline([(center[0], center[1], bounds[5]), (center[0], center[1], bounds[4])],
+                              200, ["DISPLACEMENT"])
+
+    def export_binary():
+        # 与 JSON 导出相同的内容，按数组压缩编码（SeepageResult 数组存储所用格式）
+        arrays = [mesh.points, mesh.cells] + [mesh[name] for name in mesh.array_names]
+        return sum(len(encode_array(np.asarray(a))) for a in arrays)
+
+    json_path = os.path.join(workdir, "visualization.json")
+    return {
+        "result_consolidate": {**consolidate, "steps": scenario.result_steps},
+        "result_query": _timed(query, repeat),
+        "export_json": {**_timed(lambda: processor.export_visualization_data(mesh, json_path),
+                                 repeat),
+                        "bytes": os.path.getsize(json_path)},
+        "export_binary": {**_timed(export_binary, repeat), "bytes": export_binary()},
+    }
+
+
+# --- run / compare ---
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _guarded(stages: Dict[str, Any], name: str, func: Callable[[], Dict[str, Any]]):
+    """单个阶段失败（如缺少依赖）时记录错误并继续其余阶段"""
+    try:
+        stages[name] = func()
+    except Exception as e:
+        stages[name] = {"error": f"{type(e).__name__}: {e}"}
+
+
+def run_scenario(scenario: Scenario, repeat: int, keep: bool = False) -> Dict[str, Any]:
+    """运行单个场景；keep 为 False 时结束后删除工作目录与剖分生成器的目录"""
+    boreholes = generate_boreholes(scenario)
+    workdir = tempfile.mkdtemp(prefix=f"bench_pipeline_{scenario.name}_")
+    scratch_dirs = [workdir]
+    stages: Dict[str, Any] = {}
+
+    try:
+        _guarded(stages, "geology_surfaces",
+                 lambda: bench_geology_surfaces(boreholes, scenario, repeat))
+        _guarded(stages, "occ_intersection",
+                 lambda: bench_occ_intersection(boreholes, scenario, repeat))
+
+        try:
+            mesh_result = bench_meshing(boreholes, scenario, repeat, workdir, scratch_dirs)
+            stages["meshing"] = mesh_result["meshing"]
+            stages["mdpa_write"] = mesh_result["mdpa_write"]
+            stages.update(bench_results(mesh_result["vtk_file"], scenario, repeat, workdir))
+        except Exception as e:
+            error = {"error": f"{type(e).__name__}: {e}"}
+            for name in STAGES[2:]:
+                stages.setdefault(name, error)
+    finally:
+        if not keep:
+            for path in scratch_dirs:
+                shutil.rmtree(path, ignore_errors=True)
+
+    result = {"boreholes": int(boreholes.groupby(["X", "Y"]).ngroups),
+              "points": len(boreholes), "stages": stages}
+    if keep:
+        result["workdirs"] = scratch_dirs
+    return result
+
+
+def run(scenario_names: List[str], repeat: int, keep: bool = False) -> Dict[str, Any]:
+    return {
+        "version": RESULT_FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "scenarios": {name: run_scenario(SCENARIOS[name], repeat, keep)
+                      for name in scenario_names},
+    }
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    逐场景、逐阶段比较最短耗时；ratio = new / base
+
+    基线中有耗时、而当前结果缺失或失败的阶段记为回退（new_s 与 ratio 为 None，
+    error 给出原因）；基线中没有耗时的阶段不参与比较。
+    """
+    rows = []
+    new_scenarios = new.get("scenarios", {})
+    for scenario, base_result in base.get("scenarios", {}).items():
+        new_stages = new_scenarios.get(scenario, {}).get("stages", {})
+        for stage, timing in base_result.get("stages", {}).items():
+            before = timing.get("seconds")
+            if before is None or before <= 0:
+                continue
+            current = new_stages.get(stage)
+            after = current.get("seconds") if current else None
+            if after is None:
+                rows.append({"scenario": scenario, "stage": stage, "base_s": before,
+                             "new_s": None, "ratio": None, "regression": True,
+                             "error": current.get("error", "无耗时") if current else "缺失"})
+                continue
+            ratio = after / before
+            rows.append({"scenario": scenario, "stage": stage, "base_s": before,
+                         "new_s": after, "ratio": ratio,
+                         "regression": ratio > 1.0 + threshold})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="运行基准并输出JSON结果")
+    run_parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS),
+                            default=["small", "medium"])
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--output", help="结果JSON路径（默认带时间戳）")
+    run_parser.add_argument("--keep", action="store_true", help="保留各场景的临时工作目录")
+
+    cmp_parser = sub.add_parser("compare", help="比较两份基准结果")
+    cmp_parser.add_argument("base")
+    cmp_parser.add_argument("new")
+    cmp_parser.add_argument("--threshold", type=float, default=0.10,
+                            help="允许的相对变慢比例，默认 0.10")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        result = run(args.scenarios, args.repeat, args.keep)
+        output = args.output or f"bench_pipeline_{datetime.now():%Y%m%d_%H%M%S}.json"
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        for name, scenario in result["scenarios"].items():
+            print(f"[{name}] {scenario['boreholes']} 个钻孔, {scenario['points']} 个点")
+            for stage in STAGES:
+                timing = scenario["stages"].get(stage, {})
+                if "seconds" in timing:
+                    print(f"  {stage:<20} {timing['seconds'] * 1000:10.1f} ms")
+                else:
+                    print(f"  {stage:<20} 失败: {timing.get('error')}")
+            for path in scenario.get("workdirs", []):
+                print(f"  工作目录: {path}")
+        print(f"结果已写入: {output}")
+        return 0
+
+    with open(args.base, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    rows = compare(base, new, args.threshold)
+    print(f"{'场景':<8} {'阶段':<20} {'基线':>10} {'当前':>10} {'比值':>7}")
+    for row in rows:
+        if row["new_s"] is None:
+            print(f"{row['scenario']:<8} {row['stage']:<20} {row['base_s'] * 1000:>8.1f}ms "
+                  f"{'-':>10} {'-':>7}  回退: {row['error']}")
+            continue
+        flag = "  回退" if row["regression"] else ""
+        print(f"{row['scenario']:<8} {row['stage']:<20} {row['base_s'] * 1000:>8.1f}ms "
+              f"{row['new_s'] * 1000:>8.1f}ms {row['ratio']:>7.2f}{flag}")
+    regressions = [r for r in rows if r["regression"]]
+    if regressions:
+        print(f"发现 {len(regressions)} 处性能回退（阈值 {args.threshold:.0%}）")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
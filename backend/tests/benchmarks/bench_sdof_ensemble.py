@@ -0,0 +1,104 @@
+"""
+CoSimulation SDoF 参数扫描基准：逐个 SDoFSolver 循环 vs 向量化 SDoFEnsembleSolver
+
+对 n 个刚度、阻尼、激励频率不同的单自由度系统做时间积分：
+- 循环：每个系统一个 SDoFSolver，逐个推进时间步；
+- 集合：一个 SDoFEnsembleSolver 以 numpy 数组一次推进全部系统。
+两者均不写结果文件；最后一列给出末步位移的最大差。需要 KratosMultiphysics 与 CoSimulationApplication 的 Python 模块。
+
+用法:
+    python -m backend.tests.benchmarks.bench_sdof_ensemble [--systems 10 100 1000] [--steps 200]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from KratosMultiphysics.CoSimulationApplication.solver_wrappers.sdof.sdof_solver import SDoFSolver, SDoFEnsembleSolver
+
+
+def _ensemble_settings(n_systems: int) -> dict:
+    rng = np.random.default_rng(0)
+    return {
+        "system_parameters": {
+            "mass": 10.0,
+            "stiffness": rng.uniform(500.0, 2000.0, n_systems).tolist(),
+            "damping": rng.uniform(0.0, 20.0, n_systems).tolist(),
+        },
+        "time_integration_parameters": {"alpha_m": -0.3, "time_step": 0.01},
+        "boundary_conditions": {
+            "omega_force": rng.uniform(1.0, 20.0, n_systems).tolist(),
+            "amplitude_force": 1000.0,
+            "omega_root_point_displacement": rng.uniform(1.0, 20.0, n_systems).tolist(),
+            "amplitude_root_point_displacement": 0.1,
+        },
+        "output_parameters": {"write_output_file": False},
+    }
+
+
+def _single_settings(settings: dict, index: int) -> dict:
+    return {group: {key: value[index] if isinstance(value, list) else value for key, value in values.items()}
+            for group, values in settings.items()}
+
+
+def _advance(system, n_steps: int) -> None:
+    current_time = 0.0
+    for _ in range(n_steps):
+        current_time = system.AdvanceInTime(current_time)
+        system.SolveSolutionStep()
+
+
+def _run_loop(settings: dict, n_systems: int, n_steps: int) -> np.ndarray:
+    systems = [SDoFSolver(_single_settings(settings, i)) for i in range(n_systems)]
+    for system in systems:
+        system.Initialize()
+        _advance(system, n_steps)
+    return np.array([system.dx[0] for system in systems])
+
+
+def _run_ensemble(settings: dict, n_steps: int) -> np.ndarray:
+    ensemble = SDoFEnsembleSolver(settings)
+    ensemble.Initialize()
+    _advance(ensemble, n_steps)
+    ensemble.Finalize()
+    return ensemble.dx[0]
+
+
+def _best_of(func, repeat: int) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(system_counts, n_steps: int = 200, repeat: int = 3) -> list:
+    rows = []
+    for n_systems in system_counts:
+        settings = _ensemble_settings(n_systems)
+        loop_s, loop_displacement = _best_of(lambda: _run_loop(settings, n_systems, n_steps), repeat)
+        ensemble_s, ensemble_displacement = _best_of(lambda: _run_ensemble(settings, n_steps), repeat)
+        rows.append({
+            "systems": n_systems,
+            "loop_s": loop_s,
+            "ensemble_s": ensemble_s,
+            "max_diff": float(np.max(np.abs(loop_displacement - ensemble_displacement))),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--systems", type=int, nargs="+", default=[10, 100, 1000], help="系统个数")
+    parser.add_argument("--steps", type=int, default=200, help="时间步数")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'系统数':>8} {'循环':>10} {'集合':>10} {'加速比':>8} {'最大差':>10}")
+    for row in run(args.systems, args.steps, args.repeat):
+        print(f"{row['systems']:>8} {row['loop_s'] * 1000:>8.1f}ms {row['ensemble_s'] * 1000:>8.1f}ms "
+              f"{row['loop_s'] / row['ensemble_s']:>8.1f} {row['max_diff']:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+渗流结果读取基准：旧JSON列 vs 二进制数组存储
+
+用法:
+    python -m backend.tests.benchmarks.bench_seepage_result_read [--nodes 1000000]
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import JSON, Column, Float, Integer, MetaData, Table, create_engine, select
+from sqlalchemy.orm import Session
+
+from backend.models import array_storage
+from backend.models.base import Base
+from backend.models.project import SeepageResult
+
+
+def _timed(func, repeat: int = 3) -> float:
+    """返回多次运行中的最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(n_nodes: int) -> dict:
+    rng = np.random.default_rng(0)
+    head = rng.uniform(-10.0, 10.0, n_nodes)
+    pressure = rng.uniform(0.0, 2e5, n_nodes)
+    velocity = rng.normal(0.0, 1e-5, (n_nodes, 3))
+
+    artifact_dir = tempfile.mkdtemp(prefix="bench_artifacts_")
+    previous_dir = array_storage.ARTIFACT_DIR
+    array_storage.ARTIFACT_DIR = artifact_dir
+    try:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+
+        # 旧结构：三个JSON列
+        legacy = Table(
+            "legacy_seepage_results", MetaData(),
+            Column("id", Integer, primary_key=True),
+            Column("head_data", JSON), Column("pressure_data", JSON),
+            Column("velocity_data", JSON), Column("flow_rate", Float),
+        )
+        legacy.create(engine)
+
+        with engine.begin() as conn:
+            conn.execute(legacy.insert(), {
+                "id": 1, "head_data": head.tolist(), "pressure_data": pressure.tolist(),
+                "velocity_data": velocity.tolist(), "flow_rate": 1.0,
+            })
+        with Session(engine) as session:
+            session.add(SeepageResult(id=1, status="completed", flow_rate=1.0,
+                                      head_data=head, pressure_data=pressure,
+                                      velocity_data=velocity))
+            session.commit()
+
+        def legacy_summary():
+            with engine.connect() as conn:
+                row = conn.execute(select(legacy).where(legacy.c.id == 1)).one()
+                max(row.head_data)
+
+        def legacy_head():
+            with engine.connect() as conn:
+                row = conn.execute(select(legacy).where(legacy.c.id == 1)).one()
+                np.asarray(row.head_data).sum()
+
+        def binary_summary():
+            with Session(engine) as session:
+                session.get(SeepageResult, 1).head_max
+
+        def binary_head():
+            # 数组为内存映射，求和强制读出全部数据，与 JSON 解析的工作量可比
+            with Session(engine) as session:
+                np.asarray(session.get(SeepageResult, 1).head_data).sum()
+
+        results = {
+            "nodes": n_nodes,
+            "timings_s": {
+                "legacy_summary": _timed(legacy_summary),
+                "binary_summary": _timed(binary_summary),
+                "legacy_head_array": _timed(legacy_head),
+                "binary_head_array": _timed(binary_head),
+            },
+        }
+    finally:
+        array_storage.ARTIFACT_DIR = previous_dir
+        shutil.rmtree(artifact_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    args = parser.parse_args()
+    result = run(args.nodes)
+    print(f"节点数: {result['nodes']}")
+    for name, seconds in result["timings_s"].items():
+        print(f"  {name:<20} {seconds * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+基准测试用的合成钻孔场景
+以 data/synthetic_borehole_data.csv 的钻孔布置为模板，在平面上平铺 scale×scale 份，
+并给各层高程加入小扰动，得到 small / medium / large 三种规模的场景。
+"""
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+SEED_CSV = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "data", "synthetic_borehole_data.csv"))
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    scale: int              # 模板在 X、Y 方向各平铺的份数
+    mesh_size: float        # 网格尺寸
+    surface_resolution: int  # 地层面插值网格分辨率
+    structure_count: int    # OCC 求交的结构（基坑/地连墙）个数
+    result_steps: int       # 合成结果的输出步数
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "small": Scenario("small", 1, 20.0, 50, 5, 5),
+    "medium": Scenario("medium", 3, 12.0, 100, 20, 10),
+    "large": Scenario("large", 8, 8.0, 200, 50, 20),
+}
+
+
+def load_seed_boreholes() -> pd.DataFrame:
+    return pd.read_csv(SEED_CSV)[["X", "Y", "Z", "surface"]]
+
+
+def generate_boreholes(scenario: Scenario, seed: int = 0) -> pd.DataFrame:
+    """平铺模板钻孔并扰动高程；同一钻孔内各层的扰动相同，保持层序不变"""
+    template = load_seed_boreholes()
+    span_x = template["X"].max() - template["X"].min()
+    span_y = template["Y"].max() - template["Y"].min()
+    step_x = span_x + span_x / max(template["X"].nunique() - 1, 1)
+    step_y = span_y + span_y / max(template["Y"].nunique() - 1, 1)
+
+    rng = np.random.default_rng(seed)
+    tiles = []
+    for i in range(scenario.scale):
+        for j in range(scenario.scale):
+            tile = template.copy()
+            tile["X"] += i * step_x
+            tile["Y"] += j * step_y
+            hole = tile.groupby(["X", "Y"]).ngroup()
+            tile["Z"] += rng.normal(0.0, 0.5, hole.max() + 1)[hole]
+            tiles.append(tile)
+    return pd.concat(tiles, ignore_index=True)
+
+
+def surface_order(boreholes: pd.DataFrame) -> List[str]:
+    return list(dict.fromkeys(boreholes["surface"]))
+
+
+def terrain_extent(boreholes: pd.DataFrame, depth_padding: float = 10.0) -> Dict[str, float]:
+    return {
+        "x_min": float(boreholes["X"].min()), "x_max": float(boreholes["X"].max()),
+        "y_min": float(boreholes["Y"].min()), "y_max": float(boreholes["Y"].max()),
+        "z_min": float(boreholes["Z"].min() - depth_padding),
+        "z_max": float(boreholes["Z"].max()),
+    }
+
+
+def terrain_data(boreholes: pd.DataFrame) -> Dict[str, Any]:
+    """TerrainMeshGenerator 的输入：计算域与按层序排列的地层体"""
+    return {
+        "terrain_extent": terrain_extent(boreholes),
+        "top_surface": {"is_undulating": False},
+        "volumes": {name: {"material_id": i + 1}
+                    for i, name in enumerate(surface_order(boreholes))},
+    }
@@ -0,0 +1,67 @@
+"""
+分析任务按需可视化接口单元测试
+"""
+import pyvista as pv
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from backend.api.routes import analysis_router
+
+
+def _client(monkeypatch, job_dirs):
+    monkeypatch.setattr(analysis_router, "job_working_dir", job_dirs.get)
+    app = FastAPI()
+    app.include_router(analysis_router.router, prefix="/api/analysis")
+    return TestClient(app)
+
+
+def _write_result(working_dir):
+    vtk_dir = working_dir / "vtk_output"
+    vtk_dir.mkdir()
+    grid = pv.ImageData(dimensions=(3, 3, 3)).cast_to_unstructured_grid().triangulate()
+    grid.point_data["WATER_PRESSURE"] = grid.points[:, 2]
+    grid.save(str(vtk_dir / "Structure_0_1.vtk"), binary=False)
+
+
+def test_visualization_data_endpoint(tmp_path, monkeypatch):
+    """测试可视化JSON接口按需导出"""
+    _write_result(tmp_path)
+    client = _client(monkeypatch, {"job-1": str(tmp_path)})
+
+    response = client.get("/api/analysis/jobs/job-1/visualization-data")
+    assert response.status_code == status.HTTP_200_OK
+    assert "WATER_PRESSURE" in response.json()["scalar_fields"]
+    assert (tmp_path / "job-1_visualization.json").exists()
+
+
+def test_preview_endpoint(tmp_path, monkeypatch):
+    """测试预览图接口返回渲染池生成的图片"""
+    _write_result(tmp_path)
+    client = _client(monkeypatch, {"job-1": str(tmp_path)})
+    requested = []
+
+    def fake_preview(working_dir, project_name, scalar_field=None, wait=True, timeout=None):
+        from concurrent.futures import Future
+        path = tmp_path / f"{project_name}_preview_{scalar_field}.png"
+        path.write_bytes(b"\x89PNG")
+        requested.append(scalar_field)
+        future = Future()
+        future.set_result(str(path))
+        return future
+
+    monkeypatch.setattr(analysis_router, "get_preview_image", fake_preview)
+    response = client.get("/api/analysis/jobs/job-1/preview", params={"field": "WATER_PRESSURE"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "image/png"
+    assert requested == ["WATER_PRESSURE"]
+
+    response = client.get("/api/analysis/jobs/job-1/preview", params={"field": "../x"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_unknown_job_or_missing_results(tmp_path, monkeypatch):
+    """测试未知任务与没有结果的任务返回 404"""
+    client = _client(monkeypatch, {"job-1": str(tmp_path)})
+    assert client.get("/api/analysis/jobs/unknown/visualization-data").status_code == 404
+    assert client.get("/api/analysis/jobs/job-1/visualization-data").status_code == 404
+    assert client.get("/api/analysis/jobs/job-1/preview").status_code == 404
@@ -0,0 +1,146 @@
+"""
+结果数组二进制存储单元测试
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+from sqlalchemy import JSON, Column, Float, Integer, MetaData, String, Table, create_engine, text
+from sqlalchemy.orm import Session
+
+from backend.models import array_storage
+from backend.models.base import Base
+from backend.models.project import Project, SeepageModel, SeepageResult
+
+
+@pytest.fixture
+def artifact_dir(tmp_path, monkeypatch):
+    """外部数组文件写入临时目录，并把内联上限调小以便测试外部存储"""
+    monkeypatch.setattr(array_storage, "ARTIFACT_DIR", str(tmp_path / "artifacts"))
+    monkeypatch.setattr(array_storage, "INLINE_LIMIT_BYTES", 1024)
+    return tmp_path / "artifacts"
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'results.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        yield db
+
+
+def _artifact_files(root):
+    return sorted(p.name for p in root.rglob("*.npy")) if root.exists() else []
+
+
+def _new_result(db, **arrays):
+    model = SeepageModel(name="m", project=Project(name="p"))
+    result = SeepageResult(model=model, status="completed", **arrays)
+    db.add(result)
+    db.commit()
+    return result
+
+
+def test_encode_decode_roundtrip_keeps_dtype_and_shape():
+    """测试压缩blob编解码"""
+    array = np.arange(12, dtype=np.float64).reshape(4, 3)
+    decoded = array_storage.decode_array(array_storage.encode_array(array))
+    assert decoded.dtype == array.dtype and decoded.shape == array.shape
+    np.testing.assert_array_equal(decoded, array)
+
+
+def test_store_array_inline_or_artifact(artifact_dir):
+    """测试小数组内联、大数组写入去重的外部文件并内存映射读取"""
+    small = np.linspace(0.0, 1.0, 10)
+    blob, ref = array_storage.store_array(small)
+    assert blob is not None and ref is None
+    np.testing.assert_array_equal(array_storage.load_array(blob, ref), small)
+
+    large = np.linspace(0.0, 1.0, 1000)
+    blob, ref = array_storage.store_array(large)
+    assert blob is None and ref == array_storage.array_digest(large)
+    assert array_storage.store_array(large.copy()) == (None, ref)
+    assert len(_artifact_files(artifact_dir)) == 1
+
+    loaded = array_storage.load_array(blob, ref)
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, large)
+    assert array_storage.load_array(None, None) is None
+
+
+def test_seepage_result_roundtrip_and_summary(artifact_dir, session):
+    """测试渗流结果数组的读写与汇总列"""
+    head = np.linspace(10.0, 20.0, 500)
+    velocity = np.tile([3.0, 4.0, 0.0], (500, 1))
+    result = _new_result(session, head_data=head, pressure_data=[1.0, 2.0], velocity_data=velocity)
+    assert result.head_ref is not None and result.pressure_blob is not None
+
+    session.expunge_all()
+    loaded = session.get(SeepageResult, result.id)
+    assert (loaded.node_count, loaded.head_min, loaded.head_max) == (500, 10.0, 20.0)
+    assert loaded.velocity_max == pytest.approx(5.0)
+    np.testing.assert_array_equal(loaded.head_data, head)
+    np.testing.assert_array_equal(loaded.pressure_data, [1.0, 2.0])
+    np.testing.assert_array_equal(loaded.velocity_data, velocity)
+
+
+def test_artifacts_deleted_with_owning_result(artifact_dir, session):
+    """测试删除或替换结果后回收外部文件，仍被引用的文件保留"""
+    head = np.linspace(0.0, 1.0, 1000)
+    first = _new_result(session, head_data=head, pressure_data=np.linspace(1.0, 2.0, 1000))
+    second = _new_result(session, head_data=head.copy())
+    assert len(_artifact_files(artifact_dir)) == 2
+
+    # 压力数组只被 first 引用，head 数组两行共享
+    session.delete(first.model)
+    session.commit()
+    assert _artifact_files(artifact_dir) == [f"{second.head_ref}.npy"]
+
+    # 回滚的删除不回收文件
+    session.delete(second)
+    session.flush()
+    session.rollback()
+    assert _artifact_files(artifact_dir) == [f"{second.head_ref}.npy"]
+
+    second.head_data = np.linspace(5.0, 6.0, 1000)
+    session.commit()
+    assert _artifact_files(artifact_dir) == [f"{second.head_ref}.npy"]
+
+    session.delete(second)
+    session.commit()
+    assert _artifact_files(artifact_dir) == []
+
+
+def test_alembic_revision_converts_legacy_json_rows(artifact_dir, tmp_path):
+    """测试 alembic 迁移把旧JSON列转换为二进制存储并可回退"""
+    pytest.importorskip("alembic")
+    from backend.migrations import rollback_migration, run_migrations
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    legacy = Table(
+        "seepage_results", MetaData(),
+        Column("id", Integer, primary_key=True), Column("model_id", Integer),
+        Column("status", String(20)), Column("flow_rate", Float),
+        Column("head_data", JSON), Column("pressure_data", JSON), Column("velocity_data", JSON),
+    )
+    legacy.create(engine)
+    head = np.linspace(0.0, 1.0, 1000).tolist()
+    with engine.begin() as conn:
+        conn.execute(legacy.insert(), [{"id": 1, "status": "completed", "head_data": head,
+                                        "pressure_data": [1.0, 3.0], "velocity_data": None}])
+
+    run_migrations(engine)
+    with engine.connect() as conn:
+        row = conn.execute(text(
+            "SELECT head_ref, pressure_blob, head_data, node_count, pressure_max "
+            "FROM seepage_results")).one()
+    assert row.head_ref == array_storage.array_digest(np.asarray(head))
+    np.testing.assert_array_equal(array_storage.decode_array(row.pressure_blob), [1.0, 3.0])
+    assert row.head_data is None and row.node_count == 1000 and row.pressure_max == 3.0
+
+    rollback_migration(engine, "base")
+    with engine.connect() as conn:
+        restored = conn.execute(text("SELECT head_data, head_ref FROM seepage_results")).one()
+    assert json.loads(restored.head_data) == head and restored.head_ref is None
+    assert os.path.exists(array_storage.ArtifactStore().path_for(row.head_ref))
@@ -0,0 +1,132 @@
+"""
+钻孔数据摄取：校验、去重与按内容哈希缓存单元测试
+"""
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from core import borehole_dataset
+from core.borehole_dataset import (
+    BoreholeDatasetStore, parse_borehole_csv, parse_borehole_excel, validate_boreholes
+)
+
+CSV = """x,y,z,formation
+0,0,-5,fill
+0,0,-7,fill
+10,0,-6,fill
+10,0,abc,fill
+0,0,-20,clay
+10,0,-21,clay
+,5,-3,clay
+"""
+
+
+def test_validate_drops_invalid_and_merges_duplicates():
+    """测试剔除无效行、同一地层内重复 (x, y) 取 Z 平均，地层顺序保持"""
+    table, report = validate_boreholes(parse_borehole_csv(CSV))
+    assert report.input_rows == 7
+    assert report.invalid_rows == 2
+    assert report.merged_duplicates == 1
+    assert report.surfaces == {"fill": 2, "clay": 2}
+    assert list(table.columns) == ["X", "Y", "Z", "surface"]
+    fill = table[table["surface"] == "fill"].set_index("X")["Z"]
+    assert fill[0.0] == pytest.approx(-6.0)
+    # 不同地层的相同 (x, y) 不合并
+    assert len(table[(table["X"] == 0.0) & (table["Y"] == 0.0)]) == 2
+
+
+def test_missing_columns_rejected():
+    with pytest.raises(ValueError):
+        parse_borehole_csv("x,y,formation\n0,0,fill\n")
+
+
+def test_store_ingests_once_and_loads_by_id(tmp_path):
+    """测试相同内容只摄取一次，之后按 id 读取"""
+    store = BoreholeDatasetStore(str(tmp_path))
+    dataset_id = store.ingest(CSV)
+    assert store.ingest(CSV) == dataset_id
+    assert store.metadata(dataset_id)["valid_rows"] == 4
+
+    fresh = BoreholeDatasetStore(str(tmp_path))
+    loaded = fresh.resolve(dataset_id=dataset_id)
+    pd.testing.assert_frame_equal(
+        loaded.astype({"surface": str}),
+        store.load(dataset_id).astype({"surface": str}))
+    with pytest.raises(KeyError):
+        fresh.load("0" * 64)
+
+
+def _excel_bytes(rows):
+    pytest.importorskip("openpyxl")
+    buffer = io.BytesIO()
+    pd.DataFrame(rows).to_excel(buffer, header=False, index=False)
+    return buffer.getvalue()
+
+
+def test_parse_excel_long_table():
+    """测试长表 Excel：表头含 X, Y, Z, formation"""
+    data = _excel_bytes([["X", "Y", "Z", "formation"], [0, 0, -5, "fill"], [10, 0, -20, "clay"]])
+    table = parse_borehole_excel(data)
+    assert list(table.columns) == ["X", "Y", "Z", "surface"]
+    assert table["surface"].tolist() == ["fill", "clay"]
+    assert table["Z"].astype(float).tolist() == [-5.0, -20.0]
+
+
+def test_parse_excel_layered_wide_table():
+    """测试分层宽表：每层 X/Y/Z 三列，纵向拼接并把“第N层”改名为 surface_N"""
+    data = _excel_bytes([
+        ["第1层", None, None, "第2层", None, None],
+        ["X", "Y", "Z", "X", "Y", "Z"],
+        [0, 0, -5, 0, 0, -20],
+        [10, 0, -6, 10, 0, -21],
+    ])
+    table, report = validate_boreholes(parse_borehole_excel(data))
+    assert report.surfaces == {"surface_1": 2, "surface_2": 2}
+    assert table[table["surface"] == "surface_2"]["Z"].tolist() == [-20.0, -21.0]
+
+    with pytest.raises(ValueError):
+        parse_borehole_excel(_excel_bytes([["a", "b"], ["c", "d"], [1, 2]]))
+
+
+def test_storage_format_recorded_in_metadata(tmp_path, monkeypatch):
+    """测试表文件格式记录在元数据中，读取不依赖当前是否安装 pyarrow"""
+    monkeypatch.setattr(borehole_dataset, "PARQUET_AVAILABLE", False)
+    store = BoreholeDatasetStore(str(tmp_path))
+    dataset_id = store.ingest(CSV)
+    assert store.metadata(dataset_id)["storage"] == "pickle"
+
+    monkeypatch.setattr(borehole_dataset, "PARQUET_AVAILABLE", True)
+    assert len(BoreholeDatasetStore(str(tmp_path)).load(dataset_id)) == 4
+
+    # 未记录格式的旧数据集按后缀探测
+    meta_path = tmp_path / f"{dataset_id}.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    del meta["storage"]
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    assert len(BoreholeDatasetStore(str(tmp_path)).load(dataset_id)) == 4
+
+
+def test_unreadable_metadata_means_absent_and_is_rewritten(tmp_path):
+    """测试写了一半/损坏的元数据视为数据集不存在，重新摄取时覆盖"""
+    store = BoreholeDatasetStore(str(tmp_path))
+    dataset_id = store.ingest(CSV)
+    meta_path = tmp_path / f"{dataset_id}.json"
+    meta_path.write_text('{"format": "csv", "stor', encoding="utf-8")
+
+    fresh = BoreholeDatasetStore(str(tmp_path))
+    assert not fresh.has(dataset_id)
+    with pytest.raises(KeyError):
+        fresh.metadata(dataset_id)
+    assert fresh.ingest(CSV) == dataset_id
+    assert fresh.metadata(dataset_id)["valid_rows"] == 4
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_content_id_depends_on_format():
+    """测试相同字节按不同格式摄取时得到不同的数据集 id"""
+    data = CSV.encode("utf-8")
+    assert (BoreholeDatasetStore.content_id(data, "csv")
+            != BoreholeDatasetStore.content_id(data, "xlsx"))
+    assert BoreholeDatasetStore.content_id(CSV) == BoreholeDatasetStore.content_id(data, "csv")
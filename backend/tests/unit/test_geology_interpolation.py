@@ -0,0 +1,53 @@
+"""
+GemPy 插值缓存：数据集哈希与 LRU 单元测试
+"""
+import pandas as pd
+
+from core.geology_interpolation import (InterpolationCache, MultiResolutionGeology,
+                                        borehole_dataset_hash, interpolation_cache)
+
+POINTS = pd.DataFrame({
+    "X": [0.0, 50.0, 100.0, 0.0, 50.0, 100.0],
+    "Y": [0.0, 50.0, 100.0, 0.0, 50.0, 100.0],
+    "Z": [-5.0, -6.0, -5.5, -20.0, -21.0, -19.5],
+    "surface": ["fill", "fill", "fill", "clay", "clay", "clay"],
+})
+ORIENTATIONS = pd.DataFrame(columns=["X", "Y", "Z", "G_x", "G_y", "G_z", "surface"])
+SURFACES = ["fill", "clay"]
+
+
+def test_dataset_hash_ignores_row_order():
+    """测试钻孔点的行顺序不影响数据集哈希"""
+    shuffled = POINTS.sample(frac=1.0, random_state=0)
+    assert (borehole_dataset_hash(POINTS, ORIENTATIONS, SURFACES)
+            == borehole_dataset_hash(shuffled, ORIENTATIONS, SURFACES))
+
+
+def test_dataset_hash_changes_with_data_and_stack():
+    """测试钻孔数据或地层顺序改变时哈希改变"""
+    base = borehole_dataset_hash(POINTS, ORIENTATIONS, SURFACES)
+    moved = POINTS.copy()
+    moved.loc[0, "Z"] = -5.1
+    assert borehole_dataset_hash(moved, ORIENTATIONS, SURFACES) != base
+    assert borehole_dataset_hash(POINTS, ORIENTATIONS, SURFACES[::-1]) != base
+
+
+def test_interpolation_cache_lru():
+    """测试缓存按最近使用淘汰"""
+    cache = InterpolationCache(max_entries=2)
+    cache.put("a", object())
+    cache.put("b", object())
+    assert cache.get("a") is not None
+    cache.put("c", object())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_injected_empty_cache_is_used():
+    """测试注入的空缓存不会被替换为全局缓存"""
+    cache = InterpolationCache(max_entries=2)
+    model = MultiResolutionGeology(POINTS, ORIENTATIONS, SURFACES, cache=cache)
+    assert model.cache is cache
+    assert MultiResolutionGeology(POINTS, ORIENTATIONS, SURFACES).cache is interpolation_cache
@@ -0,0 +1,93 @@
+"""
+BREP 几何缓存键与前缀查找单元测试
+"""
+import json
+import os
+
+from core.geometry_cache import BrepGeometryCache, chain_keys
+
+TERRAIN = {"terrain_extent": {"x_min": 0, "x_max": 100, "y_min": 0, "y_max": 100,
+                              "z_min": -50, "z_max": 10}}
+EXCAVATION = {"type": "excavation", "points": [[0, 0], [20, 0], [20, 20]], "depth": 8.0}
+TUNNEL = {"type": "tunnel", "shape": "horseshoe", "width": 10.0, "center": [50, 50, -20]}
+
+
+def _touch_entry(cache, key):
+    for path in cache._paths(key):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "w").close()
+
+
+def test_editing_tunnel_keeps_excavation_prefix(tmp_path):
+    """测试修改隧道只使隧道之后的缓存键失效"""
+    keys = chain_keys(TERRAIN, [EXCAVATION, TUNNEL])
+    edited = chain_keys(TERRAIN, [EXCAVATION, {**TUNNEL, "width": 12.0}])
+    assert keys[:2] == edited[:2]
+    assert keys[2] != edited[2]
+
+    cache = BrepGeometryCache(str(tmp_path))
+    assert cache.longest_prefix(keys) == -1
+    for key in keys:
+        _touch_entry(cache, key)
+    assert cache.longest_prefix(keys) == 2
+    assert cache.longest_prefix(edited) == 1
+
+
+def test_terrain_change_invalidates_everything():
+    """测试地形数据变化时所有键都改变"""
+    keys = chain_keys(TERRAIN, [EXCAVATION])
+    moved = chain_keys({"terrain_extent": {**TERRAIN["terrain_extent"], "z_min": -60}},
+                       [EXCAVATION])
+    assert not set(keys) & set(moved)
+
+
+class _FakeOcc:
+    """只记录导入与删除的 gmsh.model.occ 替身"""
+
+    def __init__(self, volume_count):
+        self.volume_count = volume_count
+        self.removed = []
+
+    def importShapes(self, path):
+        return [(3, 100 + i) for i in range(self.volume_count)]
+
+    def remove(self, dim_tags, recursive=False):
+        self.removed.extend(dim_tags)
+
+
+class _FakeGmsh:
+    def __init__(self, volume_count):
+        self.model = type("Model", (), {})()
+        self.model.occ = _FakeOcc(volume_count)
+
+
+def _write_entry(cache, key, meta):
+    brep_path, meta_path = cache._paths(key)
+    os.makedirs(os.path.dirname(brep_path), exist_ok=True)
+    open(brep_path, "w").close()
+    with open(meta_path, "w", encoding="utf-8") as f:
+        f.write(meta)
+
+
+def test_corrupt_entries_are_cache_misses(tmp_path):
+    """测试截断的JSON或体积数不符的缓存项按未命中处理并被删除，回退到更短的前缀"""
+    keys = chain_keys(TERRAIN, [EXCAVATION, TUNNEL])
+    cache = BrepGeometryCache(str(tmp_path))
+    _write_entry(cache, keys[0], json.dumps({"roles": ["soil"]}))
+    _write_entry(cache, keys[1], json.dumps({"roles": ["soil", "soil"]}))
+    _write_entry(cache, keys[2], '{"roles": ["so')
+
+    gmsh = _FakeGmsh(volume_count=1)
+    assert cache.restore(gmsh, keys) == (0, {"soil": [100]})
+    assert not cache.has(keys[2]) and not cache.has(keys[1])
+    # 体积数不符时已导入的体积被删除
+    assert gmsh.model.occ.removed == [(3, 100)]
+
+
+def test_try_save_reports_failure_without_raising(tmp_path):
+    """测试写入失败只返回 False，已存在的缓存项不重复写入"""
+    keys = chain_keys(TERRAIN, [EXCAVATION])
+    cache = BrepGeometryCache(str(tmp_path))
+    assert cache.try_save(None, keys[0], {"soil": [1]}) is False
+    _touch_entry(cache, keys[0])
+    assert cache.try_save(None, keys[0], {"soil": [1]}) is True
@@ -0,0 +1,53 @@
+"""
+几何求交引擎：支护结构工具体与批量切分单元测试
+"""
+import pytest
+
+pytest.importorskip("gmsh")
+
+from core.geometry_operations import GeometryIntersectionEngine  # noqa: E402
+
+TERRAIN = {"terrain_extent": {"x_min": 0, "x_max": 100, "y_min": 0, "y_max": 100,
+                              "z_min": -50, "z_max": 10}}
+
+
+@pytest.fixture
+def engine():
+    engine = GeometryIntersectionEngine(use_occ=True)
+    engine.initialize_gmsh()
+    engine.kernel.gmsh.option.setNumber("General.Terminal", 0)
+    yield engine
+    engine.finalize_gmsh()
+
+
+def test_wall_and_piles_follow_path(engine):
+    """测试地连墙沿路径方向布置、排桩按间距布置"""
+    occ = engine.kernel.gmsh.model.occ
+    wall = engine.create_diaphragm_wall_geometry(
+        {"path": [[10, 10, 0], [10, 90, 0]], "thickness": 1.0, "height": 5.0})
+    assert occ.getBoundingBox(3, wall) == pytest.approx((9.5, 10.0, -5.0, 10.5, 90.0, 0.0), abs=1e-6)
+
+    piles = engine.create_pile_geometries(
+        {"path": [[20, 70, 0], [60, 70, 0]], "diameter": 1.0, "spacing": 10.0, "length": 20.0})
+    assert len(piles) == 5
+    assert occ.getBoundingBox(3, piles[-1]) == pytest.approx((59.5, 69.5, -20.0, 60.5, 70.5, 0.0), abs=1e-6)
+
+
+def test_batch_fragment_with_excavation_wall_and_piles(engine):
+    """测试基坑挖空、墙体与桩保留为与土体共享界面的独立体积"""
+    soil = engine.create_soil_volume(TERRAIN)
+    tools = {
+        "excavation_0": engine.create_excavation_geometry(
+            {"type": "polygon", "points": [[20, 20], [60, 20], [60, 60], [20, 60]], "depth": 10.0}),
+        "diaphragm_wall_1": engine.create_diaphragm_wall_geometry(
+            {"path": [[18, 18, 0], [62, 18, 0]], "thickness": 0.8, "height": 25.0}),
+    }
+    piles = engine.create_pile_geometries(
+        {"path": [[18, 64, 0], [62, 64, 0]], "diameter": 1.0, "spacing": 11.0, "length": 20.0})
+    tools.update({f"pile_2_{k}": tag for k, tag in enumerate(piles)})
+
+    fragments = engine.batch_fragment([soil], tools, remove_tools=["excavation_0"])
+    assert len(fragments["soil"]) == 1 and not fragments["skipped"]
+    assert fragments["tools"]["excavation_0"] == []
+    assert all(len(fragments["tools"][name]) == 1 for name in tools if name != "excavation_0")
+    assert len(engine.kernel.gmsh.model.getEntities(3)) == 1 + 1 + len(piles)
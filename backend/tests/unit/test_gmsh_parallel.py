@@ -0,0 +1,24 @@
+"""
+Gmsh 多线程剖分：CPU 预算与目标单元数尺寸调整单元测试
+"""
+import pytest
+
+from core.gmsh_parallel import MESH_CPU_BUDGET_ENV, cpu_budget, size_factor_for_target
+
+
+def test_cpu_budget_precedence(monkeypatch):
+    """测试显式线程数优先于调度器分配的环境变量"""
+    monkeypatch.setenv(MESH_CPU_BUDGET_ENV, "6")
+    assert cpu_budget() == 6
+    assert cpu_budget(3) == 3
+    monkeypatch.delenv(MESH_CPU_BUDGET_ENV)
+    assert cpu_budget() >= 1
+
+
+def test_size_factor_for_target():
+    """测试按 N ∝ h^-3 由试剖分反推尺寸系数"""
+    # 尺寸放大 2 倍试剖分得到 1000 个单元，则原尺寸约 8000 个
+    assert size_factor_for_target(2.0, 1000, 8000) == pytest.approx(1.0)
+    # 目标减少为 1/8 时尺寸加倍
+    assert size_factor_for_target(2.0, 1000, 1000) == pytest.approx(2.0)
+    assert size_factor_for_target(2.0, 0, 1000) == 1.0
@@ -0,0 +1,45 @@
+"""
+自适应网格尺寸场与单元数估算单元测试
+"""
+import numpy as np
+import pytest
+
+from core.mesh_size_fields import MeshSizeFieldBuilder
+
+EXTENT = {"x_min": 0, "x_max": 200, "y_min": 0, "y_max": 200, "z_min": -60, "z_max": 0}
+
+
+def test_grading_controls_transition_distance():
+    """测试渐变系数决定过渡带宽度"""
+    builder = MeshSizeFieldBuilder(size_max=10.0, grading=1.5)
+    assert builder.transition_distance(1.0) == pytest.approx(18.0)
+    with pytest.raises(ValueError):
+        MeshSizeFieldBuilder(size_max=10.0, grading=1.0)
+
+
+def test_size_function_refines_near_features():
+    """测试基坑与隧道附近尺寸减小，远场保持全局尺寸"""
+    builder = MeshSizeFieldBuilder(size_max=10.0, grading=1.3)
+    builder.add_feature({"type": "excavation", "points": [[80, 80], [120, 80], [120, 120]],
+                         "depth": 15.0, "size": 1.0})
+    builder.add_feature({"type": "tunnel", "center": [0, 30, -40], "length": 200,
+                         "radius": 3.0, "size": 2.0})
+    sizes = builder.size_at(np.array([
+        [100, 100, -5],   # 坑内
+        [100, 30, -40],   # 隧道轴线上
+        [10, 190, -55],   # 远场
+    ]))
+    np.testing.assert_allclose(sizes, [1.0, 2.0, 10.0])
+
+
+def test_estimate_is_far_below_uniform_fine_mesh():
+    """测试局部加密的估算单元数远小于全域细网格"""
+    builder = MeshSizeFieldBuilder(size_max=10.0, grading=1.3)
+    builder.add_feature({"type": "wall", "points": [[80, 80], [120, 80]], "thickness": 1.0,
+                         "depth": 20.0, "size": 1.0})
+    refined = builder.estimate_element_count(EXTENT)
+    coarse = MeshSizeFieldBuilder(size_max=10.0).estimate_element_count(EXTENT)
+    fine = MeshSizeFieldBuilder(size_max=1.0).estimate_element_count(EXTENT)
+
+    assert coarse == pytest.approx(6 * 200 * 200 * 60 / 10.0 ** 3, rel=1e-6)
+    assert coarse < refined < fine / 10
@@ -0,0 +1,113 @@
+"""
+按需导出可视化JSON与预览图单元测试
+"""
+import json
+import os
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+import pyvista as pv
+
+from core import post_processing
+from core.post_processing import PreviewRendererPool, get_preview_image, get_visualization_data
+
+
+def _write_result(working_dir):
+    vtk_dir = working_dir / "vtk_output"
+    vtk_dir.mkdir()
+    grid = pv.ImageData(dimensions=(3, 3, 3)).cast_to_unstructured_grid().triangulate()
+    grid.point_data["DISPLACEMENT"] = grid.points * 0.01
+    grid.point_data["WATER_PRESSURE"] = grid.points[:, 2] * 10.0
+    path = vtk_dir / "Structure_0_1.vtk"
+    grid.save(str(path), binary=False)
+    return path
+
+
+def _wait_until_forgotten(pool, timeout=10.0):
+    # 完成回调在 Future 结果可见之后才在工作线程中执行
+    deadline = time.monotonic() + timeout
+    while pool._pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return pool._pending
+
+
+def test_visualization_data_is_exported_once(tmp_path):
+    """测试可视化JSON首次请求时导出，结果未变化时复用"""
+    _write_result(tmp_path)
+    path = get_visualization_data(str(tmp_path), "demo")
+    assert path == str(tmp_path / "demo_visualization.json")
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["n_points"] == 27
+    assert "WATER_PRESSURE" in data["scalar_fields"]
+
+    mtime = os.stat(path).st_mtime_ns
+    assert get_visualization_data(str(tmp_path), "demo") == path
+    assert os.stat(path).st_mtime_ns == mtime
+
+
+def test_missing_results_raise(tmp_path):
+    """测试没有分析结果时抛出 FileNotFoundError"""
+    with pytest.raises(FileNotFoundError):
+        get_visualization_data(str(tmp_path), "demo")
+    with pytest.raises(FileNotFoundError):
+        get_preview_image(str(tmp_path), "demo")
+
+
+def test_preview_reuses_image_and_forgets_finished_renders(tmp_path, monkeypatch):
+    """测试预览图只渲染一次，完成的渲染任务不再保留在 pending 中"""
+    vtk_file = _write_result(tmp_path)
+    pool = PreviewRendererPool(max_workers=1)
+    renders = []
+
+    def fake_render(vtk_path, output_path, scalar_field):
+        renders.append(scalar_field)
+        with open(output_path, "wb") as f:
+            f.write(b"png")
+        return output_path
+
+    monkeypatch.setattr(pool, "_render", fake_render)
+    monkeypatch.setattr(post_processing, "get_renderer_pool", lambda: pool)
+    try:
+        path = get_preview_image(str(tmp_path), "demo", scalar_field="DISPLACEMENT", timeout=10)
+        assert path == str(tmp_path / "demo_preview_DISPLACEMENT.png")
+        assert get_preview_image(str(tmp_path), "demo", scalar_field="DISPLACEMENT") == path
+        assert renders == ["DISPLACEMENT"]
+        assert _wait_until_forgotten(pool) == {}
+
+        # 结果文件更新后重新渲染
+        os.utime(vtk_file, (os.path.getmtime(path) + 10,) * 2)
+        future = get_preview_image(str(tmp_path), "demo", scalar_field="DISPLACEMENT", wait=False)
+        assert isinstance(future, Future)
+        future.result(10)
+        assert renders == ["DISPLACEMENT", "DISPLACEMENT"]
+        assert _wait_until_forgotten(pool) == {}
+    finally:
+        pool.shutdown()
+
+
+def test_failed_render_is_retried(tmp_path, monkeypatch):
+    """测试渲染失败后不缓存失败结果，下一次请求重新渲染"""
+    vtk_file = _write_result(tmp_path)
+    pool = PreviewRendererPool(max_workers=1)
+    calls = []
+
+    def flaky_render(vtk_path, output_path, scalar_field):
+        calls.append(output_path)
+        if len(calls) == 1:
+            raise RuntimeError("no OpenGL context")
+        np.save(output_path + ".npy", np.zeros(1))
+        return output_path
+
+    monkeypatch.setattr(pool, "_render", flaky_render)
+    try:
+        output = str(tmp_path / "preview.png")
+        with pytest.raises(RuntimeError):
+            pool.request(str(vtk_file), output).result(10)
+        assert pool.request(str(vtk_file), output).result(10) == output
+        assert len(calls) == 2
+        assert _wait_until_forgotten(pool) == {}
+    finally:
+        pool.shutdown()
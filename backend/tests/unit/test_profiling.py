@@ -0,0 +1,39 @@
+"""
+按任务剖析单元测试
+"""
+import os
+
+from core.profiling import PROFILE_DIRNAME, load_profile_summary, profile_job, profile_stage
+
+
+@profile_stage("unit.work")
+def _work(n):
+    return sum(i * i for i in range(n))
+
+
+def test_disabled_stage_is_passthrough(tmp_path):
+    """测试未开启剖析时不写任何文件"""
+    with profile_job(str(tmp_path), "job-off", enabled=False) as session:
+        assert session is None
+        with profile_stage("unit.outer"):
+            assert _work(10) == 285
+    assert not os.path.exists(tmp_path / PROFILE_DIRNAME)
+    assert load_profile_summary(str(tmp_path)) is None
+
+
+def test_enabled_job_writes_summary(tmp_path):
+    """测试开启剖析后写出各阶段记录、.prof 文件与热点函数"""
+    with profile_job(str(tmp_path), "job-on", enabled=True):
+        with profile_stage("unit.outer"):
+            _work(1000)
+            _work(1000)
+
+    summary = load_profile_summary(str(tmp_path))
+    assert summary["job_id"] == "job-on"
+    stages = {(s["name"], s["depth"]) for s in summary["stages"]}
+    assert stages == {("unit.outer", 0), ("unit.work", 1)}
+    # 只有最外层阶段运行 cProfile
+    assert len(summary["profiles"]) == 1
+    assert os.path.exists(tmp_path / PROFILE_DIRNAME / summary["profiles"][0])
+    assert any("_work" in row["function"] for row in summary["top_functions"])
+    assert all("peak_mb" in s for s in summary["stages"])
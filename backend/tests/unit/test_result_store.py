@@ -0,0 +1,119 @@
+"""
+HDF5 时间序列结果库单元测试
+"""
+import h5py
+import numpy as np
+import pytest
+import pyvista as pv
+
+from core import result_store
+from core.result_store import ResultStore, consolidate_vtk_output, vtk_step_files
+
+
+def _write_steps(working_dir, n_steps=3):
+    vtk_dir = working_dir / "vtk_output"
+    vtk_dir.mkdir()
+    grid = pv.ImageData(dimensions=(3, 3, 3)).cast_to_unstructured_grid()
+    # 故意以乱序写出，验证按步号而不是文件时间排序
+    for step in reversed(range(1, n_steps + 1)):
+        grid.point_data["DISPLACEMENT"] = grid.points * step
+        grid.point_data["WATER_PRESSURE"] = np.full(grid.n_points, float(step))
+        grid.save(str(vtk_dir / f"Structure_0_{step}.vtk"), binary=False)
+    return grid
+
+
+def test_consolidate_and_lazy_reads(tmp_path):
+    """测试合并逐步VTK并按场、按步读取"""
+    grid = _write_steps(tmp_path)
+    names = [p.rsplit("/", 1)[-1] for p in vtk_step_files(str(tmp_path / "vtk_output"))]
+    assert names == ["Structure_0_1.vtk", "Structure_0_2.vtk", "Structure_0_3.vtk"]
+
+    store_path = consolidate_vtk_output(str(tmp_path))
+    assert (tmp_path / "results.xdmf").exists()
+    # 结果库已是最新时不会重新合并
+    mtime = (tmp_path / "results.h5").stat().st_mtime_ns
+    assert consolidate_vtk_output(str(tmp_path)) == store_path
+    assert (tmp_path / "results.h5").stat().st_mtime_ns == mtime
+
+    with ResultStore(store_path) as store:
+        assert store.n_steps == 3
+        np.testing.assert_allclose(store.read_field("WATER_PRESSURE", step=1), 2.0)
+        np.testing.assert_allclose(store.read_field("DISPLACEMENT"), grid.points * 3)
+
+        last = store.load_step(-1, fields=["WATER_PRESSURE"])
+        assert last.n_cells == grid.n_cells
+        assert list(last.point_data.keys()) == ["WATER_PRESSURE"]
+
+        history = store.time_series("WATER_PRESSURE", [4, 0])
+        np.testing.assert_allclose(history, [[1, 1], [2, 2], [3, 3]])
+
+
+def test_xdmf_topology_reorders_voxels(tmp_path):
+    """测试体素按六面体节点顺序写入 XDMF 拓扑"""
+    grid = _write_steps(tmp_path, n_steps=1)
+    store_path = consolidate_vtk_output(str(tmp_path))
+    xdmf = (tmp_path / "results.xdmf").read_text(encoding="utf-8")
+    assert 'TopologyType="Hexahedron"' in xdmf
+    assert "results.h5:/mesh/xdmf_topology" in xdmf
+    assert ".tmp" not in xdmf
+
+    with h5py.File(store_path, "r") as f:
+        topology = f["mesh/xdmf_topology"][()].reshape(grid.n_cells, 8)
+    np.testing.assert_array_equal(topology[0], grid.cell_connectivity[:8][[0, 1, 3, 2, 4, 5, 7, 6]])
+
+
+def test_xdmf_quadratic_and_unsupported_cells(tmp_path):
+    """测试二次单元写出 XDMF，不支持的单元类型跳过 XDMF 但仍合并结果库"""
+    vtk_dir = tmp_path / "vtk_output"
+    vtk_dir.mkdir()
+    points = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [0.5, 0, 0],
+                       [0.5, 0.5, 0], [0, 0.5, 0], [0, 0, 0.5], [0.5, 0, 0.5], [0, 0.5, 0.5]], dtype=float)
+    tet10 = pv.UnstructuredGrid(np.r_[10, np.arange(10)], [pv.CellType.QUADRATIC_TETRA], points)
+    tet10.save(str(vtk_dir / "Structure_0_1.vtk"), binary=False)
+    consolidate_vtk_output(str(tmp_path))
+    assert 'TopologyType="Tetrahedron_10"' in (tmp_path / "results.xdmf").read_text(encoding="utf-8")
+
+    polygon = pv.UnstructuredGrid(np.r_[5, np.arange(5)], [pv.CellType.POLYGON],
+                                  np.array([[0, 0, 0], [1, 0, 0], [1.5, 1, 0], [0.5, 1.5, 0], [-0.5, 1, 0]], dtype=float))
+    polygon.point_data["WATER_PRESSURE"] = np.arange(5, dtype=float)
+    polygon.save(str(vtk_dir / "Structure_0_1.vtk"), binary=False)
+    store_path = consolidate_vtk_output(str(tmp_path), force=True)
+    assert not (tmp_path / "results.xdmf").exists()
+    with ResultStore(store_path) as store:
+        np.testing.assert_allclose(store.read_field("WATER_PRESSURE"), np.arange(5))
+
+
+def test_xdmf_failure_does_not_publish_store(tmp_path, monkeypatch):
+    """测试 XDMF 写出失败时不发布结果库，下次调用重新合并"""
+    _write_steps(tmp_path, n_steps=2)
+
+    def failing_write_xdmf(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(result_store, "write_xdmf", failing_write_xdmf)
+    with pytest.raises(OSError):
+        consolidate_vtk_output(str(tmp_path))
+    assert not (tmp_path / "results.h5").exists()
+    assert not any(p.name.endswith(".tmp") for p in tmp_path.iterdir())
+
+    monkeypatch.undo()
+    consolidate_vtk_output(str(tmp_path))
+    assert (tmp_path / "results.h5").exists()
+    assert (tmp_path / "results.xdmf").exists()
+
+
+def test_post_processing_falls_back_to_vtk(tmp_path, monkeypatch):
+    """测试结果库合并失败时后处理回退到读取最后一个VTK文件"""
+    from core import post_processing
+
+    grid = _write_steps(tmp_path, n_steps=2)
+
+    def failing_consolidate(working_dir):
+        raise ValueError("corrupt store")
+
+    monkeypatch.setattr(post_processing, "open_result_store", failing_consolidate)
+    results = post_processing.process_kratos_results(str(tmp_path), "demo")
+    assert "error" not in results
+    assert results["result_store"] is None
+    assert results["mesh_info"]["n_points"] == grid.n_points
+    assert "WATER_PRESSURE" in results["mesh_info"]["available_fields"]
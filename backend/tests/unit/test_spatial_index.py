@@ -0,0 +1,94 @@
+"""
+结果空间索引单元测试
+"""
+import numpy as np
+import pyvista as pv
+
+from core.spatial_index import ResultSpatialIndex, SpatialIndexService
+
+
+def _linear_field_grid():
+    grid = pv.ImageData(dimensions=(6, 6, 6), spacing=(1.0, 1.0, 1.0)).cast_to_unstructured_grid()
+    grid.point_data["HEAD"] = grid.points[:, 0] + 2.0 * grid.points[:, 2]
+    grid.point_data["DISPLACEMENT"] = grid.points * 0.01
+    return grid
+
+
+def test_probe_interpolates_linear_field_and_reuses_weights():
+    """测试点探测对线性场精确插值，且同一点集复用权重"""
+    index = ResultSpatialIndex(_linear_field_grid())
+    points = [[0.5, 0.5, 0.5], [2.25, 3.0, 1.75], [10.0, 0.0, 0.0]]
+
+    result = index.probe(points, ["HEAD", "DISPLACEMENT"])
+    assert result["valid"].tolist() == [True, True, False]
+    np.testing.assert_allclose(result["HEAD"][:2], [1.5, 5.75])
+    np.testing.assert_allclose(result["DISPLACEMENT"][1], [0.0225, 0.03, 0.0175])
+    assert np.isnan(result["HEAD"][2])
+
+    # 同一点集再次探测（如下一时间步）直接命中缓存
+    assert index.probe_weights(points) is index.probe_weights(points)
+
+
+def test_sample_polyline_and_cached_slice():
+    """测试钻孔采样与切片缓存"""
+    grid = _linear_field_grid()
+    index = ResultSpatialIndex(grid)
+
+    borehole = index.sample_polyline([[2.5, 2.5, 5.0], [2.5, 2.5, 0.0]], resolution=11, fields=["HEAD"])
+    np.testing.assert_allclose(borehole["distance"][-1], 5.0)
+    np.testing.assert_allclose(borehole["HEAD"], 2.5 + 2.0 * np.linspace(5.0, 0.0, 11))
+
+    section = index.slice((2.5, 2.5, 2.5), (1.0, 0.0, 0.0))
+    reference = grid.slice(normal=(1.0, 0.0, 0.0), origin=(2.5, 2.5, 2.5))
+    np.testing.assert_allclose(section.area, reference.area)
+    assert index.slice((2.5, 2.5, 2.5), (1.0, 0.0, 0.0)) is section
+
+
+def test_probe_on_mixed_mesh_locates_all_points_at_once():
+    """测试混合单元网格（四面体+六面体）上的批量定位与插值"""
+    hexes = pv.ImageData(dimensions=(4, 4, 4)).cast_to_unstructured_grid()
+    tets = pv.ImageData(dimensions=(4, 4, 4), origin=(3.0, 0.0, 0.0)).triangulate()
+    grid = hexes.merge(tets, merge_points=True)
+    grid.point_data["HEAD"] = 3.0 * grid.points[:, 0] - grid.points[:, 1] + 0.5 * grid.points[:, 2]
+    index = ResultSpatialIndex(grid)
+
+    rng = np.random.default_rng(0)
+    points = np.vstack([rng.uniform([0.0, 0.0, 0.0], [6.0, 3.0, 3.0], size=(200, 3)),
+                        [[7.0, 1.0, 1.0]]])
+    weights = index.probe_weights(points)
+    assert weights.cell_ids[:-1].min() >= 0 and weights.cell_ids[-1] == -1
+    np.testing.assert_allclose(weights.weights[:-1].sum(axis=1), 1.0)
+
+    result = index.probe(points, ["HEAD"])
+    expected = 3.0 * points[:-1, 0] - points[:-1, 1] + 0.5 * points[:-1, 2]
+    np.testing.assert_allclose(result["HEAD"][:-1], expected, atol=1e-9)
+    assert np.isnan(result["HEAD"][-1])
+
+
+def test_index_shares_mesh_nodes_and_colors_cells_properly():
+    """测试索引不复制单元节点：探测源与原网格节点数相同，单元内节点颜色互异"""
+    grid = _linear_field_grid().triangulate()
+    index = ResultSpatialIndex(grid)
+    assert index._probe_source.n_points == grid.n_points
+
+    offsets = np.asarray(grid.cell_offsets)
+    colors = index.node_colors[np.asarray(grid.cell_connectivity)]
+    for start, stop in zip(offsets[:-1], offsets[1:]):
+        assert len(set(colors[start:stop])) == stop - start
+
+
+def test_service_keys_indices_by_result_file_and_step(tmp_path):
+    """测试索引服务按结果文件与输出步缓存，文件被覆盖后重建"""
+    path = str(tmp_path / "result.vtk")
+    _linear_field_grid().save(path)
+    service = SpatialIndexService()
+
+    index = service.for_file(path)
+    assert service.for_file(path) is index
+
+    mesh = _linear_field_grid()
+    assert service.for_mesh(mesh, (path, 3)) is service.for_mesh(mesh.copy(), (path, 3))
+    assert service.for_mesh(mesh, (path, 4)) is not service.for_mesh(mesh, (path, 3))
+
+    service.invalidate(path)
+    assert service.for_file(path) is not index
@@ -0,0 +1,38 @@
+"""
+分阶段开挖检查点逻辑单元测试
+"""
+from core.staged_excavation import resume_stage_index, stage_digests
+
+
+def _stages():
+    return [
+        {"name": "dig_1", "depth": 2.0, "active_supports": []},
+        {"name": "strut_1", "depth": 2.0, "active_supports": ["strut_1"]},
+        {"name": "dig_2", "depth": 5.0, "active_supports": ["strut_1"]},
+    ]
+
+
+def test_editing_stage_invalidates_only_following_stages():
+    """测试修改第k阶段后只有k..N需要重算"""
+    stages = _stages()
+    old = stage_digests("base", stages)
+
+    stages[1]["active_supports"] = ["strut_1", "anchor_1"]
+    new = stage_digests("base", stages)
+
+    assert new[0] == old[0]
+    assert new[1] != old[1] and new[2] != old[2]
+    assert resume_stage_index(old, new) == 1
+
+
+def test_resume_index_for_unchanged_appended_and_new_base():
+    """测试阶段不变、追加阶段以及网格变化时的恢复位置"""
+    stages = _stages()
+    old = stage_digests("base", stages)
+    assert resume_stage_index(old, old) == 3
+
+    appended = stage_digests("base", stages + [{"name": "dig_3", "depth": 8.0,
+                                                 "active_supports": ["strut_1"]}])
+    assert resume_stage_index(old, appended) == 3
+
+    assert resume_stage_index(old, stage_digests("other_mesh", stages)) == 0
@@ -0,0 +1,50 @@
+"""
+分阶段追踪模块单元测试
+"""
+import json
+
+from core.tracing import (
+    file_trace, load_spans, main, render_flame, summarize_flame, trace_span
+)
+
+
+def test_nested_spans_written_to_jsonl(tmp_path):
+    """测试嵌套span写入JSONL并保留父子关系"""
+    trace_file = tmp_path / "trace.jsonl"
+    with file_trace(str(trace_file)):
+        with trace_span("v5.run_analysis") as root:
+            with trace_span("gmsh.generate", mesh_size=5.0) as span:
+                span.set_attribute("element_count", 1200)
+            root.set_attribute("status", "completed")
+
+    spans = load_spans(str(trace_file))
+    by_name = {s["name"]: s for s in spans}
+    assert set(by_name) == {"v5.run_analysis", "gmsh.generate"}
+    assert by_name["gmsh.generate"]["parent_id"] == by_name["v5.run_analysis"]["span_id"]
+    assert by_name["gmsh.generate"]["attributes"] == {"mesh_size": 5.0, "element_count": 1200}
+
+
+def test_span_without_exporter_is_noop(tmp_path):
+    """测试未配置导出器时span不产生文件"""
+    with trace_span("orphan") as span:
+        span.set_attribute("ignored", 1)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_chrome_format_and_flame_summary(tmp_path):
+    """测试Chrome trace格式与火焰图摘要"""
+    trace_file = tmp_path / "trace.json"
+    with file_trace(str(trace_file), fmt="chrome"):
+        with trace_span("kratos.run"):
+            for _ in range(3):
+                with trace_span("kratos.solve"):
+                    pass
+
+    events = json.loads(trace_file.read_text(encoding="utf-8"))
+    assert all(e["ph"] == "X" for e in events)
+
+    rows = summarize_flame(load_spans(str(trace_file)))
+    assert [r["path"] for r in rows] == [("kratos.run",), ("kratos.run", "kratos.solve")]
+    assert rows[1]["count"] == 3
+    assert "kratos.solve" in render_flame(rows)
+    assert main(["flame", str(trace_file)]) == 0